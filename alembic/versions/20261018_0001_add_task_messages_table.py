@@ -0,0 +1,79 @@
+"""Add append-only task_messages table.
+
+Revision ID: 20261018_0001
+Revises: 20260119_0001
+Create Date: 2026-10-18 09:00:00.000000
+
+Task message history used to live in the tasks.history JSONB array, which was
+rewritten (together with its GIN index entries) on every appended message.
+This migration moves history into a normalized task_messages table with one
+row per message, keyed by (task_id, seq):
+
+- Creates task_messages and backfills it from tasks.history in message order
+- Empties tasks.history (the column is kept for backward compatibility)
+- Drops idx_tasks_history_gin, which no longer indexes anything useful
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0001"
+down_revision: Union[str, None] = "20260119_0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema - create task_messages and backfill history."""
+    op.create_table(
+        "task_messages",
+        sa.Column("task_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("seq", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            nullable=False,
+            server_default=sa.text("NOW()"),
+        ),
+        sa.PrimaryKeyConstraint("task_id", "seq"),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        comment="Append-only task message history, one row per message",
+    )
+
+    # Backfill: one row per history element, preserving per-task order
+    op.execute("""
+        INSERT INTO task_messages (task_id, payload, created_at)
+        SELECT t.id, m.value, t.created_at
+        FROM tasks t
+        CROSS JOIN LATERAL jsonb_array_elements(t.history) WITH ORDINALITY AS m(value, ord)
+        ORDER BY t.id, m.ord
+    """)
+
+    op.execute("UPDATE tasks SET history = '[]'::jsonb WHERE history <> '[]'::jsonb")
+
+    op.drop_index("idx_tasks_history_gin", table_name="tasks")
+
+
+def downgrade() -> None:
+    """Downgrade database schema - fold task_messages back into tasks.history."""
+    op.execute("""
+        UPDATE tasks t
+        SET history = t.history || m.messages
+        FROM (
+            SELECT task_id, jsonb_agg(payload ORDER BY seq) AS messages
+            FROM task_messages
+            GROUP BY task_id
+        ) m
+        WHERE m.task_id = t.id
+    """)
+
+    op.create_index(
+        "idx_tasks_history_gin", "tasks", ["history"], postgresql_using="gin"
+    )
+
+    op.drop_table("task_messages")
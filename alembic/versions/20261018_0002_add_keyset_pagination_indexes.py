@@ -0,0 +1,53 @@
+"""Add composite indexes for keyset pagination.
+
+Revision ID: 20261018_0002
+Revises: 20261018_0001
+Create Date: 2026-10-18 10:00:00.000000
+
+Task and context listings page by (created_at, id) with optional context and
+state filters. The composite indexes below let each page be read with a single
+index range scan. They replace the single-column indexes on context_id, state
+and created_at, whose lookups are served by the composite index prefixes.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0002"
+down_revision: Union[str, None] = "20261018_0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema - replace listing indexes with keyset indexes."""
+    op.create_index("idx_tasks_created_at_id", "tasks", ["created_at", "id"])
+    op.create_index(
+        "idx_tasks_context_id_created_at_id",
+        "tasks",
+        ["context_id", "created_at", "id"],
+    )
+    op.create_index(
+        "idx_tasks_state_created_at_id", "tasks", ["state", "created_at", "id"]
+    )
+    op.create_index("idx_contexts_created_at_id", "contexts", ["created_at", "id"])
+
+    op.drop_index("idx_tasks_context_id", table_name="tasks")
+    op.drop_index("idx_tasks_state", table_name="tasks")
+    op.drop_index("idx_tasks_created_at", table_name="tasks")
+    op.drop_index("idx_contexts_created_at", table_name="contexts")
+
+
+def downgrade() -> None:
+    """Downgrade database schema - restore single-column listing indexes."""
+    op.create_index("idx_tasks_context_id", "tasks", ["context_id"])
+    op.create_index("idx_tasks_state", "tasks", ["state"])
+    op.create_index("idx_tasks_created_at", "tasks", ["created_at"])
+    op.create_index("idx_contexts_created_at", "contexts", ["created_at"])
+
+    op.drop_index("idx_tasks_created_at_id", table_name="tasks")
+    op.drop_index("idx_tasks_context_id_created_at_id", table_name="tasks")
+    op.drop_index("idx_tasks_state_created_at_id", table_name="tasks")
+    op.drop_index("idx_contexts_created_at_id", table_name="contexts")
@@ -0,0 +1,49 @@
+"""Add NOTIFY trigger for task changes.
+
+Revision ID: 20261018_0003
+Revises: 20261018_0002
+Create Date: 2026-10-18 12:00:00.000000
+
+Every committed insert, update or delete on tasks sends a NOTIFY on the
+bindu_task_changes channel with the task ID as payload. Read-through task
+caches LISTEN on it to invalidate entries written by other pods.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0003"
+down_revision: Union[str, None] = "20261018_0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema - notify listeners on task changes."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_task_change()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                PERFORM pg_notify('bindu_task_changes', OLD.id::text);
+            ELSE
+                PERFORM pg_notify('bindu_task_changes', NEW.id::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("""
+        CREATE TRIGGER notify_tasks_change
+        AFTER INSERT OR UPDATE OR DELETE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION notify_task_change();
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade database schema - remove the task change trigger."""
+    op.execute("DROP TRIGGER IF EXISTS notify_tasks_change ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS notify_task_change()")
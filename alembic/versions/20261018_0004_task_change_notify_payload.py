@@ -0,0 +1,65 @@
+"""Send task context and state in task change notifications.
+
+Revision ID: 20261018_0004
+Revises: 20261018_0003
+Create Date: 2026-10-18 14:00:00.000000
+
+The notify_task_change() payload becomes a JSON object with the task's id,
+context_id, state and the operation (insert/update/delete), so change-feed
+subscribers can filter by context without reading the task back.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0004"
+down_revision: Union[str, None] = "20261018_0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema - JSON payload for task change notifications."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_task_change()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            task_row tasks;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                task_row := OLD;
+            ELSE
+                task_row := NEW;
+            END IF;
+            PERFORM pg_notify(
+                'bindu_task_changes',
+                json_build_object(
+                    'id', task_row.id,
+                    'context_id', task_row.context_id,
+                    'state', task_row.state,
+                    'op', lower(TG_OP)
+                )::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade database schema - task ID only payload."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_task_change()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                PERFORM pg_notify('bindu_task_changes', OLD.id::text);
+            ELSE
+                PERFORM pg_notify('bindu_task_changes', NEW.id::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
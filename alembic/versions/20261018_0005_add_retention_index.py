@@ -0,0 +1,33 @@
+"""Add index for the retention purge.
+
+Revision ID: 20261018_0005
+Revises: 20261018_0004
+Create Date: 2026-10-18 14:00:00.000000
+
+The retention engine deletes tasks that have been in a terminal state longer
+than a per-state TTL, oldest first. An index on (state, state_timestamp) lets
+each purge batch be found with an index range scan per state instead of a
+sequential scan of the tasks table.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0005"
+down_revision: Union[str, None] = "20261018_0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema - add the retention purge index."""
+    op.create_index(
+        "idx_tasks_state_state_timestamp", "tasks", ["state", "state_timestamp"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema - drop the retention purge index."""
+    op.drop_index("idx_tasks_state_state_timestamp", table_name="tasks")
@@ -0,0 +1,194 @@
+"""Partition tasks by created_at into monthly ranges.
+
+Revision ID: 20261018_0006
+Revises: 20261018_0005
+Create Date: 2026-10-18 15:00:00.000000
+
+The tasks table becomes a declaratively range-partitioned table with one
+partition per calendar month (tasks_pYYYYMM) and a default partition. Old
+tasks can then be removed by dropping a whole partition, and queries bounded
+on created_at only scan the partitions in range.
+
+Partitioned tables need every unique key to include the partition key, so:
+- The primary key becomes (id, created_at); submit_task() keeps ids unique
+  (the database does again from 20261018_0012 on).
+- task_messages, task_feedback and webhook_configs can no longer reference
+  tasks(id). Their foreign keys are replaced by the delete_task_dependents()
+  statement trigger, which deletes them together with their task.
+
+Existing rows are copied into partitions covering their months, and
+partitions are created three months ahead; PostgresStorage keeps creating
+them from then on. The copy rewrites the whole table, so plan for downtime
+proportional to its size. Requires PostgreSQL 13 or later.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0006"
+down_revision: Union[str, None] = "20261018_0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_DEPENDENT_TABLES = ("task_messages", "task_feedback", "webhook_configs")
+
+_TASK_INDEXES = (
+    "CREATE INDEX idx_tasks_created_at_id ON tasks (created_at, id)",
+    "CREATE INDEX idx_tasks_context_id_created_at_id "
+    "ON tasks (context_id, created_at, id)",
+    "CREATE INDEX idx_tasks_state_created_at_id ON tasks (state, created_at, id)",
+    "CREATE INDEX idx_tasks_updated_at ON tasks (updated_at)",
+    "CREATE INDEX idx_tasks_state_state_timestamp ON tasks (state, state_timestamp)",
+    "CREATE INDEX idx_tasks_metadata_gin ON tasks USING gin (metadata)",
+    "CREATE INDEX idx_tasks_artifacts_gin ON tasks USING gin (artifacts)",
+)
+
+_TASK_TRIGGERS = (
+    """
+    CREATE TRIGGER notify_tasks_change
+    AFTER INSERT OR UPDATE OR DELETE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION notify_task_change()
+    """,
+    """
+    CREATE TRIGGER update_tasks_updated_at
+    BEFORE UPDATE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()
+    """,
+)
+
+
+def _move_aside(old_name: str) -> None:
+    """Rename tasks and free the constraint and index names it holds."""
+    op.execute(f"ALTER TABLE tasks RENAME TO {old_name}")
+    op.execute(f"DROP TRIGGER IF EXISTS notify_tasks_change ON {old_name}")
+    op.execute(f"DROP TRIGGER IF EXISTS update_tasks_updated_at ON {old_name}")
+    op.execute(f"ALTER TABLE {old_name} DROP CONSTRAINT tasks_pkey")
+    op.execute(f"ALTER TABLE {old_name} DROP CONSTRAINT tasks_context_id_fkey")
+    op.execute("""
+        DO $$
+        DECLARE
+            idx record;
+        BEGIN
+            FOR idx IN
+                SELECT indexname FROM pg_indexes
+                WHERE schemaname = current_schema() AND indexname LIKE 'idx_tasks_%'
+            LOOP
+                EXECUTE format('DROP INDEX %I', idx.indexname);
+            END LOOP;
+        END;
+        $$;
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade database schema - range-partition tasks by created_at."""
+    for table in _DEPENDENT_TABLES:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {table}_task_id_fkey")
+
+    _move_aside("tasks_unpartitioned")
+
+    op.execute("""
+        CREATE TABLE tasks (
+            LIKE tasks_unpartitioned INCLUDING DEFAULTS INCLUDING COMMENTS
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER TABLE tasks ADD PRIMARY KEY (id, created_at)")
+    op.execute("""
+        ALTER TABLE tasks ADD CONSTRAINT tasks_context_id_fkey
+        FOREIGN KEY (context_id) REFERENCES contexts(id) ON DELETE CASCADE
+    """)
+    op.execute("CREATE TABLE tasks_default PARTITION OF tasks DEFAULT")
+
+    # One partition per month from the oldest task to three months ahead
+    op.execute("""
+        DO $$
+        DECLARE
+            month timestamptz;
+            last_month timestamptz := date_trunc('month', now() AT TIME ZONE 'UTC')
+                AT TIME ZONE 'UTC' + interval '3 months';
+        BEGIN
+            SELECT coalesce(
+                date_trunc('month', min(created_at) AT TIME ZONE 'UTC')
+                    AT TIME ZONE 'UTC',
+                last_month - interval '3 months'
+            ) INTO month FROM tasks_unpartitioned;
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF tasks FOR VALUES FROM (%L) TO (%L)',
+                    'tasks_p' || to_char(month AT TIME ZONE 'UTC', 'YYYYMM'),
+                    month,
+                    month + interval '1 month'
+                );
+                month := month + interval '1 month';
+            END LOOP;
+        END;
+        $$;
+    """)
+
+    op.execute("INSERT INTO tasks SELECT * FROM tasks_unpartitioned")
+    op.execute("DROP TABLE tasks_unpartitioned")
+
+    for statement in (*_TASK_INDEXES, *_TASK_TRIGGERS):
+        op.execute(statement)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION delete_task_dependents()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            DELETE FROM task_messages WHERE task_id IN (SELECT id FROM deleted_tasks);
+            DELETE FROM task_feedback WHERE task_id IN (SELECT id FROM deleted_tasks);
+            DELETE FROM webhook_configs
+            WHERE task_id IN (SELECT id FROM deleted_tasks);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER delete_tasks_dependents
+        AFTER DELETE ON tasks
+        REFERENCING OLD TABLE AS deleted_tasks
+        FOR EACH STATEMENT EXECUTE FUNCTION delete_task_dependents();
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade database schema - turn tasks back into a single table.
+
+    If two partitions hold tasks with the same id, the most recently updated
+    one is kept.
+    """
+    op.execute("DROP TRIGGER IF EXISTS delete_tasks_dependents ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS delete_task_dependents()")
+
+    _move_aside("tasks_partitioned")
+
+    op.execute("""
+        CREATE TABLE tasks (
+            LIKE tasks_partitioned INCLUDING DEFAULTS INCLUDING COMMENTS
+        )
+    """)
+    op.execute(
+        "INSERT INTO tasks SELECT DISTINCT ON (id) * FROM tasks_partitioned "
+        "ORDER BY id, updated_at DESC"
+    )
+    op.execute("DROP TABLE tasks_partitioned CASCADE")
+
+    op.execute("ALTER TABLE tasks ADD PRIMARY KEY (id)")
+    op.execute("""
+        ALTER TABLE tasks ADD CONSTRAINT tasks_context_id_fkey
+        FOREIGN KEY (context_id) REFERENCES contexts(id) ON DELETE CASCADE
+    """)
+    for statement in (*_TASK_INDEXES, *_TASK_TRIGGERS):
+        op.execute(statement)
+
+    for table in _DEPENDENT_TABLES:
+        # Rows whose task is gone would violate the restored foreign key
+        op.execute(
+            f"DELETE FROM {table} d WHERE NOT EXISTS "
+            f"(SELECT 1 FROM tasks t WHERE t.id = d.task_id)"
+        )
+        op.execute(f"""
+            ALTER TABLE {table} ADD CONSTRAINT {table}_task_id_fkey
+            FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE CASCADE
+        """)
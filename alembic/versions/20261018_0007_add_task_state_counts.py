@@ -0,0 +1,115 @@
+"""Keep task counts per state in a trigger-maintained table.
+
+Revision ID: 20261018_0007
+Revises: 20261018_0006
+Create Date: 2026-10-18 16:00:00.000000
+
+count_tasks() and count_tasks_by_state() (the /metrics endpoint and the
+negotiation queue depth) read task_state_counts instead of running COUNT(*)
+over tasks. Statement-level triggers on tasks add each statement's net
+change per state to one of 16 shard rows per state, picked by backend pid,
+so concurrent writers rarely update the same row.
+
+Existing tasks are counted into shard 0. Creating the triggers locks tasks
+against writes until the migration commits, so no change is missed.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0007"
+down_revision: Union[str, None] = "20261018_0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TRIGGERS = (
+    """
+    CREATE TRIGGER count_tasks_insert
+    AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION count_task_states()
+    """,
+    """
+    CREATE TRIGGER count_tasks_update
+    AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_tasks NEW TABLE AS new_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION count_task_states()
+    """,
+    """
+    CREATE TRIGGER count_tasks_delete
+    AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION count_task_states()
+    """,
+    """
+    CREATE TRIGGER count_tasks_truncate
+    AFTER TRUNCATE ON tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION count_task_states()
+    """,
+)
+
+
+def upgrade() -> None:
+    """Upgrade database schema - add trigger-maintained task counts."""
+    op.execute("""
+        CREATE TABLE task_state_counts (
+            state VARCHAR(50) NOT NULL,
+            shard SMALLINT NOT NULL,
+            count BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (state, shard)
+        )
+    """)
+    op.execute(
+        "COMMENT ON TABLE task_state_counts IS "
+        "'Task counts per state, maintained by triggers on tasks'"
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION count_task_states()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'TRUNCATE' THEN
+                DELETE FROM task_state_counts;
+            ELSIF TG_OP = 'INSERT' THEN
+                INSERT INTO task_state_counts AS c (state, shard, count)
+                SELECT state, mod(pg_backend_pid(), 16), count(*)
+                FROM new_tasks GROUP BY state ORDER BY state
+                ON CONFLICT (state, shard)
+                DO UPDATE SET count = c.count + excluded.count;
+            ELSIF TG_OP = 'DELETE' THEN
+                INSERT INTO task_state_counts AS c (state, shard, count)
+                SELECT state, mod(pg_backend_pid(), 16), -count(*)
+                FROM old_tasks GROUP BY state ORDER BY state
+                ON CONFLICT (state, shard)
+                DO UPDATE SET count = c.count + excluded.count;
+            ELSE
+                INSERT INTO task_state_counts AS c (state, shard, count)
+                SELECT state, mod(pg_backend_pid(), 16), sum(delta)
+                FROM (
+                    SELECT state, 1 AS delta FROM new_tasks
+                    UNION ALL
+                    SELECT state, -1 AS delta FROM old_tasks
+                ) changes
+                GROUP BY state HAVING sum(delta) <> 0 ORDER BY state
+                ON CONFLICT (state, shard)
+                DO UPDATE SET count = c.count + excluded.count;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    for statement in _TRIGGERS:
+        op.execute(statement)
+    op.execute("""
+        INSERT INTO task_state_counts (state, shard, count)
+        SELECT state, 0, count(*) FROM tasks GROUP BY state
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade database schema - drop the task counts."""
+    for trigger in ("insert", "update", "delete", "truncate"):
+        op.execute(f"DROP TRIGGER IF EXISTS count_tasks_{trigger} ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS count_task_states()")
+    op.execute("DROP TABLE IF EXISTS task_state_counts")
@@ -0,0 +1,73 @@
+"""Add compressed payloads for compacted finished tasks.
+
+Revision ID: 20261018_0008
+Revises: 20261018_0007
+Create Date: 2026-10-18 17:00:00.000000
+
+Tasks that have been in a terminal state for longer than
+storage.compression_after_days can be compacted: their message history and
+artifacts are moved into tasks.compressed_payload as one zstd frame, and
+their task_messages rows are deleted. Frames are compressed with a shared
+dictionary trained on finished tasks and stored in
+task_compression_dictionaries.
+
+A partial index on (state, state_timestamp) over uncompacted tasks lets each
+compaction batch find its oldest candidates without walking past the tasks
+already compacted.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0008"
+down_revision: Union[str, None] = "20261018_0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema - add task compression."""
+    op.create_table(
+        "task_compression_dictionaries",
+        sa.Column("id", sa.BigInteger(), autoincrement=False, nullable=False),
+        sa.Column("dictionary", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        comment="Shared zstd dictionaries for compacted task payloads",
+    )
+    op.add_column("tasks", sa.Column("compressed_payload", sa.LargeBinary()))
+    op.create_index(
+        "idx_tasks_uncompressed_state_timestamp",
+        "tasks",
+        ["state", "state_timestamp"],
+        postgresql_where=sa.text("compressed_payload IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema - drop task compression.
+
+    Refuses to run while compacted tasks exist, since dropping the column
+    would lose their history and artifacts.
+    """
+    compacted = (
+        op.get_bind()
+        .execute(sa.text("SELECT 1 FROM tasks WHERE compressed_payload IS NOT NULL"))
+        .first()
+    )
+    if compacted is not None:
+        raise RuntimeError(
+            "Compacted tasks exist; export them with 'bindu storage export' "
+            "and purge them before downgrading"
+        )
+    op.drop_index("idx_tasks_uncompressed_state_timestamp", table_name="tasks")
+    op.drop_column("tasks", "compressed_payload")
+    op.drop_table("task_compression_dictionaries")
@@ -0,0 +1,63 @@
+"""Add message ids to task_messages for idempotent message/send.
+
+Revision ID: 20261018_0009
+Revises: 20261018_0008
+Create Date: 2026-10-18 18:00:00.000000
+
+A retried message/send must not append its message (and run the task) a
+second time. submit_task now stores the message's message_id in
+task_messages.message_id, unique per task, and returns the task unchanged
+when the message was already accepted.
+
+The column is backfilled from the first user message carrying each
+message_id; agent messages and repeated user messages stay NULL, which the
+unique index does not constrain.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0009"
+down_revision: Union[str, None] = "20261018_0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UUID_PATTERN = "^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
+
+
+def upgrade() -> None:
+    """Upgrade database schema - add task_messages.message_id."""
+    op.add_column(
+        "task_messages",
+        sa.Column("message_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+
+    op.execute(f"""
+        UPDATE task_messages m
+        SET message_id = (m.payload->>'message_id')::uuid
+        FROM (
+            SELECT DISTINCT ON (task_id, payload->>'message_id') task_id, seq
+            FROM task_messages
+            WHERE payload->>'role' = 'user'
+                AND payload->>'message_id' ~* '{UUID_PATTERN}'
+            ORDER BY task_id, payload->>'message_id', seq
+        ) first
+        WHERE m.task_id = first.task_id AND m.seq = first.seq
+    """)
+
+    op.create_index(
+        "uq_task_messages_task_id_message_id",
+        "task_messages",
+        ["task_id", "message_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema - drop task_messages.message_id."""
+    op.drop_index("uq_task_messages_task_id_message_id", table_name="task_messages")
+    op.drop_column("task_messages", "message_id")
@@ -0,0 +1,56 @@
+"""Add a full-text search vector to task_messages for tasks/search.
+
+Revision ID: 20261018_0010
+Revises: 20261018_0009
+Create Date: 2026-10-18 20:00:00.000000
+
+tasks/search finds tasks by the words of their messages. The words of each
+message's text parts are kept in a stored generated tsvector column,
+task_messages.search_vector, with a GIN index.
+
+Adding a stored generated column rewrites task_messages under an ACCESS
+EXCLUSIVE lock, so run this migration in a maintenance window on large
+databases.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0010"
+down_revision: Union[str, None] = "20261018_0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Kept in sync with task_messages.search_vector in bindu/server/storage/schema.py
+SEARCH_VECTOR = (
+    "jsonb_to_tsvector('simple'::regconfig, "
+    "jsonb_path_query_array(payload, '$.parts[*].text'), '[\"string\"]')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade database schema - add task_messages.search_vector."""
+    op.add_column(
+        "task_messages",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR, persisted=True),
+        ),
+    )
+    op.create_index(
+        "idx_task_messages_search_vector",
+        "task_messages",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema - drop task_messages.search_vector."""
+    op.drop_index("idx_task_messages_search_vector", table_name="task_messages")
+    op.drop_column("task_messages", "search_vector")
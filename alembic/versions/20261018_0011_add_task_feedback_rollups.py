@@ -0,0 +1,112 @@
+"""Keep feedback counts and ratings per skill and day in a rollup table.
+
+Revision ID: 20261018_0011
+Revises: 20261018_0010
+Create Date: 2026-10-18 21:00:00.000000
+
+tasks/feedback/summary and the feedback gauges of /metrics read
+task_feedback_rollups instead of scanning task_feedback. A statement-level
+trigger on task_feedback adds each statement's entries to their skill and
+UTC day, in one of 16 shard rows picked by backend pid.
+
+Existing feedback is rolled up into shard 0. Creating the trigger locks
+task_feedback against writes until the migration commits, so no entry is
+missed.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0011"
+down_revision: Union[str, None] = "20261018_0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Skill, UTC day and rating (1-5, else NULL) of task_feedback rows in <source>
+_ENTRIES = """
+    SELECT CASE WHEN jsonb_typeof(feedback_data -> 'skill_id') = 'string'
+                THEN feedback_data ->> 'skill_id' ELSE '' END AS skill_id,
+           (created_at AT TIME ZONE 'UTC')::date AS day,
+           CASE WHEN jsonb_typeof(feedback_data -> 'rating') = 'number' THEN
+               CASE WHEN (feedback_data ->> 'rating')::numeric IN (1, 2, 3, 4, 5)
+                    THEN (feedback_data ->> 'rating')::numeric::int END
+           END AS rating
+    FROM {source}
+"""
+
+_TOTALS = """
+    count(*), coalesce(sum(rating), 0),
+    count(*) FILTER (WHERE rating = 1), count(*) FILTER (WHERE rating = 2),
+    count(*) FILTER (WHERE rating = 3), count(*) FILTER (WHERE rating = 4),
+    count(*) FILTER (WHERE rating = 5)
+"""
+
+_COLUMNS = """
+    skill_id, day, shard, feedback_count, rating_sum,
+    rating_1, rating_2, rating_3, rating_4, rating_5
+"""
+
+
+def upgrade() -> None:
+    """Upgrade database schema - add trigger-maintained feedback rollups."""
+    op.execute("""
+        CREATE TABLE task_feedback_rollups (
+            skill_id VARCHAR NOT NULL,
+            day DATE NOT NULL,
+            shard SMALLINT NOT NULL,
+            feedback_count BIGINT NOT NULL DEFAULT 0,
+            rating_sum BIGINT NOT NULL DEFAULT 0,
+            rating_1 BIGINT NOT NULL DEFAULT 0,
+            rating_2 BIGINT NOT NULL DEFAULT 0,
+            rating_3 BIGINT NOT NULL DEFAULT 0,
+            rating_4 BIGINT NOT NULL DEFAULT 0,
+            rating_5 BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (skill_id, day, shard)
+        )
+    """)
+    op.execute(
+        "COMMENT ON TABLE task_feedback_rollups IS "
+        "'Feedback counts and ratings per skill and day, maintained by a "
+        "trigger on task_feedback'"
+    )
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION rollup_task_feedback()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO task_feedback_rollups AS r ({_COLUMNS})
+            SELECT skill_id, day, mod(pg_backend_pid(), 16), {_TOTALS}
+            FROM ({_ENTRIES.format(source="new_feedback")}) entries
+            GROUP BY skill_id, day ORDER BY skill_id, day
+            ON CONFLICT (skill_id, day, shard) DO UPDATE SET
+                feedback_count = r.feedback_count + excluded.feedback_count,
+                rating_sum = r.rating_sum + excluded.rating_sum,
+                rating_1 = r.rating_1 + excluded.rating_1,
+                rating_2 = r.rating_2 + excluded.rating_2,
+                rating_3 = r.rating_3 + excluded.rating_3,
+                rating_4 = r.rating_4 + excluded.rating_4,
+                rating_5 = r.rating_5 + excluded.rating_5;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER rollup_task_feedback_insert
+        AFTER INSERT ON task_feedback
+        REFERENCING NEW TABLE AS new_feedback
+        FOR EACH STATEMENT EXECUTE FUNCTION rollup_task_feedback()
+    """)
+    op.execute(f"""
+        INSERT INTO task_feedback_rollups ({_COLUMNS})
+        SELECT skill_id, day, 0, {_TOTALS}
+        FROM ({_ENTRIES.format(source="task_feedback")}) entries
+        GROUP BY skill_id, day
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade database schema - drop the feedback rollups."""
+    op.execute("DROP TRIGGER IF EXISTS rollup_task_feedback_insert ON task_feedback")
+    op.execute("DROP FUNCTION IF EXISTS rollup_task_feedback()")
+    op.execute("DROP TABLE IF EXISTS task_feedback_rollups")
@@ -0,0 +1,123 @@
+"""Keep task ids unique and referenced again with a task_ids table.
+
+Revision ID: 20261018_0012
+Revises: 20261018_0011
+Create Date: 2026-10-18 22:00:00.000000
+
+Since tasks was partitioned (20261018_0006) its primary key is
+(id, created_at), so nothing in the database kept task ids unique, the
+tables hanging off a task had no foreign key, and lookups by id probed
+every partition.
+
+task_ids holds every task's id and created_at, kept by statement-level
+triggers on tasks:
+- Its primary key makes a second task with the same id fail.
+- task_messages, task_feedback and webhook_configs reference it again,
+  ON DELETE CASCADE and checked at commit. This replaces the
+  delete_task_dependents() trigger.
+- PostgresStorage reads a task's created_at from it, so lookups by id only
+  scan the partition holding the task.
+
+Existing tasks are copied in. Rows of the dependent tables whose task is
+gone are deleted first. The upgrade fails if two tasks share an id.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0012"
+down_revision: Union[str, None] = "20261018_0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_DEPENDENT_TABLES = ("task_messages", "task_feedback", "webhook_configs")
+
+
+def upgrade() -> None:
+    """Upgrade database schema - add task_ids and restore the foreign keys."""
+    op.execute("""
+        CREATE TABLE task_ids (
+            id UUID PRIMARY KEY,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL
+        )
+    """)
+    op.execute(
+        "COMMENT ON TABLE task_ids IS "
+        "'Id and creation time of every task, maintained by triggers on tasks'"
+    )
+    # Keeps writers out until the triggers exist, so no task is missed
+    op.execute("LOCK TABLE tasks IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("INSERT INTO task_ids (id, created_at) SELECT id, created_at FROM tasks")
+
+    op.execute("DROP TRIGGER IF EXISTS delete_tasks_dependents ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS delete_task_dependents()")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION sync_task_ids()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO task_ids (id, created_at)
+                SELECT id, created_at FROM new_tasks;
+            ELSE
+                DELETE FROM task_ids WHERE id IN (SELECT id FROM old_tasks);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER sync_task_ids_insert
+        AFTER INSERT ON tasks
+        REFERENCING NEW TABLE AS new_tasks
+        FOR EACH STATEMENT EXECUTE FUNCTION sync_task_ids()
+    """)
+    op.execute("""
+        CREATE TRIGGER sync_task_ids_delete
+        AFTER DELETE ON tasks
+        REFERENCING OLD TABLE AS old_tasks
+        FOR EACH STATEMENT EXECUTE FUNCTION sync_task_ids()
+    """)
+
+    for table in _DEPENDENT_TABLES:
+        # Rows whose task is gone would violate the new foreign key
+        op.execute(
+            f"DELETE FROM {table} d WHERE NOT EXISTS "
+            f"(SELECT 1 FROM task_ids t WHERE t.id = d.task_id)"
+        )
+        op.execute(f"""
+            ALTER TABLE {table} ADD CONSTRAINT {table}_task_id_fkey
+            FOREIGN KEY (task_id) REFERENCES task_ids(id) ON DELETE CASCADE
+            DEFERRABLE INITIALLY DEFERRED
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade database schema - drop task_ids, back to the delete trigger."""
+    for table in _DEPENDENT_TABLES:
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {table}_task_id_fkey")
+
+    op.execute("DROP TRIGGER IF EXISTS sync_task_ids_insert ON tasks")
+    op.execute("DROP TRIGGER IF EXISTS sync_task_ids_delete ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS sync_task_ids()")
+    op.execute("DROP TABLE IF EXISTS task_ids")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION delete_task_dependents()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            DELETE FROM task_messages WHERE task_id IN (SELECT id FROM deleted_tasks);
+            DELETE FROM task_feedback WHERE task_id IN (SELECT id FROM deleted_tasks);
+            DELETE FROM webhook_configs
+            WHERE task_id IN (SELECT id FROM deleted_tasks);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER delete_tasks_dependents
+        AFTER DELETE ON tasks
+        REFERENCING OLD TABLE AS deleted_tasks
+        FOR EACH STATEMENT EXECUTE FUNCTION delete_task_dependents();
+    """)
@@ -0,0 +1,162 @@
+"""Benchmark the orjson JSONB codec against serialize_for_jsonb() + json.
+
+Usage:
+    python -m benchmarks.jsonb_codec [--url postgresql://localhost/bindu]
+
+Without --url, times encoding and decoding task histories of several sizes
+in-process. With --url, also runs update_task on tasks with long histories
+in a throwaway DID schema, once with the engine using the previous codec
+(the recursive serialize_for_jsonb() walk, then the stdlib json encoder)
+and once with the orjson codec, and prints the process CPU time per call.
+update_task returns the whole task, so the history is decoded every call.
+"""
+
+from __future__ import annotations as _annotations
+
+import argparse
+import asyncio
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import patch
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from benchmarks.postgres_fast_path import OperationStats, _measure, _message
+from bindu.server.storage.helpers import (
+    dumps_jsonb,
+    loads_jsonb,
+    serialize_for_jsonb,
+)
+from bindu.server.storage.postgres_storage import PostgresStorage
+from bindu.utils.schema_manager import drop_schema_if_exists
+
+
+def legacy_dumps(obj: Any) -> str:
+    """The encoding used before the orjson codec."""
+    return json.dumps(serialize_for_jsonb(obj))
+
+
+CODECS: dict[str, tuple[Callable[[Any], str], Callable[[str], Any]]] = {
+    "json": (legacy_dumps, json.loads),
+    "orjson": (dumps_jsonb, loads_jsonb),
+}
+
+
+def _history(length: int) -> list[dict]:
+    task_id, context_id = uuid4(), uuid4()
+    return [
+        _message(task_id, context_id, f"message {i} " + "lorem ipsum " * 20)
+        for i in range(length)
+    ]
+
+
+def bench_codecs(sizes: list[int], repeat: int) -> None:
+    """Print CPU time to encode and decode histories of each size."""
+    print(f"{'codec':<8} {'messages':>8} {'encode us':>11} {'decode us':>11}")
+    for size in sizes:
+        history = _history(size)
+        for name, (dumps, loads) in CODECS.items():
+            cpu = time.process_time()
+            for _ in range(repeat):
+                encoded = dumps(history)
+            encode = (time.process_time() - cpu) / repeat
+            cpu = time.process_time()
+            for _ in range(repeat):
+                loads(encoded)
+            decode = (time.process_time() - cpu) / repeat
+            print(f"{name:<8} {size:>8} {encode * 1e6:>11.0f} {decode * 1e6:>11.0f}")
+
+
+async def run(
+    url: str, codec: str, tasks: int, history: int, updates: int, concurrency: int
+) -> OperationStats:
+    """Time update_task on tasks with ``history`` messages using ``codec``."""
+    dumps, loads = CODECS[codec]
+    with (
+        patch("bindu.server.storage.postgres_storage.dumps_jsonb", dumps),
+        patch("bindu.server.storage.postgres_storage.loads_jsonb", loads),
+    ):
+        storage: PostgresStorage = PostgresStorage(
+            database_url=url,
+            did=f"did:bindu:benchmark:codec:{codec}",
+            fast_path=False,
+            coalesce_writes=False,
+            pool_max=concurrency,
+        )
+        await storage.connect()
+
+    try:
+        context_id = uuid4()
+        task_ids = [uuid4() for _ in range(tasks)]
+        for tid in task_ids:
+            await storage.submit_task(context_id, _message(tid, context_id, "hi"))
+            await storage.update_task(
+                tid,
+                "working",
+                new_messages=[
+                    _message(tid, context_id, f"seed {i} " + "lorem ipsum " * 20)
+                    for i in range(history)
+                ],
+            )
+
+        return await _measure(
+            "update",
+            [
+                lambda tid=tid, i=i: storage.update_task(
+                    tid,
+                    "working",
+                    new_messages=[_message(tid, context_id, f"update {i}")],
+                    new_artifacts=[
+                        {"artifact_id": uuid4(), "parts": [{"kind": "text"}]}
+                    ],
+                    metadata={"step": i, "run_id": uuid4()},
+                )
+                for i in range(updates)
+                for tid in task_ids
+            ],
+            concurrency,
+        )
+    finally:
+        async with storage._engine.connect() as conn:
+            await conn.execute(text("SET search_path TO public"))
+            await drop_schema_if_exists(conn, storage.schema_name, cascade=True)
+        await storage.disconnect()
+
+
+async def main() -> None:
+    """Parse arguments and run the benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="PostgreSQL URL for the update_task run")
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--history", type=int, default=500, help="Messages per task")
+    parser.add_argument("--updates", type=int, default=5, help="Updates per task")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    bench_codecs([10, 100, args.history], args.repeat)
+    if not args.url:
+        return
+
+    print(f"\nupdate_task on tasks with {args.history} messages of history")
+    print(
+        f"{'codec':<7} {'op':<8} {'calls':>7} {'ops/s':>10} {'p50 ms':>9} "
+        f"{'p99 ms':>9} {'cpu us/op':>11}"
+    )
+    for codec in CODECS:
+        stats = await run(
+            args.url,
+            codec,
+            args.tasks,
+            args.history,
+            args.updates,
+            args.concurrency,
+        )
+        print(f"{codec:<7} {stats.row()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
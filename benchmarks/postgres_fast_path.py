@@ -0,0 +1,174 @@
+"""Benchmark PostgresStorage with and without the asyncpg fast path.
+
+Usage:
+    python -m benchmarks.postgres_fast_path --url postgresql://localhost/bindu
+
+Runs submit_task, load_task, update_task and count_tasks against a throwaway
+DID schema, once through SQLAlchemy and once through the fast path, and
+prints per operation the throughput, latency percentiles and process CPU
+time per call. The schemas are dropped afterwards.
+"""
+
+from __future__ import annotations as _annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from uuid import UUID, uuid4
+
+from sqlalchemy import text
+
+from bindu.server.storage.postgres_storage import PostgresStorage
+from bindu.utils.schema_manager import drop_schema_if_exists
+
+
+@dataclass
+class OperationStats:
+    """Timings of one operation over a run."""
+
+    name: str
+    calls: int
+    wall_seconds: float
+    cpu_seconds: float
+    latencies: list[float]
+
+    def row(self) -> str:
+        """One formatted table row."""
+        latencies = sorted(self.latencies)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        return (
+            f"{self.name:<8} {self.calls:>7} "
+            f"{self.calls / self.wall_seconds:>10.0f} "
+            f"{statistics.median(latencies) * 1000:>9.2f} "
+            f"{p99 * 1000:>9.2f} "
+            f"{self.cpu_seconds / self.calls * 1e6:>11.0f}"
+        )
+
+
+def _message(task_id: UUID, context_id: UUID, content: str) -> dict:
+    return {
+        "message_id": uuid4(),
+        "task_id": task_id,
+        "context_id": context_id,
+        "kind": "message",
+        "role": "user",
+        "parts": [{"kind": "text", "text": content}],
+    }
+
+
+async def _measure(
+    name: str,
+    calls: list[Callable[[], Awaitable[object]]],
+    concurrency: int,
+) -> OperationStats:
+    """Run ``calls`` with bounded concurrency and time each one."""
+    latencies: list[float] = []
+    queue = iter(calls)
+
+    async def worker() -> None:
+        for call in queue:
+            start = time.perf_counter()
+            await call()
+            latencies.append(time.perf_counter() - start)
+
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return OperationStats(
+        name,
+        len(calls),
+        time.perf_counter() - wall,
+        time.process_time() - cpu,
+        latencies,
+    )
+
+
+async def run(
+    url: str, fast_path: bool, tasks: int, reads: int, concurrency: int
+) -> list[OperationStats]:
+    """Benchmark one path in its own schema."""
+    storage: PostgresStorage = PostgresStorage(
+        database_url=url,
+        did=f"did:bindu:benchmark:{'fastpath' if fast_path else 'sqlalchemy'}",
+        fast_path=fast_path,
+        pool_max=concurrency,
+    )
+    await storage.connect()
+    try:
+        context_id = uuid4()
+        task_ids = [uuid4() for _ in range(tasks)]
+        stats = [
+            await _measure(
+                "submit",
+                [
+                    lambda tid=tid: storage.submit_task(
+                        context_id, _message(tid, context_id, "hello")
+                    )
+                    for tid in task_ids
+                ],
+                concurrency,
+            ),
+            await _measure(
+                "load",
+                [
+                    lambda: storage.load_task(random.choice(task_ids))
+                    for _ in range(tasks * reads)
+                ],
+                concurrency,
+            ),
+            await _measure(
+                "update",
+                [
+                    lambda tid=tid: storage.update_task(
+                        tid,
+                        "completed",
+                        new_messages=[_message(tid, context_id, "done")],
+                        metadata={"benchmark": True},
+                    )
+                    for tid in task_ids
+                ],
+                concurrency,
+            ),
+            await _measure(
+                "count",
+                [lambda: storage.count_tasks("completed") for _ in range(tasks)],
+                concurrency,
+            ),
+        ]
+    finally:
+        async with storage._engine.connect() as conn:
+            await conn.execute(text("SET search_path TO public"))
+            await drop_schema_if_exists(conn, storage.schema_name, cascade=True)
+        await storage.disconnect()
+    return stats
+
+
+async def main() -> None:
+    """Parse arguments and benchmark both paths."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", required=True, help="PostgreSQL URL")
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--reads", type=int, default=5, help="Loads per task")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    header = (
+        f"{'op':<8} {'calls':>7} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9} "
+        f"{'cpu us/op':>11}"
+    )
+    for fast_path in (False, True):
+        stats = await run(
+            args.url, fast_path, args.tasks, args.reads, args.concurrency
+        )
+        print(f"\n{'asyncpg fast path' if fast_path else 'SQLAlchemy'}")
+        print(header)
+        for op in stats:
+            print(op.row())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
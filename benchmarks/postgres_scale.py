@@ -0,0 +1,747 @@
+"""Scale and query plan regression suite for PostgresStorage.
+
+Usage:
+    python -m benchmarks.postgres_scale --url postgresql://localhost/bindu \\
+        --tasks 1000000 --report scale.json [--baseline previous.json]
+
+Seeds a throwaway DID schema with a realistic dataset, then times the
+Storage methods against it and checks the query plans of the hot ones.
+
+The dataset spreads contexts over ``--months`` months of monthly
+partitions. Tasks pick their context from a skewed distribution, so a few
+long conversations hold many tasks and most contexts hold a handful. The
+states are mostly terminal, and each task has one to four messages,
+which mention one of 5000 ticket numbers for tasks/search to look up.
+Completed tasks carry an artifact, a tenth of them have feedback, and some
+unfinished ones have a webhook config.
+
+Each operation is then called ``--calls`` times (fewer for the bulk and
+destructive ones), and the throughput, latency percentiles and process CPU
+time per call are printed. Storage runs without the fast path and group
+commit, so every call is a SQLAlchemy statement. subscribe(),
+watch_task_changes() and clear_all() are not timed.
+
+The statements of one call of each hot operation are captured and run
+through ``EXPLAIN (FORMAT JSON)``. A check fails when the plan does not use
+the intended index, e.g. list_tasks_by_context reading
+``idx_tasks_context_id_created_at_id`` in created_at order, or sequentially
+scans a large table. Small sorts and scans of small partitions are what the
+planner picks on small datasets, so they do not fail a check. Indexes and
+tables are compared by their partitioned parent, so a partition's index
+counts as the parent index.
+
+``--report`` writes the timings and plan checks as JSON, together with the
+commit they were measured on; ``--baseline`` prints the change against such
+a report. The exit status is 1 if a plan check failed. The schema is
+dropped afterwards.
+"""
+
+from __future__ import annotations as _annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID, uuid4
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from bindu.server.storage.partitions import add_months, create_task_partition
+from bindu.server.storage.partitions import month_start
+from bindu.server.storage.postgres_storage import PostgresStorage
+from bindu.utils.schema_manager import drop_schema_if_exists
+
+from .postgres_fast_path import OperationStats, _measure, _message
+
+# Seeding runs in one transaction; the seed_* temp tables go with it
+SEED_SQL = (
+    """
+    CREATE TEMP TABLE seed_contexts ON COMMIT DROP AS
+    SELECT n, gen_random_uuid() AS id,
+           now() - random() * make_interval(days => :days) AS created_at
+    FROM generate_series(0, :contexts - 1) AS n
+    """,
+    # power(random(), 3) skews tasks towards the first contexts: the top 1%
+    # of contexts get about a fifth of the tasks
+    """
+    CREATE TEMP TABLE seed_tasks ON COMMIT DROP AS
+    SELECT gen_random_uuid() AS id, c.id AS context_id, s.r,
+           LEAST(c.created_at + s.r * interval '2 days', now()) AS created_at,
+           CASE
+               WHEN s.r < 0.70 THEN 'completed'
+               WHEN s.r < 0.78 THEN 'failed'
+               WHEN s.r < 0.82 THEN 'canceled'
+               WHEN s.r < 0.85 THEN 'rejected'
+               WHEN s.r < 0.90 THEN 'input-required'
+               WHEN s.r < 0.95 THEN 'working'
+               ELSE 'submitted'
+           END AS state
+    FROM (
+        SELECT floor(:contexts * power(random(), 3))::int AS n, random() AS r
+        FROM generate_series(1, :tasks)
+    ) s
+    JOIN seed_contexts c USING (n)
+    """,
+    """
+    INSERT INTO contexts (id, context_data, message_history, created_at, updated_at)
+    SELECT id, jsonb_build_object('user', 'user-' || n % 1000), '[]',
+           created_at, created_at
+    FROM seed_contexts ORDER BY created_at
+    """,
+    """
+    INSERT INTO tasks (
+        id, context_id, kind, state, state_timestamp, history, artifacts,
+        metadata, created_at, updated_at
+    )
+    SELECT id, context_id, 'task', state,
+           created_at + r * interval '5 minutes', '[]',
+           CASE WHEN state = 'completed' THEN jsonb_build_array(jsonb_build_object(
+               'artifact_id', gen_random_uuid(), 'name', 'result',
+               'parts', jsonb_build_array(jsonb_build_object(
+                   'kind', 'text', 'text', repeat('result ', 20)))))
+           ELSE '[]' END,
+           jsonb_build_object(
+               'source', (ARRAY['api', 'web', 'slack', 'cli'])[
+                   1 + floor(r * 1e4)::int % 4],
+               'priority', floor(r * 1e5)::int % 3),
+           created_at, created_at
+    FROM seed_tasks ORDER BY created_at
+    """,
+    # The first message is the user's (with its message_id), then the agent
+    # and user take turns
+    """
+    INSERT INTO task_messages (task_id, payload, message_id, created_at)
+    SELECT t.id,
+           jsonb_build_object(
+               'kind', 'message', 'message_id', m.message_id,
+               'role', CASE WHEN m.i % 2 = 0 THEN 'user' ELSE 'agent' END,
+               'task_id', t.id, 'context_id', t.context_id,
+               'parts', jsonb_build_array(jsonb_build_object(
+                   'kind', 'text',
+                   'text', 'message ' || m.i || ' ticket'
+                           || floor(t.r * 1e6)::int % 5000 || ' '
+                           || repeat('lorem ', 10 + m.i * 5)))),
+           CASE WHEN m.i = 0 THEN m.message_id END,
+           t.created_at + m.i * interval '10 seconds'
+    FROM seed_tasks t
+    CROSS JOIN LATERAL (
+        SELECT i, gen_random_uuid() AS message_id
+        FROM generate_series(0, floor(t.r * 1e6)::int % 4) AS i
+    ) m
+    ORDER BY t.created_at, m.i
+    """,
+    """
+    INSERT INTO task_feedback (task_id, feedback_data, created_at)
+    SELECT id,
+           jsonb_build_object(
+               'rating', 1 + floor(random() * 5)::int, 'feedback', 'Helpful',
+               'skill_id', (ARRAY['summarize', 'translate', 'research'])[
+                   1 + floor(random() * 3)::int]),
+           created_at + interval '1 hour'
+    FROM seed_tasks WHERE state = 'completed' AND random() < 0.1
+    """,
+    """
+    INSERT INTO webhook_configs (task_id, config, created_at, updated_at)
+    SELECT id,
+           jsonb_build_object(
+               'id', gen_random_uuid(), 'url', 'https://hooks.example.com/' || id),
+           created_at, created_at
+    FROM seed_tasks
+    WHERE state IN ('submitted', 'working', 'input-required') AND random() < 0.05
+    """,
+)
+
+_PARENTS_SQL = """
+SELECT c.relname, p.relname FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+JOIN pg_class p ON p.oid = i.inhparent
+WHERE c.relnamespace = current_schema()::regnamespace
+"""
+
+_ROWS_SQL = """
+SELECT relname, reltuples FROM pg_class
+WHERE relnamespace = current_schema()::regnamespace AND relkind = 'r'
+"""
+
+# Seq scans of smaller tables (e.g. empty future partitions) and small sorts
+# are fine, and what the planner picks on small datasets
+SEQ_SCAN_MIN_ROWS = 10_000
+SORT_MIN_ROWS = 1_000
+
+
+@dataclass
+class Dataset:
+    """What was seeded, and samples of it to call Storage methods with."""
+
+    tasks: int
+    contexts: int
+    messages: int
+    seconds: float
+    task_ids: list[UUID]
+    context_ids: list[UUID]
+    # (task_id, context_id, message_id) of first messages, to resubmit
+    submitted: list[tuple[UUID, UUID, UUID]]
+
+
+@dataclass(frozen=True)
+class PlanCheck:
+    """Indexes a hot operation must use, and tables it must not scan or sort."""
+
+    indexes: tuple[str, ...] = ()
+    no_seq_scan: tuple[str, ...] = ("tasks",)
+    # Tables whose rows must come out of an index in order, without a Sort
+    ordered: tuple[str, ...] = ()
+
+
+# Index names are the parents' (see schema.py); checked after one call each
+PLAN_CHECKS: dict[str, PlanCheck] = {
+    # Lookups by id read created_at from task_ids first, to prune partitions
+    "load_task": PlanCheck(("task_ids_pkey",), ("tasks", "task_messages")),
+    "load_tasks_many": PlanCheck(("task_ids_pkey",), ("tasks", "task_messages")),
+    "list_tasks_page": PlanCheck(("idx_tasks_created_at_id",), ordered=("tasks",)),
+    "list_tasks_page:context": PlanCheck(
+        ("idx_tasks_context_id_created_at_id",), ordered=("tasks",)
+    ),
+    "list_tasks_page:state": PlanCheck(
+        ("idx_tasks_state_created_at_id",), ordered=("tasks",)
+    ),
+    "list_tasks_by_context": PlanCheck(
+        ("idx_tasks_context_id_created_at_id",), ordered=("tasks",)
+    ),
+    "count_tasks": PlanCheck(),
+    "list_contexts_page": PlanCheck(
+        ("idx_contexts_created_at_id", "idx_tasks_context_id_created_at_id"),
+        ("contexts", "tasks"),
+    ),
+    "submit_task:duplicate": PlanCheck(
+        ("task_ids_pkey", "uq_task_messages_task_id_message_id"),
+        ("tasks", "task_messages"),
+    ),
+    "search_tasks": PlanCheck(
+        ("idx_task_messages_search_vector",), ("tasks", "task_messages")
+    ),
+    "get_task_feedback": PlanCheck(("idx_task_feedback_task_id",), ("task_feedback",)),
+    # Reads the rollups, never the feedback rows
+    "get_feedback_summary": PlanCheck(no_seq_scan=("task_feedback",)),
+    "purge_expired_tasks": PlanCheck(("idx_tasks_state_state_timestamp",)),
+}
+
+
+@dataclass
+class PlanResult:
+    """Outcome of one plan check."""
+
+    name: str
+    check: PlanCheck
+    indexes: set[str]
+    seq_scans: set[str]
+    sorted: set[str]
+
+    @property
+    def missing(self) -> list[str]:
+        """Expected indexes the plans did not use."""
+        return [index for index in self.check.indexes if index not in self.indexes]
+
+    @property
+    def ok(self) -> bool:
+        """Whether the plans use every expected index, in order if required."""
+        return (
+            not self.missing
+            and not self.seq_scans & set(self.check.no_seq_scan)
+            and not self.sorted & set(self.check.ordered)
+        )
+
+
+def plan_nodes(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Every node of an EXPLAIN (FORMAT JSON) plan, depth first."""
+    yield node
+    for child in node.get("Plans", ()):
+        yield from plan_nodes(child)
+
+
+def _relations(node: dict[str, Any], parents: dict[str, str]) -> set[str]:
+    """Tables scanned under ``node``, by their partitioned parents."""
+    return {
+        parents.get(child["Relation Name"], child["Relation Name"])
+        for child in plan_nodes(node)
+        if "Relation Name" in child
+    }
+
+
+def summarize_plans(
+    plans: list[dict[str, Any]], parents: dict[str, str], rows: dict[str, float]
+) -> tuple[set[str], set[str], set[str]]:
+    """Indexes used, large tables seq scanned, and tables whose rows are sorted.
+
+    Args:
+        plans: Top-level "Plan" nodes
+        parents: Partition (or partition index) name to its parent's
+        rows: Estimated rows per table; seq scans of tables with fewer than
+            SEQ_SCAN_MIN_ROWS are left out, as are sorts of fewer than
+            SORT_MIN_ROWS rows
+
+    Returns:
+        Index names and table names, mapped to their partitioned parents
+    """
+    indexes: set[str] = set()
+    seq_scans: set[str] = set()
+    sorted_tables: set[str] = set()
+    for plan in plans:
+        for node in plan_nodes(plan):
+            if "Index Name" in node:
+                indexes.add(parents.get(node["Index Name"], node["Index Name"]))
+            if node["Node Type"] == "Seq Scan":
+                relation = node["Relation Name"]
+                if rows.get(relation, 0) >= SEQ_SCAN_MIN_ROWS:
+                    seq_scans.add(parents.get(relation, relation))
+            if (
+                node["Node Type"] in ("Sort", "Incremental Sort")
+                and node["Plan Rows"] >= SORT_MIN_ROWS
+            ):
+                sorted_tables |= _relations(node, parents)
+    return indexes, seq_scans, sorted_tables
+
+
+@contextmanager
+def _capture_statements(engine: AsyncEngine) -> Iterator[list[tuple[str, Any]]]:
+    """Collect the statements (with parameters) executed on ``engine``."""
+    statements: list[tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if not executemany:
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+async def _explain(
+    engine: AsyncEngine, statements: list[tuple[str, Any]]
+) -> list[dict[str, Any]]:
+    """Plans of the queries among ``statements`` (nothing is executed)."""
+    plans = []
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            verb = statement.lstrip().split(None, 1)[0].upper()
+            if verb not in ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE"):
+                continue
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {statement}", parameters
+            )
+            explained = result.scalar()
+            if isinstance(explained, str):
+                explained = json.loads(explained)
+            plans.append(explained[0]["Plan"])
+        await conn.rollback()
+    return plans
+
+
+async def check_plan(
+    storage: PostgresStorage,
+    name: str,
+    call: Callable[[], Awaitable[object]],
+    parents: dict[str, str],
+    rows: dict[str, float],
+) -> PlanResult:
+    """Run ``call`` once and check the plans of its statements."""
+    with _capture_statements(storage._engine) as statements:
+        await call()
+    plans = await _explain(storage._engine, statements)
+    indexes, seq_scans, sorted_tables = summarize_plans(plans, parents, rows)
+    return PlanResult(name, PLAN_CHECKS[name], indexes, seq_scans, sorted_tables)
+
+
+async def seed(
+    storage: PostgresStorage, tasks: int, tasks_per_context: int, months: int
+) -> Dataset:
+    """Fill the storage's schema and sample ids from it."""
+    contexts = max(1, tasks // tasks_per_context)
+    now = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    async with storage._engine.begin() as conn:
+        first = month_start(now - timedelta(days=30 * months))
+        for offset in range(months + 1):
+            await create_task_partition(conn, add_months(first, offset))
+        for statement in SEED_SQL:
+            await conn.execute(
+                text(statement),
+                {"tasks": tasks, "contexts": contexts, "days": 30 * months},
+            )
+        sample = (
+            await conn.execute(
+                text(
+                    "SELECT t.id, t.context_id, m.message_id FROM seed_tasks t "
+                    "JOIN task_messages m ON m.task_id = t.id "
+                    "AND m.message_id IS NOT NULL "
+                    "ORDER BY random() LIMIT 1000"
+                )
+            )
+        ).all()
+    messages = (
+        await _scalar(storage._engine, "SELECT count(*) FROM task_messages")
+    ) or 0
+    async with storage._engine.begin() as conn:
+        await conn.execute(text("ANALYZE"))
+    return Dataset(
+        tasks=tasks,
+        contexts=contexts,
+        messages=messages,
+        seconds=time.perf_counter() - start,
+        task_ids=[row[0] for row in sample],
+        context_ids=[row[1] for row in sample],
+        submitted=[tuple(row) for row in sample],
+    )
+
+
+async def _scalar(engine: AsyncEngine, sql: str) -> Any:
+    async with engine.connect() as conn:
+        return (await conn.execute(text(sql))).scalar()
+
+
+def _operations(
+    storage: PostgresStorage, data: Dataset, calls: int
+) -> dict[str, tuple[int, Callable[[], Awaitable[object]]]]:
+    """Storage calls to time, by name, with how often to call each.
+
+    Writes to new tasks come after the reads, and destructive calls last.
+    """
+    task_ids, context_ids = data.task_ids, data.context_ids
+    new_tasks: list[tuple[UUID, UUID]] = []
+    few = max(1, calls // 20)
+
+    def task() -> UUID:
+        return random.choice(task_ids)
+
+    def context() -> UUID:
+        return random.choice(context_ids)
+
+    async def submit() -> None:
+        task_id, context_id = uuid4(), context()
+        await storage.submit_task(context_id, _message(task_id, context_id, "hi"))
+        new_tasks.append((task_id, context_id))
+
+    async def resubmit() -> None:
+        task_id, context_id, message_id = random.choice(data.submitted)
+        message = _message(task_id, context_id, "hi")
+        message["message_id"] = message_id
+        try:
+            await storage.submit_task(context_id, message)
+        except Exception:  # Duplicate, or the task has finished
+            pass
+
+    def new_task() -> tuple[UUID, UUID]:
+        return random.choice(new_tasks)
+
+    async def update() -> None:
+        task_id, context_id = new_task()
+        await storage.update_task(
+            task_id,
+            "working",
+            new_messages=[_message(task_id, context_id, "thinking")],
+            metadata={"step": 1},
+        )
+
+    async def transition() -> None:
+        task_id, context_id = new_tasks.pop()
+        await storage.transition_task(
+            task_id,
+            ("submitted", "working"),
+            "completed",
+            new_artifacts=[
+                {"artifact_id": str(uuid4()), "name": "result", "parts": []}
+            ],
+        )
+
+    async def purge() -> None:
+        await storage.purge_expired_tasks(
+            {"failed": datetime.now(timezone.utc) - timedelta(days=90)}, limit=100
+        )
+
+    oldest = datetime.now(timezone.utc) - timedelta(days=30)
+    return {
+        "load_task": (calls, lambda: storage.load_task(task())),
+        "load_task:status": (
+            calls,
+            lambda: storage.load_task(task(), projection="status"),
+        ),
+        "load_task:history=2": (
+            calls,
+            lambda: storage.load_task(task(), history_length=2),
+        ),
+        "load_tasks_many": (
+            calls,
+            lambda: storage.load_tasks_many(random.sample(task_ids, 20)),
+        ),
+        "list_tasks": (
+            calls,
+            lambda: storage.list_tasks(length=50, projection="summary"),
+        ),
+        "list_tasks_page": (calls, lambda: storage.list_tasks_page(50)),
+        "list_tasks_page:context": (
+            calls,
+            lambda: storage.list_tasks_page(50, context_id=context()),
+        ),
+        "list_tasks_page:state": (
+            calls,
+            lambda: storage.list_tasks_page(50, states=["working"]),
+        ),
+        "list_tasks_by_context": (
+            calls,
+            lambda: storage.list_tasks_by_context(context(), length=50),
+        ),
+        "search_tasks": (
+            calls,
+            lambda: storage.search_tasks(
+                f"ticket{random.randrange(5000)}", 20, projection="summary"
+            ),
+        ),
+        "search_tasks:metadata": (
+            calls,
+            lambda: storage.search_tasks(
+                f"ticket{random.randrange(5000)}", 20, metadata={"source": "web"}
+            ),
+        ),
+        "count_tasks": (calls, lambda: storage.count_tasks("working")),
+        "count_tasks_by_state": (calls, storage.count_tasks_by_state),
+        "load_context": (calls, lambda: storage.load_context(context())),
+        "list_contexts": (few, lambda: storage.list_contexts(length=50)),
+        "list_contexts_page": (calls, lambda: storage.list_contexts_page(50)),
+        "get_task_feedback": (calls, lambda: storage.get_task_feedback(task())),
+        "get_feedback_summary": (
+            calls,
+            lambda: storage.get_feedback_summary(
+                since=oldest.date(), group_by=["skill", "day"]
+            ),
+        ),
+        "load_webhook_config": (calls, lambda: storage.load_webhook_config(task())),
+        "load_all_webhook_configs": (few, storage.load_all_webhook_configs),
+        "export_records": (
+            few,
+            lambda: storage.export_records("tasks", None, 500),
+        ),
+        "submit_task": (calls, submit),
+        "submit_task:duplicate": (calls, resubmit),
+        "update_task": (calls, update),
+        "transition_task": (calls // 2, transition),
+        "append_to_contexts": (
+            calls,
+            lambda: storage.append_to_contexts(
+                context(), [_message(uuid4(), uuid4(), "note")]
+            ),
+        ),
+        "update_context": (
+            calls,
+            lambda: storage.update_context(context(), {"summary": "updated"}),
+        ),
+        "store_task_feedback": (
+            calls,
+            lambda: storage.store_task_feedback(task(), {"rating": 4}),
+        ),
+        "save_webhook_config": (
+            calls,
+            lambda: storage.save_webhook_config(
+                task(), {"id": uuid4(), "url": "https://hooks.example.com/x"}
+            ),
+        ),
+        "delete_webhook_config": (
+            calls,
+            lambda: storage.delete_webhook_config(task()),
+        ),
+        "compact_tasks": (
+            few if storage._compressor is not None else 0,
+            lambda: storage.compact_tasks(oldest, 100),
+        ),
+        "purge_expired_tasks": (few, purge),
+        "clear_context": (few, lambda: storage.clear_context(context())),
+    }
+
+
+async def run(
+    url: str,
+    tasks: int,
+    tasks_per_context: int,
+    months: int,
+    calls: int,
+    concurrency: int,
+) -> tuple[Dataset, list[OperationStats], list[PlanResult]]:
+    """Seed a schema, time every operation, then check the hot plans."""
+    storage = PostgresStorage(
+        database_url=url,
+        did="did:bindu:benchmark:scale",
+        pool_max=concurrency,
+        coalesce_writes=False,
+        fast_path=False,
+        replica_urls=[],
+        shared_engine=False,
+    )
+    await storage.connect()
+    try:
+        data = await seed(storage, tasks, tasks_per_context, months)
+        async with storage._engine.connect() as conn:
+            parents = dict((await conn.execute(text(_PARENTS_SQL))).all())
+            rows = dict((await conn.execute(text(_ROWS_SQL))).all())
+
+        operations = _operations(storage, data, calls)
+        stats = []
+        plans = []
+        for name, (count, call) in operations.items():
+            if count <= 0:
+                continue
+            stats.append(
+                await _measure(name, [call] * count, min(concurrency, count))
+            )
+            if name in PLAN_CHECKS:
+                plans.append(
+                    await check_plan(storage, name, call, parents, rows)
+                )
+    finally:
+        async with storage._engine.connect() as conn:
+            await conn.execute(text("SET search_path TO public"))
+            await drop_schema_if_exists(conn, storage.schema_name, cascade=True)
+        await storage.disconnect()
+    return data, stats, plans
+
+
+def _percentile(latencies: list[float], fraction: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def build_report(
+    data: Dataset,
+    stats: list[OperationStats],
+    plans: list[PlanResult],
+    concurrency: int,
+) -> dict[str, Any]:
+    """JSON-serializable report of one run."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "dataset": {
+            "tasks": data.tasks,
+            "contexts": data.contexts,
+            "messages": data.messages,
+            "seed_seconds": round(data.seconds, 2),
+        },
+        "concurrency": concurrency,
+        "operations": {
+            op.name: {
+                "calls": op.calls,
+                "ops_per_second": round(op.calls / op.wall_seconds, 1),
+                "p50_ms": round(_percentile(op.latencies, 0.5) * 1000, 3),
+                "p95_ms": round(_percentile(op.latencies, 0.95) * 1000, 3),
+                "p99_ms": round(_percentile(op.latencies, 0.99) * 1000, 3),
+                "cpu_us_per_call": round(op.cpu_seconds / op.calls * 1e6, 1),
+            }
+            for op in stats
+        },
+        "plans": {
+            plan.name: {
+                "ok": plan.ok,
+                "expected": list(plan.check.indexes),
+                "missing": plan.missing,
+                "indexes": sorted(plan.indexes),
+                "seq_scans": sorted(plan.seq_scans),
+                "sorted": sorted(plan.sorted),
+            }
+            for plan in plans
+        },
+    }
+
+
+def print_report(report: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    """Print the timings (and their change against ``baseline``) and plans."""
+    dataset = report["dataset"]
+    print(
+        f"{dataset['tasks']} tasks in {dataset['contexts']} contexts, "
+        f"{dataset['messages']} messages (seeded in {dataset['seed_seconds']}s)\n"
+    )
+    print(
+        f"{'op':<26} {'calls':>6} {'ops/s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'cpu us/op':>10}" + (f" {'p50 vs base':>12}" if baseline else "")
+    )
+    for name, op in report["operations"].items():
+        line = (
+            f"{name:<26} {op['calls']:>6} {op['ops_per_second']:>9.0f} "
+            f"{op['p50_ms']:>8.2f} {op['p99_ms']:>8.2f} "
+            f"{op['cpu_us_per_call']:>10.0f}"
+        )
+        before = (baseline or {}).get("operations", {}).get(name)
+        if before and before["p50_ms"]:
+            line += f" {op['p50_ms'] / before['p50_ms'] - 1:>+12.0%}"
+        print(line)
+
+    print(f"\n{'plan':<26} {'ok':<4} indexes used / seq scans")
+    for name, plan in report["plans"].items():
+        status = "ok" if plan["ok"] else "FAIL"
+        detail = ", ".join(plan["indexes"]) or "-"
+        if plan["seq_scans"]:
+            detail += f" / seq scan {', '.join(plan['seq_scans'])}"
+        if plan["sorted"]:
+            detail += f" / sort {', '.join(plan['sorted'])}"
+        if plan["missing"]:
+            detail += f" (missing {', '.join(plan['missing'])})"
+        before = (baseline or {}).get("plans", {}).get(name)
+        if before and before["ok"] and not plan["ok"]:
+            detail += " (regressed)"
+        print(f"{name:<26} {status:<4} {detail}")
+
+
+async def main() -> int:
+    """Parse arguments, run the suite and report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", required=True, help="PostgreSQL URL")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--tasks-per-context", type=int, default=8)
+    parser.add_argument("--months", type=int, default=12, help="Months of data")
+    parser.add_argument("--calls", type=int, default=200, help="Calls per op")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--report", help="Write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    data, stats, plans = await run(
+        args.url,
+        args.tasks,
+        args.tasks_per_context,
+        args.months,
+        args.calls,
+        args.concurrency,
+    )
+    report = build_report(data, stats, plans, args.concurrency)
+    print_report(report, baseline)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if all(plan.ok for plan in plans) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
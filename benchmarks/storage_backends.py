@@ -0,0 +1,159 @@
+"""Benchmark the storage backends against each other.
+
+Usage:
+    python -m benchmarks.storage_backends [--url postgresql://localhost/bindu]
+
+Runs submit_task, load_task, update_task, list_tasks_page and count_tasks
+against InMemoryStorage, SQLiteStorage (a database file in a temporary
+directory) and, when --url is given, PostgresStorage in a throwaway DID
+schema, and prints per backend and operation the throughput, latency
+percentiles and process CPU time per call.
+"""
+
+from __future__ import annotations as _annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from benchmarks.postgres_fast_path import OperationStats, _measure, _message
+from bindu.server.storage.base import Storage
+from bindu.server.storage.memory_storage import InMemoryStorage
+from bindu.server.storage.postgres_storage import PostgresStorage
+from bindu.server.storage.sqlite_storage import SQLiteStorage
+from bindu.utils.schema_manager import drop_schema_if_exists
+
+
+async def run(
+    storage: Storage, tasks: int, reads: int, concurrency: int
+) -> list[OperationStats]:
+    """Benchmark one connected backend."""
+    context_ids = [uuid4() for _ in range(max(tasks // 100, 1))]
+    task_contexts = {uuid4(): random.choice(context_ids) for _ in range(tasks)}
+    task_ids = list(task_contexts)
+    return [
+        await _measure(
+            "submit",
+            [
+                lambda tid=tid, cid=cid: storage.submit_task(
+                    cid, _message(tid, cid, "hello")
+                )
+                for tid, cid in task_contexts.items()
+            ],
+            concurrency,
+        ),
+        await _measure(
+            "load",
+            [
+                lambda: storage.load_task(random.choice(task_ids))
+                for _ in range(tasks * reads)
+            ],
+            concurrency,
+        ),
+        await _measure(
+            "update",
+            [
+                lambda tid=tid, cid=cid: storage.update_task(
+                    tid,
+                    "completed",
+                    new_messages=[_message(tid, cid, "done")],
+                    metadata={"benchmark": True},
+                )
+                for tid, cid in task_contexts.items()
+            ],
+            concurrency,
+        ),
+        await _measure(
+            "page",
+            [
+                lambda: storage.list_tasks_page(
+                    page_size=20, context_id=random.choice(context_ids)
+                )
+                for _ in range(tasks)
+            ],
+            concurrency,
+        ),
+        await _measure(
+            "count",
+            [lambda: storage.count_tasks("completed") for _ in range(tasks)],
+            concurrency,
+        ),
+    ]
+
+
+async def run_sqlite(
+    tasks: int, reads: int, concurrency: int, readers: int
+) -> list[OperationStats]:
+    """Benchmark SQLiteStorage on a fresh database file."""
+    with tempfile.TemporaryDirectory() as directory:
+        storage: SQLiteStorage = SQLiteStorage(
+            Path(directory) / "bindu.db", readers=readers
+        )
+        await storage.connect()
+        try:
+            return await run(storage, tasks, reads, concurrency)
+        finally:
+            await storage.disconnect()
+
+
+async def run_postgres(
+    url: str, tasks: int, reads: int, concurrency: int
+) -> list[OperationStats]:
+    """Benchmark PostgresStorage in its own schema, dropped afterwards."""
+    storage: PostgresStorage = PostgresStorage(
+        database_url=url, did="did:bindu:benchmark:backends", pool_max=concurrency
+    )
+    await storage.connect()
+    try:
+        return await run(storage, tasks, reads, concurrency)
+    finally:
+        async with storage._engine.connect() as conn:
+            await conn.execute(text("SET search_path TO public"))
+            await drop_schema_if_exists(conn, storage.schema_name, cascade=True)
+        await storage.disconnect()
+
+
+async def main() -> None:
+    """Parse arguments and benchmark each backend."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="PostgreSQL URL (skipped when unset)")
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--reads", type=int, default=5, help="Loads per task")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--sqlite-readers", type=int, default=4, help="SQLite reader connections"
+    )
+    args = parser.parse_args()
+
+    backends = {
+        "memory": lambda: run(
+            InMemoryStorage(), args.tasks, args.reads, args.concurrency
+        ),
+        "sqlite": lambda: run_sqlite(
+            args.tasks, args.reads, args.concurrency, args.sqlite_readers
+        ),
+    }
+    if args.url:
+        backends["postgres"] = lambda: run_postgres(
+            args.url, args.tasks, args.reads, args.concurrency
+        )
+
+    header = (
+        f"{'op':<8} {'calls':>7} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9} "
+        f"{'cpu us/op':>11}"
+    )
+    for name, benchmark in backends.items():
+        stats = await benchmark()
+        print(f"\n{name}")
+        print(header)
+        for op in stats:
+            print(op.row())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+"""Command line interface for bindu operations.
+
+Usage:
+    bindu storage purge [--ttl STATE=DURATION ...] [--archive-dir DIR]
+    bindu storage export DIR [--format ndjson|binary|csv]
+    bindu storage import DIR
+
+Storage is configured exactly as for the server, through ``app_settings``
+(``STORAGE__BACKEND``, ``STORAGE__POSTGRES_URL``, ...).
+"""
+
+from __future__ import annotations as _annotations
+
+import argparse
+import sys
+from collections.abc import Sequence
+
+from .storage import add_storage_commands
+
+__all__ = ["build_parser", "main"]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the ``bindu`` argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="bindu", description="Bindu operational commands"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    add_storage_commands(commands)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the ``bindu`` command.
+
+    Args:
+        argv: Arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except (ValueError, ConnectionError) as e:
+        print(f"bindu: error: {e}", file=sys.stderr)
+        return 1
@@ -0,0 +1,7 @@
+"""Allow ``python -m bindu.cli``."""
+
+import sys
+
+from bindu.cli import main
+
+sys.exit(main())
@@ -0,0 +1,294 @@
+"""``bindu storage`` commands."""
+
+from __future__ import annotations as _annotations
+
+import argparse
+import asyncio
+import re
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+from bindu.common.protocol.types import Task
+from bindu.settings import app_settings
+from bindu.server.storage.compression import CompactionEngine
+from bindu.server.storage.factory import close_storage, create_storage
+from bindu.server.storage.retention import RetentionEngine, RetentionPolicy
+from bindu.server.storage.transfer import (
+    TransferResult,
+    export_storage,
+    import_storage,
+)
+
+_DURATION_RE = re.compile(r"^(\d+)([smhdw]?)$")
+_DURATION_UNITS = {
+    "": "seconds",
+    "s": "seconds",
+    "m": "minutes",
+    "h": "hours",
+    "d": "days",
+    "w": "weeks",
+}
+
+
+class _DryRunAbort(Exception):
+    """Raised from the archive callback to roll back a dry-run batch."""
+
+    def __init__(self, tasks: list[Task]):
+        super().__init__("dry run")
+        self.tasks = tasks
+
+
+def parse_duration(value: str) -> timedelta:
+    """Parse a duration such as ``30d``, ``12h``, ``90m`` or ``3600``.
+
+    Raises:
+        ValueError: If the duration is malformed
+    """
+    match = _DURATION_RE.match(value.strip().lower())
+    if match is None:
+        raise ValueError(f"Invalid duration {value!r} (expected e.g. 30d, 12h)")
+    amount, unit = match.groups()
+    return timedelta(**{_DURATION_UNITS[unit]: int(amount)})
+
+
+def parse_ttl(value: str) -> tuple[str, timedelta]:
+    """Parse a ``STATE=DURATION`` option.
+
+    Raises:
+        argparse.ArgumentTypeError: If the option is malformed
+    """
+    state, sep, duration = value.partition("=")
+    if not sep or not state:
+        raise argparse.ArgumentTypeError(f"Expected STATE=DURATION, got {value!r}")
+    try:
+        return state.strip(), parse_duration(duration)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def add_storage_commands(commands: Any) -> None:
+    """Register ``bindu storage ...`` on the top-level subparsers."""
+    storage = commands.add_parser("storage", help="Storage maintenance")
+    storage_commands = storage.add_subparsers(dest="storage_command", required=True)
+
+    purge = storage_commands.add_parser(
+        "purge",
+        help="Delete (and optionally archive) tasks past their retention TTL",
+        description=(
+            "Delete tasks whose state is older than its TTL, in batches. "
+            "Defaults come from STORAGE__RETENTION_* settings."
+        ),
+    )
+    purge.add_argument(
+        "--ttl",
+        action="append",
+        type=parse_ttl,
+        metavar="STATE=DURATION",
+        help="TTL for a state, e.g. completed=30d (repeatable; replaces settings)",
+    )
+    purge.add_argument(
+        "--archive-dir",
+        type=Path,
+        help="Archive purged tasks to gzipped JSONL files in this directory",
+    )
+    purge.add_argument("--batch-size", type=int, help="Tasks deleted per transaction")
+    purge.add_argument("--max-batches", type=int, help="Stop after this many batches")
+    purge.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show the first batch that would be purged without deleting it",
+    )
+    purge.add_argument("--did", help="Agent DID (selects its PostgreSQL schema)")
+    purge.set_defaults(handler=_run_purge)
+
+    compact = storage_commands.add_parser(
+        "compact",
+        help="Compress the history and artifacts of old finished tasks",
+        description=(
+            "Compress tasks that have been in a terminal state for longer than "
+            "--older-than into zstd payloads, in batches (PostgreSQL only). "
+            "Defaults come from STORAGE__COMPRESSION_* settings."
+        ),
+    )
+    compact.add_argument(
+        "--older-than",
+        type=parse_duration,
+        metavar="DURATION",
+        help="How long tasks must have been finished, e.g. 30d",
+    )
+    compact.add_argument("--batch-size", type=int, help="Tasks per transaction")
+    compact.add_argument("--max-batches", type=int, help="Stop after this many batches")
+    compact.add_argument("--did", help="Agent DID (selects its PostgreSQL schema)")
+    compact.set_defaults(handler=_run_compact)
+
+    export = storage_commands.add_parser(
+        "export",
+        help="Export tasks, contexts, feedback and webhook configs to a directory",
+        description=(
+            "Write a dump that 'bindu storage import' can load into any backend "
+            "(ndjson), or PostgreSQL COPY files (binary, csv). An interrupted "
+            "export resumes when run again with the same directory."
+        ),
+    )
+    export.add_argument("directory", type=Path, help="Dump directory")
+    export.add_argument(
+        "--format",
+        choices=["ndjson", "binary", "csv"],
+        default="ndjson",
+        help="ndjson works with every backend; binary and csv need PostgreSQL",
+    )
+    _add_transfer_arguments(export)
+    export.set_defaults(handler=_run_export)
+
+    load = storage_commands.add_parser(
+        "import",
+        help="Import a directory written by 'bindu storage export'",
+        description=(
+            "Insert the records of a dump that are not stored yet. An "
+            "interrupted import resumes when run again with the same directory."
+        ),
+    )
+    load.add_argument("directory", type=Path, help="Dump directory")
+    _add_transfer_arguments(load)
+    load.set_defaults(handler=_run_import)
+
+
+def _add_transfer_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Records per batch (ndjson)"
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Start over instead of resuming an earlier run",
+    )
+    parser.add_argument("--did", help="Agent DID (selects its PostgreSQL schema)")
+
+
+def build_policy(args: argparse.Namespace) -> RetentionPolicy:
+    """Combine command line options with the retention settings."""
+    defaults = RetentionPolicy.from_settings()
+    return RetentionPolicy(
+        ttls=dict(args.ttl) if args.ttl else defaults.ttls,
+        batch_size=args.batch_size or defaults.batch_size,
+        archive_dir=args.archive_dir or defaults.archive_dir,
+    )
+
+
+def _run_purge(args: argparse.Namespace) -> int:
+    policy = build_policy(args)
+    return asyncio.run(_purge(policy, args))
+
+
+async def _purge(policy: RetentionPolicy, args: argparse.Namespace) -> int:
+    storage = await create_storage(did=args.did)
+    try:
+        if args.dry_run:
+            return await _dry_run(storage, policy)
+
+        engine = RetentionEngine(
+            storage,
+            policy,
+            interval_seconds=app_settings.storage.retention_interval_seconds,
+        )
+        result = await engine.run_once(max_batches=args.max_batches)
+        print(f"Purged {result.purged} tasks")
+        if result.archived:
+            files = ", ".join(str(path) for path in sorted(result.archive_files))
+            print(f"Archived {result.archived} tasks to {files}")
+        return 0
+    finally:
+        await close_storage(storage)
+
+
+async def _dry_run(storage: Any, policy: RetentionPolicy) -> int:
+    # The archive callback sees the batch before deletion; raising from it
+    # rolls the batch back, so nothing is deleted
+    async def _abort(tasks: list[Task]) -> None:
+        raise _DryRunAbort(tasks)
+
+    try:
+        await storage.purge_expired_tasks(policy.cutoffs(), policy.batch_size, _abort)
+    except _DryRunAbort as abort:
+        tasks = abort.tasks
+    else:
+        tasks = []
+
+    for task in tasks:
+        status = task["status"]
+        print(f"{task['id']}\t{status['state']}\t{status.get('timestamp', '')}")
+    suffix = " (first batch only)" if len(tasks) >= policy.batch_size else ""
+    print(f"Would purge {len(tasks)} tasks{suffix}")
+    return 0
+
+
+def _run_compact(args: argparse.Namespace) -> int:
+    return asyncio.run(_compact(args))
+
+
+async def _compact(args: argparse.Namespace) -> int:
+    storage = await create_storage(did=args.did)
+    try:
+        engine = CompactionEngine.from_settings(storage)
+        if args.older_than is not None:
+            engine.older_than = args.older_than
+        if args.batch_size:
+            engine.batch_size = args.batch_size
+        result = await engine.run_once(max_batches=args.max_batches)
+        print(
+            f"Compacted {result.tasks} tasks: {result.raw_bytes} -> "
+            f"{result.compressed_bytes} bytes ({result.saved_bytes} saved)"
+        )
+        return 0
+    finally:
+        await close_storage(storage)
+
+
+def _print_transfer(verb: str, result: TransferResult) -> None:
+    for name in result.skipped:
+        print(f"{name}: already {verb.lower()}")
+    for name, records in result.records.items():
+        if name in result.inserted:
+            print(f"{name}: {verb} {result.inserted[name]} of {records}")
+        else:
+            print(f"{name}: {verb} {records}")
+
+
+def _run_export(args: argparse.Namespace) -> int:
+    return asyncio.run(_export(args))
+
+
+async def _export(args: argparse.Namespace) -> int:
+    storage = await create_storage(did=args.did)
+    try:
+        result = await export_storage(
+            storage,
+            args.directory,
+            format=args.format,
+            batch_size=args.batch_size,
+            restart=args.restart,
+        )
+        _print_transfer("Exported", result)
+        return 0
+    finally:
+        await close_storage(storage)
+
+
+def _run_import(args: argparse.Namespace) -> int:
+    return asyncio.run(_import(args))
+
+
+async def _import(args: argparse.Namespace) -> int:
+    storage = await create_storage(did=args.did)
+    try:
+        result = await import_storage(
+            storage,
+            args.directory,
+            batch_size=args.batch_size,
+            restart=args.restart,
+        )
+        _print_transfer("Imported", result)
+        return 0
+    finally:
+        await close_storage(storage)
@@ -53,8 +53,9 @@ class StorageConfig:
     This defines where that memory lives.
     """
 
-    type: Literal["postgres", "memory"]
+    type: Literal["postgres", "memory", "sqlite"]
     database_url: str | None = None
+    sqlite_path: str | None = None
 
 
 @dataclass(frozen=True)
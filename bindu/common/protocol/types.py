@@ -32,6 +32,7 @@ This module contains the complete type system that enables agents to communicate
 
 from __future__ import annotations as _annotations
 
+from datetime import date, datetime
 from typing import Annotated, Any, Dict, Generic, List, Literal, TypeVar, Union
 from uuid import UUID
 
@@ -70,6 +71,17 @@ TaskState: TypeAlias = Literal[
     "negotiation-bid-won",  # The task bid was won in negotiation. <NotPartOfA2A>
 ]
 
+TaskProjection: TypeAlias = Literal[
+    "full",  # Every task field; history optionally limited to the last N messages.
+    "summary",  # id, context, status and metadata; history only if a length is given. <NotPartOfA2A>
+    "status",  # id, context and status only. <NotPartOfA2A>
+]
+
+FeedbackGroupBy: TypeAlias = Literal[
+    "skill",  # One summary per skill the feedback was given for. <NotPartOfA2A>
+    "day",  # One summary per UTC day the feedback was given on. <NotPartOfA2A>
+]
+
 NegotiationStatus: TypeAlias = Literal[
     "proposed",  # The negotiation is proposed. <NotPartOfA2A>
     "accepted",  # The negotiation is accepted. <NotPartOfA2A>
@@ -590,6 +602,9 @@ class TaskQueryParams(TaskIdParams):
     history_length: NotRequired[int]
     """The length of the history."""
 
+    projection: NotRequired[TaskProjection]
+    """Which task fields to return (defaults to "full"). <NotPartOfA2A>"""
+
 
 @pydantic.with_config(ConfigDict(alias_generator=to_camel))
 class ListTasksParams(TypedDict):
@@ -598,10 +613,78 @@ class ListTasksParams(TypedDict):
     history_length: NotRequired[int]
     """The length of the history."""
 
+    length: NotRequired[int]
+    """Maximum number of tasks to return (most recent first)."""
+
+    projection: NotRequired[TaskProjection]
+    """Which task fields to return (defaults to "full")."""
+
+    page_size: NotRequired[int]
+    """Page size; setting this (or any filter) returns a ListTasksResult page."""
+
+    page_token: NotRequired[str]
+    """Opaque cursor from a previous page's next_page_token."""
+
+    context_id: NotRequired[UUID]
+    """Only return tasks in this context."""
+
+    states: NotRequired[list[TaskState]]
+    """Only return tasks in one of these states."""
+
+    created_after: NotRequired[datetime]
+    """Only return tasks created at or after this time."""
+
+    created_before: NotRequired[datetime]
+    """Only return tasks created before this time."""
+
     metadata: NotRequired[dict[str, Any]]
     """Additional metadata."""
 
 
+@pydantic.with_config(ConfigDict(alias_generator=to_camel))
+class ListTasksResult(TypedDict):
+    """A page of tasks, newest first. <NotPartOfA2A>."""
+
+    tasks: Required[list[Task]]
+    """The tasks on this page."""
+
+    next_page_token: NotRequired[str]
+    """Cursor for the next page; absent on the last page."""
+
+
+@pydantic.with_config(ConfigDict(alias_generator=to_camel))
+class SearchTasksParams(TypedDict):
+    """Defines parameters for searching tasks. <NotPartOfA2A>.
+
+    At least one of query and metadata is required. Results are a
+    ListTasksResult page, best matches first.
+    """
+
+    query: NotRequired[str]
+    """Words that one of the task's messages must all contain."""
+
+    metadata: NotRequired[dict[str, Any]]
+    """Only return tasks whose metadata contains this object."""
+
+    page_size: NotRequired[int]
+    """Maximum tasks per page (default 50)."""
+
+    page_token: NotRequired[str]
+    """Opaque cursor from a previous search page's next_page_token."""
+
+    context_id: NotRequired[UUID]
+    """Only return tasks in this context."""
+
+    states: NotRequired[list[TaskState]]
+    """Only return tasks in one of these states."""
+
+    projection: NotRequired[TaskProjection]
+    """Which task fields to return (defaults to "full")."""
+
+    history_length: NotRequired[int]
+    """The length of the history."""
+
+
 @pydantic.with_config(ConfigDict(alias_generator=to_camel))
 class TaskFeedbackParams(TypedDict):
     """Defines parameters for providing feedback on a task. <NotPartOfA2A>."""
@@ -619,6 +702,56 @@ class TaskFeedbackParams(TypedDict):
     """Additional metadata."""
 
 
+@pydantic.with_config(ConfigDict(alias_generator=to_camel))
+class FeedbackSummaryParams(TypedDict):
+    """Defines parameters for summarizing task feedback. <NotPartOfA2A>.
+
+    With task_id the task's own feedback is summarized; otherwise the
+    per-skill, per-day aggregates are read, filtered and grouped.
+    """
+
+    task_id: NotRequired[UUID]
+    """Only summarize the feedback of this task."""
+
+    skill_id: NotRequired[str]
+    """Only count feedback for this skill ("" for feedback without one)."""
+
+    since: NotRequired[date]
+    """First UTC day to count."""
+
+    until: NotRequired[date]
+    """Last UTC day to count, inclusive."""
+
+    group_by: NotRequired[list[FeedbackGroupBy]]
+    """Split the summary by skill, day or both (default: one summary)."""
+
+
+@pydantic.with_config(ConfigDict(alias_generator=to_camel))
+class FeedbackSummary(TypedDict):
+    """Feedback count and ratings of one group. <NotPartOfA2A>."""
+
+    task_id: NotRequired[UUID]
+    """The task summarized, for a task's own summary."""
+
+    skill_id: NotRequired[str]
+    """The group's skill ("" for feedback without one), when grouped by skill."""
+
+    day: NotRequired[date]
+    """The group's UTC day, when grouped by day."""
+
+    count: Required[int]
+    """Feedback entries, with or without a rating."""
+
+    rated: Required[int]
+    """Entries with a rating from 1 to 5."""
+
+    mean_rating: Required[float | None]
+    """Mean of those ratings; None if there are none."""
+
+    ratings: Required[dict[str, int]]
+    """Number of entries per rating, keyed "1" to "5"."""
+
+
 @pydantic.with_config(ConfigDict(alias_generator=to_camel))
 class MessageSendConfiguration(TypedDict):
     """Configuration for message sending."""
@@ -799,9 +932,35 @@ class ListContextsParams(TypedDict):
     history_length: NotRequired[int]
     """The length of the list."""
 
+    length: NotRequired[int]
+    """Maximum number of contexts to return (most recent first)."""
+
     metadata: NotRequired[dict[str, Any]]
     """Additional metadata."""
 
+    page_size: NotRequired[int]
+    """Page size; setting this (or any filter) returns a ListContextsResult page."""
+
+    page_token: NotRequired[str]
+    """Opaque cursor from a previous page's next_page_token."""
+
+    created_after: NotRequired[datetime]
+    """Only return contexts created at or after this time."""
+
+    created_before: NotRequired[datetime]
+    """Only return contexts created before this time."""
+
+
+@pydantic.with_config(ConfigDict(alias_generator=to_camel))
+class ListContextsResult(TypedDict):
+    """A page of contexts, newest first. <NotPartOfA2A>."""
+
+    contexts: Required[list[dict[str, Any]]]
+    """The contexts on this page (context_id, task_count, task_ids)."""
+
+    next_page_token: NotRequired[str]
+    """Cursor for the next page; absent on the last page."""
+
 
 # -----------------------------------------------------------------------------
 # Agent-to-Agent Negotiation Models <NotPartOfA2A>
@@ -1501,15 +1660,27 @@ CancelTaskResponse = JSONRPCResponse[
 
 ListTasksRequest = JSONRPCRequest[Literal["tasks/list"], ListTasksParams]
 ListTasksResponse = JSONRPCResponse[
-    List[Task], Union[TaskNotFoundError, TaskNotCancelableError]
+    Union[List[Task], ListTasksResult],
+    Union[TaskNotFoundError, TaskNotCancelableError],
 ]
 
+SearchTasksRequest = JSONRPCRequest[Literal["tasks/search"], SearchTasksParams]
+SearchTasksResponse = JSONRPCResponse[ListTasksResult, InvalidParamsError]
+
 TaskFeedbackRequest = JSONRPCRequest[Literal["tasks/feedback"], TaskFeedbackParams]
 TaskFeedbackResponse = JSONRPCResponse[Dict[str, str], TaskNotFoundError]
 
+FeedbackSummaryRequest = JSONRPCRequest[
+    Literal["tasks/feedback/summary"], FeedbackSummaryParams
+]
+FeedbackSummaryResponse = JSONRPCResponse[
+    list[FeedbackSummary], Union[TaskNotFoundError, InvalidParamsError]
+]
+
 ListContextsRequest = JSONRPCRequest[Literal["contexts/list"], ListContextsParams]
 ListContextsResponse = JSONRPCResponse[
-    List[Context], Union[ContextNotFoundError, ContextNotCancelableError]
+    Union[List[Context], ListContextsResult],
+    Union[ContextNotFoundError, ContextNotCancelableError],
 ]
 
 ClearContextsRequest = JSONRPCRequest[Literal["contexts/clear"], ContextIdParams]
@@ -1558,7 +1729,9 @@ A2ARequest = Annotated[
         GetTaskRequest,
         CancelTaskRequest,
         ListTasksRequest,
+        SearchTasksRequest,
         TaskFeedbackRequest,
+        FeedbackSummaryRequest,
         ListContextsRequest,
         ClearContextsRequest,
         SetTaskPushNotificationRequest,
@@ -1576,7 +1749,9 @@ A2AResponse: TypeAlias = Union[
     GetTaskResponse,
     CancelTaskResponse,
     ListTasksResponse,
+    SearchTasksResponse,
     TaskFeedbackResponse,
+    FeedbackSummaryResponse,
     ListContextsResponse,
     ClearContextsResponse,
     SetTaskPushNotificationResponse,
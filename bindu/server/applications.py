@@ -42,6 +42,9 @@ from bindu.utils.retry import execute_with_retry
 from .middleware.auth import HydraMiddleware
 from .scheduler.base import Scheduler
 from .storage.base import Storage
+from .storage.blob import BlobStore
+from .storage.compression import CompactionEngine
+from .storage.retention import RetentionEngine
 from .task_manager import TaskManager
 from bindu.utils.logging import get_logger
 
@@ -137,6 +140,9 @@ class BinduApplication(Starlette):
         self.task_manager: TaskManager | None = None
         self._storage: Storage | None = None
         self._scheduler: Scheduler | None = None
+        self._blob_store: BlobStore | None = None
+        self._retention_engine: RetentionEngine | None = None
+        self._compaction_engine: CompactionEngine | None = None
         self._agent_card_json_schema: bytes | None = None
         self._x402_ext = x402_ext
         self._payment_session_manager = None
@@ -228,6 +234,17 @@ class BinduApplication(Starlette):
             with_app=True,
         )
 
+        # Blob download endpoint (only when large file parts are offloaded)
+        if app_settings.storage.blob_backend != "none":
+            from .endpoints import blob_download_endpoint
+
+            self._add_route(
+                "/blobs/{digest}",
+                blob_download_endpoint,
+                ["GET", "HEAD"],
+                with_app=True,
+            )
+
         if self._x402_ext:
             self._register_payment_endpoints()
 
@@ -309,6 +326,12 @@ class BinduApplication(Starlette):
                     app_settings.storage.run_migrations_on_startup = getattr(
                         self._storage_config, "run_migrations_on_startup", False
                     )
+                elif self._storage_config.type == "sqlite":
+                    app_settings.storage.backend = "sqlite"
+                    if self._storage_config.sqlite_path:
+                        app_settings.storage.sqlite_path = (
+                            self._storage_config.sqlite_path
+                        )
                 elif self._storage_config.type == "memory":
                     app_settings.storage.backend = "memory"
 
@@ -323,6 +346,14 @@ class BinduApplication(Starlette):
             app._storage = storage
             logger.info(f"✅ Storage initialized: {type(storage).__name__}")
 
+            # Initialize blob store for large file parts (optional)
+            from .storage.factory import create_blob_store
+
+            blob_store = create_blob_store()
+            app._blob_store = blob_store
+            if blob_store:
+                logger.info(f"✅ Blob store initialized: {type(blob_store).__name__}")
+
             # Initialize scheduler
             logger.info("🔧 Initializing scheduler...")
             from .scheduler.factory import create_scheduler
@@ -389,11 +420,34 @@ class BinduApplication(Starlette):
             if app._payment_session_manager:
                 await app._payment_session_manager.start_cleanup_task()
 
+            # Start retention (TTL purge of finished tasks) if enabled
+            if app_settings.storage.retention_enabled:
+                from .storage.retention import RetentionPolicy
+
+                app._retention_engine = RetentionEngine(
+                    storage,
+                    RetentionPolicy.from_settings(),
+                    interval_seconds=app_settings.storage.retention_interval_seconds,
+                )
+                await app._retention_engine.start()
+
+            # Start compaction (compression of old finished tasks) if enabled
+            if app_settings.storage.compression_enabled:
+                try:
+                    app._compaction_engine = CompactionEngine.from_settings(storage)
+                except (ValueError, RuntimeError) as e:
+                    logger.warning(f"Task compression disabled: {e}")
+                else:
+                    await app._compaction_engine.start()
+
             # Start TaskManager
             if manifest:
                 logger.info("🔧 Starting TaskManager...")
                 task_manager = TaskManager(
-                    scheduler=scheduler, storage=storage, manifest=manifest
+                    scheduler=scheduler,
+                    storage=storage,
+                    manifest=manifest,
+                    blob_store=blob_store,
                 )
                 async with task_manager:
                     app.task_manager = task_manager
@@ -407,6 +461,12 @@ class BinduApplication(Starlette):
             if app._payment_session_manager:
                 await app._payment_session_manager.stop_cleanup_task()
 
+            # Stop retention and compaction before their storage is closed
+            if app._retention_engine:
+                await app._retention_engine.stop()
+            if app._compaction_engine:
+                await app._compaction_engine.stop()
+
             # Cleanup storage
             logger.info("🧹 Cleaning up storage...")
             from .storage.factory import close_storage
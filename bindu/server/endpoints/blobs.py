@@ -0,0 +1,128 @@
+"""Blob download endpoint for offloaded file parts.
+
+Serves content-addressed blobs with single-range HTTP Range support so
+clients can resume downloads or fetch slices of large files.
+"""
+
+from __future__ import annotations
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from bindu.server.applications import BinduApplication
+from bindu.server.storage.blob import is_valid_digest
+from bindu.utils.logging import get_logger
+from bindu.utils.request_utils import get_client_ip, handle_endpoint_errors
+
+logger = get_logger("bindu.server.endpoints.blobs")
+
+
+def parse_range_header(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single-range ``Range`` header into inclusive byte offsets.
+
+    Args:
+        header: Raw Range header value (e.g. "bytes=0-1023", "bytes=-500")
+        size: Total size of the blob
+
+    Returns:
+        (start, end) inclusive offsets, or None if the header should be
+        ignored (malformed, non-bytes unit, or multiple ranges)
+
+    Raises:
+        ValueError: If the range is well-formed but not satisfiable
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_str, sep, end_str = spec.strip().partition("-")
+    if not sep:
+        return None
+    start_str, end_str = start_str.strip(), end_str.strip()
+    if not (start_str.isdigit() or start_str == "") or not (
+        end_str.isdigit() or end_str == ""
+    ):
+        return None
+
+    if start_str == "":
+        # Suffix range: last N bytes
+        if end_str == "":
+            return None
+        suffix = int(end_str)
+        if suffix == 0 or size == 0:
+            raise ValueError("Unsatisfiable suffix range")
+        return max(size - suffix, 0), size - 1
+
+    start = int(start_str)
+    end = int(end_str) if end_str else None
+    if end is not None and end < start:
+        return None
+    if start >= size:
+        raise ValueError("Range start beyond end of blob")
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+@handle_endpoint_errors("blob download")
+async def blob_download_endpoint(app: BinduApplication, request: Request) -> Response:
+    """Stream a stored blob, honouring a single byte range if requested."""
+    client_ip = get_client_ip(request)
+    digest = request.path_params.get("digest", "")
+
+    blob_store = app._blob_store
+    if blob_store is None:
+        return JSONResponse(
+            content={"error": "Blob store not configured"}, status_code=404
+        )
+
+    if not is_valid_digest(digest):
+        return JSONResponse(content={"error": "Invalid blob digest"}, status_code=400)
+
+    size = await blob_store.size(digest)
+    if size is None:
+        return JSONResponse(
+            content={"error": f"Blob not found: {digest}"}, status_code=404
+        )
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{digest}"',
+        # Content-addressed, so the bytes behind a URI never change
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
+
+    # If-Range with a different validator means "send the whole blob"
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and if_range in (None, headers["ETag"]):
+        try:
+            byte_range = parse_range_header(range_header, size)
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{size}"},
+            )
+
+    if byte_range is None:
+        start, end, status_code = 0, size - 1, 200
+    else:
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    headers["Content-Length"] = str(end - start + 1 if size else 0)
+    logger.debug(f"Serving blob {digest} bytes {start}-{end}/{size} to {client_ip}")
+
+    if request.method == "HEAD" or size == 0:
+        return Response(
+            status_code=status_code,
+            headers=headers,
+            media_type="application/octet-stream",
+        )
+
+    return StreamingResponse(
+        blob_store.iter_range(digest, start, end),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/octet-stream",
+    )
@@ -7,6 +7,7 @@ from starlette.responses import Response
 
 from bindu.server.applications import BinduApplication
 from bindu.server.metrics import get_metrics
+from bindu.settings import app_settings
 from bindu.utils.logging import get_logger
 
 logger = get_logger("bindu.server.endpoints.metrics")
@@ -28,30 +29,22 @@ async def _update_agent_metrics(app: BinduApplication) -> None:
         agent_id = app.manifest.did_extension.did
 
         try:
-            # Count active tasks from storage (optimized)
-            # We count tasks that are NOT in terminal states
-            # Since count_tasks supports single status filtering, we might need multiple calls
-            # or just count total active if storage supports it.
-            # For now, let's use the most common active state "submitted" + "working"
-            # Or if storage supports efficient filtering.
-
-            # Optimization: most tasks are likely completed.
-            # If we want total active, we can count total and subtract completed/failed?
-            # Or just count 'submitted' and 'working' which are the main active ones.
-
-            submitted = await app._storage.count_tasks(status="submitted")
-            working = await app._storage.count_tasks(status="working")
-            input_required = await app._storage.count_tasks(status="input-required")
-
-            active_count = submitted + working + input_required
+            # One read of the per-state counters instead of a COUNT(*) per state
+            counts = await app._storage.count_tasks_by_state()
+            active_count = sum(
+                counts.get(state, 0) for state in app_settings.agent.non_terminal_states
+            )
             metrics.set_agent_tasks_active(agent_id, active_count)
-
-            # Count completed tasks by status
-            # Note: This counts from current session only, not historical totals
-            # For historical totals, you'd need to track this separately
         except Exception as e:
             logger.debug(f"Failed to update agent metrics: {e}")
 
+        try:
+            # Reads the feedback aggregates, one row per skill and day
+            summaries = await app._storage.get_feedback_summary(group_by=["skill"])
+            metrics.set_feedback_summaries(agent_id, summaries)
+        except Exception as e:
+            logger.debug(f"Failed to update feedback metrics: {e}")
+
 
 async def metrics_endpoint(app: BinduApplication, request: Request) -> Response:
     """Prometheus metrics endpoint.
@@ -63,6 +56,8 @@ async def metrics_endpoint(app: BinduApplication, request: Request) -> Response:
     - http_request_duration_seconds: HTTP request latency histogram
     - agent_tasks_active: Currently active tasks per agent
     - agent_tasks_completed_total: Total completed tasks per agent and status
+    - agent_feedback_count, agent_feedback_rating_mean, agent_feedback_ratings:
+      Feedback received per agent and skill
     """
     logger.debug("Metrics endpoint called")
 
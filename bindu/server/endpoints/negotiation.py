@@ -149,12 +149,10 @@ async def negotiation_endpoint(app: BinduApplication, request: Request) -> Respo
     queue_depth = None
     if app.task_manager and app.task_manager.storage:
         try:
-            tasks = await app.task_manager.storage.list_tasks()
+            counts = await app.task_manager.storage.count_tasks_by_state()
             # Count tasks in non-terminal states (from agent settings)
             queue_depth = sum(
-                1
-                for task in tasks
-                if task.get("state") in app_settings.agent.non_terminal_states
+                counts.get(state, 0) for state in app_settings.agent.non_terminal_states
             )
         except Exception as e:
             logger.warning(f"Failed to get queue depth from storage: {e}")
@@ -22,6 +22,7 @@ from bindu.common.protocol.types import (
     ClearContextsRequest,
     ClearContextsResponse,
     ContextNotFoundError,
+    InvalidParamsError,
     ListContextsRequest,
     ListContextsResponse,
 )
@@ -29,6 +30,10 @@ from bindu.common.protocol.types import (
 from bindu.utils.task_telemetry import trace_context_operation
 
 from bindu.server.storage import Storage
+from bindu.server.storage.helpers.pagination import as_utc
+
+# contexts/list params that switch the response to a keyset-paginated page
+_CONTEXT_PAGE_PARAMS = ("page_size", "page_token", "created_after", "created_before")
 
 
 @dataclass
@@ -40,11 +45,30 @@ class ContextHandlers:
 
     @trace_context_operation("list_contexts")
     async def list_contexts(self, request: ListContextsRequest) -> ListContextsResponse:
-        """List all contexts in storage."""
+        """List contexts in storage.
+
+        Returns the legacy list of contexts unless a page_size, page_token or
+        time filter is given, in which case a keyset-paginated
+        ListContextsResult page (newest first) is returned.
+        """
         # Support both 'length' and 'history_length' for backwards compatibility
         params = request.get("params", {})
         length = params.get("length") or params.get("history_length")
 
+        if any(key in params for key in _CONTEXT_PAGE_PARAMS):
+            try:
+                page = await self.storage.list_contexts_page(
+                    params.get("page_size") or length,
+                    params.get("page_token"),
+                    created_after=as_utc(params.get("created_after")),
+                    created_before=as_utc(params.get("created_before")),
+                )
+            except ValueError as e:
+                return self.error_response_creator(
+                    ListContextsResponse, request["id"], InvalidParamsError, str(e)
+                )
+            return ListContextsResponse(jsonrpc="2.0", id=request["id"], result=page)
+
         contexts = await self.storage.list_contexts(length)
 
         # Return empty list if no contexts, not an error
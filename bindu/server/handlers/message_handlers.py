@@ -17,8 +17,10 @@ from __future__ import annotations
 
 import inspect
 import json
+import time
 import uuid
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 
@@ -33,7 +35,65 @@ from bindu.common.protocol.types import (
 from bindu.utils.task_telemetry import trace_task_operation, track_active_task
 
 from bindu.server.scheduler import Scheduler
-from bindu.server.storage import Storage
+from bindu.server.storage import DuplicateMessageError, Storage
+from bindu.server.storage.blob import BlobStore, offload_messages
+from bindu.settings import app_settings
+
+
+class SentMessages:
+    """Tasks of messages this process accepted recently, by (task_id, message_id).
+
+    Clients retry message/send on timeouts. Storage refuses to append a
+    message twice (DuplicateMessageError); this short-lived LRU answers most
+    retries before they reach storage. Entries also record whether the task
+    was scheduled, so a retry after a scheduling failure schedules it.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 300.0):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of remembered messages
+            ttl_seconds: How long a message's task is remembered
+        """
+        self.max_entries = max(max_entries, 1)
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Task, bool]] = (
+            OrderedDict()
+        )
+
+    @staticmethod
+    def key(message: dict[str, Any]) -> tuple[str, str] | None:
+        """Cache key of a message, or None if it has no task_id or message_id."""
+        task_id, message_id = message.get("task_id"), message.get("message_id")
+        if task_id is None or message_id is None:
+            return None
+        return str(task_id), str(message_id)
+
+    def get(self, key: tuple[str, str]) -> tuple[Task, bool] | None:
+        """The task and whether it was scheduled, if the message is remembered."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, task, scheduled = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        return task, scheduled
+
+    def put(self, key: tuple[str, str], task: Task, scheduled: bool) -> None:
+        """Remember a message's task."""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, task, scheduled)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _sent_messages() -> SentMessages:
+    return SentMessages(
+        max_entries=app_settings.agent.message_dedup_max_entries,
+        ttl_seconds=app_settings.agent.message_dedup_ttl_seconds,
+    )
 
 
 @dataclass
@@ -46,6 +106,19 @@ class MessageHandlers:
     workers: list[Any] | None = None
     context_id_parser: Any = None
     push_manager: Any | None = None
+    blob_store: BlobStore | None = None
+    sent_messages: SentMessages = field(default_factory=_sent_messages)
+
+    async def _offload_file_parts(self, message: dict[str, Any]) -> None:
+        """Move large inline file parts of an incoming message to the blob store."""
+        if self.blob_store is None or self.manifest is None:
+            return
+        await offload_messages(
+            [message],
+            self.blob_store,
+            self.manifest.url,
+            app_settings.storage.blob_threshold_bytes,
+        )
 
     @trace_task_operation("send_message")
     @track_active_task
@@ -55,12 +128,32 @@ class MessageHandlers:
         Note: Payment enforcement is handled by X402Middleware before this method is called.
         If the request reaches here, payment has already been verified.
         Settlement will be handled by ManifestWorker when task completes.
+
+        Sending is idempotent per message_id: a retried message returns its
+        task without appending the message again. A task still submitted is
+        scheduled again, and runs once.
         """
         message = request["params"]["message"]
+        key = SentMessages.key(message)
+        sent = self.sent_messages.get(key) if key is not None else None
+        if sent is not None and sent[1]:
+            return SendMessageResponse(jsonrpc="2.0", id=request["id"], result=sent[0])
+
         context_id = self.context_id_parser(message.get("context_id"))
+        await self._offload_file_parts(message)
 
         # Submit task to storage
-        task: Task = await self.storage.submit_task(context_id, message)
+        try:
+            task: Task = await self.storage.submit_task(context_id, message)
+        except DuplicateMessageError as e:
+            task = e.task
+            if task["status"]["state"] != "submitted":
+                # Accepted before (possibly by another process) and picked up
+                return SendMessageResponse(jsonrpc="2.0", id=request["id"], result=task)
+            # Still submitted: scheduling may have failed or never happened
+            # (a crash after submit, or a commit whose ack was lost), here or
+            # in another process. Schedule it again; the worker's
+            # submitted -> working claim makes sure it runs once.
 
         # Schedule task for execution
         scheduler_params: TaskSendParams = TaskSendParams(
@@ -92,7 +185,14 @@ class MessageHandlers:
             # Remove from message metadata to keep it clean (internal use only)
             del message["metadata"]["_payment_context"]
 
-        await self.scheduler.run_task(scheduler_params)
+        try:
+            await self.scheduler.run_task(scheduler_params)
+        except Exception:
+            if key is not None:
+                self.sent_messages.put(key, task, scheduled=False)
+            raise
+        if key is not None:
+            self.sent_messages.put(key, task, scheduled=True)
         return SendMessageResponse(jsonrpc="2.0", id=request["id"], result=task)
 
     async def stream_message(self, request: StreamMessageRequest):
@@ -107,9 +207,31 @@ class MessageHandlers:
 
         message = request["params"]["message"]
         context_id = self.context_id_parser(message.get("context_id"))
+        await self._offload_file_parts(message)
 
         # similar to the "messages/send flow submit the task to the configured storage"
-        task: Task = await self.storage.submit_task(context_id, message)
+        try:
+            task: Task = await self.storage.submit_task(context_id, message)
+        except DuplicateMessageError as e:
+            # A retried stream: report the task's state instead of running it again
+            status = e.task["status"]
+            duplicate_event = {
+                "kind": "status-update",
+                "task_id": str(e.task["id"]),
+                "context_id": str(e.task["context_id"]),
+                "status": {
+                    "state": status["state"],
+                    "timestamp": str(status["timestamp"]),
+                },
+                "final": True,
+            }
+
+            async def duplicate_generator():
+                yield f"data: {json.dumps(duplicate_event)}\n\n"
+
+            return StreamingResponse(
+                duplicate_generator(), media_type="text/event-stream"
+            )
 
         async def stream_generator():
             """Generate a consumable stream based on the function which was decorated using pebblify."""
@@ -10,7 +10,8 @@
 """Task handlers for Bindu server.
 
 This module handles task-related RPC requests including
-getting, listing, canceling tasks, and submitting feedback.
+getting, listing, searching, canceling tasks, and submitting and
+summarizing feedback.
 """
 
 from __future__ import annotations
@@ -22,10 +23,15 @@ from typing import Any
 from bindu.common.protocol.types import (
     CancelTaskRequest,
     CancelTaskResponse,
+    FeedbackSummaryRequest,
+    FeedbackSummaryResponse,
     GetTaskRequest,
     GetTaskResponse,
+    InvalidParamsError,
     ListTasksRequest,
     ListTasksResponse,
+    SearchTasksRequest,
+    SearchTasksResponse,
     TaskFeedbackRequest,
     TaskFeedbackResponse,
     TaskNotCancelableError,
@@ -33,10 +39,23 @@ from bindu.common.protocol.types import (
 )
 from bindu.settings import app_settings
 
+from bindu.utils.skill_utils import find_skill_by_id
 from bindu.utils.task_telemetry import trace_task_operation, track_active_task
 
 from bindu.server.scheduler import Scheduler
 from bindu.server.storage import Storage
+from bindu.server.storage.helpers.feedback import summarize_feedback
+from bindu.server.storage.helpers.pagination import as_utc
+
+# tasks/list params that switch the response to a keyset-paginated page
+_TASK_PAGE_PARAMS = (
+    "page_size",
+    "page_token",
+    "context_id",
+    "states",
+    "created_after",
+    "created_before",
+)
 
 
 @dataclass
@@ -46,13 +65,15 @@ class TaskHandlers:
     scheduler: Scheduler
     storage: Storage[Any]
     error_response_creator: Any = None
+    manifest: Any | None = None
 
     @trace_task_operation("get_task")
     async def get_task(self, request: GetTaskRequest) -> GetTaskResponse:
         """Get a task and return it to the client."""
         task_id = request["params"]["task_id"]
         history_length = request["params"].get("history_length")
-        task = await self.storage.load_task(task_id, history_length)
+        projection = request["params"].get("projection", "full")
+        task = await self.storage.load_task(task_id, history_length, projection)
 
         if task is None:
             return self.error_response_creator(
@@ -93,8 +114,37 @@ class TaskHandlers:
 
     @trace_task_operation("list_tasks", include_params=False)
     async def list_tasks(self, request: ListTasksRequest) -> ListTasksResponse:
-        """List all tasks in storage."""
-        tasks = await self.storage.list_tasks(request["params"].get("length"))
+        """List tasks in storage.
+
+        Returns the legacy list of tasks unless a page_size, page_token or
+        filter is given, in which case a keyset-paginated ListTasksResult
+        page (newest first) is returned.
+        """
+        params = request["params"]
+
+        if any(key in params for key in _TASK_PAGE_PARAMS):
+            try:
+                page = await self.storage.list_tasks_page(
+                    params.get("page_size") or params.get("length"),
+                    params.get("page_token"),
+                    projection=params.get("projection", "full"),
+                    history_length=params.get("history_length"),
+                    context_id=params.get("context_id"),
+                    states=params.get("states"),
+                    created_after=as_utc(params.get("created_after")),
+                    created_before=as_utc(params.get("created_before")),
+                )
+            except ValueError as e:
+                return self.error_response_creator(
+                    ListTasksResponse, request["id"], InvalidParamsError, str(e)
+                )
+            return ListTasksResponse(jsonrpc="2.0", id=request["id"], result=page)
+
+        tasks = await self.storage.list_tasks(
+            params.get("length"),
+            projection=params.get("projection", "full"),
+            history_length=params.get("history_length"),
+        )
 
         if tasks is None:
             return self.error_response_creator(
@@ -103,6 +153,52 @@ class TaskHandlers:
 
         return ListTasksResponse(jsonrpc="2.0", id=request["id"], result=tasks)
 
+    @trace_task_operation("search_tasks", include_params=False)
+    async def search_tasks(self, request: SearchTasksRequest) -> SearchTasksResponse:
+        """Search tasks by message text and metadata.
+
+        Returns a ListTasksResult page, best matches first.
+        """
+        params = request["params"]
+
+        try:
+            page = await self.storage.search_tasks(
+                params.get("query"),
+                params.get("page_size"),
+                params.get("page_token"),
+                metadata=params.get("metadata"),
+                projection=params.get("projection", "full"),
+                history_length=params.get("history_length"),
+                context_id=params.get("context_id"),
+                states=params.get("states"),
+            )
+        except ValueError as e:
+            return self.error_response_creator(
+                SearchTasksResponse, request["id"], InvalidParamsError, str(e)
+            )
+        return SearchTasksResponse(jsonrpc="2.0", id=request["id"], result=page)
+
+    def _feedback_skill(
+        self, metadata: dict[str, Any] | None, task: dict[str, Any]
+    ) -> str | None:
+        """Skill feedback is summarized under, if it names one of the agent's.
+
+        Taken from the feedback's metadata, else from the task's (where the
+        agent may record the skill it used). Names of unknown skills are
+        dropped, so clients cannot add skills to the aggregates and gauges.
+        """
+        for source in (metadata or {}, task.get("metadata") or {}):
+            skill_id = source.get("skill_id")
+            if isinstance(skill_id, str) and skill_id:
+                break
+        else:
+            return None
+
+        if self.manifest is None:
+            return skill_id
+        skill = find_skill_by_id(getattr(self.manifest, "skills", None) or [], skill_id)
+        return skill.get("id") if skill else None
+
     @trace_task_operation("task_feedback")
     async def task_feedback(self, request: TaskFeedbackRequest) -> TaskFeedbackResponse:
         """Submit feedback for a completed task."""
@@ -117,10 +213,13 @@ class TaskHandlers:
         feedback_data = {
             "task_id": task_id,
             "feedback": request["params"]["feedback"],
-            "rating": request["params"]["rating"],
-            "metadata": request["params"]["metadata"],
+            "rating": request["params"].get("rating"),
+            "metadata": request["params"].get("metadata"),
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
+        skill_id = self._feedback_skill(feedback_data["metadata"], task)
+        if skill_id is not None:
+            feedback_data["skill_id"] = skill_id
 
         if hasattr(self.storage, "store_task_feedback"):
             await self.storage.store_task_feedback(task_id, feedback_data)
@@ -133,3 +232,46 @@ class TaskHandlers:
                 "task_id": str(task_id),
             },
         )
+
+    @trace_task_operation("feedback_summary", include_params=False)
+    async def feedback_summary(
+        self, request: FeedbackSummaryRequest
+    ) -> FeedbackSummaryResponse:
+        """Summarize feedback: one task's, or per skill and day.
+
+        Without task_id the storage's feedback aggregates are read, so no
+        feedback entries are scanned.
+        """
+        params = request["params"]
+        task_id = params.get("task_id")
+
+        if task_id is not None:
+            task = await self.storage.load_task(task_id, projection="status")
+            if task is None:
+                return self.error_response_creator(
+                    FeedbackSummaryResponse,
+                    request["id"],
+                    TaskNotFoundError,
+                    "Task not found",
+                )
+            entries = await self.storage.get_task_feedback(task_id)
+            summary = summarize_feedback(entries or [])
+            summary["task_id"] = task_id
+            return FeedbackSummaryResponse(
+                jsonrpc="2.0", id=request["id"], result=[summary]
+            )
+
+        try:
+            summaries = await self.storage.get_feedback_summary(
+                skill_id=params.get("skill_id"),
+                since=params.get("since"),
+                until=params.get("until"),
+                group_by=params.get("group_by", ()),
+            )
+        except ValueError as e:
+            return self.error_response_creator(
+                FeedbackSummaryResponse, request["id"], InvalidParamsError, str(e)
+            )
+        return FeedbackSummaryResponse(
+            jsonrpc="2.0", id=request["id"], result=summaries
+        )
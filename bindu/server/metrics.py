@@ -6,8 +6,9 @@ This module provides metrics collection for HTTP requests, latency, and agent ta
 from __future__ import annotations
 
 from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping
 from threading import Lock
-from typing import cast
+from typing import Any, cast
 
 from bindu.utils.logging import get_logger
 
@@ -60,6 +61,38 @@ class PrometheusMetrics:
         self._http_response_size_count = 0
         self._http_requests_in_flight = 0
 
+        # Task cache lookups: {"hit"|"miss": count}
+        self._task_cache_lookups: dict[str, int] = defaultdict(int)
+
+        # Task cache evictions: {reason: count} (capacity, expired, invalidated)
+        self._task_cache_evictions: dict[str, int] = defaultdict(int)
+
+        # Task compaction: tasks compacted and their payload bytes before/after
+        self._compacted_tasks = 0
+        self._compaction_raw_bytes = 0
+        self._compaction_compressed_bytes = 0
+
+        # Connection pools: checkout wait and checkout latency histograms,
+        # {(pool, bucket_le): count}, plus sums and counts per pool
+        self._pool_buckets = [
+            0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float("inf")
+        ]
+        self._pool_wait_counts: dict[tuple[str, float], int] = defaultdict(int)
+        self._pool_wait_sum: dict[str, float] = defaultdict(float)
+        self._pool_wait_total: dict[str, int] = defaultdict(int)
+        self._pool_checkout_counts: dict[tuple[str, float], int] = defaultdict(int)
+        self._pool_checkout_sum: dict[str, float] = defaultdict(float)
+        self._pool_checkout_total: dict[str, int] = defaultdict(int)
+        self._pool_timeouts: dict[str, int] = defaultdict(int)
+
+        # Connection pool gauges, read when metrics are generated:
+        # {pool: callback returning checked_out, idle, waiting and max}
+        self._pool_stats: dict[str, Callable[[], Mapping[str, int]]] = {}
+
+        # Feedback gauges from the storage's feedback aggregates, refreshed
+        # on each scrape: {(agent_id, skill_id): FeedbackSummary}
+        self._feedback: dict[tuple[str, str], Mapping[str, Any]] = {}
+
     def record_http_request(
         self,
         method: str,
@@ -162,6 +195,134 @@ class PrometheusMetrics:
         with self._lock:
             self._http_requests_in_flight = max(0, self._http_requests_in_flight - 1)
 
+    def record_task_cache_lookup(self, hit: bool) -> None:
+        """Record a task cache lookup.
+
+        Args:
+            hit: Whether the task was served from the cache
+        """
+        with self._lock:
+            self._task_cache_lookups["hit" if hit else "miss"] += 1
+
+    def record_task_cache_eviction(self, reason: str, count: int = 1) -> None:
+        """Record task cache entries being dropped.
+
+        Args:
+            reason: Why entries were dropped (capacity, expired, invalidated)
+            count: Number of entries dropped
+        """
+        with self._lock:
+            self._task_cache_evictions[reason] += count
+
+    def record_task_compaction(
+        self, tasks: int, raw_bytes: int, compressed_bytes: int
+    ) -> None:
+        """Record a batch of compacted tasks.
+
+        Args:
+            tasks: Number of tasks compacted
+            raw_bytes: Size of their history and artifacts as JSON
+            compressed_bytes: Size of the compressed payloads stored instead
+        """
+        with self._lock:
+            self._compacted_tasks += tasks
+            self._compaction_raw_bytes += raw_bytes
+            self._compaction_compressed_bytes += compressed_bytes
+
+    def set_feedback_summaries(
+        self, agent_id: str, summaries: Iterable[Mapping[str, Any]]
+    ) -> None:
+        """Replace an agent's feedback gauges.
+
+        Args:
+            agent_id: Agent identifier
+            summaries: FeedbackSummary dicts grouped by skill
+        """
+        with self._lock:
+            for key in [key for key in self._feedback if key[0] == agent_id]:
+                del self._feedback[key]
+            for summary in summaries:
+                self._feedback[(agent_id, summary.get("skill_id", ""))] = summary
+
+    def record_pool_wait(self, pool: str, seconds: float) -> None:
+        """Record the time a checkout spent getting a connection from a pool.
+
+        Args:
+            pool: Pool name
+            seconds: Time waiting for a free connection or opening a new one
+        """
+        with self._lock:
+            for bucket in self._pool_buckets:
+                if seconds <= bucket:
+                    self._pool_wait_counts[(pool, bucket)] += 1
+            self._pool_wait_sum[pool] += seconds
+            self._pool_wait_total[pool] += 1
+
+    def record_pool_checkout(self, pool: str, seconds: float) -> None:
+        """Record the duration of a whole connection checkout.
+
+        Args:
+            pool: Pool name
+            seconds: Wait plus connection checks (pre-ping) and setup
+        """
+        with self._lock:
+            for bucket in self._pool_buckets:
+                if seconds <= bucket:
+                    self._pool_checkout_counts[(pool, bucket)] += 1
+            self._pool_checkout_sum[pool] += seconds
+            self._pool_checkout_total[pool] += 1
+
+    def record_pool_timeout(self, pool: str) -> None:
+        """Record a checkout that gave up waiting for a connection.
+
+        Args:
+            pool: Pool name
+        """
+        with self._lock:
+            self._pool_timeouts[pool] += 1
+
+    def register_pool(
+        self, pool: str, stats: Callable[[], Mapping[str, int]]
+    ) -> None:
+        """Report a connection pool's gauges until it is unregistered.
+
+        Args:
+            pool: Pool name
+            stats: Returns the pool's checked_out, idle, waiting and max
+                connection counts; called whenever metrics are generated
+        """
+        with self._lock:
+            self._pool_stats[pool] = stats
+
+    def unregister_pool(self, pool: str) -> None:
+        """Stop reporting a pool's gauges (its counters are kept).
+
+        Args:
+            pool: Pool name
+        """
+        with self._lock:
+            self._pool_stats.pop(pool, None)
+
+    def _pool_histogram_lines(
+        self,
+        name: str,
+        help_text: str,
+        counts: dict[tuple[str, float], int],
+        sums: dict[str, float],
+        totals: dict[str, int],
+    ) -> list[str]:
+        lines = ["", f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for pool in sorted(totals):
+            for bucket in self._pool_buckets:
+                bucket_str = "+Inf" if bucket == float("inf") else str(bucket)
+                lines.append(
+                    f'{name}_bucket{{pool="{pool}",le="{bucket_str}"}} '
+                    f"{counts.get((pool, bucket), 0)}"
+                )
+            lines.append(f'{name}_sum{{pool="{pool}"}} {sums[pool]:.6f}')
+            lines.append(f'{name}_count{{pool="{pool}"}} {totals[pool]}')
+        return lines
+
     def generate_prometheus_text(self) -> str:
         """Generate Prometheus text format metrics.
 
@@ -204,6 +365,47 @@ class PrometheusMetrics:
                 for agent_id, count in sorted(self._agent_tasks_active.items()):
                     lines.append(f'agent_tasks_active{{agent_id="{agent_id}"}} {count}')
 
+            # Agent feedback (skill ids are free text, so escape them)
+            if self._feedback:
+                feedback = [
+                    (f'agent_id="{agent_id}",skill="{_escape_label(skill)}"', summary)
+                    for (agent_id, skill), summary in sorted(self._feedback.items())
+                ]
+
+                lines.append("")
+                lines.append(
+                    "# HELP agent_feedback_count Feedback entries received per skill"
+                )
+                lines.append("# TYPE agent_feedback_count gauge")
+                for labels, summary in feedback:
+                    lines.append(f"agent_feedback_count{{{labels}}} {summary['count']}")
+
+                lines.append("")
+                lines.append(
+                    "# HELP agent_feedback_rating_mean Mean feedback rating (1-5) "
+                    "per skill"
+                )
+                lines.append("# TYPE agent_feedback_rating_mean gauge")
+                for labels, summary in feedback:
+                    if summary["mean_rating"] is not None:
+                        lines.append(
+                            f"agent_feedback_rating_mean{{{labels}}} "
+                            f"{summary['mean_rating']:.4f}"
+                        )
+
+                lines.append("")
+                lines.append(
+                    "# HELP agent_feedback_ratings Feedback entries per rating "
+                    "and skill"
+                )
+                lines.append("# TYPE agent_feedback_ratings gauge")
+                for labels, summary in feedback:
+                    for rating, count in sorted(summary["ratings"].items()):
+                        lines.append(
+                            f'agent_feedback_ratings{{{labels},rating="{rating}"}} '
+                            f"{count}"
+                        )
+
             # Agent tasks completed
             if self._agent_tasks_completed:
                 lines.append("")
@@ -281,6 +483,131 @@ class PrometheusMetrics:
                     f"http_response_size_bytes_count {self._http_response_size_count}"
                 )
 
+            # Task cache
+            if self._task_cache_lookups:
+                lines.append("")
+                lines.append(
+                    "# HELP storage_task_cache_requests_total Task cache lookups"
+                )
+                lines.append("# TYPE storage_task_cache_requests_total counter")
+                for result, count in sorted(self._task_cache_lookups.items()):
+                    lines.append(
+                        f'storage_task_cache_requests_total{{result="{result}"}} {count}'
+                    )
+
+            if self._task_cache_evictions:
+                lines.append("")
+                lines.append(
+                    "# HELP storage_task_cache_evictions_total Task cache entries dropped"
+                )
+                lines.append("# TYPE storage_task_cache_evictions_total counter")
+                for reason, count in sorted(self._task_cache_evictions.items()):
+                    lines.append(
+                        f'storage_task_cache_evictions_total{{reason="{reason}"}} {count}'
+                    )
+
+            # Task compaction
+            if self._compacted_tasks:
+                lines.append("")
+                lines.append(
+                    "# HELP storage_compacted_tasks_total Finished tasks compacted"
+                )
+                lines.append("# TYPE storage_compacted_tasks_total counter")
+                lines.append(f"storage_compacted_tasks_total {self._compacted_tasks}")
+
+                lines.append("")
+                lines.append(
+                    "# HELP storage_compaction_bytes_total Compacted payload size"
+                )
+                lines.append("# TYPE storage_compaction_bytes_total counter")
+                lines.append(
+                    f'storage_compaction_bytes_total{{size="raw"}} '
+                    f"{self._compaction_raw_bytes}"
+                )
+                lines.append(
+                    f'storage_compaction_bytes_total{{size="compressed"}} '
+                    f"{self._compaction_compressed_bytes}"
+                )
+
+                saved = self._compaction_raw_bytes - self._compaction_compressed_bytes
+                lines.append("")
+                lines.append(
+                    "# HELP storage_compaction_bytes_saved_total "
+                    "Bytes saved by compacting tasks"
+                )
+                lines.append("# TYPE storage_compaction_bytes_saved_total counter")
+                lines.append(f"storage_compaction_bytes_saved_total {saved}")
+
+            # Connection pools
+            pool_stats = {
+                pool: stats() for pool, stats in sorted(self._pool_stats.items())
+            }
+            if pool_stats:
+                lines.append("")
+                lines.append(
+                    "# HELP storage_pool_connections Pooled database connections"
+                )
+                lines.append("# TYPE storage_pool_connections gauge")
+                for pool, stats in pool_stats.items():
+                    for state in ("checked_out", "idle"):
+                        lines.append(
+                            f'storage_pool_connections{{pool="{pool}",'
+                            f'state="{state}"}} {stats[state]}'
+                        )
+
+                lines.append("")
+                lines.append(
+                    "# HELP storage_pool_max_connections Connection pool size limit"
+                )
+                lines.append("# TYPE storage_pool_max_connections gauge")
+                for pool, stats in pool_stats.items():
+                    lines.append(
+                        f'storage_pool_max_connections{{pool="{pool}"}} {stats["max"]}'
+                    )
+
+                lines.append("")
+                lines.append(
+                    "# HELP storage_pool_waiting Checkouts waiting for a connection"
+                )
+                lines.append("# TYPE storage_pool_waiting gauge")
+                for pool, stats in pool_stats.items():
+                    lines.append(
+                        f'storage_pool_waiting{{pool="{pool}"}} {stats["waiting"]}'
+                    )
+
+            if self._pool_wait_total:
+                lines.extend(
+                    self._pool_histogram_lines(
+                        "storage_pool_checkout_wait_seconds",
+                        "Time getting a connection from the pool",
+                        self._pool_wait_counts,
+                        self._pool_wait_sum,
+                        self._pool_wait_total,
+                    )
+                )
+            if self._pool_checkout_total:
+                lines.extend(
+                    self._pool_histogram_lines(
+                        "storage_pool_checkout_seconds",
+                        "Connection checkout latency, including pre-ping",
+                        self._pool_checkout_counts,
+                        self._pool_checkout_sum,
+                        self._pool_checkout_total,
+                    )
+                )
+            if self._pool_timeouts:
+                lines.append("")
+                lines.append(
+                    "# HELP storage_pool_checkout_timeouts_total "
+                    "Checkouts that timed out waiting for a connection"
+                )
+                lines.append("# TYPE storage_pool_checkout_timeouts_total counter")
+                for pool, count in sorted(self._pool_timeouts.items()):
+                    lines.append(
+                        f'storage_pool_checkout_timeouts_total{{pool="{pool}"}} '
+                        f"{count}"
+                    )
+
             # Requests in flight
             lines.append("")
             lines.append(
@@ -292,6 +619,11 @@ class PrometheusMetrics:
         return "\n".join(lines) + "\n"
 
 
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
 # Global metrics instance
 _metrics_instance: PrometheusMetrics | None = None
 _metrics_init_lock = Lock()
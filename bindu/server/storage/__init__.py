@@ -24,6 +24,7 @@ Think of this as the restaurant's order management system catalog:
 2. STORAGE IMPLEMENTATIONS:
    - InMemoryStorage: Fast whiteboard system (development/testing)
    - PostgresStorage: Persistent database storage (production)
+   - SQLiteStorage: Persistent single-file storage (one host)
 
 3. USAGE PATTERNS:
    - Import the base Storage class for type hints and interfaces
@@ -33,21 +34,54 @@ Think of this as the restaurant's order management system catalog:
 AVAILABLE STORAGE OPTIONS:
 - InMemoryStorage: Lightning-fast temporary storage
 - PostgresStorage: Persistent PostgreSQL storage
+- SQLiteStorage: Persistent SQLite storage (WAL, aiosqlite)
+- CachedStorage: Read-through task cache wrapping either of the above
+- TieredStorage: In-memory hot tier of active tasks over a persistent backend
+- RetentionEngine: Purges and archives tasks past their per-state TTL
+- CompactionEngine: Compresses history and artifacts of old finished tasks
+- export_storage/import_storage: Resumable bulk dumps (NDJSON or COPY)
 """
 
 from __future__ import annotations as _annotations
 
 # Export the base storage interface
-from .base import Storage
+from .base import DuplicateMessageError, Storage
 
 # Export all storage implementations
 from .memory_storage import InMemoryStorage
 
 # Export factory functions
-from .factory import create_storage, close_storage
+from .factory import create_blob_store, create_storage, close_storage
+
+# Export read-through task cache
+from .cache import CachedStorage
+
+# Export hot/cold tiered storage (write-through hot tier)
+from .tiered import TieredStorage
+
+# Export retention engine (TTL purge and archival)
+from .retention import RetentionEngine, RetentionPolicy, RetentionResult
+
+# Export compaction of old finished tasks (zstd payloads, PostgreSQL)
+from .compression import CompactionEngine, CompactionResult
+
+# Export bulk transfer (export/import dumps, backend-to-backend copy)
+from .transfer import TransferResult, copy_storage, export_storage, import_storage
+
+# Export task change feed types (Storage.subscribe)
+from .change_feed import ChangeFeedGapError, TaskChange, TaskSubscription
+
+# Export blob store for large file parts
+from .blob import BlobStore, FilesystemBlobStore
 
 # Export SQLAlchemy schema (tables, not models)
-from .schema import contexts_table, metadata, task_feedback_table, tasks_table
+from .schema import (
+    contexts_table,
+    metadata,
+    task_feedback_table,
+    task_messages_table,
+    tasks_table,
+)
 
 # Conditional import of PostgresStorage (requires SQLAlchemy)
 try:
@@ -55,18 +89,49 @@ try:
 except ImportError:
     PostgresStorage = None  # type: ignore[assignment]  # SQLAlchemy not installed
 
+# Conditional import of SQLiteStorage (requires aiosqlite)
+try:
+    from .sqlite_storage import SQLiteStorage
+except ImportError:
+    SQLiteStorage = None  # type: ignore[assignment]  # aiosqlite not installed
+
 __all__ = [
     # Base interface
     "Storage",
+    "DuplicateMessageError",
     # Storage implementations
     "InMemoryStorage",
     "PostgresStorage",
+    "SQLiteStorage",
+    "CachedStorage",
+    "TieredStorage",
+    # Change feed
+    "TaskChange",
+    "TaskSubscription",
+    "ChangeFeedGapError",
+    # Retention
+    "RetentionEngine",
+    "RetentionPolicy",
+    "RetentionResult",
+    # Compaction
+    "CompactionEngine",
+    "CompactionResult",
+    # Bulk transfer
+    "export_storage",
+    "import_storage",
+    "copy_storage",
+    "TransferResult",
     # Factory functions
     "create_storage",
     "close_storage",
+    "create_blob_store",
+    # Blob storage
+    "BlobStore",
+    "FilesystemBlobStore",
     # SQLAlchemy schema
     "metadata",
     "tasks_table",
+    "task_messages_table",
     "contexts_table",
     "task_feedback_table",
 ]
@@ -3,21 +3,71 @@
 from __future__ import annotations as _annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Generic
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from datetime import date, datetime
+from typing import Any, Generic, Literal
 from uuid import UUID
 
 from typing_extensions import TypeVar
 
 from bindu.common.protocol.types import (
     Artifact,
+    FeedbackGroupBy,
+    FeedbackSummary,
+    ListContextsResult,
+    ListTasksResult,
     Message,
     PushNotificationConfig,
     Task,
+    TaskProjection,
     TaskState,
 )
 
+from .change_feed import TaskSubscription
+from .helpers.feedback import summarize_rollups
+
 ContextT = TypeVar("ContextT", default=Any)
 
+# Record kinds moved by export_records()/import_records(), in dependency order
+RecordKind = Literal["contexts", "tasks", "feedback", "webhook_configs"]
+RECORD_KINDS: tuple[RecordKind, ...] = (
+    "contexts",
+    "tasks",
+    "feedback",
+    "webhook_configs",
+)
+
+# Field holding each kind's key; records are exported in ascending key order
+RECORD_KEYS: dict[RecordKind, str] = {
+    "contexts": "id",
+    "tasks": "id",
+    "feedback": "task_id",
+    "webhook_configs": "task_id",
+}
+
+
+class DuplicateMessageError(Exception):
+    """submit_task() got a message its task already holds.
+
+    Clients retry message/send on timeouts, so the same message (same
+    message_id) may arrive again after it was stored. It is not appended a
+    second time; the task is attached as it is now, for the caller to return
+    instead of running it again.
+    """
+
+    def __init__(self, task: Task, message_id: UUID):
+        """Initialize the error.
+
+        Args:
+            task: The task that already holds the message
+            message_id: The repeated message's ID
+        """
+        super().__init__(
+            f"Message {message_id} was already submitted to task {task['id']}"
+        )
+        self.task = task
+        self.message_id = message_id
+
 
 class Storage(ABC, Generic[ContextT]):
     """Abstract storage interface for A2A protocol task and context management.
@@ -43,28 +93,67 @@ class Storage(ABC, Generic[ContextT]):
 
     @abstractmethod
     async def load_task(
-        self, task_id: UUID, history_length: int | None = None
+        self,
+        task_id: UUID,
+        history_length: int | None = None,
+        projection: TaskProjection = "full",
     ) -> Task | None:
         """Load a task from storage.
 
         Args:
             task_id: Unique identifier of the task
             history_length: Optional limit on message history length
+            projection: Which fields to return - "full", "summary" (no
+                artifacts, history only if history_length is set) or "status"
 
         Returns:
             Task object if found, None otherwise
+
+        Raises:
+            ValueError: If projection is unknown
+        """
+
+    async def load_tasks_many(
+        self,
+        task_ids: Iterable[UUID],
+        history_length: int | None = None,
+        projection: TaskProjection = "full",
+    ) -> dict[UUID, Task]:
+        """Load several tasks at once.
+
+        Args:
+            task_ids: Task identifiers (duplicates are loaded once)
+            history_length: Optional limit on message history length per task
+            projection: Which fields to return (see load_task)
+
+        Returns:
+            Mapping of task ID to task for every task that exists; missing IDs
+            are omitted
         """
+        # Default implementation with one load per task - override in subclasses
+        tasks: dict[UUID, Task] = {}
+        for task_id in dict.fromkeys(task_ids):
+            task = await self.load_task(task_id, history_length, projection)
+            if task is not None:
+                tasks[task_id] = task
+        return tasks
 
     @abstractmethod
     async def submit_task(self, context_id: UUID, message: Message) -> Task:
         """Create and store a new task.
 
+        Submitting is idempotent per message: a message whose message_id the
+        task already holds is not appended again.
+
         Args:
             context_id: Context to associate the task with
             message: Initial message containing task request
 
         Returns:
             Newly created task in 'submitted' state
+
+        Raises:
+            DuplicateMessageError: If the task already holds the message
         """
 
     @abstractmethod
@@ -89,15 +178,137 @@ class Storage(ABC, Generic[ContextT]):
             Updated task object
         """
 
+    async def transition_task(
+        self,
+        task_id: UUID,
+        expected_states: Iterable[TaskState],
+        state: TaskState,
+        new_artifacts: list[Artifact] | None = None,
+        new_messages: list[Message] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> Task | None:
+        """Move a task to a new state only if it is currently in an expected state.
+
+        Compare-and-set counterpart of update_task(): the state check and the
+        update are applied together, so concurrent workers cannot both claim
+        the same task.
+
+        Args:
+            task_id: Task to transition
+            expected_states: States the task must currently be in
+            state: New task state
+            new_artifacts: Optional artifacts to append
+            new_messages: Optional messages to append to history
+            metadata: Optional metadata to update/merge with task metadata
+
+        Returns:
+            Updated task object, or None if the task does not exist or is not
+            in one of the expected states
+        """
+        # Default non-atomic implementation - override in subclasses
+        task = await self.load_task(task_id)
+        if task is None or task["status"]["state"] not in set(expected_states):
+            return None
+        return await self.update_task(
+            task_id,
+            state=state,
+            new_artifacts=new_artifacts,
+            new_messages=new_messages,
+            metadata=metadata,
+        )
+
     @abstractmethod
-    async def list_tasks(self, length: int | None = None) -> list[Task]:
+    async def list_tasks(
+        self,
+        length: int | None = None,
+        projection: TaskProjection = "full",
+        history_length: int | None = None,
+    ) -> list[Task]:
         """List all tasks in storage.
 
         Args:
             length: Optional limit on number of tasks to return (most recent)
+            projection: Which fields to return (see load_task)
+            history_length: Optional limit on message history length per task
 
         Returns:
             List of tasks
+
+        Raises:
+            ValueError: If projection is unknown
+        """
+
+    @abstractmethod
+    async def list_tasks_page(
+        self,
+        page_size: int | None = None,
+        page_token: str | None = None,
+        *,
+        projection: TaskProjection = "full",
+        history_length: int | None = None,
+        context_id: UUID | None = None,
+        states: Iterable[TaskState] | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> ListTasksResult:
+        """List one page of tasks, newest first, using a keyset cursor.
+
+        Pages are ordered by (created_at, id) descending. Passing a context_id
+        gives a paginated list_tasks_by_context.
+
+        Args:
+            page_size: Maximum tasks per page (default 50, capped at 1000)
+            page_token: Cursor from a previous page's next_page_token
+            projection: Which fields to return (see load_task)
+            history_length: Optional limit on message history length per task
+            context_id: Only return tasks in this context
+            states: Only return tasks in one of these states
+            created_after: Only return tasks created at or after this time
+            created_before: Only return tasks created before this time
+
+        Returns:
+            Page of tasks, with next_page_token set if more tasks may follow
+
+        Raises:
+            ValueError: If page_token or projection is invalid
+        """
+
+    @abstractmethod
+    async def search_tasks(
+        self,
+        query: str | None = None,
+        page_size: int | None = None,
+        page_token: str | None = None,
+        *,
+        metadata: dict[str, Any] | None = None,
+        projection: TaskProjection = "full",
+        history_length: int | None = None,
+        context_id: UUID | None = None,
+        states: Iterable[TaskState] | None = None,
+    ) -> ListTasksResult:
+        """Search tasks by message text and metadata, one ranked page at a time.
+
+        A task matches the query when one of its messages contains every word
+        of it. Matches are ordered by rank, then newest first; without a
+        query, tasks are only filtered by metadata and listed newest first.
+
+        Args:
+            query: Words to find in the text parts of the task's messages
+            page_size: Maximum tasks per page (default 50, capped at 1000)
+            page_token: Cursor from a previous search page's next_page_token
+            metadata: Only return tasks whose metadata contains this object
+                (JSONB ``@>`` semantics)
+            projection: Which fields to return (see load_task)
+            history_length: Optional limit on message history length per task
+            context_id: Only return tasks in this context
+            states: Only return tasks in one of these states
+
+        Returns:
+            Page of tasks, with next_page_token set if more tasks may follow
+
+        Raises:
+            ValueError: If neither query nor metadata is given, the query has
+                no words, or page_token or projection is invalid
         """
 
     async def count_tasks(self, status: str | None = None) -> int:
@@ -110,11 +321,24 @@ class Storage(ABC, Generic[ContextT]):
             Count of matching tasks
         """
         # Default inefficient implementation - override in subclasses
-        tasks = await self.list_tasks()
+        tasks = await self.list_tasks(projection="status")
         if status:
             return sum(1 for t in tasks if t["status"]["state"] == status)
         return len(tasks)
 
+    async def count_tasks_by_state(self) -> dict[str, int]:
+        """Count tasks in every state.
+
+        Returns:
+            Number of tasks per state; states without tasks are left out
+        """
+        # Default inefficient implementation - override in subclasses
+        counts: dict[str, int] = {}
+        for task in await self.list_tasks(projection="status"):
+            state = task["status"]["state"]
+            counts[state] = counts.get(state, 0) + 1
+        return counts
+
     @abstractmethod
     async def list_tasks_by_context(
         self, context_id: UUID, length: int | None = None
@@ -177,6 +401,30 @@ class Storage(ABC, Generic[ContextT]):
             List of context objects
         """
 
+    @abstractmethod
+    async def list_contexts_page(
+        self,
+        page_size: int | None = None,
+        page_token: str | None = None,
+        *,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> ListContextsResult:
+        """List one page of contexts, newest first, using a keyset cursor.
+
+        Args:
+            page_size: Maximum contexts per page (default 50, capped at 1000)
+            page_token: Cursor from a previous page's next_page_token
+            created_after: Only return contexts created at or after this time
+            created_before: Only return contexts created before this time
+
+        Returns:
+            Page of contexts, with next_page_token set if more may follow
+
+        Raises:
+            ValueError: If page_token is invalid
+        """
+
     # -------------------------------------------------------------------------
     # Utility Operations
     # -------------------------------------------------------------------------
@@ -198,6 +446,77 @@ class Storage(ABC, Generic[ContextT]):
         Warning: This is a destructive operation.
         """
 
+    @abstractmethod
+    async def purge_expired_tasks(
+        self,
+        cutoffs: Mapping[TaskState, datetime],
+        limit: int,
+        archive: Callable[[list[Task]], Awaitable[None]] | None = None,
+    ) -> int:
+        """Delete one batch of tasks that have been in their state too long.
+
+        A task is expired when its state has a cutoff and its status
+        timestamp is older than that cutoff; tasks in other states are kept.
+        Message history, feedback and webhook configs are deleted with the
+        task, and contexts left without tasks are deleted too.
+
+        Args:
+            cutoffs: Oldest status timestamp kept, per state
+            limit: Maximum number of tasks to delete
+            archive: Called with the full expired tasks before they are
+                deleted; if it raises, nothing is deleted
+
+        Returns:
+            Number of tasks deleted (0 once nothing is left to purge)
+
+        Warning: This is a destructive operation.
+        """
+
+    # -------------------------------------------------------------------------
+    # Bulk Transfer (Optional)
+    # -------------------------------------------------------------------------
+
+    async def export_records(
+        self, kind: RecordKind, after: str | None, limit: int
+    ) -> list[dict[str, Any]]:
+        """Read one batch of records for export, in ascending key order.
+
+        Records are backend-neutral dicts (see RECORD_KEYS for their keys):
+        - contexts: id, created_at, context_data, message_history
+        - tasks: the full Task plus created_at
+        - feedback: task_id and the task's feedback entries, oldest first
+        - webhook_configs: task_id and config
+
+        Args:
+            kind: Which records to read
+            after: Key of the last record of the previous batch (None to start)
+            limit: Maximum number of records
+
+        Returns:
+            Records with keys greater than ``after``; fewer than ``limit``
+            once the end is reached
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support export")
+
+    async def import_records(
+        self, kind: RecordKind, records: list[dict[str, Any]]
+    ) -> int:
+        """Insert exported records that are not stored yet.
+
+        Importing is idempotent: contexts and tasks that already exist are
+        left alone, and feedback and webhook configs are only added to
+        existing tasks that have none yet. Re-running an interrupted import
+        is therefore safe.
+
+        Args:
+            kind: Which records these are
+            records: Records as produced by export_records()
+
+        Returns:
+            Number of records inserted
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support import")
+
     # -------------------------------------------------------------------------
     # Feedback Operations (Optional)
     # -------------------------------------------------------------------------
@@ -229,6 +548,82 @@ class Storage(ABC, Generic[ContextT]):
         # Optional - override in subclass if feedback retrieval is needed
         return None
 
+    async def get_feedback_summary(
+        self,
+        *,
+        skill_id: str | None = None,
+        since: date | None = None,
+        until: date | None = None,
+        group_by: Iterable[FeedbackGroupBy] = (),
+    ) -> list[FeedbackSummary]:
+        """Summarize stored feedback per skill and UTC day.
+
+        Reads aggregates kept up to date as feedback is stored, not the
+        feedback entries, so the cost depends on the number of skills and
+        days, not on the amount of feedback. Entries stay counted after
+        their task is deleted. An entry's skill is its ``skill_id`` ("" if
+        none) and its rating counts if it is a whole number from 1 to 5.
+
+        Args:
+            skill_id: Only count feedback for this skill
+            since: First day to count
+            until: Last day to count, inclusive
+            group_by: Split the summary by "skill", "day" or both
+
+        Returns:
+            One summary per group, by skill then day; without group_by, a
+            single summary of everything matched
+
+        Raises:
+            ValueError: If group_by has an unknown field
+        """
+        # Optional - override in subclass along with store_task_feedback
+        return summarize_rollups((), group_by=group_by)
+
+    # -------------------------------------------------------------------------
+    # Change Notifications
+    # -------------------------------------------------------------------------
+
+    @abstractmethod
+    async def subscribe(
+        self, task_id: UUID | None = None, context_id: UUID | None = None
+    ) -> TaskSubscription:
+        """Subscribe to task changes.
+
+        Every change committed after this returns and matching the filter is
+        delivered, including changes made by other processes sharing the
+        backend. Subscribe before reading current state to avoid missing
+        changes in between.
+
+        Args:
+            task_id: Only deliver changes to this task
+            context_id: Only deliver changes to tasks in this context
+
+        Returns:
+            Async iterator of TaskChange events; close it with aclose() or
+            use it as an async context manager
+        """
+
+    async def watch_task_changes(
+        self, callback: Callable[[UUID | None], None]
+    ) -> Callable[[], Awaitable[None]] | None:
+        """Get notified when any process changes a task.
+
+        Used by caches to stay coherent across pods. The callback receives
+        the changed task's ID, or None when notifications may have been
+        missed (e.g. the listener connection dropped) and every cached task
+        should be treated as stale.
+
+        Args:
+            callback: Called from the event loop for each change
+
+        Returns:
+            Coroutine function that stops watching, or None if this backend
+            has no cross-process change feed
+        """
+        # Optional - override in subclasses shared by several processes
+        return None
+
     # -------------------------------------------------------------------------
     # Webhook Persistence Operations (for long-running tasks)
     # -------------------------------------------------------------------------
@@ -0,0 +1,25 @@
+"""Content-addressed blob storage for large file parts.
+
+Blobs are addressed by the SHA-256 digest of their content, which gives
+deduplication for free: identical payloads are stored once no matter how
+many tasks reference them.
+
+AVAILABLE BLOB STORES:
+- FilesystemBlobStore: Local directory, sharded by digest prefix
+"""
+
+from __future__ import annotations as _annotations
+
+from .base import BlobStore, compute_digest, is_valid_digest
+from .filesystem import FilesystemBlobStore
+from .offload import blob_uri, offload_messages, offload_parts
+
+__all__ = [
+    "BlobStore",
+    "FilesystemBlobStore",
+    "blob_uri",
+    "compute_digest",
+    "is_valid_digest",
+    "offload_messages",
+    "offload_parts",
+]
@@ -0,0 +1,96 @@
+"""Base interface for content-addressed blob storage."""
+
+from __future__ import annotations as _annotations
+
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def compute_digest(data: bytes) -> str:
+    """Compute the SHA-256 hex digest used as a blob's address.
+
+    Args:
+        data: Blob content
+
+    Returns:
+        Lowercase hex SHA-256 digest
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def is_valid_digest(digest: str) -> bool:
+    """Check that a string is a lowercase hex SHA-256 digest.
+
+    Args:
+        digest: Candidate digest (e.g. from a URL path)
+
+    Returns:
+        True if the digest is well-formed
+    """
+    return bool(_DIGEST_RE.match(digest))
+
+
+class BlobStore(ABC):
+    """Abstract content-addressed blob store.
+
+    Blobs are immutable and addressed by the SHA-256 digest of their
+    content, so storing the same payload twice is a no-op.
+    """
+
+    @abstractmethod
+    async def put(self, data: bytes) -> str:
+        """Store a blob, deduplicating identical content.
+
+        Args:
+            data: Blob content
+
+        Returns:
+            SHA-256 hex digest addressing the blob
+        """
+
+    @abstractmethod
+    async def size(self, digest: str) -> int | None:
+        """Get the size of a stored blob.
+
+        Args:
+            digest: Blob digest
+
+        Returns:
+            Size in bytes, or None if the blob does not exist
+        """
+
+    @abstractmethod
+    def iter_range(
+        self,
+        digest: str,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream a byte range of a blob.
+
+        Args:
+            digest: Blob digest
+            start: First byte offset (inclusive)
+            end: Last byte offset (inclusive), or None for end of blob
+            chunk_size: Maximum size of each yielded chunk
+
+        Returns:
+            Async iterator over the requested bytes
+        """
+
+    @abstractmethod
+    async def delete(self, digest: str) -> None:
+        """Delete a blob.
+
+        Args:
+            digest: Blob digest
+
+        Note: Should not raise if the blob doesn't exist.
+        """
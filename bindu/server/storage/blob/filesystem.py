@@ -0,0 +1,132 @@
+"""Local filesystem blob store.
+
+Blobs are written to ``<root>/<d[0:2]>/<d[2:4]>/<digest>`` through a temporary
+file and an atomic rename, so readers never observe partial content and
+concurrent writers of the same payload are harmless.
+"""
+
+from __future__ import annotations as _annotations
+
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import uuid4
+
+import aiofiles
+import aiofiles.os
+
+from bindu.utils.logging import get_logger
+
+from .base import DEFAULT_CHUNK_SIZE, BlobStore, compute_digest, is_valid_digest
+
+logger = get_logger("bindu.server.storage.blob.filesystem")
+
+
+class FilesystemBlobStore(BlobStore):
+    """Content-addressed blob store on the local filesystem."""
+
+    def __init__(self, root: str | Path):
+        """Initialize filesystem blob store.
+
+        Args:
+            root: Directory that holds the blobs (created on first write)
+        """
+        self.root = Path(root)
+
+    def _path(self, digest: str) -> Path:
+        """Resolve the on-disk path of a blob.
+
+        Raises:
+            ValueError: If digest is not a SHA-256 hex digest
+        """
+        if not is_valid_digest(digest):
+            raise ValueError(f"Invalid blob digest: {digest!r}")
+        return self.root / digest[0:2] / digest[2:4] / digest
+
+    async def put(self, data: bytes) -> str:
+        """Store a blob unless an identical one already exists.
+
+        Args:
+            data: Blob content
+
+        Returns:
+            SHA-256 hex digest addressing the blob
+        """
+        digest = compute_digest(data)
+        path = self._path(digest)
+
+        if await aiofiles.os.path.exists(path):
+            logger.debug(f"Blob {digest} already stored, skipping write")
+            return digest
+
+        await aiofiles.os.makedirs(path.parent, exist_ok=True)
+        tmp_path = path.with_name(f".{digest}.{uuid4().hex}.tmp")
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                await f.write(data)
+            await aiofiles.os.replace(tmp_path, path)
+        except BaseException:
+            if await aiofiles.os.path.exists(tmp_path):
+                await aiofiles.os.remove(tmp_path)
+            raise
+
+        logger.debug(f"Stored blob {digest} ({len(data)} bytes)")
+        return digest
+
+    async def size(self, digest: str) -> int | None:
+        """Get the size of a stored blob.
+
+        Args:
+            digest: Blob digest
+
+        Returns:
+            Size in bytes, or None if the blob does not exist
+        """
+        try:
+            stat = await aiofiles.os.stat(self._path(digest))
+        except FileNotFoundError:
+            return None
+        return stat.st_size
+
+    async def iter_range(
+        self,
+        digest: str,
+        start: int = 0,
+        end: int | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """Stream a byte range of a blob from disk.
+
+        Args:
+            digest: Blob digest
+            start: First byte offset (inclusive)
+            end: Last byte offset (inclusive), or None for end of blob
+            chunk_size: Maximum size of each yielded chunk
+
+        Yields:
+            Chunks of the requested range
+
+        Raises:
+            FileNotFoundError: If the blob does not exist
+        """
+        async with aiofiles.open(self._path(digest), "rb") as f:
+            await f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await f.read(size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    async def delete(self, digest: str) -> None:
+        """Delete a blob if it exists.
+
+        Args:
+            digest: Blob digest
+        """
+        try:
+            await aiofiles.os.remove(self._path(digest))
+        except FileNotFoundError:
+            pass
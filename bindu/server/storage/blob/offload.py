@@ -0,0 +1,113 @@
+"""Offload large inline file parts to a blob store.
+
+Base64 file bytes embedded in messages and artifacts are persisted with the
+task (in task history and artifacts), so a single large attachment is
+rewritten and re-read on every load. Parts at or above the configured size
+threshold are moved to the blob store and replaced with a ``FileWithUri``
+pointing at the ``/blobs/{digest}`` download endpoint.
+"""
+
+from __future__ import annotations as _annotations
+
+import base64
+import binascii
+from typing import Any, Iterable
+
+from bindu.utils.logging import get_logger
+
+from .base import BlobStore
+
+logger = get_logger("bindu.server.storage.blob.offload")
+
+BLOB_ROUTE_PREFIX = "/blobs"
+
+
+def blob_uri(base_url: str, digest: str) -> str:
+    """Build the download URI for a blob.
+
+    Args:
+        base_url: Public base URL of the agent (e.g. manifest.url)
+        digest: Blob digest
+
+    Returns:
+        Absolute URI of the blob download endpoint
+    """
+    return f"{base_url.rstrip('/')}{BLOB_ROUTE_PREFIX}/{digest}"
+
+
+async def offload_parts(
+    parts: Iterable[dict[str, Any]],
+    blob_store: BlobStore,
+    base_url: str,
+    threshold_bytes: int,
+) -> int:
+    """Replace large inline file parts with blob URIs, in place.
+
+    Args:
+        parts: Message or artifact parts
+        blob_store: Destination blob store
+        base_url: Public base URL used to build blob URIs
+        threshold_bytes: Minimum decoded size for a part to be offloaded
+
+    Returns:
+        Number of parts offloaded
+    """
+    offloaded = 0
+    for part in parts:
+        if not isinstance(part, dict) or part.get("kind") != "file":
+            continue
+        file = part.get("file")
+        if not isinstance(file, dict) or not isinstance(file.get("bytes"), str):
+            continue
+
+        # Cheap upper bound on decoded size before decoding anything
+        encoded = file["bytes"]
+        if len(encoded) * 3 // 4 < threshold_bytes:
+            continue
+
+        try:
+            data = base64.b64decode(encoded, validate=True)
+        except (binascii.Error, ValueError):
+            logger.warning("File part has invalid base64 content, keeping inline")
+            continue
+
+        if len(data) < threshold_bytes:
+            continue
+
+        digest = await blob_store.put(data)
+        new_file = {k: v for k, v in file.items() if k != "bytes"}
+        new_file["uri"] = blob_uri(base_url, digest)
+        part["file"] = new_file
+        offloaded += 1
+        logger.debug(f"Offloaded {len(data)} byte file part to blob {digest}")
+
+    return offloaded
+
+
+async def offload_messages(
+    messages: Iterable[dict[str, Any]],
+    blob_store: BlobStore,
+    base_url: str,
+    threshold_bytes: int,
+) -> int:
+    """Offload large file parts of messages or artifacts, in place.
+
+    Works for any items with a ``parts`` list, i.e. both Message and Artifact.
+
+    Args:
+        messages: Messages or artifacts
+        blob_store: Destination blob store
+        base_url: Public base URL used to build blob URIs
+        threshold_bytes: Minimum decoded size for a part to be offloaded
+
+    Returns:
+        Number of parts offloaded
+    """
+    offloaded = 0
+    for item in messages:
+        parts = item.get("parts") if isinstance(item, dict) else None
+        if parts:
+            offloaded += await offload_parts(
+                parts, blob_store, base_url, threshold_bytes
+            )
+    return offloaded
@@ -0,0 +1,562 @@
+"""Read-through task cache in front of any storage backend.
+
+``tasks/get`` polling is the highest-volume read, and with PostgreSQL every
+poll is a database round trip. CachedStorage keeps recently read tasks in a
+bounded, in-process LRU with a TTL and serves load_task() from it.
+
+Coherence:
+- Writes made through this process invalidate the task immediately, so a
+  caller always reads its own writes.
+- Writes made by other processes arrive through the backend's change feed
+  (Storage.watch_task_changes; LISTEN/NOTIFY for PostgreSQL) and invalidate
+  the task on every pod.
+- A load that races with an invalidation is returned but not cached.
+- If the change feed drops, the cache is emptied and reads bypass it until
+  the feed is re-established. The TTL bounds staleness in any case.
+
+Hit/miss and eviction counts are exported on /metrics.
+"""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+
+from typing_extensions import TypeVar
+
+from bindu.common.protocol.types import (
+    Artifact,
+    FeedbackGroupBy,
+    FeedbackSummary,
+    ListContextsResult,
+    ListTasksResult,
+    Message,
+    PushNotificationConfig,
+    Task,
+    TaskProjection,
+    TaskState,
+)
+from bindu.server.metrics import get_metrics
+from bindu.utils.logging import get_logger
+
+from .base import RecordKind, Storage
+from .change_feed import TaskSubscription
+from .helpers import project_task, validate_projection
+
+logger = get_logger("bindu.server.storage.cache")
+
+ContextT = TypeVar("ContextT", default=Any)
+
+# Delay before re-establishing a dropped change feed, doubled up to the max
+_REWATCH_MIN_DELAY = 1.0
+_REWATCH_MAX_DELAY = 30.0
+
+
+def _is_full_load(projection: TaskProjection, history_length: int | None) -> bool:
+    return projection == "full" and history_length is None
+
+
+class CachedStorage(Storage[ContextT]):
+    """Storage wrapper caching full tasks for load_task() and load_tasks_many().
+
+    Full tasks are cached once per task ID; every projection and
+    history_length is served from that entry, but only full loads fill it.
+    All other operations are delegated to the wrapped storage.
+    """
+
+    def __init__(
+        self,
+        storage: Storage[ContextT],
+        max_entries: int = 10_000,
+        ttl_seconds: float = 30.0,
+    ):
+        """Initialize the cache.
+
+        Args:
+            storage: Backend to read through to
+            max_entries: Maximum number of cached tasks (least recently used
+                entries are evicted first)
+            ttl_seconds: How long an entry may be served before reloading
+        """
+        self.storage = storage
+        self.max_entries = max(max_entries, 1)
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: OrderedDict[UUID, tuple[float, Task]] = OrderedDict()
+        # Tokens of in-flight loads per task; invalidation drops them so a
+        # load that raced with a write does not cache what it read
+        self._loads: dict[UUID, set[object]] = {}
+
+        self._unwatch: Callable[[], Awaitable[None]] | None = None
+        self._rewatch_task: asyncio.Task[None] | None = None
+        # False while a change feed that should exist is down
+        self._coherent = True
+
+    def __getattr__(self, name: str) -> Any:
+        """Expose backend-specific attributes of the wrapped storage."""
+        if name == "storage":
+            raise AttributeError(name)
+        return getattr(self.storage, name)
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Subscribe to the backend's change feed, if it has one."""
+        self._unwatch = await self.storage.watch_task_changes(self._on_task_change)
+
+    async def stop(self) -> None:
+        """Stop watching for changes and drop all entries."""
+        if self._rewatch_task is not None:
+            self._rewatch_task.cancel()
+            self._rewatch_task = None
+        if self._unwatch is not None:
+            unwatch, self._unwatch = self._unwatch, None
+            await unwatch()
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop every cached task."""
+        if self._entries:
+            get_metrics().record_task_cache_eviction("invalidated", len(self._entries))
+        self._entries.clear()
+        self._loads.clear()
+
+    def invalidate(self, task_id: UUID) -> None:
+        """Drop one task from the cache.
+
+        Args:
+            task_id: Task that changed
+        """
+        self._loads.pop(task_id, None)
+        if self._entries.pop(task_id, None) is not None:
+            get_metrics().record_task_cache_eviction("invalidated")
+
+    def _on_task_change(self, task_id: UUID | None) -> None:
+        if task_id is not None:
+            self.invalidate(task_id)
+            return
+
+        # Change feed lost: nothing cached can be trusted until it is back
+        self._coherent = False
+        self.clear()
+        if self._rewatch_task is None or self._rewatch_task.done():
+            self._rewatch_task = asyncio.get_running_loop().create_task(
+                self._rewatch()
+            )
+
+    async def _rewatch(self) -> None:
+        delay = _REWATCH_MIN_DELAY
+        while True:
+            try:
+                if self._unwatch is not None:
+                    unwatch, self._unwatch = self._unwatch, None
+                    await unwatch()
+                self._unwatch = await self.storage.watch_task_changes(
+                    self._on_task_change
+                )
+                # Anything cached while the feed was down may have been missed
+                self.clear()
+                self._coherent = True
+                logger.info("Task cache change feed re-established")
+                return
+            except Exception as e:
+                logger.warning(f"Task cache change feed unavailable: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _REWATCH_MAX_DELAY)
+
+    # -------------------------------------------------------------------------
+    # Cache internals
+    # -------------------------------------------------------------------------
+
+    def _get(self, task_id: UUID) -> Task | None:
+        entry = self._entries.get(task_id)
+        if entry is None:
+            return None
+
+        expires_at, task = entry
+        if expires_at <= time.monotonic():
+            del self._entries[task_id]
+            get_metrics().record_task_cache_eviction("expired")
+            return None
+
+        self._entries.move_to_end(task_id)
+        return task
+
+    def _begin_load(self, task_id: UUID) -> object:
+        token = object()
+        self._loads.setdefault(task_id, set()).add(token)
+        return token
+
+    def _end_load(self, task_id: UUID, token: object, task: Task | None) -> None:
+        tokens = self._loads.get(task_id)
+        fresh = tokens is not None and token in tokens
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._loads[task_id]
+
+        if task is None or not fresh or not self._coherent:
+            return
+
+        self._store(task_id, task)
+
+    def _store(self, task_id: UUID, task: Task) -> None:
+        self._put(task_id, task, time.monotonic() + self.ttl_seconds)
+
+    def _put(self, task_id: UUID, task: Task, expires_at: float) -> None:
+        """Cache a task until the monotonic time expires_at."""
+        self._entries[task_id] = (expires_at, task)
+        self._entries.move_to_end(task_id)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            get_metrics().record_task_cache_eviction("capacity")
+
+    # -------------------------------------------------------------------------
+    # Cached reads
+    # -------------------------------------------------------------------------
+
+    async def load_task(
+        self,
+        task_id: UUID,
+        history_length: int | None = None,
+        projection: TaskProjection = "full",
+    ) -> Task | None:
+        """Load a task, serving it from the cache when possible.
+
+        Misses are only cached for full loads; others are passed to the
+        backend as is, so a status poll never reads the whole history.
+
+        Args:
+            task_id: Unique identifier of the task
+            history_length: Optional limit on message history length
+            projection: Which fields to return ("full", "summary" or "status")
+
+        Returns:
+            Task copy if found, None otherwise
+        """
+        projection = validate_projection(projection)
+
+        task = self._get(task_id)
+        get_metrics().record_task_cache_lookup(task is not None)
+        if task is None:
+            if not _is_full_load(projection, history_length):
+                return await self.storage.load_task(task_id, history_length, projection)
+            token = self._begin_load(task_id)
+            try:
+                task = await self.storage.load_task(task_id)
+            finally:
+                self._end_load(task_id, token, task)
+            if task is None:
+                return None
+
+        # Always return a copy so callers cannot mutate the cached entry
+        return project_task(task, projection, history_length)
+
+    async def load_tasks_many(
+        self,
+        task_ids: Iterable[UUID],
+        history_length: int | None = None,
+        projection: TaskProjection = "full",
+    ) -> dict[UUID, Task]:
+        """Load several tasks, fetching only the cache misses from the backend.
+
+        As with load_task(), misses are only cached for full loads.
+
+        Args:
+            task_ids: Task identifiers (duplicates are loaded once)
+            history_length: Optional limit on message history length per task
+            projection: Which fields to return ("full", "summary" or "status")
+
+        Returns:
+            Mapping of task ID to task copy for every task that exists
+        """
+        projection = validate_projection(projection)
+        metrics = get_metrics()
+
+        found: dict[UUID, Task] = {}
+        missing: list[UUID] = []
+        for task_id in dict.fromkeys(task_ids):
+            task = self._get(task_id)
+            metrics.record_task_cache_lookup(task is not None)
+            if task is None:
+                missing.append(task_id)
+            else:
+                found[task_id] = task
+
+        projected: dict[UUID, Task] = {}
+        if missing and not _is_full_load(projection, history_length):
+            projected = await self.storage.load_tasks_many(
+                missing, history_length, projection
+            )
+        elif missing:
+            tokens = {task_id: self._begin_load(task_id) for task_id in missing}
+            loaded: dict[UUID, Task] = {}
+            try:
+                loaded = await self.storage.load_tasks_many(missing)
+            finally:
+                for task_id, token in tokens.items():
+                    self._end_load(task_id, token, loaded.get(task_id))
+            found.update(loaded)
+
+        tasks = {
+            task_id: project_task(task, projection, history_length)
+            for task_id, task in found.items()
+        }
+        tasks.update(projected)
+        return tasks
+
+    # -------------------------------------------------------------------------
+    # Writes (delegated, then invalidated)
+    # -------------------------------------------------------------------------
+
+    async def submit_task(self, context_id: UUID, message: Message) -> Task:
+        """Create or continue a task and invalidate its cache entry."""
+        task = await self.storage.submit_task(context_id, message)
+        self.invalidate(task["id"])
+        return task
+
+    async def update_task(
+        self,
+        task_id: UUID,
+        state: TaskState,
+        new_artifacts: list[Artifact] | None = None,
+        new_messages: list[Message] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> Task:
+        """Update a task and invalidate its cache entry."""
+        try:
+            return await self.storage.update_task(
+                task_id, state, new_artifacts, new_messages, metadata
+            )
+        finally:
+            self.invalidate(task_id)
+
+    async def transition_task(
+        self,
+        task_id: UUID,
+        expected_states: Iterable[TaskState],
+        state: TaskState,
+        new_artifacts: list[Artifact] | None = None,
+        new_messages: list[Message] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> Task | None:
+        """Transition a task and invalidate its cache entry."""
+        try:
+            return await self.storage.transition_task(
+                task_id, expected_states, state, new_artifacts, new_messages, metadata
+            )
+        finally:
+            self.invalidate(task_id)
+
+    async def clear_context(self, context_id: UUID) -> None:
+        """Clear a context's tasks and drop the whole cache."""
+        try:
+            await self.storage.clear_context(context_id)
+        finally:
+            self.clear()
+
+    async def clear_all(self) -> None:
+        """Clear the backend and drop the whole cache."""
+        try:
+            await self.storage.clear_all()
+        finally:
+            self.clear()
+
+    async def purge_expired_tasks(
+        self,
+        cutoffs: Mapping[TaskState, datetime],
+        limit: int,
+        archive: Callable[[list[Task]], Awaitable[None]] | None = None,
+    ) -> int:
+        """Purge expired tasks and drop the whole cache."""
+        try:
+            return await self.storage.purge_expired_tasks(cutoffs, limit, archive)
+        finally:
+            self.clear()
+
+    async def import_records(
+        self, kind: RecordKind, records: list[dict[str, Any]]
+    ) -> int:
+        """Import records and drop the whole cache."""
+        try:
+            return await self.storage.import_records(kind, records)
+        finally:
+            self.clear()
+
+    async def store_task_feedback(
+        self, task_id: UUID, feedback_data: dict[str, Any]
+    ) -> None:
+        """Store feedback and invalidate the task's cache entry."""
+        try:
+            await self.storage.store_task_feedback(task_id, feedback_data)
+        finally:
+            self.invalidate(task_id)
+
+    # -------------------------------------------------------------------------
+    # Pass-through operations
+    # -------------------------------------------------------------------------
+
+    async def list_tasks(
+        self,
+        length: int | None = None,
+        projection: TaskProjection = "full",
+        history_length: int | None = None,
+    ) -> list[Task]:
+        """Delegate to the wrapped storage."""
+        return await self.storage.list_tasks(length, projection, history_length)
+
+    async def list_tasks_page(
+        self,
+        page_size: int | None = None,
+        page_token: str | None = None,
+        *,
+        projection: TaskProjection = "full",
+        history_length: int | None = None,
+        context_id: UUID | None = None,
+        states: list[TaskState] | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> ListTasksResult:
+        """Delegate to the wrapped storage."""
+        return await self.storage.list_tasks_page(
+            page_size,
+            page_token,
+            projection=projection,
+            history_length=history_length,
+            context_id=context_id,
+            states=states,
+            created_after=created_after,
+            created_before=created_before,
+        )
+
+    async def search_tasks(
+        self,
+        query: str | None = None,
+        page_size: int | None = None,
+        page_token: str | None = None,
+        *,
+        metadata: dict[str, Any] | None = None,
+        projection: TaskProjection = "full",
+        history_length: int | None = None,
+        context_id: UUID | None = None,
+        states: list[TaskState] | None = None,
+    ) -> ListTasksResult:
+        """Delegate to the wrapped storage."""
+        return await self.storage.search_tasks(
+            query,
+            page_size,
+            page_token,
+            metadata=metadata,
+            projection=projection,
+            history_length=history_length,
+            context_id=context_id,
+            states=states,
+        )
+
+    async def export_records(
+        self, kind: RecordKind, after: str | None, limit: int
+    ) -> list[dict[str, Any]]:
+        """Delegate to the wrapped storage."""
+        return await self.storage.export_records(kind, after, limit)
+
+    async def count_tasks(self, status: str | None = None) -> int:
+        """Delegate to the wrapped storage."""
+        return await self.storage.count_tasks(status)
+
+    async def count_tasks_by_state(self) -> dict[str, int]:
+        """Delegate to the wrapped storage."""
+        return await self.storage.count_tasks_by_state()
+
+    async def list_tasks_by_context(
+        self, context_id: UUID, length: int | None = None
+    ) -> list[Task]:
+        """Delegate to the wrapped storage."""
+        return await self.storage.list_tasks_by_context(context_id, length)
+
+    async def load_context(self, context_id: UUID) -> ContextT | None:
+        """Delegate to the wrapped storage."""
+        return await self.storage.load_context(context_id)
+
+    async def append_to_contexts(
+        self, context_id: UUID, messages: list[Message]
+    ) -> None:
+        """Delegate to the wrapped storage."""
+        await self.storage.append_to_contexts(context_id, messages)
+
+    async def update_context(self, context_id: UUID, context: ContextT) -> None:
+        """Delegate to the wrapped storage."""
+        await self.storage.update_context(context_id, context)
+
+    async def list_contexts(self, length: int | None = None) -> list[dict]:
+        """Delegate to the wrapped storage."""
+        return await self.storage.list_contexts(length)
+
+    async def list_contexts_page(
+        self,
+        page_size: int | None = None,
+        page_token: str | None = None,
+        *,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> ListContextsResult:
+        """Delegate to the wrapped storage."""
+        return await self.storage.list_contexts_page(
+            page_size,
+            page_token,
+            created_after=created_after,
+            created_before=created_before,
+        )
+
+    async def get_task_feedback(self, task_id: UUID) -> list[dict[str, Any]] | None:
+        """Delegate to the wrapped storage."""
+        return await self.storage.get_task_feedback(task_id)
+
+    async def get_feedback_summary(
+        self,
+        *,
+        skill_id: str | None = None,
+        since: date | None = None,
+        until: date | None = None,
+        group_by: Iterable[FeedbackGroupBy] = (),
+    ) -> list[FeedbackSummary]:
+        """Delegate to the wrapped storage."""
+        return await self.storage.get_feedback_summary(
+            skill_id=skill_id, since=since, until=until, group_by=group_by
+        )
+
+    async def subscribe(
+        self, task_id: UUID | None = None, context_id: UUID | None = None
+    ) -> TaskSubscription:
+        """Delegate to the wrapped storage."""
+        return await self.storage.subscribe(task_id, context_id)
+
+    async def watch_task_changes(
+        self, callback: Callable[[UUID | None], None]
+    ) -> Callable[[], Awaitable[None]] | None:
+        """Delegate to the wrapped storage."""
+        return await self.storage.watch_task_changes(callback)
+
+    async def save_webhook_config(
+        self, task_id: UUID, config: PushNotificationConfig
+    ) -> None:
+        """Delegate to the wrapped storage."""
+        await self.storage.save_webhook_config(task_id, config)
+
+    async def load_webhook_config(self, task_id: UUID) -> PushNotificationConfig | None:
+        """Delegate to the wrapped storage."""
+        return await self.storage.load_webhook_config(task_id)
+
+    async def delete_webhook_config(self, task_id: UUID) -> None:
+        """Delegate to the wrapped storage."""
+        await self.storage.delete_webhook_config(task_id)
+
+    async def load_all_webhook_configs(self) -> dict[UUID, PushNotificationConfig]:
+        """Delegate to the wrapped storage."""
+        return await self.storage.load_all_webhook_configs()
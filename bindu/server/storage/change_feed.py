@@ -0,0 +1,233 @@
+"""In-process fan-out of task change events.
+
+Storage backends publish a TaskChange whenever a task is created, updated or
+deleted. InMemoryStorage publishes directly from its write methods.
+PostgresStorage publishes what it receives from the tasks NOTIFY trigger, so
+subscribers on every pod see changes made anywhere.
+
+Consumers use Storage.subscribe(), which returns a TaskSubscription:
+
+    subscription = await storage.subscribe(task_id=task_id)
+    task = await storage.load_task(task_id)  # nothing is missed after subscribe
+    async with subscription:
+        async for change in subscription:
+            ...
+
+A subscription raises ChangeFeedGapError when changes may have been lost
+(the listener connection dropped or the consumer fell too far behind). The
+consumer should then re-read current state and subscribe again.
+"""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Literal
+from uuid import UUID
+
+from bindu.common.protocol.types import TaskState
+from bindu.utils.logging import get_logger
+
+logger = get_logger("bindu.server.storage.change_feed")
+
+TaskChangeOperation = Literal["insert", "update", "delete"]
+
+# Events buffered per subscription before it is considered to have fallen behind
+DEFAULT_MAX_PENDING = 1000
+
+
+class ChangeFeedGapError(Exception):
+    """Raised by a subscription when task changes may have been missed."""
+
+
+@dataclass(frozen=True)
+class TaskChange:
+    """A committed change to one task."""
+
+    task_id: UUID
+    context_id: UUID | None
+    state: TaskState | None
+    operation: TaskChangeOperation
+
+
+class TaskSubscription:
+    """Async iterator over task changes matching a task or context filter.
+
+    Also an async context manager that closes the subscription on exit.
+    """
+
+    def __init__(
+        self,
+        task_id: UUID | None,
+        context_id: UUID | None,
+        on_close: Callable[[TaskSubscription], Awaitable[None]],
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ):
+        """Initialize a subscription (use Storage.subscribe() instead).
+
+        Args:
+            task_id: Only deliver changes to this task
+            context_id: Only deliver changes to tasks in this context
+            on_close: Called once when the subscription is closed
+            max_pending: Undelivered events kept before reporting a gap
+        """
+        self.task_id = task_id
+        self.context_id = context_id
+        self._on_close = on_close
+        self._max_pending = max_pending
+
+        self._pending: deque[TaskChange] = deque()
+        self._ready = asyncio.Event()
+        self._gap = False
+        self._closed = False
+
+    def matches(self, change: TaskChange) -> bool:
+        """Whether a change passes this subscription's filter."""
+        if self.task_id is not None and change.task_id != self.task_id:
+            return False
+        if self.context_id is not None and change.context_id != self.context_id:
+            return False
+        return True
+
+    def push(self, change: TaskChange) -> None:
+        """Queue a change for delivery (called by the feed)."""
+        if self._closed or self._gap:
+            return
+        if len(self._pending) >= self._max_pending:
+            logger.warning("Task change subscriber fell behind; reporting a gap")
+            self._gap = True
+        else:
+            self._pending.append(change)
+        self._ready.set()
+
+    def interrupt(self) -> None:
+        """Report that changes may have been missed (called by the feed)."""
+        self._gap = True
+        self._ready.set()
+
+    def __aiter__(self) -> TaskSubscription:
+        """Return the subscription itself."""
+        return self
+
+    async def __anext__(self) -> TaskChange:
+        """Wait for the next matching change.
+
+        Raises:
+            ChangeFeedGapError: If changes may have been missed
+            StopAsyncIteration: Once the subscription is closed
+        """
+        while True:
+            if self._pending:
+                return self._pending.popleft()
+            if self._closed:
+                raise StopAsyncIteration
+            if self._gap:
+                raise ChangeFeedGapError("Task changes may have been missed")
+            self._ready.clear()
+            await self._ready.wait()
+
+    async def aclose(self) -> None:
+        """Stop receiving changes; pending events are discarded."""
+        if self._closed:
+            return
+        self._closed = True
+        self._pending.clear()
+        self._ready.set()
+        await self._on_close(self)
+
+    async def __aenter__(self) -> TaskSubscription:
+        """Enter the context; the subscription is already active."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the subscription."""
+        await self.aclose()
+
+
+class TaskChangeFeed:
+    """Fan out task changes to subscriptions and callbacks in this process."""
+
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING):
+        """Initialize the feed.
+
+        Args:
+            max_pending: Undelivered events kept per subscription
+        """
+        self.max_pending = max_pending
+        self._subscriptions: set[TaskSubscription] = set()
+        self._callbacks: list[Callable[[TaskChange | None], None]] = []
+
+    @property
+    def has_consumers(self) -> bool:
+        """Whether any subscription or callback is registered."""
+        return bool(self._subscriptions or self._callbacks)
+
+    def subscribe(
+        self,
+        task_id: UUID | None = None,
+        context_id: UUID | None = None,
+        on_close: Callable[[TaskSubscription], Awaitable[None]] | None = None,
+    ) -> TaskSubscription:
+        """Register a subscription for changes matching the filter.
+
+        Args:
+            task_id: Only deliver changes to this task
+            context_id: Only deliver changes to tasks in this context
+            on_close: Extra cleanup to run after the subscription is removed
+
+        Returns:
+            Active subscription
+        """
+
+        async def _close(subscription: TaskSubscription) -> None:
+            self._subscriptions.discard(subscription)
+            if on_close is not None:
+                await on_close(subscription)
+
+        subscription = TaskSubscription(
+            task_id, context_id, _close, max_pending=self.max_pending
+        )
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def add_callback(
+        self, callback: Callable[[TaskChange | None], None]
+    ) -> Callable[[], None]:
+        """Register a callback for every change (None signals a gap).
+
+        Args:
+            callback: Called synchronously for each change
+
+        Returns:
+            Function that removes the callback
+        """
+        self._callbacks.append(callback)
+
+        def _remove() -> None:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+        return _remove
+
+    def publish(self, change: TaskChange) -> None:
+        """Deliver a change to every matching consumer."""
+        for subscription in list(self._subscriptions):
+            if subscription.matches(change):
+                subscription.push(change)
+        for callback in list(self._callbacks):
+            try:
+                callback(change)
+            except Exception as e:
+                logger.error(f"Task change callback failed: {e}")
+
+    def interrupt(self) -> None:
+        """Tell every consumer that changes may have been missed."""
+        for subscription in list(self._subscriptions):
+            subscription.interrupt()
+        for callback in list(self._callbacks):
+            try:
+                callback(None)
+            except Exception as e:
+                logger.error(f"Task change callback failed: {e}")
@@ -0,0 +1,171 @@
+"""Group-commit coalescing for small, frequent storage writes.
+
+Under burst load many workers update task status at the same time, and each
+update otherwise pays for its own session, statement and commit. The
+coalescer gathers writes that arrive within a short window and hands them to
+a flush function as one batch, so the storage backend can apply them with a
+single multi-row statement and a single commit.
+
+Guarantees:
+- A caller's ``submit()`` returns only after the batch containing its write
+  has been flushed (committed); flush errors are raised to every caller in
+  the batch.
+- Batches are flushed one at a time, in submission order, so writes for the
+  same key are applied in the order they were submitted.
+- ``wait_for(key)`` lets writes that bypass the coalescer wait for pending
+  writes to the same key first.
+"""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from typing import Any, Generic
+
+from typing_extensions import TypeVar
+
+from bindu.utils.logging import get_logger
+
+logger = get_logger("bindu.server.storage.coalescer")
+
+ItemT = TypeVar("ItemT")
+ResultT = TypeVar("ResultT")
+
+# Flush callback: receives the batch in submission order and returns one
+# result per item; an exception instance fails only that item's caller
+FlushFunc = Callable[[list[ItemT]], Awaitable[Sequence[Any]]]
+
+
+class WriteCoalescer(Generic[ItemT, ResultT]):
+    """Batch writes arriving within a short window into one flush.
+
+    A batch is flushed when the window elapses after its first write or as
+    soon as it reaches ``max_batch`` items, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        flush: FlushFunc[ItemT],
+        window_ms: float = 2.0,
+        max_batch: int = 500,
+    ):
+        """Initialize the coalescer.
+
+        Args:
+            flush: Coroutine applying a batch of writes in one transaction
+            window_ms: How long to gather writes before flushing, in milliseconds
+            max_batch: Flush immediately once this many writes are pending
+        """
+        self._flush = flush
+        self.window = max(window_ms, 0.0) / 1000
+        self.max_batch = max(max_batch, 1)
+
+        self._pending: list[tuple[Hashable, ItemT, asyncio.Future[ResultT]]] = []
+        self._last_by_key: dict[Hashable, asyncio.Future[ResultT]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_lock = asyncio.Lock()
+        self._inflight: set[asyncio.Task[None]] = set()
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """Number of writes waiting for the next flush."""
+        return len(self._pending)
+
+    async def submit(self, key: Hashable, item: ItemT) -> ResultT:
+        """Queue a write and wait until it has been flushed.
+
+        Args:
+            key: Ordering key (e.g. task ID); writes with the same key are
+                applied in submission order
+            item: Write to hand to the flush function
+
+        Returns:
+            Result produced by the flush function for this write
+
+        Raises:
+            RuntimeError: If the coalescer has been closed
+            Exception: Whatever the flush raised for this write or its batch
+        """
+        if self._closed:
+            raise RuntimeError("Write coalescer is closed")
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[ResultT] = loop.create_future()
+        self._pending.append((key, item, future))
+        self._last_by_key[key] = future
+        future.add_done_callback(lambda f: self._forget(key, f))
+
+        if len(self._pending) >= self.max_batch:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._start_flush)
+
+        # Shield so a cancelled caller does not drop the write from its batch
+        return await asyncio.shield(future)
+
+    async def wait_for(self, key: Hashable) -> None:
+        """Wait until every write queued so far for ``key`` has been flushed.
+
+        Errors from those writes are not raised here; they belong to the
+        callers that submitted them.
+
+        Args:
+            key: Ordering key to wait for
+        """
+        future = self._last_by_key.get(key)
+        if future is not None and not future.done():
+            await asyncio.wait([future])
+
+    async def close(self) -> None:
+        """Flush pending writes and stop accepting new ones."""
+        self._closed = True
+        if self._pending:
+            self._start_flush()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    def _forget(self, key: Hashable, future: asyncio.Future[ResultT]) -> None:
+        if self._last_by_key.get(key) is future:
+            del self._last_by_key[key]
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._flush_batch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _flush_batch(
+        self, batch: list[tuple[Hashable, ItemT, asyncio.Future[ResultT]]]
+    ) -> None:
+        # asyncio.Lock wakes waiters in FIFO order, so batches commit in the
+        # order they were cut and per-key ordering holds across batches
+        async with self._flush_lock:
+            try:
+                results = await self._flush([item for _, item, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"Flush returned {len(results)} results for "
+                        f"{len(batch)} writes"
+                    )
+            except Exception as e:
+                logger.error(f"Coalesced flush of {len(batch)} writes failed: {e}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            logger.debug(f"Flushed {len(batch)} coalesced writes")
+            for (_, _, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
@@ -0,0 +1,314 @@
+"""Compaction of finished tasks into zstd-compressed payloads.
+
+Terminal tasks keep their full message history and artifacts forever, and
+PostgreSQL's TOAST compression (pglz by default) does little for many small,
+similar JSON documents. Compaction moves the history and artifacts of tasks
+that have been terminal for longer than ``storage.compression_after_days``
+into ``tasks.compressed_payload``: one zstd frame per task holding
+``{"history": [...], "artifacts": [...]}``. The task's task_messages rows are
+deleted; id, state, timestamps and metadata stay in their columns, so
+listing, filtering and counting are unaffected.
+
+Frames are compressed with a dictionary trained on finished tasks and shared
+by every task in the schema (task_compression_dictionaries). The dictionary
+ID is written into each frame header, so readers pick the right dictionary
+and frames written before any dictionary existed still decode.
+
+Reads decompress transparently. The compaction job runs in the app lifespan
+when ``storage.compression_enabled`` is set, and on demand via
+``bindu storage compact``. PostgreSQL only; needs the ``compression`` extra
+(zstandard).
+"""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from bindu.common.protocol.types import Task
+from bindu.server.metrics import get_metrics
+from bindu.settings import app_settings
+from bindu.utils.logging import get_logger
+
+from .base import Storage
+from .helpers.serialization import dumps_jsonb_bytes, loads_jsonb
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None  # type: ignore[assignment]
+    ZSTD_AVAILABLE = False
+
+logger = get_logger("bindu.server.storage.compression")
+
+# Fewer samples than this rarely train a useful dictionary (and zstd may
+# refuse to); payloads are compressed without one until there are enough
+MIN_TRAINING_SAMPLES = 64
+
+
+class UnknownCompressionDictionary(Exception):
+    """A payload was compressed with a dictionary this process has not loaded."""
+
+    def __init__(self, dictionary_id: int):
+        """Initialize the error.
+
+        Args:
+            dictionary_id: Dictionary ID from the frame header
+        """
+        super().__init__(f"Unknown compression dictionary {dictionary_id}")
+        self.dictionary_id = dictionary_id
+
+
+@dataclass
+class CompactionResult:
+    """Outcome of compacting one or more batches of tasks."""
+
+    tasks: int = 0
+    raw_bytes: int = 0
+    compressed_bytes: int = 0
+
+    @property
+    def saved_bytes(self) -> int:
+        """Bytes of JSON no longer stored."""
+        return self.raw_bytes - self.compressed_bytes
+
+    def add(self, other: CompactionResult) -> None:
+        """Accumulate another result into this one."""
+        self.tasks += other.tasks
+        self.raw_bytes += other.raw_bytes
+        self.compressed_bytes += other.compressed_bytes
+
+
+class TaskCompressor:
+    """zstd compression of task payloads with shared dictionaries.
+
+    New payloads are compressed with the most recently added dictionary;
+    payloads compressed with any added dictionary (or none) can be read.
+    """
+
+    def __init__(self, level: int = 9):
+        """Initialize the compressor.
+
+        Args:
+            level: zstd compression level
+
+        Raises:
+            RuntimeError: If zstandard is not installed
+        """
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError(
+                "Task compression requires zstandard. "
+                "Install with: pip install bindu[compression]"
+            )
+        self.level = level
+        self.dictionary_id: int | None = None
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressors: dict[int, Any] = {0: zstandard.ZstdDecompressor()}
+
+    def add_dictionary(self, data: bytes) -> int:
+        """Make a dictionary available and use it for new payloads.
+
+        Args:
+            data: Dictionary as stored in task_compression_dictionaries
+
+        Returns:
+            The dictionary's ID
+        """
+        dictionary = zstandard.ZstdCompressionDict(data)
+        dictionary_id = dictionary.dict_id()
+        if dictionary_id not in self._decompressors:
+            self._decompressors[dictionary_id] = zstandard.ZstdDecompressor(
+                dict_data=dictionary
+            )
+        self._compressor = zstandard.ZstdCompressor(
+            level=self.level, dict_data=dictionary
+        )
+        self.dictionary_id = dictionary_id
+        return dictionary_id
+
+    def train(self, samples: list[bytes], size: int) -> bytes | None:
+        """Train a dictionary on encoded payloads.
+
+        Args:
+            samples: Payloads as returned by encode()
+            size: Maximum dictionary size in bytes
+
+        Returns:
+            The dictionary, or None if there are too few samples
+        """
+        if len(samples) < MIN_TRAINING_SAMPLES:
+            return None
+        try:
+            dictionary = zstandard.train_dictionary(size, samples, level=self.level)
+        except zstandard.ZstdError as e:
+            logger.warning(f"Could not train a compression dictionary: {e}")
+            return None
+        return dictionary.as_bytes()
+
+    @staticmethod
+    def encode(history: list[Any], artifacts: list[Any]) -> bytes:
+        """Serialize the part of a task that gets compressed."""
+        return dumps_jsonb_bytes({"history": history, "artifacts": artifacts})
+
+    def compress(self, raw: bytes) -> bytes:
+        """Compress an encoded payload with the current dictionary."""
+        return self._compressor.compress(raw)
+
+    def decompress(self, data: bytes) -> dict[str, list[Any]]:
+        """Decompress a payload written by compress().
+
+        Raises:
+            UnknownCompressionDictionary: If the frame's dictionary has not
+                been added
+        """
+        dictionary_id = zstandard.get_frame_parameters(data).dict_id
+        decompressor = self._decompressors.get(dictionary_id)
+        if decompressor is None:
+            raise UnknownCompressionDictionary(dictionary_id)
+        return loads_jsonb(decompressor.decompress(data))
+
+
+def restore_compressed(
+    task: Task, data: bytes, compressor: TaskCompressor | None
+) -> Task:
+    """Put a compacted task's history and artifacts back into it.
+
+    Only the fields the task was read with are restored; anything stored
+    uncompressed after compaction follows the compressed part.
+
+    Raises:
+        RuntimeError: If zstandard is not installed
+        UnknownCompressionDictionary: If the dictionary has not been loaded
+    """
+    if "history" not in task and "artifacts" not in task:
+        return task
+    if compressor is None:
+        raise RuntimeError(
+            f"Task {task['id']} is compressed; reading it requires zstandard. "
+            "Install with: pip install bindu[compression]"
+        )
+
+    payload = compressor.decompress(data)
+    if "history" in task:
+        task["history"] = payload["history"] + task["history"]
+    if "artifacts" in task:
+        task["artifacts"] = payload["artifacts"] + task["artifacts"]
+    return task
+
+
+class CompactionEngine:
+    """Compact finished tasks of a storage backend, once or periodically."""
+
+    def __init__(
+        self,
+        storage: Storage[Any],
+        older_than: timedelta,
+        batch_size: int = 200,
+        interval_seconds: float = 3600,
+    ):
+        """Initialize the engine.
+
+        Args:
+            storage: Backend to compact (PostgreSQL)
+            older_than: How long tasks must have been terminal
+            batch_size: Tasks compacted per transaction
+            interval_seconds: Delay between runs of the background task
+
+        Raises:
+            ValueError: If the backend cannot compact tasks
+            RuntimeError: If zstandard is not installed
+        """
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError(
+                "Task compression requires zstandard. "
+                "Install with: pip install bindu[compression]"
+            )
+        if not hasattr(storage, "compact_tasks"):
+            raise ValueError("Task compression requires PostgreSQL storage")
+        if batch_size < 1:
+            raise ValueError("Compaction batch_size must be at least 1")
+        self.storage = storage
+        self.older_than = older_than
+        self.batch_size = batch_size
+        self.interval = interval_seconds
+        self._task: asyncio.Task[None] | None = None
+
+    @classmethod
+    def from_settings(cls, storage: Storage[Any]) -> CompactionEngine:
+        """Build the engine from ``app_settings.storage``."""
+        settings = app_settings.storage
+        return cls(
+            storage,
+            older_than=timedelta(days=settings.compression_after_days),
+            batch_size=settings.compression_batch_size,
+            interval_seconds=settings.compression_interval_seconds,
+        )
+
+    async def run_once(
+        self, now: datetime | None = None, max_batches: int | None = None
+    ) -> CompactionResult:
+        """Compact batches until no candidate is left (or max_batches is reached).
+
+        Args:
+            now: Reference time for older_than (defaults to the current UTC time)
+            max_batches: Stop after this many batches
+
+        Returns:
+            Tasks compacted and their size before and after
+        """
+        cutoff = (now or datetime.now(timezone.utc)) - self.older_than
+        result = CompactionResult()
+        metrics = get_metrics()
+        compact = self.storage.compact_tasks  # type: ignore[attr-defined]
+
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            batch: CompactionResult = await compact(cutoff, self.batch_size)
+            batches += 1
+            if batch.tasks == 0:
+                break
+            result.add(batch)
+            metrics.record_task_compaction(
+                batch.tasks, batch.raw_bytes, batch.compressed_bytes
+            )
+            # Let request handling run between batches
+            await asyncio.sleep(0)
+
+        if result.tasks:
+            logger.info(
+                f"Compacted {result.tasks} tasks in {batches} batches "
+                f"({result.raw_bytes} -> {result.compressed_bytes} bytes)"
+            )
+        return result
+
+    async def start(self) -> None:
+        """Start the periodic compaction task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_periodically())
+            logger.info(f"Compaction task started (every {self.interval}s)")
+
+    async def stop(self) -> None:
+        """Stop the periodic compaction task."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            logger.info("Compaction task stopped")
+
+    async def _run_periodically(self) -> None:
+        """Run compaction every interval until cancelled."""
+        while True:
+            try:
+                await self.run_once()
+                await asyncio.sleep(self.interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in compaction task: {e}", exc_info=True)
+                await asyncio.sleep(self.interval)
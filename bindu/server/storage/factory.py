@@ -20,7 +20,10 @@ from bindu.settings import app_settings
 from bindu.utils.logging import get_logger
 
 from .base import Storage
+from .blob import BlobStore, FilesystemBlobStore
+from .cache import CachedStorage
 from .memory_storage import InMemoryStorage
+from .tiered import TieredStorage
 
 # Import PostgresStorage conditionally
 try:
@@ -31,6 +34,15 @@ except ImportError:
     PostgresStorage = None  # type: ignore[assignment]  # SQLAlchemy not installed
     POSTGRES_AVAILABLE = False
 
+# Import SQLiteStorage conditionally (aiosqlite is the optional "sqlite" extra)
+try:
+    from .sqlite_storage import SQLiteStorage
+
+    SQLITE_AVAILABLE = True
+except ImportError:
+    SQLiteStorage = None  # type: ignore[assignment]  # aiosqlite not installed
+    SQLITE_AVAILABLE = False
+
 logger = get_logger("bindu.server.storage.factory")
 
 
@@ -43,6 +55,11 @@ async def create_storage(did: str | None = None) -> Storage:
     Supported backends:
     - "memory": InMemoryStorage (default, non-persistent)
     - "postgres": PostgresStorage (persistent)
+    - "sqlite": SQLiteStorage (persistent, single host)
+
+    If app_settings.storage.hot_tier_enabled is set, the backend becomes the
+    cold tier of a TieredStorage; otherwise, if task_cache_enabled is set, it
+    is wrapped in a CachedStorage read-through task cache.
 
     Args:
         did: Optional DID for schema-based multi-tenancy (PostgreSQL only)
@@ -67,7 +84,7 @@ async def create_storage(did: str | None = None) -> Storage:
 
     if backend == "memory":
         logger.info("Using in-memory storage (non-persistent)")
-        return InMemoryStorage()
+        return await _with_task_cache(InMemoryStorage())
 
     elif backend == "postgres":
         if not POSTGRES_AVAILABLE or PostgresStorage is None:
@@ -96,14 +113,109 @@ async def create_storage(did: str | None = None) -> Storage:
         # Connect to database
         await storage.connect()
 
-        return storage
+        return await _with_task_cache(storage)
+
+    elif backend == "sqlite":
+        if not SQLITE_AVAILABLE or SQLiteStorage is None:
+            raise ValueError(
+                "SQLite storage requires aiosqlite. "
+                "Install with: pip install bindu[sqlite]"
+            )
+
+        logger.info(f"Using SQLite storage at {app_settings.storage.sqlite_path}")
+        storage = SQLiteStorage(
+            path=app_settings.storage.sqlite_path,
+            readers=app_settings.storage.sqlite_readers,
+            busy_timeout_ms=app_settings.storage.sqlite_busy_timeout_ms,
+        )
+        await storage.connect()
+
+        return await _with_task_cache(storage)
 
     else:
         raise ValueError(
-            f"Unknown storage backend: {backend}. Supported backends: memory, postgres"
+            f"Unknown storage backend: {backend}. "
+            "Supported backends: memory, postgres, sqlite"
         )
 
 
+async def _with_task_cache(storage: Storage) -> Storage:
+    """Wrap storage in a hot tier or read-through task cache if enabled."""
+    settings = app_settings.storage
+    if not settings.hot_tier_enabled and not settings.task_cache_enabled:
+        return storage
+
+    if (
+        PostgresStorage is not None
+        and isinstance(storage, PostgresStorage)
+        and settings.postgres_pgbouncer
+        and not storage.listen_url
+    ):
+        # Entries are invalidated across pods over LISTEN (see
+        # PostgresStorage._listen_engine)
+        enabled = (
+            "hot_tier_enabled" if settings.hot_tier_enabled else "task_cache_enabled"
+        )
+        logger.warning(
+            f"{enabled} is ignored with postgres_pgbouncer unless "
+            "postgres_listen_url is set"
+        )
+        return storage
+
+    if settings.hot_tier_enabled:
+        logger.info(
+            f"Using in-memory hot tier (max_entries={settings.hot_tier_max_entries}, "
+            f"terminal_ttl={settings.hot_tier_terminal_ttl_seconds}s)"
+        )
+        tiered = TieredStorage(
+            storage,
+            max_entries=settings.hot_tier_max_entries,
+            terminal_ttl_seconds=settings.hot_tier_terminal_ttl_seconds,
+        )
+        await tiered.start()
+        return tiered
+
+    logger.info(
+        f"Using task cache (max_entries={settings.task_cache_max_entries}, "
+        f"ttl={settings.task_cache_ttl_seconds}s)"
+    )
+    cached = CachedStorage(
+        storage,
+        max_entries=settings.task_cache_max_entries,
+        ttl_seconds=settings.task_cache_ttl_seconds,
+    )
+    await cached.start()
+    return cached
+
+
+def create_blob_store() -> BlobStore | None:
+    """Create blob store for large file parts based on configuration.
+
+    Supported backends:
+    - "none": No blob store, file bytes stay inline (default)
+    - "filesystem": FilesystemBlobStore rooted at app_settings.storage.blob_path
+
+    Returns:
+        BlobStore instance, or None if offloading is disabled
+
+    Raises:
+        ValueError: If unknown blob backend is specified
+    """
+    backend = app_settings.storage.blob_backend.lower()
+
+    if backend == "none":
+        return None
+
+    if backend == "filesystem":
+        blob_path = app_settings.storage.blob_path
+        logger.info(f"Using filesystem blob store at {blob_path}")
+        return FilesystemBlobStore(blob_path)
+
+    raise ValueError(
+        f"Unknown blob backend: {backend}. Supported backends: none, filesystem"
+    )
+
+
 async def close_storage(storage: Storage) -> None:
     """Close storage connection gracefully.
 
@@ -122,5 +234,14 @@ async def close_storage(storage: Storage) -> None:
     ):
         await storage.disconnect()
         logger.info("PostgreSQL storage connection closed")
+    elif (
+        SQLITE_AVAILABLE
+        and SQLiteStorage is not None
+        and isinstance(storage, SQLiteStorage)
+    ):
+        await storage.disconnect()
+    elif isinstance(storage, CachedStorage):
+        await storage.stop()
+        await close_storage(storage.storage)
     else:
         logger.debug(f"Storage {type(storage).__name__} does not require cleanup")
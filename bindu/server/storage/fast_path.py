@@ -0,0 +1,386 @@
+"""asyncpg fast path for the hottest PostgresStorage operations.
+
+Every PostgresStorage method builds a SQLAlchemy Core statement, opens an
+AsyncSession and maps result row proxies. For small tasks that overhead
+(statement construction, compilation, row adaptation) costs more CPU than the
+query itself. The fast path runs load_task, submit_task, update_task and
+count_tasks as fixed SQL text on a dedicated asyncpg pool instead:
+
+- The SQL never changes, so asyncpg's per-connection statement cache prepares
+  each statement once per connection and only binds parameters afterwards.
+  Optional arguments are nullable parameters rather than different SQL.
+  With ``storage.postgres_pgbouncer`` the cache is off, since a transaction
+  pooler may run each statement on a different server connection.
+- JSONB columns use a binary codec installed on every connection, so values
+  go to and from Python objects without SQLAlchemy's type processors.
+- Records are mapped straight to protocol Tasks (compacted tasks are
+  decompressed with the storage's TaskCompressor).
+
+The statements mirror the SQLAlchemy ones in PostgresStorage (history
+assembled from task_messages, advisory-locked submit), so both paths can be
+used side by side. Enabled with ``storage.postgres_fast_path``.
+"""
+
+from __future__ import annotations as _annotations
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+import asyncpg
+
+from bindu.common.protocol.types import (
+    Artifact,
+    Message,
+    Task,
+    TaskState,
+    TaskStatus,
+)
+from bindu.settings import app_settings
+from bindu.utils.logging import get_logger
+
+from .base import DuplicateMessageError
+from .compression import (
+    TaskCompressor,
+    UnknownCompressionDictionary,
+    restore_compressed,
+)
+from .helpers import dumps_jsonb_bytes, loads_jsonb, sanitize_identifier
+
+logger = get_logger("bindu.server.storage.fast_path")
+
+# Task columns returned by every statement, history excluded
+_COLUMNS = (
+    "id, context_id, kind, state, state_timestamp, artifacts, metadata, "
+    "compressed_payload"
+)
+
+# Task $1 on (id, created_at): created_at comes from task_ids, so only the
+# partition holding the task is scanned
+_TASK_KEY = "id = $1 AND created_at = (SELECT created_at FROM task_ids WHERE id = $1)"
+
+# Legacy tasks.history followed by the task's task_messages rows; $2 limits
+# the tail that is read (LIMIT NULL reads all of it)
+LOAD_TASK_SQL = f"""
+SELECT {_COLUMNS},
+    coalesce(t.history, '[]'::jsonb) || coalesce((
+        SELECT jsonb_agg(m.payload ORDER BY m.seq)
+        FROM (
+            SELECT seq, payload FROM task_messages
+            WHERE task_id = t.id ORDER BY seq DESC LIMIT $2
+        ) m
+    ), '[]'::jsonb) AS history
+FROM tasks t
+WHERE {_TASK_KEY}
+"""
+
+LOCK_TASK_SQL = "SELECT pg_advisory_xact_lock(hashtextextended($1::text, 0))"
+
+# Continue the non-terminal task $1 or create it, then append message $5
+# with message_id $6, unless the task already holds it (a retried send).
+# Run after LOCK_TASK_SQL in the same transaction
+SUBMIT_TASK_SQL = f"""
+WITH ensure_context AS (
+    INSERT INTO contexts (id)
+    SELECT $2::uuid WHERE NOT EXISTS (SELECT 1 FROM task_ids WHERE id = $1::uuid)
+    ON CONFLICT (id) DO NOTHING
+), continued AS (
+    UPDATE tasks
+    SET state = 'submitted', state_timestamp = $3::timestamptz, updated_at = $3
+    WHERE {_TASK_KEY} AND state <> ALL($4::text[])
+        AND NOT EXISTS (
+            SELECT 1 FROM task_messages WHERE task_id = $1 AND message_id = $6
+        )
+    RETURNING {_COLUMNS}, history, false AS inserted
+), created AS (
+    INSERT INTO tasks (id, context_id, kind, state, state_timestamp,
+                       artifacts, metadata)
+    SELECT $1, $2, 'task', 'submitted', $3, '[]'::jsonb, '{{}}'::jsonb
+    WHERE NOT EXISTS (SELECT 1 FROM task_ids WHERE id = $1)
+    RETURNING {_COLUMNS}, history, true AS inserted
+), upserted AS (
+    SELECT * FROM continued UNION ALL SELECT * FROM created
+), appended AS (
+    INSERT INTO task_messages (task_id, message_id, payload)
+    SELECT id, $6::uuid, $5::jsonb FROM upserted
+    RETURNING seq, payload
+)
+SELECT {_COLUMNS}, inserted,
+    coalesce(u.history, '[]'::jsonb) || coalesce((
+        SELECT jsonb_agg(payload ORDER BY seq) FROM task_messages
+        WHERE task_id = u.id
+    ), '[]'::jsonb) || coalesce((
+        SELECT jsonb_agg(payload ORDER BY seq) FROM appended
+    ), '[]'::jsonb) AS history
+FROM upserted u
+"""
+
+TASK_STATE_SQL = f"SELECT state FROM tasks WHERE {_TASK_KEY}"
+
+SUBMITTED_MESSAGE_SQL = (
+    "SELECT EXISTS (SELECT 1 FROM task_messages "
+    "WHERE task_id = $1 AND message_id = $2)"
+)
+
+# Set state $2 at $3, merge metadata $4, append artifacts $5 and messages $6.
+# jsonb || NULL is NULL, so NULL parameters leave the column unchanged
+UPDATE_TASK_SQL = f"""
+WITH updated AS (
+    UPDATE tasks SET
+        state = $2::varchar,
+        state_timestamp = $3::timestamptz,
+        updated_at = $3,
+        metadata = coalesce(metadata || $4::jsonb, metadata),
+        artifacts = coalesce(artifacts || $5::jsonb, artifacts)
+    WHERE {_TASK_KEY}
+    RETURNING {_COLUMNS}, history
+), appended AS (
+    INSERT INTO task_messages (task_id, payload)
+    SELECT u.id, m.value || jsonb_build_object('context_id', u.context_id)
+    FROM updated u,
+        jsonb_array_elements(coalesce($6::jsonb, '[]'::jsonb))
+            WITH ORDINALITY AS m(value, ordinality)
+    ORDER BY m.ordinality
+    RETURNING seq, payload
+)
+SELECT {_COLUMNS},
+    coalesce(u.history, '[]'::jsonb) || coalesce((
+        SELECT jsonb_agg(payload ORDER BY seq) FROM task_messages
+        WHERE task_id = u.id
+    ), '[]'::jsonb) || coalesce((
+        SELECT jsonb_agg(payload ORDER BY seq) FROM appended
+    ), '[]'::jsonb) AS history
+FROM updated u
+"""
+
+# Trigger-maintained counters (see schema.task_state_counts_table)
+COUNT_TASKS_SQL = "SELECT coalesce(sum(count), 0)::bigint FROM task_state_counts"
+COUNT_TASKS_IN_STATE_SQL = (
+    "SELECT coalesce(sum(count), 0)::bigint FROM task_state_counts WHERE state = $1"
+)
+
+LOAD_DICTIONARIES_SQL = (
+    "SELECT dictionary FROM task_compression_dictionaries ORDER BY created_at, id"
+)
+
+
+def _encode_jsonb(value: Any) -> bytes:
+    # Binary jsonb is a version byte followed by the JSON text
+    return b"\x01" + dumps_jsonb_bytes(value)
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    return loads_jsonb(memoryview(data)[1:])
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Install the JSONB codec on a new pool connection."""
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        schema="pg_catalog",
+        format="binary",
+    )
+
+
+def _record_to_task(
+    record: asyncpg.Record, compressor: TaskCompressor | None = None
+) -> Task:
+    """Map a task record (all columns plus history) to a Task."""
+    task = Task(
+        id=record["id"],
+        context_id=record["context_id"],
+        kind=record["kind"],
+        status=TaskStatus(
+            state=record["state"], timestamp=record["state_timestamp"].isoformat()
+        ),
+        history=record["history"] or [],
+        artifacts=record["artifacts"] or [],
+        metadata=record["metadata"] or {},
+    )
+    compressed = record.get("compressed_payload")
+    if compressed is not None:
+        restore_compressed(task, compressed, compressor)
+    return task
+
+
+class AsyncpgFastPath:
+    """Prepared-statement task operations on a dedicated asyncpg pool.
+
+    Arguments are expected to be validated and normalized by PostgresStorage;
+    this class only runs the statements and maps the results.
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        pool_min: int,
+        pool_max: int,
+        timeout: float,
+        command_timeout: float,
+        schema_name: str | None = None,
+        compressor: TaskCompressor | None = None,
+    ):
+        """Initialize the fast path.
+
+        Args:
+            database_url: PostgreSQL URL (a ``+asyncpg`` driver suffix is dropped)
+            pool_min: Minimum pool size
+            pool_max: Maximum pool size
+            timeout: Connection timeout in seconds
+            command_timeout: Statement timeout in seconds
+            schema_name: Schema to put on the search_path (DID isolation)
+            compressor: Decompresses compacted tasks (shared with the storage)
+        """
+        self.dsn = database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+        self.pool_min = pool_min
+        self.pool_max = pool_max
+        self.timeout = timeout
+        self.command_timeout = command_timeout
+        self.schema_name = schema_name
+        self.compressor = compressor
+        self._pool: asyncpg.Pool | None = None
+
+    async def connect(self) -> None:
+        """Create the pool; each connection gets the JSONB codec."""
+        server_settings = {}
+        if self.schema_name:
+            server_settings["search_path"] = (
+                f'"{sanitize_identifier(self.schema_name)}"'
+            )
+
+        self._pool = await asyncpg.create_pool(
+            self.dsn,
+            min_size=min(self.pool_min, self.pool_max),
+            max_size=self.pool_max,
+            timeout=self.timeout,
+            command_timeout=self.command_timeout,
+            server_settings=server_settings,
+            init=_init_connection,
+            **(
+                {"statement_cache_size": 0}
+                if app_settings.storage.postgres_pgbouncer
+                else {}
+            ),
+        )
+
+    async def close(self) -> None:
+        """Close the pool."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    @property
+    def pool(self) -> asyncpg.Pool:
+        """The connection pool.
+
+        Raises:
+            RuntimeError: If connect() has not been called
+        """
+        if self._pool is None:
+            raise RuntimeError("Fast path not connected. Call connect() first.")
+        return self._pool
+
+    async def _to_task(self, record: asyncpg.Record) -> Task:
+        """Map a record, loading dictionaries trained since the last load."""
+        try:
+            return _record_to_task(record, self.compressor)
+        except UnknownCompressionDictionary:
+            pass
+
+        # The record is already read (and any write committed), so only the
+        # mapping is repeated; the statement must not be run again
+        assert self.compressor is not None
+        for row in await self.pool.fetch(LOAD_DICTIONARIES_SQL):
+            self.compressor.add_dictionary(row["dictionary"])
+        try:
+            return _record_to_task(record, self.compressor)
+        except UnknownCompressionDictionary as e:
+            raise RuntimeError(f"Task {record['id']} cannot be decompressed: {e}")
+
+    async def load_task(
+        self, task_id: UUID, history_length: int | None = None
+    ) -> Task | None:
+        """Load a task with its history (the last ``history_length`` messages).
+
+        Returns:
+            The task, or None if it does not exist
+        """
+        limit = history_length if history_length and history_length > 0 else None
+        record = await self.pool.fetchrow(LOAD_TASK_SQL, task_id, limit)
+        return await self._to_task(record) if record is not None else None
+
+    async def submit_task(
+        self, task_id: UUID, context_id: UUID, message: Message, now: datetime
+    ) -> Task:
+        """Create a task or continue a non-terminal one, appending ``message``.
+
+        Raises:
+            ValueError: If the task is in a terminal state
+            DuplicateMessageError: If the task already holds the message
+        """
+        message_id = message.get("message_id")
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(LOCK_TASK_SQL, str(task_id))
+                record = await conn.fetchrow(
+                    SUBMIT_TASK_SQL,
+                    task_id,
+                    context_id,
+                    now,
+                    sorted(app_settings.agent.terminal_states),
+                    message,
+                    message_id,
+                )
+
+                if record is None and message_id is not None:
+                    if await conn.fetchval(SUBMITTED_MESSAGE_SQL, task_id, message_id):
+                        existing = await conn.fetchrow(LOAD_TASK_SQL, task_id, None)
+                        raise DuplicateMessageError(
+                            await self._to_task(existing), message_id
+                        )
+
+                if record is None:
+                    current_state = await conn.fetchval(TASK_STATE_SQL, task_id)
+                    raise ValueError(
+                        f"Cannot continue task {task_id}: Task is in terminal state '{current_state}' and is immutable. "
+                        f"Create a new task with referenceTaskIds to continue the conversation."
+                    )
+
+        if not record["inserted"]:
+            logger.info(f"Continuing existing task {task_id}")
+        return await self._to_task(record)
+
+    async def update_task(
+        self,
+        task_id: UUID,
+        state: TaskState,
+        now: datetime,
+        new_artifacts: list[Artifact] | None = None,
+        new_messages: list[Message] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> Task:
+        """Update state, merge metadata and append artifacts and messages.
+
+        Raises:
+            KeyError: If the task does not exist
+        """
+        record = await self.pool.fetchrow(
+            UPDATE_TASK_SQL,
+            task_id,
+            state,
+            now,
+            metadata or None,
+            new_artifacts or None,
+            new_messages or None,
+        )
+        if record is None:
+            raise KeyError(f"Task {task_id} not found")
+        return await self._to_task(record)
+
+    async def count_tasks(self, status: str | None = None) -> int:
+        """Count tasks, optionally only those in one state."""
+        if status is None:
+            return await self.pool.fetchval(COUNT_TASKS_SQL)
+        return await self.pool.fetchval(COUNT_TASKS_IN_STATE_SQL, status)
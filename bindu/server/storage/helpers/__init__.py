@@ -1,22 +1,40 @@
 """Helper utilities for PostgreSQL storage operations.
 
 This package provides reusable helper functions for:
-- UUID validation and normalization
+- UUID and timestamp validation and normalization
 - JSONB serialization
 - Security (password masking, SQL injection prevention)
 - Database operations (timestamps, JSONB preparation)
+- Task field projection
 """
 
-from .normalization import normalize_message_uuids, normalize_uuid
+from .normalization import (
+    normalize_message_uuids,
+    normalize_timestamp,
+    normalize_uuid,
+)
+from .projection import includes_history, project_task, validate_projection
 from .security import mask_database_url, sanitize_identifier
-from .serialization import serialize_for_jsonb
+from .serialization import (
+    dumps_jsonb,
+    dumps_jsonb_bytes,
+    loads_jsonb,
+    serialize_for_jsonb,
+)
 from .validation import validate_uuid_type
 
 __all__ = [
     "normalize_message_uuids",
+    "normalize_timestamp",
     "normalize_uuid",
+    "includes_history",
+    "project_task",
+    "validate_projection",
     "mask_database_url",
     "sanitize_identifier",
+    "dumps_jsonb",
+    "dumps_jsonb_bytes",
+    "loads_jsonb",
     "serialize_for_jsonb",
     "validate_uuid_type",
 ]
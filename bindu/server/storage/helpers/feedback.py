@@ -0,0 +1,141 @@
+"""Feedback aggregates for tasks/feedback/summary.
+
+Every backend keeps, per skill and UTC day, the number of feedback entries,
+the sum of their ratings and a histogram of ratings 1-5, added to as
+feedback is stored. These helpers read a feedback entry the way the SQL
+rollups do and turn the totals into FeedbackSummary dicts:
+
+- The skill is the entry's string ``skill_id``, or "" if it has none.
+- The rating is the entry's ``rating`` if it is a whole number from 1 to 5;
+  other entries are counted but not rated.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from datetime import date
+from typing import Any, get_args
+
+from bindu.common.protocol.types import FeedbackGroupBy, FeedbackSummary
+
+RATINGS = (1, 2, 3, 4, 5)
+
+# Totals of a group: [count, rating_sum, rating_1, ..., rating_5]
+FeedbackTotals = list[int]
+
+
+def feedback_skill(feedback_data: dict[str, Any]) -> str:
+    """Skill an entry counts towards ("" if it names none)."""
+    skill_id = feedback_data.get("skill_id")
+    return skill_id if isinstance(skill_id, str) else ""
+
+
+def feedback_rating(feedback_data: dict[str, Any]) -> int | None:
+    """An entry's rating, or None if it has no rating from 1 to 5."""
+    rating = feedback_data.get("rating")
+    if isinstance(rating, bool) or not isinstance(rating, int | float):
+        return None
+    return int(rating) if rating in RATINGS else None
+
+
+def new_totals() -> FeedbackTotals:
+    """Totals of an empty group."""
+    return [0] * (2 + len(RATINGS))
+
+
+def add_feedback(totals: FeedbackTotals, feedback_data: dict[str, Any]) -> None:
+    """Count one feedback entry into a group's totals."""
+    totals[0] += 1
+    rating = feedback_rating(feedback_data)
+    if rating is not None:
+        totals[1] += rating
+        totals[1 + rating] += 1
+
+
+def validate_group_by(group_by: Iterable[str]) -> tuple[FeedbackGroupBy, ...]:
+    """Check summary grouping fields, in ("skill", "day") order.
+
+    Raises:
+        ValueError: If a field is not "skill" or "day"
+    """
+    fields = set(group_by)
+    allowed = get_args(FeedbackGroupBy)
+    unknown = fields.difference(allowed)
+    if unknown:
+        raise ValueError(
+            f"Invalid group_by {sorted(unknown)}: must be among {list(allowed)}"
+        )
+    return tuple(field for field in allowed if field in fields)
+
+
+def feedback_summary(
+    totals: Sequence[int],
+    *,
+    skill_id: str | None = None,
+    day: date | None = None,
+) -> FeedbackSummary:
+    """Summary of one group from its totals.
+
+    Args:
+        totals: count, rating sum and ratings 1-5, as in FeedbackTotals
+        skill_id: Skill of the group, if grouped by skill
+        day: Day of the group, if grouped by day
+    """
+    count, rating_sum, *histogram = (int(value or 0) for value in totals)
+    rated = sum(histogram)
+    summary = FeedbackSummary(
+        count=count,
+        rated=rated,
+        mean_rating=rating_sum / rated if rated else None,
+        ratings={str(r): n for r, n in zip(RATINGS, histogram, strict=True)},
+    )
+    if skill_id is not None:
+        summary["skill_id"] = skill_id
+    if day is not None:
+        summary["day"] = day
+    return summary
+
+
+def summarize_feedback(entries: Iterable[dict[str, Any]]) -> FeedbackSummary:
+    """Summary of a list of feedback entries, e.g. one task's."""
+    totals = new_totals()
+    for feedback_data in entries:
+        add_feedback(totals, feedback_data)
+    return feedback_summary(totals)
+
+
+def summarize_rollups(
+    rollups: Iterable[tuple[str, date, Sequence[int]]],
+    *,
+    skill_id: str | None = None,
+    since: date | None = None,
+    until: date | None = None,
+    group_by: Iterable[str] = (),
+) -> list[FeedbackSummary]:
+    """Filter and group (skill, day, totals) rollups, like the SQL backends.
+
+    Raises:
+        ValueError: If group_by has an unknown field
+    """
+    fields = validate_group_by(group_by)
+    groups: dict[tuple[str | None, date | None], FeedbackTotals] = {}
+    if not fields:
+        groups[(None, None)] = new_totals()
+
+    for skill, day, totals in rollups:
+        if skill_id is not None and skill != skill_id:
+            continue
+        if (since is not None and day < since) or (until is not None and day > until):
+            continue
+        key = (
+            skill if "skill" in fields else None,
+            day if "day" in fields else None,
+        )
+        group = groups.setdefault(key, new_totals())
+        for i, value in enumerate(totals):
+            group[i] += value
+
+    return [
+        feedback_summary(groups[key], skill_id=key[0], day=key[1])
+        for key in sorted(groups, key=lambda k: (k[0] or "", k[1] or date.min))
+    ]
@@ -1,5 +1,6 @@
-"""UUID and message normalization utilities for storage operations."""
+"""UUID, timestamp and message normalization utilities for storage operations."""
 
+from datetime import datetime, timezone
 from uuid import UUID
 
 from bindu.common.protocol.types import Message
@@ -62,3 +63,34 @@ def normalize_message_uuids(
         ]
 
     return message
+
+
+def normalize_timestamp(
+    value: datetime | str | None, param_name: str = "timestamp"
+) -> datetime | None:
+    """Normalize an ISO 8601 string or datetime to an aware UTC datetime.
+
+    Naive values are taken to be UTC.
+
+    Args:
+        value: Timestamp to normalize (datetime, ISO string, or None)
+        param_name: Parameter name for error messages (default: "timestamp")
+
+    Returns:
+        Aware datetime, or None if value is None
+
+    Raises:
+        TypeError: If value is neither a datetime nor a string
+        ValueError: If the string is not an ISO 8601 timestamp
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        raise TypeError(
+            f"{param_name} must be datetime or str, got {type(value).__name__}"
+        )
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
@@ -0,0 +1,116 @@
+"""Opaque keyset cursors for paginated storage listings.
+
+A page token encodes the ``(created_at, id)`` of the last row of a page.
+The next page continues strictly after that key, so listing cost stays
+proportional to the page size no matter how deep the client pages.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime, timezone
+from uuid import UUID
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+
+def as_utc(value: datetime | None) -> datetime | None:
+    """Treat a naive created_after/created_before bound as UTC.
+
+    Stored timestamps are timezone-aware, so a naive bound from a client
+    (e.g. "2020-01-01T00:00:00") is read as UTC, as PostgreSQL and SQLite do.
+    """
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def encode_page_token(created_at: datetime, row_id: UUID) -> str:
+    """Encode a keyset position as an opaque, URL-safe page token.
+
+    Args:
+        created_at: Creation timestamp of the last row returned
+        row_id: ID of the last row returned
+
+    Returns:
+        Page token for the next page
+    """
+    raw = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_page_token(token: str) -> tuple[datetime, UUID]:
+    """Decode a page token back into its keyset position.
+
+    Args:
+        token: Page token from a previous page
+
+    Returns:
+        (created_at, id) of the last row of the previous page
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid page token: {token!r}") from e
+
+
+def encode_search_token(rank: float, created_at: datetime, row_id: UUID) -> str:
+    """Encode the position of the last task of a search page.
+
+    Search results are ordered by (rank, created_at, id) descending, so the
+    rank is part of the key.
+
+    Args:
+        rank: Search rank of the last task returned
+        created_at: Creation timestamp of the last task returned
+        row_id: ID of the last task returned
+
+    Returns:
+        Page token for the next page
+    """
+    raw = json.dumps(
+        [rank, created_at.isoformat(), str(row_id)], separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_search_token(token: str) -> tuple[float, datetime, UUID]:
+    """Decode a search page token back into its keyset position.
+
+    Args:
+        token: Page token from a previous search page
+
+    Returns:
+        (rank, created_at, id) of the last task of the previous page
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        rank, created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(rank), datetime.fromisoformat(created_at), UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid page token: {token!r}") from e
+
+
+def clamp_page_size(page_size: int | None) -> int:
+    """Normalize a requested page size into ``[1, MAX_PAGE_SIZE]``.
+
+    Args:
+        page_size: Requested page size, or None for the default
+
+    Returns:
+        Page size to use
+    """
+    if page_size is None or page_size <= 0:
+        return DEFAULT_PAGE_SIZE
+    return min(page_size, MAX_PAGE_SIZE)
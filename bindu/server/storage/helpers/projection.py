@@ -0,0 +1,81 @@
+"""Task field projection for storage reads."""
+
+from __future__ import annotations
+
+import copy
+from typing import Any, cast, get_args
+
+from bindu.common.protocol.types import Task, TaskProjection
+
+# Fields returned by each projection (history is handled separately)
+PROJECTION_FIELDS: dict[str, tuple[str, ...]] = {
+    "full": ("id", "context_id", "kind", "status", "artifacts", "metadata"),
+    "summary": ("id", "context_id", "kind", "status", "metadata"),
+    "status": ("id", "context_id", "kind", "status"),
+}
+
+
+def validate_projection(projection: str) -> TaskProjection:
+    """Validate a projection name.
+
+    Args:
+        projection: Requested projection
+
+    Returns:
+        The projection, typed as TaskProjection
+
+    Raises:
+        ValueError: If projection is unknown
+    """
+    if projection not in get_args(TaskProjection):
+        raise ValueError(
+            f"Unknown task projection: {projection!r}. "
+            f"Supported projections: {', '.join(get_args(TaskProjection))}"
+        )
+    return cast(TaskProjection, projection)
+
+
+def includes_history(projection: TaskProjection, history_length: int | None) -> bool:
+    """Whether a projection returns message history.
+
+    "full" always does; "summary" only when a positive history_length asks
+    for the last N messages; "status" never does.
+    """
+    if projection == "full":
+        return True
+    if projection == "summary":
+        return history_length is not None and history_length > 0
+    return False
+
+
+def project_task(
+    task: Task,
+    projection: TaskProjection = "full",
+    history_length: int | None = None,
+) -> Task:
+    """Build a deep-copied task containing only the projected fields.
+
+    Only the fields (and history tail) that are returned get copied, so a
+    status-only read of a task with a long history stays cheap.
+
+    Args:
+        task: Stored task
+        projection: Which fields to return
+        history_length: Optional limit on message history length
+
+    Returns:
+        New task dict with the projected fields
+    """
+    projected: dict[str, Any] = {
+        field: copy.deepcopy(task[field])
+        for field in PROJECTION_FIELDS[projection]
+        if field in task
+    }
+
+    if includes_history(projection, history_length) and "history" in task:
+        history = task["history"]
+        if history_length is not None and history_length > 0:
+            history = history[-history_length:]
+        projected["history"] = copy.deepcopy(history)
+
+    return cast(Task, projected)
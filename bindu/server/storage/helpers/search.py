@@ -0,0 +1,123 @@
+"""Task search for backends without a full-text index.
+
+PostgreSQL matches messages against task_messages.search_vector. The
+in-memory and SQLite backends match the same way in Python:
+
+- A query is split into lowercase words. A task matches when one of its
+  messages contains every word in its text parts, and ranks by how often
+  the best such message uses them.
+- A metadata filter matches like JSONB ``@>``: objects match when every
+  filter key matches, arrays when every filter element is in the array,
+  and other values when equal.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any, TypeVar
+from uuid import UUID
+
+from .pagination import clamp_page_size, decode_search_token, encode_search_token
+
+ItemT = TypeVar("ItemT")
+
+# Letters and digits; like PostgreSQL's parser, underscores separate words
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def search_terms(query: str | None, metadata: Any = None) -> list[str] | None:
+    """Lowercase words of a search query, checking the search filters on something.
+
+    Args:
+        query: Full-text query, if any
+        metadata: Metadata filter, if any
+
+    Returns:
+        Words of the query, or None if only metadata is filtered on
+
+    Raises:
+        ValueError: If there is neither a query nor a metadata object, or the
+            query has no words
+    """
+    if metadata is not None and not isinstance(metadata, dict):
+        raise ValueError("Search metadata must be an object")
+    if query is None:
+        if metadata is None:
+            raise ValueError("Search needs a query or a metadata filter")
+        return None
+    terms = _WORD_RE.findall(query.lower())
+    if not terms:
+        raise ValueError(f"Search query has no words: {query!r}")
+    return terms
+
+
+def metadata_contains(value: Any, pattern: Any) -> bool:
+    """Whether ``value`` contains ``pattern``, like JSONB ``@>``."""
+    if isinstance(pattern, dict):
+        return isinstance(value, dict) and all(
+            key in value and metadata_contains(value[key], item)
+            for key, item in pattern.items()
+        )
+    if isinstance(pattern, list):
+        if not isinstance(value, list):
+            return False
+        return all(
+            any(metadata_contains(element, item) for element in value)
+            for item in pattern
+        )
+    # A top-level array contains a single value
+    if isinstance(value, list) and not isinstance(pattern, dict | list):
+        return pattern in value
+    return value == pattern
+
+
+def _message_words(message: dict[str, Any]) -> Counter[str]:
+    words: Counter[str] = Counter()
+    for part in message.get("parts", ()):
+        if isinstance(part, dict) and isinstance(part.get("text"), str):
+            words.update(_WORD_RE.findall(part["text"].lower()))
+    return words
+
+
+def rank_messages(messages: Iterable[dict[str, Any]], terms: list[str]) -> float:
+    """Rank of a task's messages for a query, or 0.0 if none matches.
+
+    Returns:
+        Occurrences of the query's words in the best matching message
+    """
+    best = 0
+    for message in messages:
+        words = _message_words(message)
+        if all(words[term] for term in terms):
+            best = max(best, sum(words[term] for term in set(terms)))
+    return float(best)
+
+
+def search_page(
+    keyed: list[tuple[float, datetime, UUID, ItemT]],
+    page_size: int | None,
+    page_token: str | None,
+) -> tuple[list[ItemT], str | None]:
+    """Take one page from (rank, created_at, id, item) tuples, best first.
+
+    Mirrors the PostgreSQL search query so the backends page identically.
+
+    Returns:
+        Items on the page and the token for the next page (None if last)
+    """
+    size = clamp_page_size(page_size)
+    if page_token is not None:
+        after = decode_search_token(page_token)
+        keyed = [k for k in keyed if (k[0], k[1], k[2]) < after]
+
+    keyed.sort(key=lambda k: (k[0], k[1], k[2]), reverse=True)
+    page = keyed[: size + 1]
+
+    next_token = None
+    if len(page) > size:
+        page = page[:size]
+        next_token = encode_search_token(page[-1][0], page[-1][1], page[-1][2])
+    return [item for _, _, _, item in page], next_token
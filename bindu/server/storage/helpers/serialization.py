@@ -3,11 +3,54 @@
 from typing import Any
 from uuid import UUID
 
+import orjson
+
+# Non-str keys (ints, UUIDs) become strings, like the stdlib json encoder does
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _encode_default(obj: Any) -> Any:
+    # orjson only encodes uuid.UUID itself; asyncpg returns its own subclass
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps_jsonb(obj: Any) -> str:
+    """Encode a value for a JSON/JSONB column in one pass.
+
+    Used as the engine's ``json_serializer``. UUIDs, datetimes, dataclasses
+    and enums are encoded natively, so values need no serialize_for_jsonb()
+    walk first.
+
+    Args:
+        obj: Value to encode
+
+    Returns:
+        Compact JSON text
+    """
+    return dumps_jsonb_bytes(obj).decode()
+
+
+def dumps_jsonb_bytes(obj: Any) -> bytes:
+    """Encode a value like dumps_jsonb(), returning UTF-8 bytes."""
+    return orjson.dumps(obj, default=_encode_default, option=_ORJSON_OPTIONS)
+
+
+def loads_jsonb(data: str | bytes | bytearray | memoryview) -> Any:
+    """Decode JSON text read from a JSON/JSONB column.
+
+    Used as the engine's ``json_deserializer``.
+    """
+    return orjson.loads(data)
+
 
 def serialize_for_jsonb(obj: Any) -> Any:
     """Recursively serialize objects for JSONB storage.
 
     Converts UUID objects to strings for PostgreSQL JSONB compatibility.
+    Values bound to JSONB columns are encoded by dumps_jsonb() and do not
+    need this; it is for values compared or used outside a JSON encoder.
 
     Args:
         obj: Object to serialize (dict, list, UUID, or primitive)
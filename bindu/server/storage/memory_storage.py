@@ -17,17 +17,24 @@ Note: All data is lost when the application stops. Use persistent storage for pr
 from __future__ import annotations as _annotations
 
 import copy
-from datetime import datetime, timezone
-from typing import Any, cast
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from datetime import date, datetime, timezone
+from typing import Any
 from uuid import UUID
 
 from typing_extensions import TypeVar
 
 from bindu.common.protocol.types import (
     Artifact,
+    FeedbackGroupBy,
+    FeedbackSummary,
+    ListContextsResult,
+    ListTasksResult,
     Message,
     PushNotificationConfig,
     Task,
+    TaskProjection,
     TaskState,
     TaskStatus,
 )
@@ -35,11 +42,74 @@ from bindu.settings import app_settings
 from bindu.utils.logging import get_logger
 from bindu.utils.retry import retry_storage_operation
 
-from .base import Storage
+from .base import RECORD_KEYS, DuplicateMessageError, RecordKind, Storage
+from .change_feed import (
+    TaskChange,
+    TaskChangeFeed,
+    TaskChangeOperation,
+    TaskSubscription,
+)
+from .helpers import (
+    normalize_message_uuids,
+    normalize_timestamp,
+    normalize_uuid,
+    project_task,
+    validate_projection,
+)
+from .helpers.feedback import (
+    FeedbackTotals,
+    add_feedback,
+    feedback_skill,
+    new_totals,
+    summarize_rollups,
+)
+from .helpers.pagination import (
+    as_utc,
+    clamp_page_size,
+    decode_page_token,
+    encode_page_token,
+)
+from .helpers.search import (
+    metadata_contains,
+    rank_messages,
+    search_page,
+    search_terms,
+)
 
 logger = get_logger("bindu.server.storage.memory_storage")
 
 ContextT = TypeVar("ContextT", default=Any)
+ItemT = TypeVar("ItemT")
+
+# Creation time for rows stored before creation times were tracked
+_EPOCH = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _keyset_page(
+    keyed: list[tuple[datetime, UUID, ItemT]],
+    page_size: int | None,
+    page_token: str | None,
+) -> tuple[list[ItemT], str | None]:
+    """Take one newest-first page from (created_at, id, item) tuples.
+
+    Mirrors the PostgreSQL keyset query so both backends page identically.
+
+    Returns:
+        Items on the page and the token for the next page (None if last)
+    """
+    size = clamp_page_size(page_size)
+    if page_token is not None:
+        after = decode_page_token(page_token)
+        keyed = [k for k in keyed if (k[0], k[1]) < after]
+
+    keyed.sort(key=lambda k: (k[0], k[1]), reverse=True)
+    page = keyed[: size + 1]
+
+    next_token = None
+    if len(page) > size:
+        page = page[:size]
+        next_token = encode_page_token(page[-1][0], page[-1][1])
+    return [item for _, _, item in page], next_token
 
 
 class InMemoryStorage(Storage[ContextT]):
@@ -49,6 +119,7 @@ class InMemoryStorage(Storage[ContextT]):
     - tasks: Dict[UUID, Task] - All tasks indexed by task_id
     - contexts: Dict[UUID, list[UUID]] - Task IDs grouped by context_id
     - task_feedback: Dict[UUID, List[dict]] - Optional feedback storage
+    - _feedback_rollups: Dict[(skill, day), totals] - Feedback aggregates
     """
 
     def __init__(self):
@@ -59,36 +130,98 @@ class InMemoryStorage(Storage[ContextT]):
         self.tasks: dict[UUID, Task] = {}
         self.contexts: dict[UUID, list[UUID]] = {}
         self.task_feedback: dict[UUID, list[dict[str, Any]]] = {}
+        # Feedback totals per (skill, UTC day), added to as feedback is stored
+        self._feedback_rollups: dict[tuple[str, date], FeedbackTotals] = {}
         self._webhook_configs: dict[UUID, PushNotificationConfig] = {}
+        # Creation time of tasks and contexts, the keyset for paginated listing
+        self._created_at: dict[UUID, datetime] = {}
+        # Change events for subscribe(); published by every task write
+        self._change_feed = TaskChangeFeed()
+        # Tasks per state, kept in step by _publish_change()
+        self._task_states: dict[UUID, str] = {}
+        self._state_counts: Counter[str] = Counter()
+
+    def _publish_change(self, task: Task, operation: TaskChangeOperation) -> None:
+        self._count_state_change(task["id"], task["status"]["state"], operation)
+        self._change_feed.publish(
+            TaskChange(
+                task_id=task["id"],
+                context_id=task["context_id"],
+                state=task["status"]["state"],
+                operation=operation,
+            )
+        )
+
+    def _count_state_change(
+        self, task_id: UUID, state: str, operation: TaskChangeOperation
+    ) -> None:
+        previous = self._task_states.pop(task_id, None)
+        if previous is not None:
+            self._state_counts[previous] -= 1
+            if not self._state_counts[previous]:
+                del self._state_counts[previous]
+        if operation != "delete":
+            self._task_states[task_id] = state
+            self._state_counts[state] += 1
 
     @retry_storage_operation(max_attempts=3, min_wait=0.1, max_wait=1)
     async def load_task(
-        self, task_id: UUID, history_length: int | None = None
+        self,
+        task_id: UUID,
+        history_length: int | None = None,
+        projection: TaskProjection = "full",
     ) -> Task | None:
         """Load a task from memory.
 
         Args:
             task_id: Unique identifier of the task
             history_length: Optional limit on message history length
+            projection: Which fields to return ("full", "summary" or "status")
 
         Returns:
             Task object if found, None otherwise
         """
         if not isinstance(task_id, UUID):
             raise TypeError(f"task_id must be UUID, got {type(task_id).__name__}")
+        projection = validate_projection(projection)
 
         task = self.tasks.get(task_id)
         if task is None:
             return None
 
-        # Always return a deep copy to prevent mutations affecting stored task
-        task_copy = cast(Task, copy.deepcopy(task))
+        # Always return a copy to prevent mutations affecting stored task;
+        # only the projected fields and history tail are copied
+        return project_task(task, projection, history_length)
+
+    async def load_tasks_many(
+        self,
+        task_ids: Iterable[UUID],
+        history_length: int | None = None,
+        projection: TaskProjection = "full",
+    ) -> dict[UUID, Task]:
+        """Load several tasks from memory in a single pass.
+
+        Args:
+            task_ids: Task identifiers (duplicates are loaded once)
+            history_length: Optional limit on message history length per task
+            projection: Which fields to return ("full", "summary" or "status")
 
-        # Limit history if requested
-        if history_length is not None and history_length > 0 and "history" in task:
-            task_copy["history"] = task["history"][-history_length:]
+        Returns:
+            Mapping of task ID to task copy for every task that exists
+
+        Raises:
+            TypeError: If any task_id is not UUID
+        """
+        projection = validate_projection(projection)
 
-        return task_copy
+        tasks: dict[UUID, Task] = {}
+        for task_id in task_ids:
+            if not isinstance(task_id, UUID):
+                raise TypeError(f"task_id must be UUID, got {type(task_id).__name__}")
+            task = self.tasks.get(task_id)
+            if task is not None and task_id not in tasks:
+                tasks[task_id] = project_task(task, projection, history_length)
+        return tasks
 
     @retry_storage_operation(max_attempts=3, min_wait=0.1, max_wait=1)
     async def submit_task(self, context_id: UUID, message: Message) -> Task:
@@ -98,6 +231,8 @@ class InMemoryStorage(Storage[ContextT]):
         - If task exists and is in non-terminal state: Append message and reset to 'submitted'
         - If task exists and is in terminal state: Raise error (immutable)
         - If task doesn't exist: Create new task
+        - If task already holds the message (same message_id): Raise
+          DuplicateMessageError with the task as it is (a retried send)
 
         Args:
             context_id: Context to associate the task with
@@ -109,6 +244,7 @@ class InMemoryStorage(Storage[ContextT]):
         Raises:
             TypeError: If IDs are invalid types
             ValueError: If attempting to continue a terminal task
+            DuplicateMessageError: If the task already holds the message
         """
         if not isinstance(context_id, UUID):
             raise TypeError(f"context_id must be UUID, got {type(context_id).__name__}")
@@ -159,6 +295,14 @@ class InMemoryStorage(Storage[ContextT]):
         existing_task = self.tasks.get(task_id)
 
         if existing_task:
+            # A retried send: the message is already in the history
+            message_id = message.get("message_id")
+            if message_id is not None and any(
+                entry.get("message_id") == message_id
+                for entry in existing_task.get("history", [])
+            ):
+                raise DuplicateMessageError(existing_task, message_id)
+
             # Task exists - check if it's mutable
             current_state = existing_task["status"]["state"]
 
@@ -183,6 +327,7 @@ class InMemoryStorage(Storage[ContextT]):
                 state="submitted", timestamp=datetime.now(timezone.utc).isoformat()
             )
 
+            self._publish_change(existing_task, "update")
             return existing_task
 
         # Task doesn't exist - create new task
@@ -197,12 +342,16 @@ class InMemoryStorage(Storage[ContextT]):
             history=[message],
         )
         self.tasks[task_id] = task
+        now = datetime.now(timezone.utc)
+        self._created_at[task_id] = now
 
         # Add task to context
         if context_id not in self.contexts:
             self.contexts[context_id] = []
+            self._created_at.setdefault(context_id, now)
         self.contexts[context_id].append(task_id)
 
+        self._publish_change(task, "insert")
         return task
 
     @retry_storage_operation(max_attempts=3, min_wait=0.1, max_wait=1)
@@ -268,8 +417,53 @@ class InMemoryStorage(Storage[ContextT]):
                 message["context_id"] = task["context_id"]
                 task["history"].append(message)
 
+        self._publish_change(task, "update")
         return task
 
+    async def transition_task(
+        self,
+        task_id: UUID,
+        expected_states: Iterable[TaskState],
+        state: TaskState,
+        new_artifacts: list[Artifact] | None = None,
+        new_messages: list[Message] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> Task | None:
+        """Update a task only if it is currently in one of the expected states.
+
+        The check and the update run without yielding to the event loop, so
+        the transition is atomic with respect to other coroutines.
+
+        Args:
+            task_id: Task to transition
+            expected_states: States the task must currently be in
+            state: New task state
+            new_artifacts: Optional artifacts to append
+            new_messages: Optional messages to append to history
+            metadata: Optional metadata to update/merge with task metadata
+
+        Returns:
+            Updated task object, or None if the task does not exist or is not
+            in one of the expected states
+
+        Raises:
+            TypeError: If task_id is not UUID
+        """
+        if not isinstance(task_id, UUID):
+            raise TypeError(f"task_id must be UUID, got {type(task_id).__name__}")
+
+        task = self.tasks.get(task_id)
+        if task is None or task["status"]["state"] not in set(expected_states):
+            return None
+
+        return await self.update_task(
+            task_id,
+            state=state,
+            new_artifacts=new_artifacts,
+            new_messages=new_messages,
+            metadata=metadata,
+        )
+
     async def update_context(self, context_id: UUID, context: ContextT) -> None:
         """Store or update context metadata.
 
@@ -327,23 +521,152 @@ class InMemoryStorage(Storage[ContextT]):
         if not isinstance(messages, list):
             raise TypeError(f"messages must be list, got {type(messages).__name__}")
 
-            self.contexts[context_id] = []
-
-    async def list_tasks(self, length: int | None = None) -> list[Task]:
+    async def list_tasks(
+        self,
+        length: int | None = None,
+        projection: TaskProjection = "full",
+        history_length: int | None = None,
+    ) -> list[Task]:
         """List all tasks in storage.
 
         Args:
             length: Optional limit on number of tasks to return (most recent)
+            projection: Which fields to return ("full", "summary" or "status")
+            history_length: Optional limit on message history length per task
 
         Returns:
             List of tasks
         """
-        if length is None:
-            return list(self.tasks.values())
+        projection = validate_projection(projection)
 
         # Optimize: Only convert to list what we need
         all_tasks = list(self.tasks.values())
-        return all_tasks[-length:] if length < len(all_tasks) else all_tasks
+        if length is not None and length < len(all_tasks):
+            all_tasks = all_tasks[-length:]
+
+        if projection == "full" and not history_length:
+            return all_tasks
+
+        return [project_task(task, projection, history_length) for task in all_tasks]
+
+    async def list_tasks_page(
+        self,
+        page_size: int | None = None,
+        page_token: str | None = None,
+        *,
+        projection: TaskProjection = "full",
+        history_length: int | None = None,
+        context_id: UUID | None = None,
+        states: Iterable[TaskState] | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> ListTasksResult:
+        """List one page of tasks, newest first, using a keyset cursor.
+
+        Args:
+            page_size: Maximum tasks per page (default 50, capped at 1000)
+            page_token: Cursor from a previous page's next_page_token
+            projection: Which fields to return ("full", "summary" or "status")
+            history_length: Optional limit on message history length per task
+            context_id: Only return tasks in this context
+            states: Only return tasks in one of these states
+            created_after: Only return tasks created at or after this time
+            created_before: Only return tasks created before this time
+
+        Returns:
+            Page of tasks, with next_page_token set if more tasks may follow
+        """
+        projection = validate_projection(projection)
+        state_set = set(states) if states is not None else None
+
+        if context_id is not None:
+            task_ids = self.contexts.get(context_id, [])
+            candidates = [self.tasks[t] for t in task_ids if t in self.tasks]
+        else:
+            candidates = list(self.tasks.values())
+
+        created_after, created_before = as_utc(created_after), as_utc(created_before)
+        keyed = []
+        for task in candidates:
+            created_at = self._created_at.get(task["id"], _EPOCH)
+            if state_set is not None and task["status"]["state"] not in state_set:
+                continue
+            if created_after is not None and created_at < created_after:
+                continue
+            if created_before is not None and created_at >= created_before:
+                continue
+            keyed.append((created_at, task["id"], task))
+
+        tasks, next_token = _keyset_page(keyed, page_size, page_token)
+        result = ListTasksResult(
+            tasks=[project_task(t, projection, history_length) for t in tasks]
+        )
+        if next_token is not None:
+            result["next_page_token"] = next_token
+        return result
+
+    async def search_tasks(
+        self,
+        query: str | None = None,
+        page_size: int | None = None,
+        page_token: str | None = None,
+        *,
+        metadata: dict[str, Any] | None = None,
+        projection: TaskProjection = "full",
+        history_length: int | None = None,
+        context_id: UUID | None = None,
+        states: Iterable[TaskState] | None = None,
+    ) -> ListTasksResult:
+        """Search tasks by message text and metadata, best matches first.
+
+        Every task is matched in Python (see helpers/search.py).
+
+        Args:
+            query: Words to find in the text parts of the task's messages
+            page_size: Maximum tasks per page (default 50, capped at 1000)
+            page_token: Cursor from a previous search page's next_page_token
+            metadata: Only return tasks whose metadata contains this object
+            projection: Which fields to return ("full", "summary" or "status")
+            history_length: Optional limit on message history length per task
+            context_id: Only return tasks in this context
+            states: Only return tasks in one of these states
+
+        Returns:
+            Page of tasks, with next_page_token set if more tasks may follow
+        """
+        projection = validate_projection(projection)
+        terms = search_terms(query, metadata)
+        state_set = set(states) if states is not None else None
+
+        if context_id is not None:
+            task_ids = self.contexts.get(context_id, [])
+            candidates = [self.tasks[t] for t in task_ids if t in self.tasks]
+        else:
+            candidates = list(self.tasks.values())
+
+        keyed = []
+        for task in candidates:
+            if state_set is not None and task["status"]["state"] not in state_set:
+                continue
+            if metadata is not None and not metadata_contains(
+                task.get("metadata", {}), metadata
+            ):
+                continue
+            rank = 0.0
+            if terms is not None:
+                rank = rank_messages(task.get("history", []), terms)
+                if not rank:
+                    continue
+            created_at = self._created_at.get(task["id"], _EPOCH)
+            keyed.append((rank, created_at, task["id"], task))
+
+        tasks, next_token = search_page(keyed, page_size, page_token)
+        result = ListTasksResult(
+            tasks=[project_task(t, projection, history_length) for t in tasks]
+        )
+        if next_token is not None:
+            result["next_page_token"] = next_token
+        return result
 
     async def count_tasks(self, status: str | None = None) -> int:
         """Count number of tasks, optionally filtered by status.
@@ -357,7 +680,15 @@ class InMemoryStorage(Storage[ContextT]):
         if status is None:
             return len(self.tasks)
 
-        return sum(1 for t in self.tasks.values() if t["status"]["state"] == status)
+        return self._state_counts[status]
+
+    async def count_tasks_by_state(self) -> dict[str, int]:
+        """Count tasks in every state from the counters kept on each write.
+
+        Returns:
+            Number of tasks per state; states without tasks are left out
+        """
+        return dict(self._state_counts)
 
     async def list_tasks_by_context(
         self, context_id: UUID, length: int | None = None
@@ -407,6 +738,50 @@ class InMemoryStorage(Storage[ContextT]):
             return contexts[-length:]
         return contexts
 
+    async def list_contexts_page(
+        self,
+        page_size: int | None = None,
+        page_token: str | None = None,
+        *,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> ListContextsResult:
+        """List one page of contexts, newest first, using a keyset cursor.
+
+        Args:
+            page_size: Maximum contexts per page (default 50, capped at 1000)
+            page_token: Cursor from a previous page's next_page_token
+            created_after: Only return contexts created at or after this time
+            created_before: Only return contexts created before this time
+
+        Returns:
+            Page of contexts, with next_page_token set if more may follow
+        """
+        created_after, created_before = as_utc(created_after), as_utc(created_before)
+        keyed = []
+        for ctx_id, task_ids in self.contexts.items():
+            created_at = self._created_at.get(ctx_id, _EPOCH)
+            if created_after is not None and created_at < created_after:
+                continue
+            if created_before is not None and created_at >= created_before:
+                continue
+            keyed.append((created_at, ctx_id, (ctx_id, task_ids)))
+
+        page, next_token = _keyset_page(keyed, page_size, page_token)
+        result = ListContextsResult(
+            contexts=[
+                {
+                    "context_id": ctx_id,
+                    "task_count": len(task_ids),
+                    "task_ids": list(task_ids),
+                }
+                for ctx_id, task_ids in page
+            ]
+        )
+        if next_token is not None:
+            result["next_page_token"] = next_token
+        return result
+
     async def clear_context(self, context_id: UUID) -> None:
         """Clear all tasks associated with a specific context.
 
@@ -432,13 +807,15 @@ class InMemoryStorage(Storage[ContextT]):
         # Remove all tasks associated with this context
         for task_id in task_ids:
             if task_id in self.tasks:
-                del self.tasks[task_id]
+                self._publish_change(self.tasks.pop(task_id), "delete")
+            self._created_at.pop(task_id, None)
             # Also clear feedback for these tasks
             if task_id in self.task_feedback:
                 del self.task_feedback[task_id]
 
         # Remove the context itself
         del self.contexts[context_id]
+        self._created_at.pop(context_id, None)
 
         logger.info(f"Cleared context {context_id}: removed {len(task_ids)} tasks")
 
@@ -447,10 +824,202 @@ class InMemoryStorage(Storage[ContextT]):
 
         Warning: This is a destructive operation.
         """
+        for task in list(self.tasks.values()):
+            self._publish_change(task, "delete")
         self.tasks.clear()
         self.contexts.clear()
         self.task_feedback.clear()
+        self._feedback_rollups.clear()
         self._webhook_configs.clear()
+        self._created_at.clear()
+
+    async def purge_expired_tasks(
+        self,
+        cutoffs: Mapping[TaskState, datetime],
+        limit: int,
+        archive: Callable[[list[Task]], Awaitable[None]] | None = None,
+    ) -> int:
+        """Delete one batch of tasks that have been in their state too long.
+
+        Args:
+            cutoffs: Oldest status timestamp kept, per state
+            limit: Maximum number of tasks to delete
+            archive: Called with copies of the expired tasks before deletion
+
+        Returns:
+            Number of tasks deleted
+        """
+        expired: list[tuple[datetime, UUID]] = []
+        for task_id, task in self.tasks.items():
+            cutoff = cutoffs.get(task["status"]["state"])
+            if cutoff is None:
+                continue
+            try:
+                timestamp = datetime.fromisoformat(task["status"]["timestamp"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if timestamp < cutoff:
+                expired.append((timestamp, task_id))
+
+        expired.sort(key=lambda item: item[0])
+        task_ids = [task_id for _, task_id in expired[:limit]]
+        if not task_ids:
+            return 0
+
+        if archive is not None:
+            await archive([copy.deepcopy(self.tasks[task_id]) for task_id in task_ids])
+
+        for task_id in task_ids:
+            task = self.tasks.pop(task_id, None)
+            if task is None:
+                continue
+            self._created_at.pop(task_id, None)
+            self.task_feedback.pop(task_id, None)
+            self._webhook_configs.pop(task_id, None)
+
+            context_id = task["context_id"]
+            context_tasks = self.contexts.get(context_id)
+            if context_tasks is not None:
+                if task_id in context_tasks:
+                    context_tasks.remove(task_id)
+                if not context_tasks:
+                    del self.contexts[context_id]
+                    self._created_at.pop(context_id, None)
+
+            self._publish_change(task, "delete")
+
+        logger.info(f"Purged {len(task_ids)} expired tasks")
+        return len(task_ids)
+
+    async def export_records(
+        self, kind: RecordKind, after: str | None, limit: int
+    ) -> list[dict[str, Any]]:
+        """Read one batch of records for export, in ascending key order.
+
+        Args:
+            kind: Which records to read
+            after: Key of the last record of the previous batch (None to start)
+            limit: Maximum number of records
+
+        Returns:
+            Copies of the records with keys greater than ``after``
+        """
+        sources: dict[RecordKind, dict[UUID, Any]] = {
+            "contexts": self.contexts,
+            "tasks": self.tasks,
+            "feedback": self.task_feedback,
+            "webhook_configs": self._webhook_configs,
+        }
+        source = sources[kind]
+        start = UUID(after) if after is not None else None
+        keys = sorted(key for key in source if start is None or key > start)
+
+        records: list[dict[str, Any]] = []
+        for key in keys[:limit]:
+            if kind == "contexts":
+                records.append(
+                    {
+                        "id": key,
+                        "created_at": self._created_at.get(key),
+                        "context_data": {},
+                        "message_history": [],
+                    }
+                )
+                continue
+            value = copy.deepcopy(source[key])
+            if kind == "tasks":
+                records.append({**value, "created_at": self._created_at.get(key)})
+            elif kind == "feedback":
+                records.append({"task_id": key, "feedback": value})
+            else:
+                records.append({"task_id": key, "config": value})
+        return records
+
+    async def import_records(
+        self, kind: RecordKind, records: list[dict[str, Any]]
+    ) -> int:
+        """Insert exported records that are not stored yet.
+
+        Args:
+            kind: Which records these are
+            records: Records as produced by export_records()
+
+        Returns:
+            Number of records inserted
+        """
+        inserted = 0
+        now = datetime.now(timezone.utc)
+        for record in records:
+            key = normalize_uuid(record[RECORD_KEYS[kind]], RECORD_KEYS[kind])
+            if kind == "contexts":
+                if key in self.contexts:
+                    continue
+                self.contexts[key] = []
+                self._created_at[key] = (
+                    normalize_timestamp(record.get("created_at")) or now
+                )
+            elif kind == "tasks":
+                if key in self.tasks:
+                    continue
+                task = self._task_from_record(key, record)
+                context_id = task["context_id"]
+                self.tasks[key] = task
+                self._created_at[key] = (
+                    normalize_timestamp(record.get("created_at")) or now
+                )
+                if context_id not in self.contexts:
+                    self.contexts[context_id] = []
+                    self._created_at.setdefault(context_id, now)
+                self.contexts[context_id].append(key)
+                self._publish_change(task, "insert")
+            elif key not in self.tasks:
+                # Feedback and webhook configs only follow imported tasks
+                continue
+            elif kind == "feedback":
+                if key in self.task_feedback:
+                    continue
+                self.task_feedback[key] = copy.deepcopy(list(record["feedback"]))
+                self._rollup_feedback(self.task_feedback[key])
+            else:
+                if key in self._webhook_configs:
+                    continue
+                self._webhook_configs[key] = copy.deepcopy(record["config"])
+            inserted += 1
+        return inserted
+
+    @staticmethod
+    def _task_from_record(task_id: UUID, record: dict[str, Any]) -> Task:
+        """Build a stored task from an exported task record."""
+        context_id = normalize_uuid(record["context_id"], "context_id")
+        task = Task(
+            id=task_id,
+            context_id=context_id,
+            kind=record.get("kind", "task"),
+            status=copy.deepcopy(record["status"]),
+            history=[
+                normalize_message_uuids(copy.deepcopy(message))
+                for message in record.get("history") or []
+            ],
+        )
+        if record.get("artifacts") is not None:
+            task["artifacts"] = copy.deepcopy(record["artifacts"])
+        if record.get("metadata") is not None:
+            task["metadata"] = copy.deepcopy(record["metadata"])
+        return task
+
+    async def subscribe(
+        self, task_id: UUID | None = None, context_id: UUID | None = None
+    ) -> TaskSubscription:
+        """Subscribe to task changes made through this storage instance.
+
+        Args:
+            task_id: Only deliver changes to this task
+            context_id: Only deliver changes to tasks in this context
+
+        Returns:
+            Async iterator of TaskChange events
+        """
+        return self._change_feed.subscribe(task_id, context_id)
 
     async def store_task_feedback(
         self, task_id: UUID, feedback_data: dict[str, Any]
@@ -475,6 +1044,15 @@ class InMemoryStorage(Storage[ContextT]):
         if task_id not in self.task_feedback:
             self.task_feedback[task_id] = []
         self.task_feedback[task_id].append(feedback_data)
+        self._rollup_feedback([feedback_data])
+
+    def _rollup_feedback(self, entries: Iterable[dict[str, Any]]) -> None:
+        day = datetime.now(timezone.utc).date()
+        for feedback_data in entries:
+            totals = self._feedback_rollups.setdefault(
+                (feedback_skill(feedback_data), day), new_totals()
+            )
+            add_feedback(totals, feedback_data)
 
     async def get_task_feedback(self, task_id: UUID) -> list[dict[str, Any]] | None:
         """Retrieve feedback for a task.
@@ -493,6 +1071,39 @@ class InMemoryStorage(Storage[ContextT]):
 
         return self.task_feedback.get(task_id)
 
+    async def get_feedback_summary(
+        self,
+        *,
+        skill_id: str | None = None,
+        since: date | None = None,
+        until: date | None = None,
+        group_by: Iterable[FeedbackGroupBy] = (),
+    ) -> list[FeedbackSummary]:
+        """Summarize stored feedback per skill and UTC day.
+
+        Args:
+            skill_id: Only count feedback for this skill
+            since: First day to count
+            until: Last day to count, inclusive
+            group_by: Split the summary by "skill", "day" or both
+
+        Returns:
+            One summary per group, by skill then day
+
+        Raises:
+            ValueError: If group_by has an unknown field
+        """
+        return summarize_rollups(
+            (
+                (skill, day, totals)
+                for (skill, day), totals in self._feedback_rollups.items()
+            ),
+            skill_id=skill_id,
+            since=since,
+            until=until,
+            group_by=group_by,
+        )
+
     # -------------------------------------------------------------------------
     # Webhook Persistence Operations (for long-running tasks)
     # -------------------------------------------------------------------------
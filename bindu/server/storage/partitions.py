@@ -0,0 +1,261 @@
+"""Monthly range partitions of the tasks table.
+
+The tasks table is partitioned by ``created_at`` into one partition per
+calendar month (``tasks_pYYYYMM``), plus a default partition that only
+catches rows no monthly partition covers. Listings, keyset pages and purges
+that bound ``created_at`` only scan the partitions in range, and old data is
+removed by dropping whole partitions instead of deleting rows.
+
+maintain_task_partitions() keeps this in shape:
+
+1. Create the partitions for the current month and ``months_ahead`` months
+   after it, so new tasks never land in the default partition.
+2. Detach the partitions that ended before the retention window. Detaching
+   only touches catalog rows, so the lock on tasks is brief. Their tasks are
+   subtracted from task_state_counts in the same transaction.
+3. Delete the detached partition's task ids (which takes their messages,
+   feedback and webhook configs with them) and the contexts left without
+   tasks, then drop it.
+
+Step 3 also picks up partitions a previous run detached but did not drop.
+Each step runs in its own transaction, which first takes a transaction-level
+advisory lock; concurrent maintainers (one per pod) skip the rest of the run
+when it is held.
+"""
+
+from __future__ import annotations as _annotations
+
+import re
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from bindu.utils.logging import get_logger
+
+from .helpers import sanitize_identifier
+
+logger = get_logger("bindu.server.storage.partitions")
+
+TASK_PARTITION_PREFIX = "tasks_p"
+_TASK_PARTITION_RE = re.compile(rf"^{TASK_PARTITION_PREFIX}(\d{{4}})(\d{{2}})$")
+
+# Advisory lock key (per schema) held while partitions are maintained
+_LOCK_KEY_SQL = "hashtext(current_schema() || '.bindu_task_partitions')"
+
+
+@dataclass
+class PartitionMaintenanceResult:
+    """Partitions created and dropped by one maintenance run."""
+
+    created: list[str] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
+    skipped: bool = False  # Not partitioned, or another process holds the lock
+
+
+def month_start(moment: datetime) -> datetime:
+    """First instant (UTC) of the month containing ``moment``."""
+    moment = moment.astimezone(timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """Shift a month start by a number of months (may be negative)."""
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    """Name of the partition holding tasks created in ``month``."""
+    return f"{TASK_PARTITION_PREFIX}{month:%Y%m}"
+
+
+def partition_month(name: str) -> datetime | None:
+    """Month covered by a partition, or None if not a monthly partition."""
+    match = _TASK_PARTITION_RE.match(name)
+    if match is None:
+        return None
+    return datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc)
+
+
+async def is_partitioned(conn: AsyncConnection) -> bool:
+    """Whether the tasks table on the search_path is partitioned."""
+    result = await conn.execute(
+        text("SELECT relkind::text FROM pg_class WHERE oid = to_regclass('tasks')")
+    )
+    return result.scalar() == "p"
+
+
+async def list_task_partitions(conn: AsyncConnection) -> list[str]:
+    """Monthly partitions currently attached to tasks, oldest first."""
+    result = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass('tasks')"
+        )
+    )
+    return sorted(name for (name,) in result if partition_month(name) is not None)
+
+
+async def list_detached_partitions(conn: AsyncConnection) -> list[str]:
+    """Monthly partition tables that were detached but not yet dropped."""
+    result = await conn.execute(
+        text(
+            "SELECT relname FROM pg_class "
+            "WHERE relnamespace = current_schema()::regnamespace "
+            "AND relkind = 'r' AND NOT relispartition "
+            "AND relname LIKE :prefix"
+        ),
+        {"prefix": f"{TASK_PARTITION_PREFIX}%"},
+    )
+    return sorted(name for (name,) in result if partition_month(name) is not None)
+
+
+async def create_task_partition(conn: AsyncConnection, month: datetime) -> bool:
+    """Create the partition for ``month`` unless it already exists.
+
+    Returns:
+        True if the partition was created
+    """
+    name = partition_name(month)
+    exists = await conn.execute(
+        text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}
+    )
+    if exists.scalar():
+        return False
+
+    lower = month.isoformat()
+    upper = add_months(month, 1).isoformat()
+    await conn.execute(
+        text(
+            f'CREATE TABLE "{name}" PARTITION OF tasks '
+            f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        )
+    )
+    return True
+
+
+async def detach_task_partition(conn: AsyncConnection, name: str) -> None:
+    """Detach a monthly partition from tasks (its rows leave the table)."""
+    if partition_month(name) is None:
+        raise ValueError(f"Not a task partition: {name}")
+    await conn.execute(text(f'ALTER TABLE tasks DETACH PARTITION "{name}"'))
+    # Detaching fires no triggers, so take its tasks out of task_state_counts
+    await conn.execute(
+        text(
+            "INSERT INTO task_state_counts AS c (state, shard, count) "
+            f'SELECT state, 0, -count(*) FROM "{name}" GROUP BY state ORDER BY state '
+            "ON CONFLICT (state, shard) DO UPDATE SET count = c.count + excluded.count"
+        )
+    )
+
+
+async def drop_detached_partition(conn: AsyncConnection, name: str) -> None:
+    """Delete the dependents of a detached partition's tasks and drop it."""
+    if partition_month(name) is None:
+        raise ValueError(f"Not a task partition: {name}")
+
+    # Their messages, feedback and webhook configs go with the ids (foreign
+    # keys to task_ids cascade)
+    await conn.execute(
+        text(f'DELETE FROM task_ids i USING "{name}" t WHERE i.id = t.id')
+    )
+    await conn.execute(
+        text(
+            f'DELETE FROM contexts c WHERE c.id IN (SELECT context_id FROM "{name}") '
+            "AND NOT EXISTS (SELECT 1 FROM tasks t WHERE t.context_id = c.id)"
+        )
+    )
+    await conn.execute(text(f'DROP TABLE "{name}"'))
+
+
+async def maintain_task_partitions(
+    engine: AsyncEngine,
+    now: datetime | None = None,
+    months_ahead: int = 3,
+    retention_months: int | None = None,
+    schema: str | None = None,
+) -> PartitionMaintenanceResult:
+    """Create upcoming partitions and drop the ones past retention.
+
+    Args:
+        engine: Engine whose connections use the storage's search_path
+        now: Reference time (defaults to the current UTC time)
+        months_ahead: Months after the current one to create partitions for
+        retention_months: Drop partitions that ended more than this many
+            months before the current month; None keeps every partition
+        schema: Schema to set per transaction, for engines shared by several
+            schemas; None uses the connection's search_path
+
+    Returns:
+        Partitions created and dropped
+    """
+    result = PartitionMaintenanceResult()
+    current = month_start(now or datetime.now(timezone.utc))
+    set_schema = (
+        f'SET LOCAL search_path TO "{sanitize_identifier(schema)}"' if schema else None
+    )
+
+    @asynccontextmanager
+    async def locked_transaction() -> AsyncIterator[bool]:
+        # Transaction-level lock: released at commit, so it never outlives
+        # the server connection (PgBouncer may switch it between transactions)
+        async with conn.begin():
+            if set_schema:
+                await conn.execute(text(set_schema))
+            locked = await conn.execute(
+                text(f"SELECT pg_try_advisory_xact_lock({_LOCK_KEY_SQL})")
+            )
+            yield bool(locked.scalar())
+
+    async with engine.connect() as conn:
+        async with locked_transaction() as locked:
+            if not locked or not await is_partitioned(conn):
+                result.skipped = True
+                return result
+            for offset in range(max(months_ahead, 0) + 1):
+                month = add_months(current, offset)
+                try:
+                    async with conn.begin_nested():
+                        if await create_task_partition(conn, month):
+                            result.created.append(partition_name(month))
+                except Exception as e:
+                    # Usually rows for this month already sit in the default
+                    # partition; they stay readable there
+                    logger.error(
+                        f"Could not create partition {partition_name(month)}: {e}"
+                    )
+
+        if retention_months is not None:
+            cutoff = add_months(current, -retention_months)
+            # Detaching locks tasks until commit, so it is not held while
+            # the partitions are dropped below
+            detached: list[str] = []
+            async with locked_transaction() as locked:
+                if locked:
+                    for name in await list_task_partitions(conn):
+                        month = partition_month(name)
+                        if month is not None and add_months(month, 1) <= cutoff:
+                            await detach_task_partition(conn, name)
+                    detached = await list_detached_partitions(conn)
+
+            for name in detached:
+                async with locked_transaction() as locked:
+                    if not locked:
+                        break
+                    # Another process may have dropped it in between
+                    if name not in await list_detached_partitions(conn):
+                        continue
+                    await drop_detached_partition(conn, name)
+                result.dropped.append(name)
+
+    if result.created:
+        logger.info(f"Created task partitions: {', '.join(result.created)}")
+    if result.dropped:
+        logger.info(f"Dropped task partitions: {', '.join(result.dropped)}")
+    return result
+
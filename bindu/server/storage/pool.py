@@ -0,0 +1,246 @@
+"""Connection pool telemetry, pre-warming and health checks for PostgreSQL.
+
+Every PostgreSQL engine is built with create_pooled_engine(), whose pool
+(InstrumentedPool) times each checkout. /metrics then shows per pool:
+
+- ``storage_pool_connections{state="checked_out"|"idle"}`` and
+  ``storage_pool_max_connections``
+- ``storage_pool_waiting``: checkouts waiting for a connection. Pools never
+  grow past ``postgres_pool_max``, so demand beyond it queues here
+- ``storage_pool_checkout_wait_seconds``: time spent getting a connection
+  from the pool (waiting for one, or opening a new one)
+- ``storage_pool_checkout_seconds``: the whole checkout, including the
+  pre-ping when ``postgres_pool_ping`` is "checkout"
+- ``storage_pool_checkout_timeouts_total``
+
+A wait histogram shifting right while checked_out sits at the maximum is
+pool starvation; a slow checkout with a fast wait is the pre-ping or a slow
+connect.
+
+Pools open ``postgres_pool_min`` connections on connect (prewarm()), so the
+first requests do not pay for connection setup. With ``postgres_pool_ping``
+set to "periodic", PoolPinger checks idle connections in the background
+instead of once per checkout.
+"""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import time
+from collections.abc import Mapping
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from bindu.server.metrics import get_metrics
+from bindu.settings import app_settings
+from bindu.utils.logging import get_logger
+
+from .helpers import dumps_jsonb, loads_jsonb
+
+logger = get_logger("bindu.server.storage.pool")
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool recording checkout timings under its label."""
+
+    label = "postgres"
+    _waiting = 0
+
+    def recreate(self) -> InstrumentedPool:
+        """Create the replacement pool (engine.dispose()), keeping the label."""
+        pool = super().recreate()
+        pool.label = self.label  # type: ignore[attr-defined]
+        return pool  # type: ignore[return-value]
+
+    def connect(self) -> Any:
+        """Check out a connection, recording how long it took."""
+        start = time.perf_counter()
+        connection = super().connect()
+        get_metrics().record_pool_checkout(self.label, time.perf_counter() - start)
+        return connection
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        self._waiting += 1
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            get_metrics().record_pool_timeout(self.label)
+            raise
+        finally:
+            self._waiting -= 1
+            get_metrics().record_pool_wait(self.label, time.perf_counter() - start)
+
+    def stats(self) -> Mapping[str, int]:
+        """Connections checked out, idle, waited for, and the maximum."""
+        return {
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "waiting": self._waiting,
+            "max": self.size() + max(self._max_overflow, 0),
+        }
+
+
+def pgbouncer_connect_args() -> dict[str, Any]:
+    """asyncpg arguments for PgBouncer transaction pooling.
+
+    Statements are not cached per connection, since consecutive transactions
+    may run on different server connections; prepared statements get unique
+    names so they never collide there.
+    """
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+
+
+def create_pooled_engine(
+    url: str, pool_max: int, timeout: float, label: str
+) -> AsyncEngine:
+    """Create an async engine with an instrumented pool of pool_max connections.
+
+    The pool's stats are reported on /metrics under ``label`` until
+    dispose_pooled_engine() is called.
+
+    Args:
+        url: SQLAlchemy asyncpg URL
+        pool_max: Connections in the pool (it never overflows)
+        timeout: Seconds to wait for a connection
+        label: Pool name in metrics
+    """
+    settings = app_settings.storage
+    engine = create_async_engine(
+        url,
+        json_serializer=dumps_jsonb,
+        json_deserializer=loads_jsonb,
+        poolclass=InstrumentedPool,
+        pool_size=pool_max,
+        max_overflow=0,
+        pool_timeout=timeout,
+        pool_pre_ping=settings.postgres_pool_ping == "checkout",
+        connect_args=pgbouncer_connect_args() if settings.postgres_pgbouncer else {},
+        echo=False,  # Set to True for SQL query logging
+    )
+    engine.sync_engine.pool.label = label  # type: ignore[attr-defined]
+
+    def _stats() -> Mapping[str, int]:
+        # Looked up each time: dispose() replaces the engine's pool
+        return engine.sync_engine.pool.stats()  # type: ignore[attr-defined]
+
+    get_metrics().register_pool(label, _stats)
+    return engine
+
+
+async def dispose_pooled_engine(engine: AsyncEngine) -> None:
+    """Close an engine from create_pooled_engine() and drop its metrics."""
+    pool = engine.sync_engine.pool
+    get_metrics().unregister_pool(pool.label)  # type: ignore[attr-defined]
+    await engine.dispose()
+
+
+async def prewarm(engine: AsyncEngine, connections: int) -> None:
+    """Open ``connections`` pooled connections so first requests find them ready.
+
+    Raises:
+        Exception: If a connection cannot be opened (the others are returned)
+    """
+    if connections <= 0:
+        return
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(connections)), return_exceptions=True
+    )
+    for result in results:
+        if not isinstance(result, BaseException):
+            await result.close()
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+async def ping_idle_connections(engine: AsyncEngine) -> int:
+    """Check each connection idle in the pool with a round trip.
+
+    Broken connections are invalidated (and reopened on their next use), and
+    a disconnect invalidates every connection opened before it.
+
+    Returns:
+        Number of broken connections found
+    """
+    held = []
+    broken = 0
+    try:
+        for _ in range(engine.sync_engine.pool.checkedin()):
+            # Each is held until the end, so the next checkout takes another
+            conn = await engine.connect()
+            held.append(conn)
+            try:
+                await conn.exec_driver_sql("SELECT 1")
+                await conn.rollback()
+            except exc.DBAPIError as e:
+                if not e.connection_invalidated:
+                    raise
+                broken += 1
+    finally:
+        for conn in held:
+            await conn.close()
+    return broken
+
+
+class PoolPinger:
+    """Ping idle pooled connections periodically instead of on each checkout."""
+
+    def __init__(self, engines: list[AsyncEngine], interval_seconds: float = 30.0):
+        """Initialize the pinger.
+
+        Args:
+            engines: Engines whose idle connections are checked
+            interval_seconds: Delay between checks
+        """
+        self.engines = engines
+        self.interval = interval_seconds
+        self._task: asyncio.Task[None] | None = None
+
+    async def ping_once(self) -> int:
+        """Check every engine once.
+
+        Returns:
+            Number of broken connections found
+        """
+        broken = 0
+        for engine in self.engines:
+            try:
+                broken += await ping_idle_connections(engine)
+            except Exception as e:
+                logger.warning(f"Pool health check failed: {e}")
+        if broken:
+            logger.warning(f"Replaced {broken} broken pooled connections")
+        return broken
+
+    async def start(self) -> None:
+        """Start the periodic checks."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_periodically())
+
+    async def stop(self) -> None:
+        """Stop the periodic checks."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run_periodically(self) -> None:
+        """Ping every interval until cancelled."""
+        while True:
+            try:
+                await asyncio.sleep(self.interval)
+                await self.ping_once()
+            except asyncio.CancelledError:
+                break
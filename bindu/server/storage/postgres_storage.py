@@ -25,38 +25,124 @@ Features:
 
 from __future__ import annotations as _annotations
 
-from typing import Any
+import asyncio
+import json
+from collections.abc import Awaitable, Callable, Iterable, Mapping, Sequence
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Literal
 from uuid import UUID
 
-from sqlalchemy import delete, func, select, update, cast
-from sqlalchemy.dialects.postgresql import insert, JSONB, JSON
+from sqlalchemy import (
+    ColumnElement,
+    String,
+    and_,
+    bindparam,
+    any_,
+    cast,
+    column,
+    delete,
+    exists,
+    false,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+    true,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    JSON,
+    JSONB,
+    UUID as PG_UUID,
+    aggregate_order_by,
+    insert,
+)
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 from typing_extensions import TypeVar
 
 from bindu.common.protocol.types import (
     Artifact,
+    FeedbackGroupBy,
+    FeedbackSummary,
+    ListContextsResult,
+    ListTasksResult,
     Message,
     PushNotificationConfig,
     Task,
+    TaskProjection,
     TaskState,
     TaskStatus,
 )
 from bindu.settings import app_settings
 from bindu.utils.logging import get_logger
 
-from .base import Storage
+from .base import DuplicateMessageError, RecordKind, Storage
+from .change_feed import TaskChange, TaskChangeFeed, TaskSubscription
+from .coalescer import WriteCoalescer
+from .compression import (
+    ZSTD_AVAILABLE,
+    CompactionResult,
+    TaskCompressor,
+    UnknownCompressionDictionary,
+    restore_compressed,
+)
+from .fast_path import AsyncpgFastPath
 from .helpers import (
+    includes_history,
     mask_database_url,
     normalize_message_uuids,
+    normalize_timestamp,
     normalize_uuid,
     sanitize_identifier,
-    serialize_for_jsonb,
+    validate_projection,
     validate_uuid_type,
 )
 from .helpers.db_operations import get_current_utc_timestamp
+from .helpers.feedback import RATINGS, feedback_summary, validate_group_by
+from .helpers.pagination import (
+    clamp_page_size,
+    decode_page_token,
+    decode_search_token,
+    encode_page_token,
+    encode_search_token,
+)
+from .helpers.search import search_terms
+from .partitions import (
+    PartitionMaintenanceResult,
+    create_task_partition,
+    is_partitioned,
+    list_task_partitions,
+    maintain_task_partitions,
+    month_start,
+    partition_month,
+    partition_name,
+)
+from .pool import PoolPinger, create_pooled_engine, dispose_pooled_engine, prewarm
+from .replicas import Replica, ReplicaRouter
+from .tenancy import (
+    SharedEngine,
+    acquire_shared_engine,
+    release_shared_engine,
+    schema_session_class,
+)
 from .schema import (
+    TASK_CHANGES_CHANNEL,
+    TEXT_SEARCH_CONFIG,
     contexts_table,
+    task_compression_dictionaries_table,
+    task_feedback_rollups_table,
     task_feedback_table,
+    task_ids_table,
+    task_messages_table,
+    task_state_counts_table,
     tasks_table,
     webhook_configs_table,
 )
@@ -65,12 +151,89 @@ logger = get_logger("bindu.server.storage.postgres_storage")
 
 ContextT = TypeVar("ContextT", default=Any)
 
+# tasks_table columns selected by the narrower projections
+_PROJECTION_COLUMNS: dict[str, frozenset[str]] = {
+    "summary": frozenset(
+        {"id", "context_id", "kind", "state", "state_timestamp", "metadata"}
+    ),
+    "status": frozenset({"id", "context_id", "kind", "state", "state_timestamp"}),
+}
+
+# (task_id, state, metadata or None) queued for a coalesced update_task()
+_StatusUpdate = tuple[UUID, TaskState, "dict[str, Any] | None"]
+
+T = TypeVar("T")
+
+# COPY file formats for copy_out()/copy_in()
+CopyFormat = Literal["binary", "csv"]
+
+# Tables carried by COPY dumps, in restore order (contexts before the tasks
+# referencing them, tasks before their dependents; compression dictionaries
+# travel with the compacted tasks that need them)
+COPY_TABLES: dict[str, Any] = {
+    table.name: table
+    for table in (
+        task_compression_dictionaries_table,
+        contexts_table,
+        tasks_table,
+        task_messages_table,
+        task_feedback_table,
+        webhook_configs_table,
+    )
+}
+
+# Generated columns left out of COPY dumps. copy_in() assigns new keys in
+# file order, so message order survives and ids never collide with existing
+# rows; search vectors are computed from the payload again
+_COPY_GENERATED_COLUMNS = {
+    "task_messages": {"seq", "search_vector"},
+    "task_feedback": {"id"},
+}
+
+# Staging table COPY FROM fills before rows are merged into the real table
+_COPY_STAGING_TABLE = "_bindu_copy_in"
+
+
+def _task_key(task_id: UUID) -> ColumnElement[bool]:
+    """Match one task on (id, created_at).
+
+    created_at is read from task_ids, so the query only scans the partition
+    holding the task instead of every partition's primary key.
+    """
+    return and_(
+        tasks_table.c.id == task_id,
+        tasks_table.c.created_at
+        == select(task_ids_table.c.created_at)
+        .where(task_ids_table.c.id == task_id)
+        .scalar_subquery(),
+    )
+
+
+def _task_keys(task_ids: Sequence[UUID]) -> ColumnElement[bool]:
+    """Match several tasks on (id, created_at), like _task_key()."""
+    return tuple_(tasks_table.c.id, tasks_table.c.created_at).in_(
+        select(task_ids_table.c.id, task_ids_table.c.created_at).where(
+            task_ids_table.c.id
+            == any_(literal(list(task_ids), ARRAY(PG_UUID(as_uuid=True))))
+        )
+    )
+
+
+def _asyncpg_url(url: str) -> str:
+    """Make sure a PostgreSQL URL selects the asyncpg driver."""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    if not url.startswith("postgresql+asyncpg://"):
+        return f"postgresql+asyncpg://{url}"
+    return url
+
 
 class PostgresStorage(Storage[ContextT]):
     """PostgreSQL storage implementation using SQLAlchemy imperative mapping.
 
     Storage Structure:
-    - tasks_table: All tasks with JSONB history and artifacts
+    - tasks_table: All tasks with JSONB artifacts and metadata
+    - task_messages_table: Append-only message history (one row per message)
     - contexts_table: Context metadata and message history
     - task_feedback_table: Optional feedback storage
 
@@ -80,6 +243,11 @@ class PostgresStorage(Storage[ContextT]):
     - Uses SQLAlchemy async engine with connection pool
     - Automatic reconnection on connection loss
     - Configurable pool size and timeouts
+    - Optional group commit of status/metadata updates (WriteCoalescer)
+    - Optional asyncpg fast path for hot task operations (AsyncpgFastPath)
+    - Optional read replicas for read-only queries (ReplicaRouter)
+    - Optional engine shared by every DID schema in the process (SharedEngine)
+    - Cross-pod task change feed over LISTEN/NOTIFY (one shared connection)
     """
 
     def __init__(
@@ -90,6 +258,11 @@ class PostgresStorage(Storage[ContextT]):
         timeout: int | None = None,
         command_timeout: int | None = None,
         did: str | None = None,
+        coalesce_writes: bool | None = None,
+        fast_path: bool | None = None,
+        replica_urls: list[str] | None = None,
+        shared_engine: bool | None = None,
+        listen_url: str | None = None,
     ):
         """Initialize PostgreSQL storage with SQLAlchemy.
 
@@ -102,18 +275,32 @@ class PostgresStorage(Storage[ContextT]):
             did: Decentralized Identifier for schema-based multi-tenancy isolation.
                 If provided, all operations will be scoped to this DID's schema.
                 If None, uses the 'public' schema (legacy behavior).
+            coalesce_writes: Batch status/metadata-only update_task() calls into
+                group commits (defaults to settings)
+            fast_path: Run load_task, submit_task, update_task and count_tasks
+                as prepared statements on an asyncpg pool (defaults to settings)
+            replica_urls: Read replicas to route read-only queries to
+                (defaults to settings)
+            shared_engine: Use the process-wide pool for this database instead
+                of a pool per storage (defaults to settings)
+            listen_url: Direct connection URL for LISTEN with postgres_pgbouncer
+                (defaults to settings)
         """
         # Use database URL from settings or parameter
         db_url = database_url or app_settings.storage.postgres_url
 
         # Ensure asyncpg driver is specified
-        if db_url is not None:
-            if db_url.startswith("postgresql://"):
-                db_url = db_url.replace("postgresql://", "postgresql+asyncpg://", 1)
-            elif not db_url.startswith("postgresql+asyncpg://"):
-                db_url = f"postgresql+asyncpg://{db_url}"
-
-        self.database_url: str | None = db_url
+        self.database_url: str | None = _asyncpg_url(db_url) if db_url else db_url
+        self.replica_urls = [
+            _asyncpg_url(url)
+            for url in (
+                app_settings.storage.postgres_replica_urls
+                if replica_urls is None
+                else replica_urls
+            )
+        ]
+        listen_url = listen_url or app_settings.storage.postgres_listen_url
+        self.listen_url = _asyncpg_url(listen_url) if listen_url else None
         self.pool_min = pool_min or app_settings.storage.postgres_pool_min
         self.pool_max = pool_max or app_settings.storage.postgres_pool_max
         self.timeout = timeout or app_settings.storage.postgres_timeout
@@ -121,8 +308,41 @@ class PostgresStorage(Storage[ContextT]):
             command_timeout or app_settings.storage.postgres_command_timeout
         )
 
+        self.coalesce_writes = (
+            app_settings.storage.postgres_coalesce_writes
+            if coalesce_writes is None
+            else coalesce_writes
+        )
+        self.fast_path = (
+            app_settings.storage.postgres_fast_path if fast_path is None else fast_path
+        )
+        self.shared_engine = (
+            app_settings.storage.postgres_shared_engine
+            if shared_engine is None
+            else shared_engine
+        )
+
         self._engine = None
         self._session_factory = None
+        self._coalescer: WriteCoalescer[_StatusUpdate, Task] | None = None
+        self._fast_path: AsyncpgFastPath | None = None
+        self._replicas: ReplicaRouter | None = None
+        self._shared: SharedEngine | None = None
+        self._pinger: PoolPinger | None = None
+        # Reads compacted tasks; dictionaries are loaded on first use
+        self._compressor: TaskCompressor | None = (
+            TaskCompressor(level=app_settings.storage.compression_level)
+            if ZSTD_AVAILABLE
+            else None
+        )
+
+        # LISTEN connection feeding _change_feed; held only while consumed
+        self._change_feed = TaskChangeFeed()
+        self._listener_conn: Any = None
+        # Unpooled engine on listen_url, used instead of PgBouncer for LISTEN
+        self._listener_engine: Any = None
+        self._listener_lock = asyncio.Lock()
+        self._partition_task: asyncio.Task[None] | None = None
         self.did = did
         self.schema_name: str | None = None
 
@@ -141,41 +361,27 @@ class PostgresStorage(Storage[ContextT]):
         Raises:
             ConnectionError: If unable to connect to database
         """
+        settings = app_settings.storage
         try:
             masked_url = mask_database_url(self.database_url)
             logger.info("Connecting to PostgreSQL database with SQLAlchemy...")
 
-            # Create async engine
-            self._engine = create_async_engine(
-                self.database_url,
-                pool_size=self.pool_max,
-                max_overflow=0,
-                pool_timeout=self.timeout,
-                pool_pre_ping=True,  # Verify connections before using
-                echo=False,  # Set to True for SQL query logging
-            )
-
-            # Set up event listener to set search_path for DID schema
-            if self.schema_name:
-                from sqlalchemy import event
-
-                sanitized_schema = sanitize_identifier(self.schema_name)
-
-                @event.listens_for(self._engine.sync_engine, "connect")
-                def set_search_path(dbapi_conn, connection_record):
-                    cursor = dbapi_conn.cursor()
-                    cursor.execute(f'SET search_path TO "{sanitized_schema}"')
-                    cursor.close()
+            if self.shared_engine:
+                await self._connect_shared_engine()
+            else:
+                self._engine = self._create_engine(self.database_url)
 
-            # Create session factory
-            self._session_factory = async_sessionmaker(
-                self._engine,
-                class_=AsyncSession,
-                expire_on_commit=False,
-            )
+                # Create session factory
+                self._session_factory = self._create_session_factory(self._engine)
 
             # If DID is provided, initialize the schema (this also tests the connection)
-            if self.did and self.schema_name:
+            if self._shared is not None:
+                if self.schema_name:
+                    await self._shared.ensure_schema(self.schema_name)
+                else:
+                    async with self._engine.begin() as conn:
+                        await conn.execute(select(1))
+            elif self.did and self.schema_name:
                 from bindu.utils.schema_manager import initialize_did_schema
 
                 logger.info(
@@ -190,6 +396,62 @@ class PostgresStorage(Storage[ContextT]):
                 async with self._engine.begin() as conn:
                     await conn.execute(select(1))
 
+            if self._shared is None:
+                # Open the rest of postgres_pool_min now, not on first requests
+                await prewarm(self._engine, min(self.pool_min, self.pool_max))
+
+            # Make sure this month's and upcoming partitions exist before
+            # the first insert, then keep them ahead in the background
+            await self.maintain_partitions()
+            if app_settings.storage.postgres_partition_maintenance_interval > 0:
+                self._partition_task = asyncio.create_task(
+                    self._maintain_partitions_periodically()
+                )
+
+            if self.fast_path and self._shared is not None:
+                logger.warning(
+                    "postgres_fast_path is ignored with postgres_shared_engine "
+                    "(it would open a pool per storage)"
+                )
+            elif self.fast_path and self.schema_name and settings.postgres_pgbouncer:
+                logger.warning(
+                    "postgres_fast_path is ignored with postgres_pgbouncer and a "
+                    "DID schema (PgBouncer does not pass search_path on connect)"
+                )
+            elif self.fast_path:
+                self._fast_path = AsyncpgFastPath(
+                    self.database_url,
+                    pool_min=self.pool_min,
+                    pool_max=self.pool_max,
+                    timeout=self.timeout,
+                    command_timeout=self.command_timeout,
+                    schema_name=self.schema_name,
+                    compressor=self._compressor,
+                )
+                await self._fast_path.connect()
+
+            if self.coalesce_writes:
+                self._coalescer = WriteCoalescer(
+                    self._flush_status_updates,
+                    window_ms=app_settings.storage.postgres_coalesce_window_ms,
+                    max_batch=app_settings.storage.postgres_coalesce_max_batch,
+                )
+
+            if self.replica_urls and self._shared is not None:
+                logger.warning(
+                    "postgres_replica_urls is ignored with postgres_shared_engine "
+                    "(it would open replica pools per storage)"
+                )
+            elif self.replica_urls:
+                await self._connect_replicas()
+
+            if self._shared is None and settings.postgres_pool_ping == "periodic":
+                engines = [self._engine]
+                if self._replicas is not None:
+                    engines += [replica.engine for replica in self._replicas.replicas]
+                self._pinger = PoolPinger(engines, settings.postgres_pool_ping_interval)
+                await self._pinger.start()
+
             logger.info(
                 f"PostgreSQL storage connected to {masked_url} (pool_size={self.pool_max})"
                 + (f" using schema '{self.schema_name}'" if self.schema_name else "")
@@ -199,10 +461,139 @@ class PostgresStorage(Storage[ContextT]):
             logger.error(f"Failed to connect to PostgreSQL: {e}")
             raise ConnectionError(f"Failed to connect to PostgreSQL: {e}") from e
 
+    async def _connect_shared_engine(self) -> None:
+        """Use the process-wide engine; its sessions set the schema per transaction."""
+        self._shared = await acquire_shared_engine(
+            self.database_url,  # type: ignore[arg-type]
+            pool_max=self.pool_max,
+            timeout=self.timeout,
+            tenant_pool_share=app_settings.storage.postgres_tenant_pool_share,
+        )
+        self._engine = self._shared.engine
+        self._session_factory = self._shared.session_factory(self.schema_name)
+
+    def _create_engine(self, url: str, label: str = "primary"):
+        """Create an async engine whose connections use the DID schema.
+
+        With postgres_pgbouncer the schema is set per transaction instead
+        (see _create_session_factory), since PgBouncer hands each transaction
+        whichever server connection is free.
+
+        Args:
+            url: SQLAlchemy asyncpg URL
+            label: Pool name in metrics (the schema is appended)
+        """
+        engine = create_pooled_engine(
+            url,
+            self.pool_max,
+            self.timeout,
+            label=f"{label}:{self.schema_name}" if self.schema_name else label,
+        )
+
+        # Set up event listener to set search_path for DID schema
+        if self.schema_name and not app_settings.storage.postgres_pgbouncer:
+            from sqlalchemy import event
+
+            sanitized_schema = sanitize_identifier(self.schema_name)
+
+            @event.listens_for(engine.sync_engine, "connect")
+            def set_search_path(dbapi_conn, connection_record):
+                # Outside a transaction: otherwise the first rolled back
+                # (read-only) session would undo the SET
+                autocommit = dbapi_conn.autocommit
+                dbapi_conn.autocommit = True
+                cursor = dbapi_conn.cursor()
+                cursor.execute(f'SET search_path TO "{sanitized_schema}"')
+                cursor.close()
+                dbapi_conn.autocommit = autocommit
+
+        return engine
+
+    def _create_session_factory(self, engine: Any) -> async_sessionmaker[AsyncSession]:
+        """Create the session factory for an engine from _create_engine()."""
+        if app_settings.storage.postgres_pgbouncer:
+            return async_sessionmaker(
+                engine,
+                class_=AsyncSession,
+                sync_session_class=schema_session_class(self.schema_name),
+                expire_on_commit=False,
+            )
+        return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def _connect_replicas(self) -> None:
+        """Create a pool per read replica and start probing their lag.
+
+        Replicas that cannot be reached yet are skipped until a probe
+        succeeds; they never fail connect().
+        """
+        replicas = []
+        for index, url in enumerate(self.replica_urls):
+            engine = self._create_engine(url, f"replica{index}")
+            replicas.append(
+                Replica(
+                    url=url,
+                    engine=engine,
+                    session_factory=self._create_session_factory(engine),
+                )
+            )
+            try:
+                await prewarm(engine, min(self.pool_min, self.pool_max))
+            except Exception as e:
+                logger.warning(
+                    f"Could not pre-warm replica {mask_database_url(url)}: {e}"
+                )
+
+        settings = app_settings.storage
+        self._replicas = ReplicaRouter(
+            replicas,
+            max_lag_seconds=settings.postgres_replica_max_lag_seconds,
+            sticky_seconds=settings.postgres_replica_sticky_seconds,
+            check_interval=settings.postgres_replica_check_interval,
+        )
+        await self._replicas.start()
+        healthy = sum(replica.healthy for replica in replicas)
+        logger.info(f"Routing reads to {healthy}/{len(replicas)} read replicas")
+
     async def disconnect(self) -> None:
         """Close SQLAlchemy engine and connection pool."""
-        if self._engine:
-            await self._engine.dispose()
+        if self._pinger is not None:
+            await self._pinger.stop()
+            self._pinger = None
+
+        if self._replicas is not None:
+            await self._replicas.stop()
+            self._replicas = None
+
+        if self._partition_task is not None:
+            self._partition_task.cancel()
+            try:
+                await self._partition_task
+            except asyncio.CancelledError:
+                pass
+            self._partition_task = None
+
+        if self._coalescer is not None:
+            # Commit queued status updates before the pool goes away
+            await self._coalescer.close()
+            self._coalescer = None
+
+        await self._stop_change_listener(force=True)
+        if self._listener_engine is not None:
+            await self._listener_engine.dispose()
+            self._listener_engine = None
+
+        if self._fast_path is not None:
+            await self._fast_path.close()
+            self._fast_path = None
+
+        if self._shared is not None:
+            # Other storages may still use the pool; the last one closes it
+            shared, self._shared = self._shared, None
+            self._engine = None
+            self._session_factory = None
+            await release_shared_engine(shared)
+        elif self._engine:
+            await dispose_pooled_engine(self._engine)
             logger.info("PostgreSQL connection pool closed")
             self._engine = None
             self._session_factory = None
@@ -222,15 +613,59 @@ class PostgresStorage(Storage[ContextT]):
         """Create a session factory that will set search_path on connection.
 
         This ensures all queries within the session use the DID's schema
-        without needing to qualify table names.
+        without needing to qualify table names. On a shared engine the
+        session also waits for one of the schema's connection slots.
 
         Returns:
             AsyncSession context manager
         """
+        if self._shared is not None:
+            return self._shared.session(self.schema_name)
         # Return the session factory directly - search_path will be set
         # at the connection level via event listeners or within transactions
         return self._session_factory()
 
+    def _mark_written(self, *keys: UUID) -> None:
+        """Read ``keys`` (everything, if none) from the primary for a while.
+
+        Called before a write is issued; the sticky window is far longer than
+        the write itself, so reads right after it see its result.
+        """
+        if self._replicas is not None:
+            self._replicas.mark_written(*keys)
+
+    async def _run_read(
+        self,
+        read: Callable[[Callable[[], AsyncSession]], Awaitable[T]],
+        *keys: UUID,
+        primary: Callable[[], Awaitable[T]] | None = None,
+    ) -> T:
+        """Run a read-only query on a read replica, or on the primary.
+
+        Args:
+            read: Runs the query on sessions from the given session factory
+            *keys: Task/context ids read, for read-your-writes stickiness
+            primary: Used instead of ``read`` when reading from the primary
+
+        Returns:
+            Result of the read
+        """
+        replica = self._replicas.choose(*keys) if self._replicas else None
+        if replica is not None:
+            try:
+                return await read(replica.session_factory)
+            except (OSError, DBAPIError) as e:
+                self._replicas.mark_failed(replica, e)  # type: ignore[union-attr]
+            except UnknownCompressionDictionary:
+                # Loaded below; the primary read then decodes the task
+                await self._load_compression_dictionaries()
+
+        if primary is not None:
+            return await self._retry_on_connection_error(primary)
+        return await self._retry_on_connection_error(
+            read, self._get_session_with_schema
+        )
+
     async def _retry_on_connection_error(self, func, *args, **kwargs):
         """Retry function on connection errors using Tenacity.
 
@@ -251,34 +686,203 @@ class PostgresStorage(Storage[ContextT]):
         max_retries = app_settings.storage.postgres_max_retries
         retry_delay = app_settings.storage.postgres_retry_delay
 
-        return await execute_with_retry(
-            func,
-            *args,
-            max_attempts=max_retries,
-            min_wait=retry_delay,
-            max_wait=retry_delay * max_retries,
-            **kwargs,
-        )
+        async def _execute():
+            return await execute_with_retry(
+                func,
+                *args,
+                max_attempts=max_retries,
+                min_wait=retry_delay,
+                max_wait=retry_delay * max_retries,
+                **kwargs,
+            )
 
-    def _row_to_task(self, row) -> Task:
+        try:
+            return await _execute()
+        except UnknownCompressionDictionary:
+            # A dictionary trained by another process since this one loaded
+            # them. Rows are decoded inside the read or the (rolled back)
+            # transaction, so running func again is safe
+            await self._load_compression_dictionaries()
+            return await _execute()
+
+    def _row_to_task(
+        self,
+        row,
+        projection: TaskProjection = "full",
+        with_history: bool = True,
+    ) -> Task:
         """Convert database row to Task protocol type.
 
         Args:
             row: SQLAlchemy Row object
+            projection: Projection the row was selected with
+            with_history: Whether the row carries a history column
 
         Returns:
             Task TypedDict from protocol
         """
-        return Task(
+        task = Task(
             id=row.id,
             context_id=row.context_id,
             kind=row.kind,
             status=TaskStatus(
                 state=row.state, timestamp=row.state_timestamp.isoformat()
             ),
-            history=row.history or [],
-            artifacts=row.artifacts or [],
-            metadata=row.metadata or {},
+        )
+
+        # Projected selects omit columns - only map what was selected
+        if with_history:
+            task["history"] = row.history or []
+        if projection == "full":
+            task["artifacts"] = row.artifacts or []
+        if projection != "status":
+            task["metadata"] = row.metadata or {}
+
+        # Compacted tasks keep history and artifacts in one compressed frame
+        compressed = getattr(row, "compressed_payload", None)
+        if isinstance(compressed, bytes):
+            restore_compressed(task, compressed, self._compressor)
+        return task
+
+    @staticmethod
+    def _trim_history(task: Task, history_length: int | None) -> Task:
+        """Trim history to the last ``history_length`` messages.
+
+        The SQL already limits task_messages rows, but legacy tasks.history
+        entries and a compacted task's compressed history are prepended ahead
+        of that tail and may push it over.
+        """
+        if history_length is not None and history_length > 0 and "history" in task:
+            task["history"] = task["history"][-history_length:]
+        return task
+
+    def _history_column(
+        self,
+        source: Any = tasks_table,
+        history_length: int | None = None,
+        appended: Any = None,
+    ):
+        """Build the history expression for a task row.
+
+        History lives in task_messages; the legacy tasks.history array (only
+        populated for rows written before the messages table existed) is
+        prepended so unmigrated rows stay readable.
+
+        Args:
+            source: Table or CTE exposing task columns (id, history)
+            history_length: If set, only the last N message rows are read
+            appended: Optional CTE of rows inserted by the same statement,
+                which the statement snapshot cannot see in task_messages
+
+        Returns:
+            Labeled SQL expression producing the JSONB history array
+        """
+        empty = literal_column("'[]'::jsonb")
+
+        stored = select(
+            task_messages_table.c.seq, task_messages_table.c.payload
+        ).where(task_messages_table.c.task_id == source.c.id)
+        if history_length is not None and history_length > 0:
+            stored = stored.order_by(task_messages_table.c.seq.desc()).limit(
+                history_length
+            )
+        stored = stored.correlate(source).subquery("stored_messages")
+
+        history = func.jsonb_concat(
+            func.coalesce(source.c.history, empty),
+            select(
+                func.coalesce(
+                    func.jsonb_agg(
+                        aggregate_order_by(stored.c.payload, stored.c.seq)
+                    ),
+                    empty,
+                )
+            ).scalar_subquery(),
+        )
+
+        if appended is not None:
+            history = func.jsonb_concat(
+                history,
+                select(
+                    func.coalesce(
+                        func.jsonb_agg(
+                            aggregate_order_by(appended.c.payload, appended.c.seq)
+                        ),
+                        empty,
+                    )
+                ).scalar_subquery(),
+            )
+
+        return history.label("history")
+
+    def _task_columns(
+        self,
+        source: Any = tasks_table,
+        history_length: int | None = None,
+        appended: Any = None,
+        projection: TaskProjection = "full",
+    ) -> list[Any]:
+        """Select list for a task row with history assembled from task_messages.
+
+        Projections are pushed down: "status" and "summary" never read
+        artifacts, and history is only aggregated when it is returned.
+
+        Args:
+            source: Table or CTE exposing task columns
+            history_length: Optional limit on message history length
+            appended: Optional CTE of message rows inserted by the same statement
+            projection: Which task fields to select
+
+        Returns:
+            Columns to pass to select()
+        """
+        if projection == "full":
+            columns: list[Any] = [c for c in source.c if c.name != "history"]
+        else:
+            names = _PROJECTION_COLUMNS[projection]
+            columns = [c for c in source.c if c.name in names]
+
+        if includes_history(projection, history_length):
+            if projection != "full":
+                columns.append(source.c.compressed_payload)
+            columns.append(self._history_column(source, history_length, appended))
+        return columns
+
+    def _append_messages(self, source: Any, messages: list[Any]):
+        """Build a CTE appending messages to task_messages for the row in ``source``.
+
+        Each message gets the task's context_id stamped in SQL and rows are
+        inserted in list order, so seq preserves message order.
+
+        Args:
+            source: CTE returning the updated task row (id, context_id)
+            messages: Messages to append (encoded by the engine's serializer)
+
+        Returns:
+            CTE returning (seq, payload) of the inserted rows
+        """
+        elements = (
+            func.jsonb_array_elements(cast(messages, JSONB))
+            .table_valued("value", with_ordinality="ordinality")
+            .render_derived(name="message")
+        )
+        rows = (
+            select(
+                source.c.id,
+                func.jsonb_concat(
+                    elements.c.value,
+                    func.jsonb_build_object("context_id", source.c.context_id),
+                ),
+            )
+            .select_from(source)
+            .join(elements, true())
+            .order_by(elements.c.ordinality)
+        )
+        return (
+            insert(task_messages_table)
+            .from_select(["task_id", "payload"], rows)
+            .returning(task_messages_table.c.seq, task_messages_table.c.payload)
+            .cte("appended")
         )
 
     # -------------------------------------------------------------------------
@@ -286,42 +890,109 @@ class PostgresStorage(Storage[ContextT]):
     # -------------------------------------------------------------------------
 
     async def load_task(
-        self, task_id: UUID, history_length: int | None = None
+        self,
+        task_id: UUID,
+        history_length: int | None = None,
+        projection: TaskProjection = "full",
     ) -> Task | None:
         """Load a task from PostgreSQL using SQLAlchemy.
 
+        Only the last ``history_length`` rows of task_messages are read when a
+        limit is given, and only the projected columns are selected. Full
+        projections go through the asyncpg fast path when it is enabled.
+
         Args:
             task_id: Unique identifier of the task
             history_length: Optional limit on message history length
+            projection: Which fields to return ("full", "summary" or "status")
 
         Returns:
             Task object if found, None otherwise
 
         Raises:
             TypeError: If task_id is not UUID
+            ValueError: If projection is unknown
         """
         task_id = validate_uuid_type(task_id, "task_id")
+        projection = validate_projection(projection)
 
         self._ensure_connected()
 
-        async def _load():
-            async with self._get_session_with_schema() as session:
-                stmt = select(tasks_table).where(tasks_table.c.id == task_id)
+        async def _load_fast():
+            task = await self._fast_path.load_task(  # type: ignore[union-attr]
+                task_id, history_length
+            )
+            return self._trim_history(task, history_length) if task else None
+
+        async def _load(new_session):
+            async with new_session() as session:
+                stmt = select(
+                    *self._task_columns(
+                        history_length=history_length, projection=projection
+                    )
+                ).where(_task_key(task_id))
                 result = await session.execute(stmt)
                 row = result.first()
 
                 if row is None:
                     return None
 
-                task = self._row_to_task(row)
+                task = self._row_to_task(
+                    row, projection, includes_history(projection, history_length)
+                )
+                return self._trim_history(task, history_length)
+
+        use_fast_path = self._fast_path is not None and projection == "full"
+        return await self._run_read(
+            _load, task_id, primary=_load_fast if use_fast_path else None
+        )
+
+    async def load_tasks_many(
+        self,
+        task_ids: Iterable[UUID],
+        history_length: int | None = None,
+        projection: TaskProjection = "full",
+    ) -> dict[UUID, Task]:
+        """Load several tasks with a single query.
+
+        Args:
+            task_ids: Task identifiers (duplicates are loaded once)
+            history_length: Optional limit on message history length per task
+            projection: Which fields to return ("full", "summary" or "status")
+
+        Returns:
+            Mapping of task ID to task for every task that exists
+
+        Raises:
+            TypeError: If any task_id is not UUID
+            ValueError: If projection is unknown
+        """
+        ids = list(
+            dict.fromkeys(validate_uuid_type(tid, "task_id") for tid in task_ids)
+        )
+        projection = validate_projection(projection)
+        if not ids:
+            return {}
+
+        self._ensure_connected()
 
-                # Limit history if requested
-                if history_length is not None and history_length > 0:
-                    task["history"] = task["history"][-history_length:]
+        async def _load_many(new_session):
+            async with new_session() as session:
+                stmt = select(
+                    *self._task_columns(
+                        history_length=history_length, projection=projection
+                    )
+                ).where(_task_keys(ids))
+                result = await session.execute(stmt)
 
-                return task
+                with_history = includes_history(projection, history_length)
+                tasks: dict[UUID, Task] = {}
+                for row in result.fetchall():
+                    task = self._row_to_task(row, projection, with_history)
+                    tasks[row.id] = self._trim_history(task, history_length)
+                return tasks
 
-        return await self._retry_on_connection_error(_load)
+        return await self._run_read(_load_many, *ids)
 
     async def submit_task(self, context_id: UUID, message: Message) -> Task:
         """Create a new task or continue an existing non-terminal task.
@@ -330,6 +1001,14 @@ class PostgresStorage(Storage[ContextT]):
         - If task exists and is in non-terminal state: Append message and reset to 'submitted'
         - If task exists and is in terminal state: Raise error (immutable)
         - If task doesn't exist: Create new task
+        - If task already holds the message (same message_id): Raise
+          DuplicateMessageError with the task as it is (a retried send)
+
+        Executed as a single statement after taking a transaction-level
+        advisory lock on the task id: the context row is created in a CTE, the
+        task is either updated (guarded by the terminal states) or inserted,
+        and the message is appended to task_messages. A task already holding
+        the message_id is left alone (unique per task in task_messages).
 
         Args:
             context_id: Context to associate the task with
@@ -341,89 +1020,271 @@ class PostgresStorage(Storage[ContextT]):
         Raises:
             TypeError: If IDs are invalid types
             ValueError: If attempting to continue a terminal task
+            DuplicateMessageError: If the task already holds the message
         """
         context_id = validate_uuid_type(context_id, "context_id")
         task_id = normalize_uuid(message.get("task_id"), "task_id")
         message = normalize_message_uuids(
             message, task_id=task_id, context_id=context_id
         )
+        message_id = message.get("message_id")
 
         self._ensure_connected()
+        self._mark_written(task_id, context_id)
+
+        if self._fast_path is not None:
+            return await self._retry_on_connection_error(
+                self._fast_path.submit_task,
+                task_id,
+                context_id,
+                message,
+                get_current_utc_timestamp(),
+            )
 
         async def _submit():
             async with self._get_session_with_schema() as session:
                 async with session.begin():
-                    # Check if task exists
-                    stmt = select(tasks_table).where(tasks_table.c.id == task_id)
-                    result = await session.execute(stmt)
-                    existing = result.first()
-
-                    if existing:
-                        # Task exists - check if mutable
-                        current_state = existing.state
+                    now = get_current_utc_timestamp()
 
-                        if current_state in app_settings.agent.terminal_states:
-                            raise ValueError(
-                                f"Cannot continue task {task_id}: Task is in terminal state '{current_state}' and is immutable. "
-                                f"Create a new task with referenceTaskIds to continue the conversation."
+                    # Serialize submits per task id, so two submits of a new
+                    # task do not both insert it (task_ids would refuse one)
+                    await session.execute(
+                        select(
+                            func.pg_advisory_xact_lock(
+                                func.hashtextextended(str(task_id), 0)
                             )
-
-                        logger.info(
-                            f"Continuing existing task {task_id} from state '{current_state}'"
                         )
+                    )
+                    task_exists = (
+                        select(task_ids_table.c.id)
+                        .where(task_ids_table.c.id == task_id)
+                        .exists()
+                    )
 
-                        serialized_message = serialize_for_jsonb(message)
-                        stmt = (
-                            update(tasks_table)
-                            .where(tasks_table.c.id == task_id)
-                            .values(
-                                history=func.jsonb_concat(
-                                    tasks_table.c.history,
-                                    cast([serialized_message], JSONB),
-                                ),
-                                state="submitted",
-                                state_timestamp=get_current_utc_timestamp(),
-                                updated_at=get_current_utc_timestamp(),
-                            )
-                            .returning(tasks_table)
+                    # Ensure context exists BEFORE creating task (foreign key constraint).
+                    # Only needed for new tasks; continued tasks keep their context.
+                    ensure_context = (
+                        insert(contexts_table)
+                        .from_select(
+                            ["id"],
+                            select(literal(context_id, PG_UUID(as_uuid=True))).where(
+                                ~task_exists
+                            ),
                         )
-                        result = await session.execute(stmt)
-                        updated_row = result.first()
-
-                        return self._row_to_task(updated_row)
+                        .on_conflict_do_nothing(index_elements=["id"])
+                        .cte("ensure_context")
+                    )
 
-                    # Ensure context exists BEFORE creating task (foreign key constraint)
-                    stmt = insert(contexts_table).values(
-                        id=context_id,
-                        context_data={},
-                        message_history=[],
+                    # Whether the task already holds this message (a retry)
+                    submitted = (
+                        exists().where(
+                            task_messages_table.c.task_id == task_id,
+                            task_messages_table.c.message_id == message_id,
+                        )
+                        if message_id is not None
+                        else false()
                     )
-                    stmt = stmt.on_conflict_do_nothing(index_elements=["id"])
-                    await session.execute(stmt)
 
-                    serialized_message = serialize_for_jsonb(message)
-                    now = get_current_utc_timestamp()
-                    stmt = (
+                    # Continue an existing non-terminal task...
+                    continued = (
+                        update(tasks_table)
+                        .where(
+                            _task_key(task_id),
+                            tasks_table.c.state.notin_(
+                                sorted(app_settings.agent.terminal_states)
+                            ),
+                            ~submitted,
+                        )
+                        .values(state="submitted", state_timestamp=now, updated_at=now)
+                        .returning(*tasks_table.c, literal(False).label("inserted"))
+                        .cte("continued")
+                    )
+                    # ...or create it if no task has this id
+                    created = (
                         insert(tasks_table)
-                        .values(
-                            id=task_id,
-                            context_id=context_id,
-                            kind="task",
-                            state="submitted",
-                            state_timestamp=now,
-                            history=[serialized_message],
-                            artifacts=[],
-                            metadata={},
+                        .from_select(
+                            [
+                                "id",
+                                "context_id",
+                                "kind",
+                                "state",
+                                "state_timestamp",
+                                "artifacts",
+                                "metadata",
+                            ],
+                            select(
+                                literal(task_id, PG_UUID(as_uuid=True)),
+                                literal(context_id, PG_UUID(as_uuid=True)),
+                                literal("task"),
+                                literal("submitted"),
+                                literal(now, tasks_table.c.state_timestamp.type),
+                                cast([], JSONB),
+                                cast({}, JSONB),
+                            ).where(~task_exists),
+                        )
+                        .returning(*tasks_table.c, literal(True).label("inserted"))
+                        .cte("created")
+                    )
+                    upserted = (
+                        select(continued).union_all(select(created)).cte("upserted")
+                    )
+                    appended = (
+                        insert(task_messages_table)
+                        .from_select(
+                            ["task_id", "message_id", "payload"],
+                            select(
+                                upserted.c.id,
+                                literal(message_id, PG_UUID(as_uuid=True)),
+                                cast(message, JSONB),
+                            ),
+                        )
+                        .returning(
+                            task_messages_table.c.seq, task_messages_table.c.payload
                         )
-                        .returning(tasks_table)
+                        .cte("appended")
                     )
+
+                    stmt = select(
+                        *self._task_columns(upserted, appended=appended)
+                    ).add_cte(ensure_context)
                     result = await session.execute(stmt)
-                    new_row = result.first()
+                    row = result.first()
+
+                    if row is None and message_id is not None:
+                        # Neither updated nor inserted: a retried send, or
+                        # the task is in a terminal state
+                        existing = (
+                            await session.execute(
+                                select(*self._task_columns()).where(
+                                    _task_key(task_id), submitted
+                                )
+                            )
+                        ).first()
+                        if existing is not None:
+                            raise DuplicateMessageError(
+                                self._row_to_task(existing), message_id
+                            )
 
-                    return self._row_to_task(new_row)
+                    if row is None:
+                        # Neither updated nor inserted: the task is in a terminal state
+                        state_result = await session.execute(
+                            select(tasks_table.c.state).where(_task_key(task_id))
+                        )
+                        current_state = state_result.scalar()
+                        raise ValueError(
+                            f"Cannot continue task {task_id}: Task is in terminal state '{current_state}' and is immutable. "
+                            f"Create a new task with referenceTaskIds to continue the conversation."
+                        )
+
+                    if not row.inserted:
+                        logger.info(f"Continuing existing task {task_id}")
+
+                    return self._row_to_task(row)
 
         return await self._retry_on_connection_error(_submit)
 
+    def _build_task_update_values(
+        self,
+        state: TaskState,
+        new_artifacts: list[Artifact] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Build the SET clause shared by update_task() and transition_task().
+
+        Args:
+            state: New task state
+            new_artifacts: Optional artifacts to append
+            metadata: Optional metadata to update/merge
+
+        Returns:
+            Dictionary of update values for an UPDATE on tasks_table
+        """
+        now = get_current_utc_timestamp()
+        update_values: dict[str, Any] = {
+            "state": state,
+            "state_timestamp": now,
+            "updated_at": now,
+        }
+
+        # JSONB values are encoded by the engine's json_serializer (orjson),
+        # which handles UUIDs and datetimes itself
+        if metadata:
+            update_values["metadata"] = func.jsonb_concat(
+                tasks_table.c.metadata, cast(metadata, JSONB)
+            )
+
+        if new_artifacts:
+            update_values["artifacts"] = func.jsonb_concat(
+                tasks_table.c.artifacts, cast(new_artifacts, JSONB)
+            )
+
+        return update_values
+
+    @staticmethod
+    def _normalize_new_messages(task_id: UUID, new_messages: list[Message]) -> None:
+        """Validate messages appended by an update and stamp their task_id.
+
+        Raises:
+            TypeError: If a message is not a dict
+        """
+        for message in new_messages:
+            if not isinstance(message, dict):
+                raise TypeError(f"Message must be dict, got {type(message).__name__}")
+            normalize_message_uuids(message, task_id=task_id)
+
+    def _build_task_update(
+        self,
+        task_id: UUID,
+        state: TaskState,
+        new_artifacts: list[Artifact] | None = None,
+        new_messages: list[Message] | None = None,
+        metadata: dict[str, Any] | None = None,
+        expected_states: list[str] | None = None,
+    ):
+        """Build the single statement used by update_task() and transition_task().
+
+        The task row is updated in a CTE, new messages are appended to
+        task_messages from that CTE, and the updated task is selected back.
+        Nothing is written when the UPDATE matches no row.
+
+        Args:
+            task_id: Task being updated
+            state: New task state
+            new_artifacts: Optional artifacts to append
+            new_messages: Optional messages to append to history
+            metadata: Optional metadata to update/merge
+            expected_states: If given, only update when the current state is one of these
+
+        Returns:
+            Executable SELECT statement returning the updated task row
+
+        Raises:
+            TypeError: If a message is not a dict
+        """
+        conditions = [_task_key(task_id)]
+        if expected_states is not None:
+            conditions.append(
+                tasks_table.c.state == any_(literal(expected_states, ARRAY(String)))
+            )
+
+        updated = (
+            update(tasks_table)
+            .where(*conditions)
+            .values(**self._build_task_update_values(state, new_artifacts, metadata))
+            .returning(*tasks_table.c)
+            .cte("updated")
+        )
+
+        appended = None
+        if new_messages:
+            self._normalize_new_messages(task_id, new_messages)
+            appended = self._append_messages(updated, new_messages)
+
+        stmt = select(*self._task_columns(updated, appended=appended))
+        if appended is not None:
+            stmt = stmt.add_cte(appended)
+        return stmt
+
     async def update_task(
         self,
         task_id: UUID,
@@ -434,6 +1295,13 @@ class PostgresStorage(Storage[ContextT]):
     ) -> Task:
         """Update task state and append new content using SQLAlchemy.
 
+        Issues a single statement; new messages are inserted into
+        task_messages rather than rewriting a history array. With write
+        coalescing enabled, updates that only change state and metadata are
+        group-committed with other concurrent updates (see
+        _flush_status_updates); the call still returns after the commit.
+        Other updates go through the asyncpg fast path when it is enabled.
+
         Args:
             task_id: Task to update
             state: New task state
@@ -451,80 +1319,223 @@ class PostgresStorage(Storage[ContextT]):
         task_id = validate_uuid_type(task_id, "task_id")
 
         self._ensure_connected()
+        self._mark_written(task_id)
+
+        if self._coalescer is not None and not new_artifacts and not new_messages:
+            return await self._coalescer.submit(
+                task_id, (task_id, state, metadata or None)
+            )
+
+        if self._fast_path is not None:
+            if new_messages:
+                self._normalize_new_messages(task_id, new_messages)
+            if self._coalescer is not None:
+                await self._coalescer.wait_for(task_id)
+            return await self._retry_on_connection_error(
+                self._fast_path.update_task,
+                task_id,
+                state,
+                get_current_utc_timestamp(),
+                new_artifacts,
+                new_messages,
+                metadata,
+            )
+
+        stmt = self._build_task_update(
+            task_id, state, new_artifacts, new_messages, metadata
+        )
+
+        if self._coalescer is not None:
+            # Keep per-task ordering with queued group-commit updates
+            await self._coalescer.wait_for(task_id)
 
         async def _update():
             async with self._get_session_with_schema() as session:
                 async with session.begin():
-                    # Check if task exists
-                    stmt = select(tasks_table).where(tasks_table.c.id == task_id)
                     result = await session.execute(stmt)
-                    task_row = result.first()
+                    updated_row = result.first()
 
-                    if task_row is None:
+                    if updated_row is None:
                         raise KeyError(f"Task {task_id} not found")
 
-                    now = get_current_utc_timestamp()
-                    update_values = {
-                        "state": state,
-                        "state_timestamp": now,
-                        "updated_at": now,
-                    }
+                    return self._row_to_task(updated_row)
 
-                    if metadata:
-                        serialized_metadata = serialize_for_jsonb(metadata)
-                        update_values["metadata"] = func.jsonb_concat(
-                            tasks_table.c.metadata, cast(serialized_metadata, JSONB)
-                        )
+        return await self._retry_on_connection_error(_update)
 
-                    if new_artifacts:
-                        serialized_artifacts = serialize_for_jsonb(new_artifacts)
-                        update_values["artifacts"] = func.jsonb_concat(
-                            tasks_table.c.artifacts, cast(serialized_artifacts, JSONB)
-                        )
+    async def transition_task(
+        self,
+        task_id: UUID,
+        expected_states: Iterable[TaskState],
+        state: TaskState,
+        new_artifacts: list[Artifact] | None = None,
+        new_messages: list[Message] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> Task | None:
+        """Atomically move a task between states with one guarded UPDATE.
 
-                    if new_messages:
-                        for message in new_messages:
-                            if not isinstance(message, dict):
-                                raise TypeError(
-                                    f"Message must be dict, got {type(message).__name__}"
-                                )
-                            normalize_message_uuids(
-                                message, task_id=task_id, context_id=task_row.context_id
-                            )
+        Runs ``UPDATE tasks ... WHERE id = :id AND state = ANY(:expected)
+        RETURNING *`` so the state check and the write happen in one round trip.
 
-                        serialized_messages = serialize_for_jsonb(new_messages)
-                        update_values["history"] = func.jsonb_concat(
-                            tasks_table.c.history, cast(serialized_messages, JSONB)
-                        )
+        Args:
+            task_id: Task to transition
+            expected_states: States the task must currently be in
+            state: New task state
+            new_artifacts: Optional artifacts to append
+            new_messages: Optional messages to append to history
+            metadata: Optional metadata to update/merge
 
-                    # Execute update
-                    stmt = (
-                        update(tasks_table)
-                        .where(tasks_table.c.id == task_id)
-                        .values(**update_values)
-                        .returning(tasks_table)
-                    )
+        Returns:
+            Updated task object, or None if the task does not exist or is not
+            in one of the expected states
+
+        Raises:
+            TypeError: If task_id is not UUID
+        """
+        task_id = validate_uuid_type(task_id, "task_id")
+
+        self._ensure_connected()
+        self._mark_written(task_id)
+
+        stmt = self._build_task_update(
+            task_id,
+            state,
+            new_artifacts,
+            new_messages,
+            metadata,
+            expected_states=sorted(set(expected_states)),
+        )
+
+        if self._coalescer is not None:
+            await self._coalescer.wait_for(task_id)
+
+        async def _transition():
+            async with self._get_session_with_schema() as session:
+                async with session.begin():
                     result = await session.execute(stmt)
                     updated_row = result.first()
 
+                    if updated_row is None:
+                        return None
+
                     return self._row_to_task(updated_row)
 
-        return await self._retry_on_connection_error(_update)
+        return await self._retry_on_connection_error(_transition)
+
+    def _build_status_batch_update(self, batch: list[_StatusUpdate]):
+        """Build one multi-row UPDATE applying a batch of status updates.
+
+        Each task may appear at most once in ``batch``.
+
+        Args:
+            batch: (task_id, state, metadata or None) per task
+
+        Returns:
+            Executable SELECT statement returning the updated task rows
+        """
+        rows = values(
+            column("id", PG_UUID(as_uuid=True)),
+            column("state", String),
+            column("metadata", JSONB),
+            name="batch",
+        ).data(batch)
+
+        now = get_current_utc_timestamp()
+        updated = (
+            update(tasks_table)
+            .where(
+                tasks_table.c.id == rows.c.id,
+                task_ids_table.c.id == rows.c.id,
+                tasks_table.c.created_at == task_ids_table.c.created_at,
+            )
+            .values(
+                state=rows.c.state,
+                state_timestamp=now,
+                updated_at=now,
+                # jsonb || NULL is NULL, so rows without metadata keep theirs
+                metadata=func.coalesce(
+                    func.jsonb_concat(tasks_table.c.metadata, rows.c.metadata),
+                    tasks_table.c.metadata,
+                ),
+            )
+            .returning(*tasks_table.c)
+            .cte("updated")
+        )
+        return select(*self._task_columns(updated))
+
+    async def _flush_status_updates(
+        self, batch: list[_StatusUpdate]
+    ) -> list[Task | KeyError]:
+        """Apply a coalesced batch of update_task() calls in one transaction.
 
-    async def list_tasks(self, length: int | None = None) -> list[Task]:
+        Repeated updates of the same task are split into successive rounds,
+        each a single multi-row UPDATE, so every task is written in the order
+        its updates were submitted. All rounds share one commit.
+
+        Args:
+            batch: Queued updates in submission order
+
+        Returns:
+            Updated task per entry, or KeyError if the task does not exist
+        """
+        rounds: list[list[int]] = []
+        seen: dict[UUID, int] = {}
+        for index, (task_id, _, _) in enumerate(batch):
+            round_no = seen.get(task_id, 0)
+            seen[task_id] = round_no + 1
+            if round_no == len(rounds):
+                rounds.append([])
+            rounds[round_no].append(index)
+
+        async def _flush():
+            results: list[Any] = [None] * len(batch)
+            async with self._get_session_with_schema() as session:
+                async with session.begin():
+                    for indexes in rounds:
+                        stmt = self._build_status_batch_update(
+                            [batch[i] for i in indexes]
+                        )
+                        result = await session.execute(stmt)
+                        updated = {row.id: row for row in result.fetchall()}
+                        for i in indexes:
+                            row = updated.get(batch[i][0])
+                            results[i] = (
+                                self._row_to_task(row)
+                                if row is not None
+                                else KeyError(f"Task {batch[i][0]} not found")
+                            )
+            return results
+
+        return await self._retry_on_connection_error(_flush)
+
+    async def list_tasks(
+        self,
+        length: int | None = None,
+        projection: TaskProjection = "full",
+        history_length: int | None = None,
+    ) -> list[Task]:
         """List all tasks using SQLAlchemy.
 
         Args:
             length: Optional limit on number of tasks to return
+            projection: Which fields to return ("full", "summary" or "status")
+            history_length: Optional limit on message history length per task
 
         Returns:
             List of tasks
+
+        Raises:
+            ValueError: If projection is unknown
         """
+        projection = validate_projection(projection)
         self._ensure_connected()
 
-        async def _list():
-            async with self._get_session_with_schema() as session:
-                stmt = select(tasks_table).order_by(tasks_table.c.created_at.desc())
+        async def _list(new_session):
+            async with new_session() as session:
+                stmt = select(
+                    *self._task_columns(
+                        history_length=history_length, projection=projection
+                    )
+                ).order_by(tasks_table.c.created_at.desc())
 
                 if length is not None:
                     stmt = stmt.limit(length)
@@ -532,13 +1543,238 @@ class PostgresStorage(Storage[ContextT]):
                 result = await session.execute(stmt)
                 rows = result.fetchall()
 
-                return [self._row_to_task(row) for row in rows]
+                with_history = includes_history(projection, history_length)
+                return [
+                    self._trim_history(
+                        self._row_to_task(row, projection, with_history),
+                        history_length,
+                    )
+                    for row in rows
+                ]
+
+        return await self._run_read(_list)
+
+    async def list_tasks_page(
+        self,
+        page_size: int | None = None,
+        page_token: str | None = None,
+        *,
+        projection: TaskProjection = "full",
+        history_length: int | None = None,
+        context_id: UUID | None = None,
+        states: Iterable[TaskState] | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> ListTasksResult:
+        """List one page of tasks, newest first, using a keyset cursor.
+
+        The page is read as ``WHERE (created_at, id) < (:created_at, :id)
+        ORDER BY created_at DESC, id DESC LIMIT :size + 1``, a range scan on
+        idx_tasks_created_at_id (or its context/state variants), so the cost
+        of a page does not depend on how deep the client has paged.
+
+        Args:
+            page_size: Maximum tasks per page (default 50, capped at 1000)
+            page_token: Cursor from a previous page's next_page_token
+            projection: Which fields to return ("full", "summary" or "status")
+            history_length: Optional limit on message history length per task
+            context_id: Only return tasks in this context
+            states: Only return tasks in one of these states
+            created_after: Only return tasks created at or after this time
+            created_before: Only return tasks created before this time
+
+        Returns:
+            Page of tasks, with next_page_token set if more tasks may follow
+
+        Raises:
+            TypeError: If context_id is not UUID
+            ValueError: If page_token or projection is invalid
+        """
+        projection = validate_projection(projection)
+        size = clamp_page_size(page_size)
+        after = decode_page_token(page_token) if page_token is not None else None
+        if context_id is not None:
+            context_id = validate_uuid_type(context_id, "context_id")
+
+        self._ensure_connected()
+
+        async def _page(new_session):
+            async with new_session() as session:
+                stmt = select(
+                    *self._task_columns(
+                        history_length=history_length, projection=projection
+                    ),
+                    tasks_table.c.created_at.label("page_created_at"),
+                )
+
+                if context_id is not None:
+                    stmt = stmt.where(tasks_table.c.context_id == context_id)
+                if states is not None:
+                    stmt = stmt.where(tasks_table.c.state.in_(list(states)))
+                if created_after is not None:
+                    stmt = stmt.where(tasks_table.c.created_at >= created_after)
+                if created_before is not None:
+                    stmt = stmt.where(tasks_table.c.created_at < created_before)
+                if after is not None:
+                    stmt = stmt.where(
+                        tuple_(tasks_table.c.created_at, tasks_table.c.id)
+                        < tuple_(literal(after[0]), literal(after[1]))
+                    )
+
+                stmt = stmt.order_by(
+                    tasks_table.c.created_at.desc(), tasks_table.c.id.desc()
+                ).limit(size + 1)
+
+                result = await session.execute(stmt)
+                rows = result.fetchall()
+
+                with_history = includes_history(projection, history_length)
+                page = ListTasksResult(
+                    tasks=[
+                        self._trim_history(
+                            self._row_to_task(row, projection, with_history),
+                            history_length,
+                        )
+                        for row in rows[:size]
+                    ]
+                )
+                if len(rows) > size:
+                    last = rows[size - 1]
+                    page["next_page_token"] = encode_page_token(
+                        last.page_created_at, last.id
+                    )
+                return page
+
+        keys = [context_id] if context_id is not None else []
+        return await self._run_read(_page, *keys)
+
+    async def search_tasks(
+        self,
+        query: str | None = None,
+        page_size: int | None = None,
+        page_token: str | None = None,
+        *,
+        metadata: dict[str, Any] | None = None,
+        projection: TaskProjection = "full",
+        history_length: int | None = None,
+        context_id: UUID | None = None,
+        states: Iterable[TaskState] | None = None,
+    ) -> ListTasksResult:
+        """Search tasks by message text and metadata, best matches first.
+
+        Messages matching the query are found through the GIN index on
+        task_messages.search_vector and ranked with ts_rank; a task takes the
+        rank of its best message. The metadata filter is a JSONB ``@>`` served
+        by idx_tasks_metadata_gin. Pages continue strictly after the
+        (rank, created_at, id) of the previous page's last task.
+
+        Compacted tasks no longer have rows in task_messages, so the query
+        does not find them; the metadata filter still does.
+
+        Args:
+            query: Words to find in the text parts of the task's messages
+            page_size: Maximum tasks per page (default 50, capped at 1000)
+            page_token: Cursor from a previous search page's next_page_token
+            metadata: Only return tasks whose metadata contains this object
+            projection: Which fields to return ("full", "summary" or "status")
+            history_length: Optional limit on message history length per task
+            context_id: Only return tasks in this context
+            states: Only return tasks in one of these states
+
+        Returns:
+            Page of tasks, with next_page_token set if more tasks may follow
+
+        Raises:
+            TypeError: If context_id is not UUID
+            ValueError: If the search has no filter, or page_token or
+                projection is invalid
+        """
+        projection = validate_projection(projection)
+        terms = search_terms(query, metadata)
+        size = clamp_page_size(page_size)
+        after = decode_search_token(page_token) if page_token is not None else None
+        if context_id is not None:
+            context_id = validate_uuid_type(context_id, "context_id")
+
+        self._ensure_connected()
 
-        return await self._retry_on_connection_error(_list)
+        async def _search(new_session):
+            async with new_session() as session:
+                stmt = select(
+                    *self._task_columns(
+                        history_length=history_length, projection=projection
+                    ),
+                    tasks_table.c.created_at.label("page_created_at"),
+                )
+                key = [tasks_table.c.created_at, tasks_table.c.id]
+
+                if terms is not None:
+                    # Same words as the other backends match
+                    tsquery = func.plainto_tsquery(
+                        literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig"),
+                        " ".join(terms),
+                    )
+                    vector = task_messages_table.c.search_vector
+                    hits = (
+                        select(
+                            task_messages_table.c.task_id,
+                            func.max(func.ts_rank(vector, tsquery)).label("rank"),
+                        )
+                        .where(vector.op("@@")(tsquery))
+                        .group_by(task_messages_table.c.task_id)
+                        .cte("hits")
+                    )
+                    stmt = stmt.add_columns(hits.c.rank.label("search_rank"))
+                    stmt = stmt.join_from(
+                        tasks_table, hits, hits.c.task_id == tasks_table.c.id
+                    )
+                    key.insert(0, hits.c.rank)
+
+                if metadata is not None:
+                    stmt = stmt.where(tasks_table.c.metadata.contains(metadata))
+                if context_id is not None:
+                    stmt = stmt.where(tasks_table.c.context_id == context_id)
+                if states is not None:
+                    stmt = stmt.where(tasks_table.c.state.in_(list(states)))
+                if after is not None:
+                    position = after if terms is not None else after[1:]
+                    stmt = stmt.where(
+                        tuple_(*key) < tuple_(*(literal(v) for v in position))
+                    )
+
+                stmt = stmt.order_by(*(c.desc() for c in key)).limit(size + 1)
+
+                result = await session.execute(stmt)
+                rows = result.fetchall()
+
+                with_history = includes_history(projection, history_length)
+                page = ListTasksResult(
+                    tasks=[
+                        self._trim_history(
+                            self._row_to_task(row, projection, with_history),
+                            history_length,
+                        )
+                        for row in rows[:size]
+                    ]
+                )
+                if len(rows) > size:
+                    last = rows[size - 1]
+                    page["next_page_token"] = encode_search_token(
+                        getattr(last, "search_rank", 0.0),
+                        last.page_created_at,
+                        last.id,
+                    )
+                return page
+
+        keys = [context_id] if context_id is not None else []
+        return await self._run_read(_search, *keys)
 
     async def count_tasks(self, status: str | None = None) -> int:
         """Count number of tasks, optionally filtered by status.
 
+        Reads the trigger-maintained task_state_counts instead of scanning
+        tasks.
+
         Args:
             status: Optional status to filter by
 
@@ -547,17 +1783,47 @@ class PostgresStorage(Storage[ContextT]):
         """
         self._ensure_connected()
 
-        async def _count():
-            async with self._get_session_with_schema() as session:
-                stmt = select(func.count()).select_from(tasks_table)
+        async def _count_fast():
+            return await self._fast_path.count_tasks(status)  # type: ignore[union-attr]
+
+        async def _count(new_session):
+            async with new_session() as session:
+                stmt = select(
+                    func.coalesce(func.sum(task_state_counts_table.c.count), 0)
+                )
 
                 if status is not None:
-                    stmt = stmt.where(tasks_table.c.state == status)
+                    stmt = stmt.where(task_state_counts_table.c.state == status)
 
                 result = await session.execute(stmt)
-                return result.scalar() or 0
+                return int(result.scalar() or 0)
+
+        return await self._run_read(
+            _count, primary=_count_fast if self._fast_path is not None else None
+        )
 
-        return await self._retry_on_connection_error(_count)
+    async def count_tasks_by_state(self) -> dict[str, int]:
+        """Count tasks in every state from the trigger-maintained counters.
+
+        Sums at most TASK_STATE_COUNT_SHARDS rows per state, however many
+        tasks there are.
+
+        Returns:
+            Number of tasks per state; states without tasks are left out
+        """
+        self._ensure_connected()
+        total = func.sum(task_state_counts_table.c.count)
+
+        async def _count(new_session):
+            async with new_session() as session:
+                result = await session.execute(
+                    select(task_state_counts_table.c.state, total)
+                    .group_by(task_state_counts_table.c.state)
+                    .having(total != 0)
+                )
+                return {state: int(count) for state, count in result.all()}
+
+        return await self._run_read(_count)
 
     async def list_tasks_by_context(
         self, context_id: UUID, length: int | None = None
@@ -578,10 +1844,10 @@ class PostgresStorage(Storage[ContextT]):
 
         self._ensure_connected()
 
-        async def _list():
-            async with self._get_session_with_schema() as session:
+        async def _list(new_session):
+            async with new_session() as session:
                 stmt = (
-                    select(tasks_table)
+                    select(*self._task_columns())
                     .where(tasks_table.c.context_id == context_id)
                     .order_by(tasks_table.c.created_at.asc())
                 )
@@ -594,7 +1860,7 @@ class PostgresStorage(Storage[ContextT]):
 
                 return [self._row_to_task(row) for row in rows]
 
-        return await self._retry_on_connection_error(_list)
+        return await self._run_read(_list, context_id)
 
     # -------------------------------------------------------------------------
     # Context Operations
@@ -616,15 +1882,15 @@ class PostgresStorage(Storage[ContextT]):
 
         self._ensure_connected()
 
-        async def _load():
-            async with self._get_session_with_schema() as session:
+        async def _load(new_session):
+            async with new_session() as session:
                 stmt = select(contexts_table).where(contexts_table.c.id == context_id)
                 result = await session.execute(stmt)
                 row = result.first()
 
                 return row.context_data if row else None
 
-        return await self._retry_on_connection_error(_load)
+        return await self._run_read(_load, context_id)
 
     async def update_context(self, context_id: UUID, context: ContextT) -> None:
         """Store or update context using SQLAlchemy.
@@ -639,22 +1905,21 @@ class PostgresStorage(Storage[ContextT]):
         context_id = validate_uuid_type(context_id, "context_id")
 
         self._ensure_connected()
+        self._mark_written(context_id)
 
         async def _update():
             async with self._get_session_with_schema() as session:
                 async with session.begin():
-                    serialized_context = serialize_for_jsonb(
-                        context if isinstance(context, dict) else {}
-                    )
+                    context_data = context if isinstance(context, dict) else {}
                     stmt = insert(contexts_table).values(
                         id=context_id,
-                        context_data=serialized_context,
+                        context_data=context_data,
                         message_history=[],
                     )
                     stmt = stmt.on_conflict_do_update(
                         index_elements=["id"],
                         set_={
-                            "context_data": serialized_context,
+                            "context_data": context_data,
                             "updated_at": get_current_utc_timestamp(),
                         },
                     )
@@ -680,6 +1945,7 @@ class PostgresStorage(Storage[ContextT]):
             raise TypeError(f"messages must be list, got {type(messages).__name__}")
 
         self._ensure_connected()
+        self._mark_written(context_id)
 
         async def _append():
             async with self._get_session_with_schema() as session:
@@ -693,14 +1959,13 @@ class PostgresStorage(Storage[ContextT]):
                     stmt = stmt.on_conflict_do_nothing(index_elements=["id"])
                     await session.execute(stmt)
 
-                    serialized_messages = serialize_for_jsonb(messages)
                     stmt = (
                         update(contexts_table)
                         .where(contexts_table.c.id == context_id)
                         .values(
                             message_history=func.jsonb_concat(
                                 contexts_table.c.message_history,
-                                cast(serialized_messages, JSONB),
+                                cast(messages, JSONB),
                             ),
                             updated_at=get_current_utc_timestamp(),
                         )
@@ -709,6 +1974,45 @@ class PostgresStorage(Storage[ContextT]):
 
         await self._retry_on_connection_error(_append)
 
+    def _context_page_select(self, page: Any):
+        """Select task counts and ids for a page of contexts.
+
+        Tasks are aggregated per context with correlated subqueries on
+        idx_tasks_context_id_created_at_id, so only the contexts on the page
+        are touched instead of grouping the whole tasks table.
+
+        Args:
+            page: Subquery of contexts (id, created_at) already limited to a page
+
+        Returns:
+            Select of (context_id, created_at, task_count, task_ids), newest first
+        """
+        context_tasks = tasks_table.c.context_id == page.c.id
+        task_count = (
+            select(func.count())
+            .select_from(tasks_table)
+            .where(context_tasks)
+            .scalar_subquery()
+        )
+        task_ids = (
+            select(
+                func.coalesce(
+                    func.json_agg(
+                        aggregate_order_by(tasks_table.c.id, tasks_table.c.created_at)
+                    ),
+                    cast("[]", JSON),
+                )
+            )
+            .where(context_tasks)
+            .scalar_subquery()
+        )
+        return select(
+            page.c.id.label("context_id"),
+            page.c.created_at,
+            task_count.label("task_count"),
+            task_ids.label("task_ids"),
+        ).order_by(page.c.created_at.desc(), page.c.id.desc())
+
     async def list_contexts(self, length: int | None = None) -> list[dict[str, Any]]:
         """List all contexts using SQLAlchemy.
 
@@ -720,30 +2024,18 @@ class PostgresStorage(Storage[ContextT]):
         """
         self._ensure_connected()
 
-        async def _list():
-            async with self._get_session_with_schema() as session:
-                # Query contexts with task counts
-                stmt = (
-                    select(
-                        contexts_table.c.id.label("context_id"),
-                        func.count(tasks_table.c.id).label("task_count"),
-                        func.coalesce(
-                            func.json_agg(tasks_table.c.id).filter(
-                                tasks_table.c.id.isnot(None)
-                            ),
-                            cast("[]", JSON),
-                        ).label("task_ids"),
-                    )
-                    .outerjoin(
-                        tasks_table, contexts_table.c.id == tasks_table.c.context_id
-                    )
-                    .group_by(contexts_table.c.id)
-                    .order_by(contexts_table.c.created_at.desc())
+        async def _list(new_session):
+            async with new_session() as session:
+                page = select(
+                    contexts_table.c.id, contexts_table.c.created_at
+                ).order_by(
+                    contexts_table.c.created_at.desc(), contexts_table.c.id.desc()
                 )
 
                 if length is not None:
-                    stmt = stmt.limit(length)
+                    page = page.limit(length)
 
+                stmt = self._context_page_select(page.subquery("page"))
                 result = await session.execute(stmt)
                 rows = result.fetchall()
 
@@ -756,15 +2048,167 @@ class PostgresStorage(Storage[ContextT]):
                     for row in rows
                 ]
 
-        return await self._retry_on_connection_error(_list)
+        return await self._run_read(_list)
+
+    async def list_contexts_page(
+        self,
+        page_size: int | None = None,
+        page_token: str | None = None,
+        *,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> ListContextsResult:
+        """List one page of contexts, newest first, using a keyset cursor.
+
+        Args:
+            page_size: Maximum contexts per page (default 50, capped at 1000)
+            page_token: Cursor from a previous page's next_page_token
+            created_after: Only return contexts created at or after this time
+            created_before: Only return contexts created before this time
+
+        Returns:
+            Page of contexts, with next_page_token set if more may follow
+
+        Raises:
+            ValueError: If page_token is invalid
+        """
+        size = clamp_page_size(page_size)
+        after = decode_page_token(page_token) if page_token is not None else None
+
+        self._ensure_connected()
+
+        async def _page(new_session):
+            async with new_session() as session:
+                page = select(contexts_table.c.id, contexts_table.c.created_at)
+
+                if created_after is not None:
+                    page = page.where(contexts_table.c.created_at >= created_after)
+                if created_before is not None:
+                    page = page.where(contexts_table.c.created_at < created_before)
+                if after is not None:
+                    page = page.where(
+                        tuple_(contexts_table.c.created_at, contexts_table.c.id)
+                        < tuple_(literal(after[0]), literal(after[1]))
+                    )
+
+                page = page.order_by(
+                    contexts_table.c.created_at.desc(), contexts_table.c.id.desc()
+                ).limit(size + 1)
+
+                stmt = self._context_page_select(page.subquery("page"))
+                result = await session.execute(stmt)
+                rows = result.fetchall()
+
+                contexts = ListContextsResult(
+                    contexts=[
+                        {
+                            "context_id": row.context_id,
+                            "task_count": row.task_count,
+                            "task_ids": row.task_ids,
+                        }
+                        for row in rows[:size]
+                    ]
+                )
+                if len(rows) > size:
+                    last = rows[size - 1]
+                    contexts["next_page_token"] = encode_page_token(
+                        last.created_at, last.context_id
+                    )
+                return contexts
+
+        return await self._run_read(_page)
+
+    # -------------------------------------------------------------------------
+    # Partition Maintenance
+    # -------------------------------------------------------------------------
+
+    async def maintain_partitions(
+        self, now: datetime | None = None
+    ) -> PartitionMaintenanceResult:
+        """Create upcoming tasks partitions and drop the ones past retention.
+
+        Uses postgres_partition_months_ahead and
+        postgres_partition_retention_months. Failures are logged, not raised:
+        tasks still land in the default partition.
+
+        Args:
+            now: Reference time (defaults to the current UTC time)
+
+        Returns:
+            Partitions created and dropped
+        """
+        self._ensure_connected()
+        settings = app_settings.storage
+
+        try:
+            return await maintain_task_partitions(
+                self._engine,  # type: ignore[arg-type]
+                now=now,
+                months_ahead=settings.postgres_partition_months_ahead,
+                retention_months=settings.postgres_partition_retention_months,
+                # Connections carry no search_path when it is set per transaction
+                schema=(
+                    self.schema_name
+                    if self._shared is not None or settings.postgres_pgbouncer
+                    else None
+                ),
+            )
+        except Exception as e:
+            logger.error(f"Task partition maintenance failed: {e}")
+            return PartitionMaintenanceResult(skipped=True)
+
+    async def _maintain_partitions_periodically(self) -> None:
+        """Run partition maintenance every interval until cancelled."""
+        interval = app_settings.storage.postgres_partition_maintenance_interval
+        while True:
+            try:
+                await asyncio.sleep(interval)
+                await self.maintain_partitions()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in partition maintenance task: {e}", exc_info=True)
 
     # -------------------------------------------------------------------------
     # Utility Operations
     # -------------------------------------------------------------------------
 
+    async def _delete_in_batches(self, table: Any, *conditions: Any) -> int:
+        """Delete matching rows in short transactions of purge_batch_size rows.
+
+        Keeps lock hold times and WAL bursts small instead of issuing one
+        large DELETE.
+
+        Args:
+            table: Table with an ``id`` primary key
+            *conditions: WHERE conditions selecting the rows to delete
+
+        Returns:
+            Number of rows deleted
+        """
+        batch_size = max(app_settings.storage.purge_batch_size, 1)
+        batch = select(table.c.id).where(*conditions).limit(batch_size)
+        stmt = delete(table).where(table.c.id.in_(batch.scalar_subquery()))
+
+        async def _delete_batch() -> int:
+            async with self._get_session_with_schema() as session:
+                async with session.begin():
+                    result = await session.execute(stmt)
+                    return result.rowcount
+
+        deleted = 0
+        while True:
+            count = await self._retry_on_connection_error(_delete_batch)
+            deleted += count
+            if count < batch_size:
+                return deleted
+
     async def clear_context(self, context_id: UUID) -> None:
         """Clear all tasks associated with a specific context.
 
+        Tasks are deleted in batches (feedback, messages and webhook configs
+        cascade), then the context itself.
+
         Args:
             context_id: The context ID to clear
 
@@ -777,58 +2221,791 @@ class PostgresStorage(Storage[ContextT]):
         context_id = validate_uuid_type(context_id, "context_id")
 
         self._ensure_connected()
+        self._mark_written()
 
-        async def _clear():
+        async def _exists() -> bool:
+            async with self._get_session_with_schema() as session:
+                stmt = select(contexts_table.c.id).where(
+                    contexts_table.c.id == context_id
+                )
+                result = await session.execute(stmt)
+                return result.first() is not None
+
+        if not await self._retry_on_connection_error(_exists):
+            raise ValueError(f"Context {context_id} not found")
+
+        deleted_count = await self._delete_in_batches(
+            tasks_table, tasks_table.c.context_id == context_id
+        )
+        await self._delete_in_batches(
+            contexts_table, contexts_table.c.id == context_id
+        )
+
+        logger.info(f"Cleared context {context_id}: removed {deleted_count} tasks")
+
+    async def clear_all(self) -> None:
+        """Clear all tasks and contexts from storage.
+
+        Tasks and contexts are deleted in batches rather than with one
+        table-wide DELETE; messages, feedback and webhook configs cascade.
+
+        Warning: This is a destructive operation.
+        """
+        self._ensure_connected()
+        self._mark_written()
+
+        await self._delete_in_batches(tasks_table)
+        await self._delete_in_batches(contexts_table)
+
+        async def _clear_orphans():
+            async with self._get_session_with_schema() as session:
+                async with session.begin():
+                    await session.execute(delete(webhook_configs_table))
+                    await session.execute(delete(task_feedback_table))
+                    await session.execute(delete(task_feedback_rollups_table))
+                    await session.execute(delete(task_messages_table))
+
+        await self._retry_on_connection_error(_clear_orphans)
+        logger.info("Cleared all tasks, contexts, feedback, and webhook configs")
+
+    async def purge_expired_tasks(
+        self,
+        cutoffs: Mapping[TaskState, datetime],
+        limit: int,
+        archive: Callable[[list[Task]], Awaitable[None]] | None = None,
+    ) -> int:
+        """Delete one batch of tasks that have been in their state too long.
+
+        The batch is selected with ``FOR UPDATE SKIP LOCKED`` so concurrent
+        purgers (one per pod) never pick the same tasks, archived, and
+        deleted in the same transaction: if archiving fails nothing is
+        deleted. Served by idx_tasks_state_state_timestamp.
+
+        Args:
+            cutoffs: Oldest status timestamp kept, per state
+            limit: Maximum number of tasks to delete
+            archive: Called with the full expired tasks before deletion
+
+        Returns:
+            Number of tasks deleted
+        """
+        if not cutoffs or limit <= 0:
+            return 0
+
+        self._ensure_connected()
+
+        expired = or_(
+            *(
+                and_(
+                    tasks_table.c.state == state,
+                    tasks_table.c.state_timestamp < cutoff,
+                )
+                for state, cutoff in cutoffs.items()
+            )
+        )
+        columns = (
+            self._task_columns()
+            if archive is not None
+            else [tasks_table.c.id, tasks_table.c.created_at]
+        )
+        stmt = (
+            select(*columns)
+            .where(expired)
+            .order_by(tasks_table.c.state_timestamp)
+            .limit(limit)
+            .with_for_update(of=tasks_table, skip_locked=True)
+        )
+
+        async def _purge() -> int:
             async with self._get_session_with_schema() as session:
                 async with session.begin():
-                    # Check if context exists
-                    stmt = select(contexts_table).where(
-                        contexts_table.c.id == context_id
+                    rows = (await session.execute(stmt)).fetchall()
+                    if not rows:
+                        return 0
+
+                    if archive is not None:
+                        await archive([self._row_to_task(row) for row in rows])
+
+                    task_ids = [row.id for row in rows]
+                    created = sorted({row.created_at for row in rows})
+                    deleted = await session.execute(
+                        delete(tasks_table)
+                        .where(
+                            tasks_table.c.id
+                            == any_(literal(task_ids, ARRAY(PG_UUID(as_uuid=True)))),
+                            # Ids are unique, so this only prunes partitions
+                            tasks_table.c.created_at
+                            == any_(
+                                literal(created, ARRAY(tasks_table.c.created_at.type))
+                            ),
+                        )
+                        .returning(tasks_table.c.context_id)
                     )
-                    result = await session.execute(stmt)
-                    context = result.first()
+                    context_ids = list({row.context_id for row in deleted})
+
+                    # Drop contexts whose last task was just purged
+                    await session.execute(
+                        delete(contexts_table).where(
+                            contexts_table.c.id
+                            == any_(
+                                literal(context_ids, ARRAY(PG_UUID(as_uuid=True)))
+                            ),
+                            ~exists().where(
+                                tasks_table.c.context_id == contexts_table.c.id
+                            ),
+                        )
+                    )
+                    return len(task_ids)
+
+        purged = await self._retry_on_connection_error(_purge)
+        if purged:
+            logger.info(f"Purged {purged} expired tasks")
+        return purged
+
+    # -------------------------------------------------------------------------
+    # Compaction
+    # -------------------------------------------------------------------------
+
+    def _require_compressor(self) -> TaskCompressor:
+        if self._compressor is None:
+            raise RuntimeError(
+                "Task compression requires zstandard. "
+                "Install with: pip install bindu[compression]"
+            )
+        return self._compressor
+
+    async def _load_compression_dictionaries(self) -> None:
+        """Load every stored dictionary; the newest compresses new payloads."""
+        compressor = self._require_compressor()
+        stmt = select(
+            task_compression_dictionaries_table.c.dictionary
+        ).order_by(
+            task_compression_dictionaries_table.c.created_at,
+            task_compression_dictionaries_table.c.id,
+        )
+
+        async def _load() -> list[bytes]:
+            async with self._get_session_with_schema() as session:
+                return list((await session.execute(stmt)).scalars())
 
-                    if context is None:
-                        raise ValueError(f"Context {context_id} not found")
+        for dictionary in await self._retry_on_connection_error(_load):
+            compressor.add_dictionary(dictionary)
 
-                    # Delete tasks (cascade will delete feedback)
-                    stmt = delete(tasks_table).where(
-                        tasks_table.c.context_id == context_id
+    async def _ensure_compression_dictionary(self, candidates: Any) -> None:
+        """Load the shared dictionary, training one first if there is none.
+
+        The dictionary is trained on a sample of the tasks about to be
+        compacted. With too few of them, payloads are compressed without a
+        dictionary until a later run can train one.
+        """
+        compressor = self._require_compressor()
+        await self._load_compression_dictionaries()
+        if compressor.dictionary_id is not None:
+            return
+
+        stmt = select(tasks_table.c.artifacts, self._history_column()).where(
+            candidates
+        ).limit(app_settings.storage.compression_training_samples)
+
+        async def _sample() -> list[bytes]:
+            async with self._get_session_with_schema() as session:
+                rows = (await session.execute(stmt)).fetchall()
+                return [
+                    compressor.encode(row.history or [], row.artifacts or [])
+                    for row in rows
+                ]
+
+        samples = await self._retry_on_connection_error(_sample)
+        dictionary = await asyncio.to_thread(
+            compressor.train, samples, app_settings.storage.compression_dictionary_size
+        )
+        if dictionary is None:
+            return
+
+        dictionary_id = compressor.add_dictionary(dictionary)
+
+        async def _store() -> None:
+            async with self._get_session_with_schema() as session:
+                async with session.begin():
+                    await session.execute(
+                        insert(task_compression_dictionaries_table)
+                        .values(id=dictionary_id, dictionary=dictionary)
+                        .on_conflict_do_nothing()
                     )
-                    result = await session.execute(stmt)
-                    deleted_count = result.rowcount
 
-                    # Delete context
-                    stmt = delete(contexts_table).where(
-                        contexts_table.c.id == context_id
+        await self._retry_on_connection_error(_store)
+        logger.info(
+            f"Trained compression dictionary {dictionary_id} "
+            f"({len(dictionary)} bytes, {len(samples)} samples)"
+        )
+
+    async def compact_tasks(self, cutoff: datetime, limit: int) -> CompactionResult:
+        """Compact one batch of tasks that have been terminal since before cutoff.
+
+        History (task_messages rows and legacy tasks.history) and artifacts of
+        each task are compressed into tasks.compressed_payload and removed
+        from their columns, in one transaction. The batch is selected with
+        ``FOR UPDATE SKIP LOCKED`` so concurrent compactors never pick the
+        same tasks. Served by idx_tasks_uncompressed_state_timestamp.
+
+        Args:
+            cutoff: Only tasks whose terminal state is older are compacted
+            limit: Maximum number of tasks to compact
+
+        Returns:
+            Number of tasks compacted and their payload size before and after
+
+        Raises:
+            RuntimeError: If zstandard is not installed
+        """
+        compressor = self._require_compressor()
+        if limit <= 0:
+            return CompactionResult()
+
+        self._ensure_connected()
+
+        candidates = and_(
+            tasks_table.c.state.in_(sorted(app_settings.agent.terminal_states)),
+            tasks_table.c.state_timestamp < cutoff,
+            tasks_table.c.compressed_payload.is_(None),
+        )
+        if compressor.dictionary_id is None:
+            await self._ensure_compression_dictionary(candidates)
+
+        stmt = (
+            select(
+                tasks_table.c.id,
+                tasks_table.c.created_at,
+                tasks_table.c.artifacts,
+                self._history_column(),
+            )
+            .where(candidates)
+            .order_by(tasks_table.c.state_timestamp)
+            .limit(limit)
+            .with_for_update(of=tasks_table, skip_locked=True)
+        )
+        # Keeps updated_at: compaction does not change what the task holds
+        compact = (
+            update(tasks_table)
+            .where(
+                tasks_table.c.id == bindparam("b_id"),
+                tasks_table.c.created_at == bindparam("b_created_at"),
+            )
+            .values(
+                compressed_payload=bindparam("b_payload"),
+                history=literal_column("'[]'::jsonb"),
+                artifacts=literal_column("'[]'::jsonb"),
+                updated_at=tasks_table.c.updated_at,
+            )
+        )
+
+        async def _compact() -> CompactionResult:
+            self._mark_written()
+            result = CompactionResult()
+            async with self._get_session_with_schema() as session:
+                async with session.begin():
+                    rows = (await session.execute(stmt)).fetchall()
+                    if not rows:
+                        return result
+
+                    params = []
+                    for row in rows:
+                        raw = compressor.encode(row.history or [], row.artifacts or [])
+                        payload = compressor.compress(raw)
+                        params.append(
+                            {
+                                "b_id": row.id,
+                                "b_created_at": row.created_at,
+                                "b_payload": payload,
+                            }
+                        )
+                        result.tasks += 1
+                        result.raw_bytes += len(raw)
+                        result.compressed_bytes += len(payload)
+
+                    await session.execute(compact, params)
+                    task_ids = [row.id for row in rows]
+                    await session.execute(
+                        delete(task_messages_table).where(
+                            task_messages_table.c.task_id
+                            == any_(literal(task_ids, ARRAY(PG_UUID(as_uuid=True))))
+                        )
                     )
-                    await session.execute(stmt)
+            return result
 
-                    logger.info(
-                        f"Cleared context {context_id}: removed {deleted_count} tasks"
+        result = await self._retry_on_connection_error(_compact)
+        if result.tasks:
+            logger.info(
+                f"Compacted {result.tasks} tasks "
+                f"({result.raw_bytes} -> {result.compressed_bytes} bytes)"
+            )
+        return result
+
+    # -------------------------------------------------------------------------
+    # Bulk Transfer
+    # -------------------------------------------------------------------------
+
+    async def export_records(
+        self, kind: RecordKind, after: str | None, limit: int
+    ) -> list[dict[str, Any]]:
+        """Read one batch of records for export, in ascending key order.
+
+        Each batch is a keyset query on the kind's primary key index, so
+        batches cost the same however far into the table they are.
+
+        Args:
+            kind: Which records to read
+            after: Key of the last record of the previous batch (None to start)
+            limit: Maximum number of records
+
+        Returns:
+            Records with keys greater than ``after``
+        """
+        self._ensure_connected()
+
+        if kind == "contexts":
+            key = contexts_table.c.id
+            stmt = select(
+                key,
+                contexts_table.c.created_at,
+                contexts_table.c.context_data,
+                contexts_table.c.message_history,
+            )
+        elif kind == "tasks":
+            key = tasks_table.c.id
+            stmt = select(*self._task_columns())
+        elif kind == "feedback":
+            key = task_feedback_table.c.task_id
+            stmt = select(
+                key,
+                func.jsonb_agg(
+                    aggregate_order_by(
+                        task_feedback_table.c.feedback_data, task_feedback_table.c.id
                     )
+                ).label("feedback"),
+            ).group_by(key)
+        else:
+            key = webhook_configs_table.c.task_id
+            stmt = select(key, webhook_configs_table.c.config)
 
-        await self._retry_on_connection_error(_clear)
+        if after is not None:
+            stmt = stmt.where(key > normalize_uuid(after, "after"))
+        stmt = stmt.order_by(key).limit(limit)
 
-    async def clear_all(self) -> None:
-        """Clear all tasks and contexts from storage.
+        async def _export() -> list[dict[str, Any]]:
+            async with self._get_session_with_schema() as session:
+                rows = (await session.execute(stmt)).fetchall()
 
-        Warning: This is a destructive operation.
+            if kind == "contexts":
+                return [
+                    {
+                        "id": row.id,
+                        "created_at": row.created_at,
+                        "context_data": row.context_data or {},
+                        "message_history": row.message_history or [],
+                    }
+                    for row in rows
+                ]
+            if kind == "tasks":
+                return [
+                    {**self._row_to_task(row), "created_at": row.created_at}
+                    for row in rows
+                ]
+            if kind == "feedback":
+                return [
+                    {"task_id": row.task_id, "feedback": row.feedback} for row in rows
+                ]
+            return [{"task_id": row.task_id, "config": row.config} for row in rows]
+
+        return await self._retry_on_connection_error(_export)
+
+    async def import_records(
+        self, kind: RecordKind, records: list[dict[str, Any]]
+    ) -> int:
+        """Insert exported records that are not stored yet.
+
+        Each call is one transaction with multi-row inserts. Tasks take the
+        same per-id advisory lock as submit_task(), and the monthly
+        partitions their created_at falls in are created first.
+
+        Args:
+            kind: Which records these are
+            records: Records as produced by export_records()
+
+        Returns:
+            Number of records inserted
         """
+        if not records:
+            return 0
+
         self._ensure_connected()
+        self._mark_written()
+
+        if kind == "tasks":
+            await self._ensure_task_partitions(
+                normalize_timestamp(record.get("created_at"))
+                or get_current_utc_timestamp()
+                for record in records
+            )
+
+        importers = {
+            "contexts": self._import_contexts,
+            "tasks": self._import_tasks,
+            "feedback": self._import_task_dependents,
+            "webhook_configs": self._import_task_dependents,
+        }
 
-        async def _clear():
+        async def _import() -> int:
             async with self._get_session_with_schema() as session:
                 async with session.begin():
-                    await session.execute(delete(webhook_configs_table))
-                    await session.execute(delete(task_feedback_table))
-                    await session.execute(delete(tasks_table))
-                    await session.execute(delete(contexts_table))
-                    logger.info(
-                        "Cleared all tasks, contexts, feedback, and webhook configs"
+                    return await importers[kind](session, kind, records)
+
+        return await self._retry_on_connection_error(_import)
+
+    async def _ensure_task_partitions(self, created: Iterable[datetime]) -> None:
+        """Create the missing monthly partitions for imported tasks.
+
+        Each partition is created in its own short transaction. If one
+        cannot be created, its tasks land in the default partition.
+        """
+        months = {month_start(moment) for moment in created}
+
+        async with self._get_session_with_schema() as session:
+            conn = await session.connection()
+            if not await is_partitioned(conn):
+                return
+            existing = {
+                partition_month(name) for name in await list_task_partitions(conn)
+            }
+
+        for month in sorted(months - existing):
+            try:
+                async with self._get_session_with_schema() as session:
+                    async with session.begin():
+                        await create_task_partition(await session.connection(), month)
+            except DBAPIError as e:
+                logger.warning(
+                    f"Could not create partition {partition_name(month)}: {e}"
+                )
+
+    async def _import_contexts(
+        self, session: AsyncSession, kind: RecordKind, records: list[dict[str, Any]]
+    ) -> int:
+        now = get_current_utc_timestamp()
+        rows = [
+            {
+                "id": normalize_uuid(record["id"], "id"),
+                "context_data": record.get("context_data") or {},
+                "message_history": record.get("message_history") or [],
+                "created_at": normalize_timestamp(record.get("created_at")) or now,
+            }
+            for record in records
+        ]
+        stmt = (
+            insert(contexts_table)
+            .on_conflict_do_nothing(index_elements=["id"])
+            .returning(contexts_table.c.id)
+        )
+        return len((await session.execute(stmt, rows)).all())
+
+    async def _import_tasks(
+        self, session: AsyncSession, kind: RecordKind, records: list[dict[str, Any]]
+    ) -> int:
+        by_id = {normalize_uuid(record["id"], "id"): record for record in records}
+        task_ids = sorted(by_id, key=str)
+        id_array = literal(task_ids, ARRAY(PG_UUID(as_uuid=True)))
+
+        # Same lock as submit_task(), taken in id order so importers running
+        # side by side cannot deadlock
+        locked = func.unnest(id_array).table_valued("id").render_derived("locked")
+        await session.execute(
+            select(
+                func.pg_advisory_xact_lock(
+                    func.hashtextextended(cast(locked.c.id, String), 0)
+                )
+            ).select_from(locked)
+        )
+        existing = set(
+            (
+                await session.execute(
+                    select(task_ids_table.c.id).where(
+                        task_ids_table.c.id == any_(id_array)
+                    )
+                )
+            ).scalars()
+        )
+        new_ids = [task_id for task_id in task_ids if task_id not in existing]
+        if not new_ids:
+            return 0
+
+        now = get_current_utc_timestamp()
+        task_rows = []
+        message_rows = []
+        for task_id in new_ids:
+            record = by_id[task_id]
+            status = record["status"]
+            state_timestamp = normalize_timestamp(status.get("timestamp")) or now
+            task_rows.append(
+                {
+                    "id": task_id,
+                    "context_id": normalize_uuid(record["context_id"], "context_id"),
+                    "kind": record.get("kind", "task"),
+                    "state": status["state"],
+                    "state_timestamp": state_timestamp,
+                    "history": [],
+                    "artifacts": record.get("artifacts") or [],
+                    "metadata": record.get("metadata") or {},
+                    "created_at": normalize_timestamp(record.get("created_at")) or now,
+                    "updated_at": state_timestamp,
+                }
+            )
+            # Inserted in order, so seq keeps the history order
+            message_rows.extend(
+                {"task_id": task_id, "payload": message}
+                for message in record.get("history") or []
+            )
+
+        await session.execute(
+            insert(contexts_table).on_conflict_do_nothing(index_elements=["id"]),
+            [{"id": context_id} for context_id in {r["context_id"] for r in task_rows}],
+        )
+        await session.execute(insert(tasks_table), task_rows)
+        if message_rows:
+            await session.execute(insert(task_messages_table), message_rows)
+        return len(new_ids)
+
+    async def _import_task_dependents(
+        self, session: AsyncSession, kind: RecordKind, records: list[dict[str, Any]]
+    ) -> int:
+        table = task_feedback_table if kind == "feedback" else webhook_configs_table
+        by_id = {
+            normalize_uuid(record["task_id"], "task_id"): record for record in records
+        }
+        id_array = literal(list(by_id), ARRAY(PG_UUID(as_uuid=True)))
+
+        # Only tasks that exist and have none of these rows yet
+        known = set(
+            (
+                await session.execute(
+                    select(task_ids_table.c.id).where(
+                        task_ids_table.c.id == any_(id_array)
+                    )
+                )
+            ).scalars()
+        )
+        taken = set(
+            (
+                await session.execute(
+                    select(table.c.task_id)
+                    .where(table.c.task_id == any_(id_array))
+                    .distinct()
+                )
+            ).scalars()
+        )
+        task_ids = [task_id for task_id in by_id if task_id in known - taken]
+        if not task_ids:
+            return 0
+
+        if kind == "feedback":
+            rows = [
+                {"task_id": task_id, "feedback_data": entry}
+                for task_id in task_ids
+                for entry in by_id[task_id]["feedback"]
+            ]
+            await session.execute(insert(table), rows)
+        else:
+            rows = [
+                {"task_id": task_id, "config": by_id[task_id]["config"]}
+                for task_id in task_ids
+            ]
+            await session.execute(
+                insert(table).on_conflict_do_nothing(index_elements=["task_id"]), rows
+            )
+        return len(task_ids)
+
+    @staticmethod
+    def _copy_columns(table: Any) -> list[str]:
+        """Columns of a table carried by COPY dumps."""
+        generated = _COPY_GENERATED_COLUMNS.get(table.name, set())
+        return [c.name for c in table.c if c.name not in generated]
+
+    @staticmethod
+    async def _driver_connection(session: AsyncSession) -> Any:
+        """The asyncpg connection behind a session, for COPY."""
+        conn = await session.connection()
+        raw = await conn.get_raw_connection()
+        return raw.driver_connection
+
+    async def copy_out(
+        self,
+        files: Mapping[str, Path],
+        format: CopyFormat = "binary",
+        on_copied: Callable[[str, int], Awaitable[None]] | None = None,
+    ) -> dict[str, int]:
+        """Dump tables to files with COPY TO, all from one snapshot.
+
+        Rows are streamed to disk in primary key order. The dump runs in a
+        single repeatable read transaction, so tasks and their messages,
+        feedback and webhook configs are consistent with each other.
+
+        Args:
+            files: File to write per table name (see COPY_TABLES)
+            format: "binary" (fastest; restore into the same schema version)
+                or "csv" (with a header row)
+            on_copied: Called with the table name and row count after each
+                table is written
+
+        Returns:
+            Rows written per table
+
+        Raises:
+            ValueError: If a table is not in COPY_TABLES
+        """
+        unknown = sorted(set(files) - set(COPY_TABLES))
+        if unknown:
+            raise ValueError(f"Cannot COPY tables: {unknown}")
+
+        self._ensure_connected()
+        counts: dict[str, int] = {}
+        async with self._get_session_with_schema() as session:
+            async with session.begin():
+                await session.execute(
+                    text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+                )
+                conn = await self._driver_connection(session)
+                for name, table in COPY_TABLES.items():
+                    if name not in files:
+                        continue
+                    columns = ", ".join(f'"{c}"' for c in self._copy_columns(table))
+                    order = ", ".join(f'"{c.name}"' for c in table.primary_key)
+                    status = await conn.copy_from_query(
+                        f'SELECT {columns} FROM "{name}" ORDER BY {order}',
+                        output=str(files[name]),
+                        format=format,
+                        header=True if format == "csv" else None,
+                    )
+                    counts[name] = int(status.split()[-1])
+                    if on_copied is not None:
+                        await on_copied(name, counts[name])
+        return counts
+
+    async def _create_staged_task_partitions(self, session: AsyncSession) -> None:
+        """Create the monthly partitions missing for staged tasks.
+
+        Each runs in a savepoint; if one cannot be created, its tasks land in
+        the default partition.
+        """
+        conn = await session.connection()
+        if not await is_partitioned(conn):
+            return
+        months = await session.execute(
+            text(
+                "SELECT DISTINCT date_trunc('month', created_at, 'UTC') "
+                f"FROM {_COPY_STAGING_TABLE}"
+            )
+        )
+        for (month,) in months.fetchall():
+            try:
+                async with session.begin_nested():
+                    await create_task_partition(conn, month_start(month))
+            except DBAPIError as e:
+                logger.warning(
+                    f"Could not create partition {partition_name(month)}: {e}"
+                )
+
+    async def copy_in(
+        self, table_name: str, path: Path, format: CopyFormat = "binary"
+    ) -> int:
+        """Restore one table from a copy_out() file with COPY FROM.
+
+        The file is streamed into a temporary staging table, then merged in
+        one statement that skips what already exists, as import_records()
+        does. Monthly partitions missing for the restored tasks are created
+        inside the transaction, which blocks writes to tasks until it ends.
+
+        Args:
+            table_name: Table the file was dumped from (see COPY_TABLES)
+            path: File written by copy_out()
+            format: Format the file was written in
+
+        Returns:
+            Number of rows inserted
+
+        Raises:
+            ValueError: If the table is not in COPY_TABLES
+        """
+        table = COPY_TABLES.get(table_name)
+        if table is None:
+            raise ValueError(f"Cannot COPY table: {table_name}")
+
+        self._ensure_connected()
+        self._mark_written()
+
+        columns = self._copy_columns(table)
+        column_list = ", ".join(f'"{c}"' for c in columns)
+        selected = ", ".join(f's."{c}"' for c in columns)
+        staging = _COPY_STAGING_TABLE
+        task_exists = "EXISTS (SELECT 1 FROM task_ids t WHERE t.id = s.task_id)"
+
+        if table_name == "contexts":
+            merges = [
+                f"INSERT INTO contexts ({column_list}) SELECT {selected} "
+                f"FROM {staging} s ON CONFLICT (id) DO NOTHING"
+            ]
+        elif table_name == "tasks":
+            merges = [
+                f"INSERT INTO contexts (id) SELECT DISTINCT context_id FROM {staging} "
+                "ON CONFLICT (id) DO NOTHING",
+                f"INSERT INTO tasks ({column_list}) SELECT {selected} FROM {staging} s "
+                "WHERE NOT EXISTS (SELECT 1 FROM task_ids t WHERE t.id = s.id)",
+            ]
+        elif table_name == "webhook_configs":
+            merges = [
+                f"INSERT INTO webhook_configs ({column_list}) SELECT {selected} "
+                f"FROM {staging} s WHERE {task_exists} "
+                "ON CONFLICT (task_id) DO NOTHING"
+            ]
+        else:
+            merges = [
+                f"INSERT INTO {table_name} ({column_list}) SELECT {selected} "
+                f"FROM {staging} s WHERE {task_exists} AND NOT EXISTS "
+                f"(SELECT 1 FROM {table_name} d WHERE d.task_id = s.task_id) "
+                "ORDER BY s.copy_seq"
+            ]
+
+        async def _copy_in() -> int:
+            async with self._get_session_with_schema() as session:
+                async with session.begin():
+                    await session.execute(
+                        text(
+                            f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                            f'SELECT {column_list} FROM "{table_name}" WITH NO DATA'
+                        )
+                    )
+                    await session.execute(
+                        text(
+                            f"ALTER TABLE {staging} ADD COLUMN copy_seq "
+                            "BIGINT GENERATED ALWAYS AS IDENTITY"
+                        )
+                    )
+                    conn = await self._driver_connection(session)
+                    await conn.copy_to_table(
+                        staging,
+                        source=str(path),
+                        columns=columns,
+                        format=format,
+                        header=True if format == "csv" else None,
                     )
 
-        await self._retry_on_connection_error(_clear)
+                    if table_name == "tasks":
+                        await self._create_staged_task_partitions(session)
+
+                    inserted = 0
+                    for merge in merges:
+                        inserted = (await session.execute(text(merge))).rowcount
+                    return inserted
+
+        return await self._retry_on_connection_error(_copy_in)
 
     # -------------------------------------------------------------------------
     # Feedback Operations
@@ -854,13 +3031,13 @@ class PostgresStorage(Storage[ContextT]):
             )
 
         self._ensure_connected()
+        self._mark_written(task_id)
 
         async def _store():
             async with self._get_session_with_schema() as session:
                 async with session.begin():
-                    serialized_feedback = serialize_for_jsonb(feedback_data)
                     stmt = insert(task_feedback_table).values(
-                        task_id=task_id, feedback_data=serialized_feedback
+                        task_id=task_id, feedback_data=feedback_data
                     )
                     await session.execute(stmt)
 
@@ -882,8 +3059,8 @@ class PostgresStorage(Storage[ContextT]):
 
         self._ensure_connected()
 
-        async def _get():
-            async with self._get_session_with_schema() as session:
+        async def _get(new_session):
+            async with new_session() as session:
                 stmt = (
                     select(task_feedback_table)
                     .where(task_feedback_table.c.task_id == task_id)
@@ -897,7 +3074,248 @@ class PostgresStorage(Storage[ContextT]):
 
                 return [row.feedback_data for row in rows]
 
-        return await self._retry_on_connection_error(_get)
+        return await self._run_read(_get, task_id)
+
+    async def get_feedback_summary(
+        self,
+        *,
+        skill_id: str | None = None,
+        since: date | None = None,
+        until: date | None = None,
+        group_by: Iterable[FeedbackGroupBy] = (),
+    ) -> list[FeedbackSummary]:
+        """Summarize stored feedback per skill and UTC day.
+
+        Sums the shards of task_feedback_rollups, which the
+        rollup_task_feedback() trigger adds to as feedback is inserted.
+
+        Args:
+            skill_id: Only count feedback for this skill
+            since: First day to count
+            until: Last day to count, inclusive
+            group_by: Split the summary by "skill", "day" or both
+
+        Returns:
+            One summary per group, by skill then day
+
+        Raises:
+            ValueError: If group_by has an unknown field
+        """
+        group_by = validate_group_by(group_by)
+        self._ensure_connected()
+
+        rollups = task_feedback_rollups_table
+        keys = [
+            rollups.c.skill_id if field == "skill" else rollups.c.day
+            for field in group_by
+        ]
+        totals = [
+            func.sum(rollups.c[name])
+            for name in (
+                "feedback_count",
+                "rating_sum",
+                *(f"rating_{rating}" for rating in RATINGS),
+            )
+        ]
+        stmt = select(*keys, *totals).group_by(*keys).order_by(*keys)
+        if skill_id is not None:
+            stmt = stmt.where(rollups.c.skill_id == skill_id)
+        if since is not None:
+            stmt = stmt.where(rollups.c.day >= since)
+        if until is not None:
+            stmt = stmt.where(rollups.c.day <= until)
+
+        async def _summarize(new_session):
+            async with new_session() as session:
+                rows = (await session.execute(stmt)).all()
+                return [
+                    feedback_summary(
+                        row[len(keys) :],
+                        skill_id=row.skill_id if "skill" in group_by else None,
+                        day=row.day if "day" in group_by else None,
+                    )
+                    for row in rows
+                ]
+
+        return await self._run_read(_summarize)
+
+    # -------------------------------------------------------------------------
+    # Change Notifications
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _parse_task_change(payload: str) -> TaskChange | None:
+        """Parse a NOTIFY payload sent by the notify_task_change() trigger.
+
+        Args:
+            payload: JSON object with id, context_id, state and op, or a bare
+                task ID from the original trigger (20261018_0003)
+
+        Returns:
+            Parsed change, or None if the payload is malformed
+        """
+        try:
+            if not payload.startswith("{"):
+                return TaskChange(UUID(payload), None, None, "update")
+
+            data = json.loads(payload)
+            context_id = data.get("context_id")
+            return TaskChange(
+                task_id=UUID(data["id"]),
+                context_id=UUID(context_id) if context_id else None,
+                state=data.get("state"),
+                operation=data.get("op", "update"),
+            )
+        except (KeyError, TypeError, ValueError):
+            logger.warning(f"Ignoring malformed task change: {payload!r}")
+            return None
+
+    def _on_task_notify(self, _conn, _pid, _channel, payload: str) -> None:
+        change = self._parse_task_change(payload)
+        if change is not None:
+            self._change_feed.publish(change)
+
+    def _on_listener_terminated(self, _conn) -> None:
+        logger.warning("Task change listener connection lost")
+        conn, self._listener_conn = self._listener_conn, None
+        if conn is not None:
+            asyncio.get_running_loop().create_task(self._release_listener(conn))
+        self._change_feed.interrupt()
+
+    async def _release_listener(self, conn: Any) -> None:
+        try:
+            driver_conn = (await conn.get_raw_connection()).driver_connection
+            driver_conn.remove_termination_listener(self._on_listener_terminated)
+            if not driver_conn.is_closed():
+                await driver_conn.remove_listener(
+                    TASK_CHANGES_CHANNEL, self._on_task_notify
+                )
+        except Exception as e:
+            logger.debug(f"Error detaching task change listener: {e}")
+        finally:
+            await conn.close()
+
+    def _listen_engine(self) -> Any:
+        """Engine to open the LISTEN connection on.
+
+        PgBouncer in transaction pooling mode hands each transaction any
+        server connection, so notifications would go to whichever client
+        next gets the one that ran LISTEN. Behind it, LISTEN goes through
+        a direct connection to listen_url instead.
+
+        Raises:
+            RuntimeError: With postgres_pgbouncer and no listen_url
+        """
+        if not app_settings.storage.postgres_pgbouncer:
+            return self._engine
+        if not self.listen_url:
+            raise RuntimeError(
+                "The task change feed needs LISTEN, which PgBouncer transaction "
+                "pooling does not support; set postgres_listen_url to a direct "
+                "connection URL"
+            )
+        if self._listener_engine is None:
+            self._listener_engine = create_async_engine(
+                self.listen_url, poolclass=NullPool
+            )
+        return self._listener_engine
+
+    async def _start_change_listener(self) -> None:
+        """LISTEN on the task changes channel unless already listening."""
+        self._ensure_connected()
+        async with self._listener_lock:
+            if self._listener_conn is not None:
+                return
+
+            conn = await self._listen_engine().connect()
+            try:
+                driver_conn = (await conn.get_raw_connection()).driver_connection
+                await driver_conn.add_listener(
+                    TASK_CHANGES_CHANNEL, self._on_task_notify
+                )
+                driver_conn.add_termination_listener(self._on_listener_terminated)
+            except Exception:
+                await conn.close()
+                raise
+
+            self._listener_conn = conn
+            logger.info(f"Listening for task changes on '{TASK_CHANGES_CHANNEL}'")
+
+    async def _stop_change_listener(self, force: bool = False) -> None:
+        """Release the LISTEN connection once nothing consumes the feed.
+
+        Args:
+            force: Release it even if consumers remain; they are interrupted
+        """
+        async with self._listener_lock:
+            if self._listener_conn is None:
+                return
+            if self._change_feed.has_consumers and not force:
+                return
+
+            conn, self._listener_conn = self._listener_conn, None
+            await self._release_listener(conn)
+            if force:
+                self._change_feed.interrupt()
+
+    async def subscribe(
+        self, task_id: UUID | None = None, context_id: UUID | None = None
+    ) -> TaskSubscription:
+        """Subscribe to task changes committed by any process.
+
+        Changes arrive through the notify_task_change() trigger; all
+        subscriptions and watchers in this process share one LISTEN
+        connection, released when the last one closes.
+
+        Args:
+            task_id: Only deliver changes to this task
+            context_id: Only deliver changes to tasks in this context
+
+        Returns:
+            Active subscription; changes committed after this returns are
+            delivered
+
+        Raises:
+            ConnectionError: If the LISTEN connection cannot be opened
+        """
+        subscription = self._change_feed.subscribe(
+            task_id, context_id, on_close=lambda _: self._stop_change_listener()
+        )
+        try:
+            await self._start_change_listener()
+        except Exception as e:
+            await subscription.aclose()
+            raise ConnectionError(f"Failed to subscribe to task changes: {e}") from e
+        return subscription
+
+    async def watch_task_changes(
+        self, callback: Callable[[UUID | None], None]
+    ) -> Callable[[], Awaitable[None]] | None:
+        """Call back with task IDs from the shared LISTEN connection.
+
+        If that connection is lost, callback(None) is called once; watching
+        again re-establishes it.
+
+        Args:
+            callback: Called with the changed task's ID, or None on connection loss
+
+        Returns:
+            Coroutine function that stops watching
+        """
+        remove = self._change_feed.add_callback(
+            lambda change: callback(change.task_id if change else None)
+        )
+        try:
+            await self._start_change_listener()
+        except Exception:
+            remove()
+            raise
+
+        async def _unwatch() -> None:
+            remove()
+            await self._stop_change_listener()
+
+        return _unwatch
 
     # -------------------------------------------------------------------------
     # Webhook Persistence Operations (for long-running tasks)
@@ -920,19 +3338,19 @@ class PostgresStorage(Storage[ContextT]):
         task_id = validate_uuid_type(task_id, "task_id")
 
         self._ensure_connected()
+        self._mark_written(task_id)
 
         async def _save():
             async with self._get_session_with_schema() as session:
                 async with session.begin():
-                    serialized_config = serialize_for_jsonb(config)
                     stmt = insert(webhook_configs_table).values(
                         task_id=task_id,
-                        config=serialized_config,
+                        config=config,
                     )
                     stmt = stmt.on_conflict_do_update(
                         index_elements=["task_id"],
                         set_={
-                            "config": serialized_config,
+                            "config": config,
                             "updated_at": get_current_utc_timestamp(),
                         },
                     )
@@ -957,8 +3375,8 @@ class PostgresStorage(Storage[ContextT]):
 
         self._ensure_connected()
 
-        async def _load():
-            async with self._get_session_with_schema() as session:
+        async def _load(new_session):
+            async with new_session() as session:
                 stmt = select(webhook_configs_table).where(
                     webhook_configs_table.c.task_id == task_id
                 )
@@ -970,7 +3388,7 @@ class PostgresStorage(Storage[ContextT]):
 
                 return row.config
 
-        return await self._retry_on_connection_error(_load)
+        return await self._run_read(_load, task_id)
 
     async def delete_webhook_config(self, task_id: UUID) -> None:
         """Delete a webhook configuration for a task using SQLAlchemy.
@@ -986,6 +3404,7 @@ class PostgresStorage(Storage[ContextT]):
         task_id = validate_uuid_type(task_id, "task_id")
 
         self._ensure_connected()
+        self._mark_written(task_id)
 
         async def _delete():
             async with self._get_session_with_schema() as session:
@@ -1009,12 +3428,12 @@ class PostgresStorage(Storage[ContextT]):
         """
         self._ensure_connected()
 
-        async def _load_all():
-            async with self._get_session_with_schema() as session:
+        async def _load_all(new_session):
+            async with new_session() as session:
                 stmt = select(webhook_configs_table)
                 result = await session.execute(stmt)
                 rows = result.fetchall()
 
                 return {row.task_id: row.config for row in rows}
 
-        return await self._retry_on_connection_error(_load_all)
+        return await self._run_read(_load_all)
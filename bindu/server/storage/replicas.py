@@ -0,0 +1,188 @@
+"""Read-replica routing for PostgresStorage.
+
+Dashboard and metrics reads otherwise compete with worker writes on the
+primary. With replica URLs configured, PostgresStorage sends read-only
+queries to a replica instead, picked round-robin from those that are healthy
+and not lagging, and falls back to the primary when:
+
+- The task or context being read was written by this process within the
+  last ``sticky_seconds`` (read-your-writes). Bulk writes such as clear_all()
+  make every read sticky for that window.
+- Every replica lags more than ``max_lag_seconds`` or is unreachable.
+  Replication lag is probed in the background every ``check_interval``
+  seconds; a replica that fails a query is skipped until it passes a probe.
+
+Writes, locks, LISTEN and partition maintenance always use the primary.
+"""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from bindu.utils.logging import get_logger
+
+from .helpers import mask_database_url
+from .pool import dispose_pooled_engine
+
+logger = get_logger("bindu.server.storage.replicas")
+
+# Seconds the replica is behind the primary: 0 when it has replayed all WAL
+# it received (an idle primary sends none; after a restart streaming resumes
+# from the segment start, behind replay), else the age of the last replayed
+# transaction. 0 on a server that is not in recovery
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() <= pg_last_wal_replay_lsn() THEN 0
+    ELSE coalesce(
+        extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0
+    )
+END
+"""
+
+
+@dataclass
+class Replica:
+    """One read replica and its last probed state."""
+
+    url: str
+    engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+    lag_seconds: float | None = None  # None until a probe succeeds
+    healthy: bool = False
+
+
+class ReplicaRouter:
+    """Choose a replica for each read, or None to read from the primary."""
+
+    def __init__(
+        self,
+        replicas: list[Replica],
+        max_lag_seconds: float = 5.0,
+        sticky_seconds: float = 10.0,
+        check_interval: float = 2.0,
+    ):
+        """Initialize the router.
+
+        Args:
+            replicas: Replicas to route reads to
+            max_lag_seconds: Replicas lagging more than this are skipped
+            sticky_seconds: How long reads of a written key stay on the primary
+            check_interval: Seconds between lag probes
+        """
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.sticky_seconds = sticky_seconds
+        self.check_interval = check_interval
+        self._written: dict[Any, float] = {}  # key -> sticky until (monotonic)
+        self._all_written_until = 0.0
+        self._next = 0
+        self._task: asyncio.Task[None] | None = None
+
+    def mark_written(self, *keys: Any) -> None:
+        """Keep reads of ``keys`` (or of everything, if none) on the primary."""
+        now = time.monotonic()
+        until = now + self.sticky_seconds
+        if not keys:
+            self._all_written_until = until
+            return
+
+        for key in keys:
+            # Re-insert so the dict stays ordered by expiry
+            self._written.pop(key, None)
+            self._written[key] = until
+        for key, expires in list(self._written.items()):
+            if expires > now:
+                break
+            del self._written[key]
+
+    def is_sticky(self, *keys: Any) -> bool:
+        """Whether a read of ``keys`` must see this process's recent writes."""
+        now = time.monotonic()
+        if self._all_written_until > now:
+            return True
+        return any(self._written.get(key, 0.0) > now for key in keys)
+
+    def choose(self, *keys: Any) -> Replica | None:
+        """Pick the next usable replica for a read of ``keys``.
+
+        Returns:
+            A healthy replica within the lag limit, or None for the primary
+        """
+        if self.is_sticky(*keys):
+            return None
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next % len(self.replicas)]
+            self._next += 1
+            if replica.healthy:
+                return replica
+        return None
+
+    def mark_failed(self, replica: Replica, error: Exception) -> None:
+        """Skip a replica until its next successful probe."""
+        if replica.healthy:
+            logger.warning(
+                f"Read replica {mask_database_url(replica.url)} failed, "
+                f"reading from the primary: {error}"
+            )
+        replica.healthy = False
+
+    async def check_lag(self) -> None:
+        """Probe every replica's replication lag and update its health."""
+        for replica in self.replicas:
+            was_healthy = replica.healthy
+            try:
+                async with replica.engine.connect() as conn:
+                    result = await conn.execute(text(REPLICA_LAG_SQL))
+                    replica.lag_seconds = float(result.scalar() or 0)
+                replica.healthy = replica.lag_seconds <= self.max_lag_seconds
+            except Exception as e:
+                replica.lag_seconds = None
+                replica.healthy = False
+                if was_healthy:
+                    logger.warning(
+                        f"Read replica {mask_database_url(replica.url)} "
+                        f"unreachable: {e}"
+                    )
+                continue
+
+            if was_healthy and not replica.healthy:
+                logger.warning(
+                    f"Read replica {mask_database_url(replica.url)} lags "
+                    f"{replica.lag_seconds:.1f}s, reading from the primary"
+                )
+
+    async def start(self) -> None:
+        """Probe the replicas, then keep probing in the background."""
+        await self.check_lag()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._check_periodically())
+
+    async def stop(self) -> None:
+        """Stop probing and close the replica pools."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        for replica in self.replicas:
+            await dispose_pooled_engine(replica.engine)
+
+    async def _check_periodically(self) -> None:
+        """Probe replication lag every interval until cancelled."""
+        while True:
+            try:
+                await asyncio.sleep(self.check_interval)
+                await self.check_lag()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in replica lag check: {e}", exc_info=True)
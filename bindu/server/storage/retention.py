@@ -0,0 +1,219 @@
+"""Retention: purge terminal tasks after a per-state TTL.
+
+Finished tasks otherwise accumulate forever, with their message history,
+artifacts and feedback. The retention engine deletes tasks whose state is
+older than the TTL configured for that state, in small batches so no purge
+holds locks or writes WAL for long. Deleted tasks can first be archived to
+gzipped JSONL files, one JSON task per line.
+
+The engine runs as a background task in the app lifespan when
+``storage.retention_enabled`` is set, and on demand via
+``bindu storage purge``. Tasks in a non-terminal state (submitted, working,
+input-required, auth-required) are never purged.
+"""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import gzip
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from bindu.common.protocol.types import Task, TaskState
+from bindu.settings import app_settings
+from bindu.utils.logging import get_logger
+
+from .base import Storage
+from .helpers.serialization import dumps_jsonb_bytes
+
+logger = get_logger("bindu.server.storage.retention")
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Which tasks to purge and where to archive them.
+
+    Attributes:
+        ttls: How long tasks are kept in each state; states not listed are
+            kept forever
+        batch_size: Tasks deleted per transaction
+        archive_dir: Directory for archive files, or None to not archive
+    """
+
+    ttls: Mapping[TaskState, timedelta]
+    batch_size: int = 500
+    archive_dir: Path | None = None
+
+    def __post_init__(self) -> None:
+        """Reject policies that would purge live tasks."""
+        live = sorted(app_settings.agent.non_terminal_states.intersection(self.ttls))
+        if live:
+            raise ValueError(f"Retention cannot purge non-terminal states: {live}")
+        if self.batch_size < 1:
+            raise ValueError("Retention batch_size must be at least 1")
+
+    @classmethod
+    def from_settings(cls) -> RetentionPolicy:
+        """Build the policy from ``app_settings.storage``."""
+        settings = app_settings.storage
+        archive_path = settings.retention_archive_path
+        return cls(
+            ttls={
+                state: timedelta(seconds=seconds)  # type: ignore[misc]
+                for state, seconds in settings.retention_ttl_seconds.items()
+            },
+            batch_size=settings.purge_batch_size,
+            archive_dir=Path(archive_path) if archive_path else None,
+        )
+
+    def cutoffs(self, now: datetime | None = None) -> dict[TaskState, datetime]:
+        """Oldest status timestamp kept for each state, as of ``now``."""
+        now = now or datetime.now(timezone.utc)
+        return {state: now - ttl for state, ttl in self.ttls.items()}
+
+
+@dataclass
+class RetentionResult:
+    """Outcome of one retention run."""
+
+    purged: int = 0
+    archived: int = 0
+    archive_files: set[Path] = field(default_factory=set)
+
+
+class JsonlArchive:
+    """Append tasks to daily gzipped JSONL files.
+
+    Each batch is written as its own gzip member, so files stay valid if the
+    process dies mid-run and can be read back with ``gzip.open``.
+    """
+
+    def __init__(self, directory: Path):
+        """Initialize the archive.
+
+        Args:
+            directory: Where archive files are written (created if missing)
+        """
+        self.directory = directory
+
+    def path_for(self, now: datetime) -> Path:
+        """Archive file for the given day."""
+        return self.directory / f"tasks-{now:%Y%m%d}.jsonl.gz"
+
+    async def write(self, tasks: list[Task], now: datetime | None = None) -> Path:
+        """Append tasks to today's file without blocking the event loop.
+
+        Args:
+            tasks: Tasks to archive
+            now: Used to pick the file (defaults to the current UTC time)
+
+        Returns:
+            Path of the file written
+        """
+        path = self.path_for(now or datetime.now(timezone.utc))
+        lines = b"".join(dumps_jsonb_bytes(task) + b"\n" for task in tasks)
+        await asyncio.to_thread(self._append, path, lines)
+        return path
+
+    def _append(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "ab") as f:
+            f.write(gzip.compress(data))
+            f.flush()
+
+
+class RetentionEngine:
+    """Purge expired tasks from a storage backend, once or periodically."""
+
+    def __init__(
+        self,
+        storage: Storage[Any],
+        policy: RetentionPolicy,
+        interval_seconds: float = 3600,
+    ):
+        """Initialize the engine.
+
+        Args:
+            storage: Backend to purge
+            policy: TTLs, batch size and archive location
+            interval_seconds: Delay between runs of the background task
+        """
+        self.storage = storage
+        self.policy = policy
+        self.interval = interval_seconds
+        self._archive = JsonlArchive(policy.archive_dir) if policy.archive_dir else None
+        self._task: asyncio.Task[None] | None = None
+
+    async def run_once(
+        self, now: datetime | None = None, max_batches: int | None = None
+    ) -> RetentionResult:
+        """Purge batches until nothing is expired (or max_batches is reached).
+
+        Args:
+            now: Reference time for the TTLs (defaults to the current UTC time)
+            max_batches: Stop after this many batches
+
+        Returns:
+            Number of tasks purged and archived
+        """
+        result = RetentionResult()
+        if not self.policy.ttls:
+            return result
+
+        cutoffs = self.policy.cutoffs(now)
+
+        async def _archive(tasks: list[Task]) -> None:
+            path = await self._archive.write(tasks, now)  # type: ignore[union-attr]
+            result.archived += len(tasks)
+            result.archive_files.add(path)
+
+        archive = _archive if self._archive is not None else None
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            purged = await self.storage.purge_expired_tasks(
+                cutoffs, self.policy.batch_size, archive
+            )
+            batches += 1
+            result.purged += purged
+            if purged == 0:
+                break
+            # Let request handling run between batches
+            await asyncio.sleep(0)
+
+        if result.purged:
+            logger.info(
+                f"Retention purged {result.purged} tasks "
+                f"({result.archived} archived) in {batches} batches"
+            )
+        return result
+
+    async def start(self) -> None:
+        """Start the periodic retention task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_periodically())
+            logger.info(f"Retention task started (every {self.interval}s)")
+
+    async def stop(self) -> None:
+        """Stop the periodic retention task."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            logger.info("Retention task stopped")
+
+    async def _run_periodically(self) -> None:
+        """Run retention every interval until cancelled."""
+        while True:
+            try:
+                await self.run_once()
+                await asyncio.sleep(self.interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in retention task: {e}", exc_info=True)
+                await asyncio.sleep(self.interval)
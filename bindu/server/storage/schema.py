@@ -18,17 +18,26 @@ from __future__ import annotations as _annotations
 
 
 from sqlalchemy import (
+    DDL,
     TIMESTAMP,
+    BigInteger,
     Column,
+    Computed,
+    Date,
     ForeignKey,
+    Identity,
     Index,
     Integer,
+    LargeBinary,
     MetaData,
+    SmallInteger,
     String,
     Table,
+    event,
     func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import JSONB, UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID as PG_UUID
 
 # Create metadata instance for table definitions
 metadata = MetaData()
@@ -40,7 +49,8 @@ metadata = MetaData()
 tasks_table = Table(
     "tasks",
     metadata,
-    # Primary key
+    # Primary key (id, created_at): a partitioned table's keys must include the
+    # partition key. task_ids keeps task ids unique
     Column("id", PG_UUID(as_uuid=True), primary_key=True, nullable=False),
     # Foreign keys
     Column(
@@ -54,13 +64,18 @@ tasks_table = Table(
     Column("state", String(50), nullable=False),
     Column("state_timestamp", TIMESTAMP(timezone=True), nullable=False),
     # JSONB columns for A2A protocol data
+    # history is legacy: messages are appended to task_messages instead
     Column("history", JSONB, nullable=False, server_default="[]"),
     Column("artifacts", JSONB, nullable=True, server_default="[]"),
     Column("metadata", JSONB, nullable=True, server_default="{}"),
+    # History and artifacts of a compacted finished task, as one zstd frame
+    # (see compression.py); NULL for tasks that were never compacted
+    Column("compressed_payload", LargeBinary, nullable=True),
     # Timestamps
     Column(
         "created_at",
         TIMESTAMP(timezone=True),
+        primary_key=True,
         nullable=False,
         server_default=func.now(),
     ),
@@ -72,15 +87,104 @@ tasks_table = Table(
         onupdate=func.now(),
     ),
     # Indexes
-    Index("idx_tasks_context_id", "context_id"),
-    Index("idx_tasks_state", "state"),
-    Index("idx_tasks_created_at", "created_at"),
+    # Keyset pagination on (created_at, id), optionally filtered by context or
+    # state; the leading columns also serve plain context_id/state lookups
+    Index("idx_tasks_created_at_id", "created_at", "id"),
+    Index("idx_tasks_context_id_created_at_id", "context_id", "created_at", "id"),
+    Index("idx_tasks_state_created_at_id", "state", "created_at", "id"),
     Index("idx_tasks_updated_at", "updated_at"),
-    Index("idx_tasks_history_gin", "history", postgresql_using="gin"),
+    # Retention purge: oldest tasks per terminal state
+    Index("idx_tasks_state_state_timestamp", "state", "state_timestamp"),
+    # Compaction: oldest finished tasks not compacted yet
+    Index(
+        "idx_tasks_uncompressed_state_timestamp",
+        "state",
+        "state_timestamp",
+        postgresql_where=text("compressed_payload IS NULL"),
+    ),
     Index("idx_tasks_metadata_gin", "metadata", postgresql_using="gin"),
     Index("idx_tasks_artifacts_gin", "artifacts", postgresql_using="gin"),
     # Table comment
     comment="A2A protocol tasks with JSONB history and artifacts",
+    # Monthly range partitions on created_at (see partitions.py)
+    postgresql_partition_by="RANGE (created_at)",
+)
+
+# Every task's id and created_at, filled in by the sync_task_ids() triggers.
+# Its primary key keeps task ids unique across partitions, the tables that
+# hang off a task reference it (tasks(id) cannot be referenced once
+# partitioned), and lookups by id read created_at from it so they only scan
+# the partition holding the task
+task_ids_table = Table(
+    "task_ids",
+    metadata,
+    Column("id", PG_UUID(as_uuid=True), primary_key=True, nullable=False),
+    Column("created_at", TIMESTAMP(timezone=True), nullable=False),
+    # Table comment
+    comment="Id and creation time of every task, maintained by triggers on tasks",
+)
+
+
+def _task_id_foreign_key() -> ForeignKey:
+    """Foreign key to task_ids(id), deleting the row with its task.
+
+    Checked at commit: a task and its first message are written by one
+    statement, before the trigger has added the task's id.
+    """
+    return ForeignKey(
+        "task_ids.id", ondelete="CASCADE", deferrable=True, initially="DEFERRED"
+    )
+
+
+# -----------------------------------------------------------------------------
+# Task Messages Table (append-only message history)
+# -----------------------------------------------------------------------------
+
+# Text search configuration of task_messages.search_vector. "simple" only
+# lowercases words (no stemming or stop words), so any language and
+# identifiers match as typed
+TEXT_SEARCH_CONFIG = "simple"
+
+task_messages_table = Table(
+    "task_messages",
+    metadata,
+    # Composite primary key: (task_id, seq) serves ordered tail reads
+    Column(
+        "task_id",
+        PG_UUID(as_uuid=True),
+        _task_id_foreign_key(),
+        primary_key=True,
+        nullable=False,
+    ),
+    Column("seq", BigInteger, Identity(), primary_key=True, nullable=False),
+    # A2A protocol Message
+    Column("payload", JSONB, nullable=False),
+    # message_id of messages added by submit_task (NULL for agent messages);
+    # unique per task, so a retried message/send is not appended twice
+    Column("message_id", PG_UUID(as_uuid=True), nullable=True),
+    # Timestamp
+    Column(
+        "created_at",
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+    # Words of the message's text parts, for tasks/search
+    Column(
+        "search_vector",
+        TSVECTOR,
+        Computed(
+            f"jsonb_to_tsvector('{TEXT_SEARCH_CONFIG}'::regconfig, "
+            "jsonb_path_query_array(payload, '$.parts[*].text'), '[\"string\"]')",
+            persisted=True,
+        ),
+    ),
+    Index(
+        "uq_task_messages_task_id_message_id", "task_id", "message_id", unique=True
+    ),
+    Index("idx_task_messages_search_vector", "search_vector", postgresql_using="gin"),
+    # Table comment
+    comment="Append-only task message history, one row per message",
 )
 
 # -----------------------------------------------------------------------------
@@ -110,7 +214,7 @@ contexts_table = Table(
         onupdate=func.now(),
     ),
     # Indexes
-    Index("idx_contexts_created_at", "created_at"),
+    Index("idx_contexts_created_at_id", "created_at", "id"),
     Index("idx_contexts_updated_at", "updated_at"),
     Index("idx_contexts_data_gin", "context_data", postgresql_using="gin"),
     Index("idx_contexts_history_gin", "message_history", postgresql_using="gin"),
@@ -127,11 +231,11 @@ task_feedback_table = Table(
     metadata,
     # Primary key
     Column("id", Integer, primary_key=True, autoincrement=True, nullable=False),
-    # Foreign key
+    # Foreign key to the task
     Column(
         "task_id",
         PG_UUID(as_uuid=True),
-        ForeignKey("tasks.id", ondelete="CASCADE"),
+        _task_id_foreign_key(),
         nullable=False,
     ),
     # JSONB column
@@ -161,7 +265,7 @@ webhook_configs_table = Table(
     Column(
         "task_id",
         PG_UUID(as_uuid=True),
-        ForeignKey("tasks.id", ondelete="CASCADE"),
+        _task_id_foreign_key(),
         primary_key=True,
         nullable=False,
     ),
@@ -187,6 +291,284 @@ webhook_configs_table = Table(
     comment="Webhook configurations for long-running task notifications",
 )
 
+# -----------------------------------------------------------------------------
+# Compression Dictionaries
+# -----------------------------------------------------------------------------
+
+task_compression_dictionaries_table = Table(
+    "task_compression_dictionaries",
+    metadata,
+    # zstd dictionary ID, also written into the header of every frame
+    # compressed with it
+    Column("id", BigInteger, primary_key=True, autoincrement=False),
+    Column("dictionary", LargeBinary, nullable=False),
+    Column(
+        "created_at",
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+    comment="Shared zstd dictionaries for compacted task payloads",
+)
+
+# -----------------------------------------------------------------------------
+# Task Change Notifications
+# -----------------------------------------------------------------------------
+
+# Every committed insert/update/delete on tasks sends NOTIFY on this channel
+# with {"id", "context_id", "state", "op"} as JSON payload; it drives cache
+# invalidation and Storage.subscribe() on every process
+TASK_CHANGES_CHANNEL = "bindu_task_changes"
+
+NOTIFY_TASK_CHANGE_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION notify_task_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    task_row tasks;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        task_row := OLD;
+    ELSE
+        task_row := NEW;
+    END IF;
+    PERFORM pg_notify(
+        '{TASK_CHANGES_CHANNEL}',
+        json_build_object(
+            'id', task_row.id,
+            'context_id', task_row.context_id,
+            'state', task_row.state,
+            'op', lower(TG_OP)
+        )::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+NOTIFY_TASK_CHANGE_TRIGGER = """
+CREATE TRIGGER notify_tasks_change
+AFTER INSERT OR UPDATE OR DELETE ON tasks
+FOR EACH ROW EXECUTE FUNCTION notify_task_change()
+"""
+
+# -----------------------------------------------------------------------------
+# Task Partitioning
+# -----------------------------------------------------------------------------
+
+# Catches rows outside every monthly partition so inserts never fail; it
+# stays empty while partitions are created ahead of time
+TASKS_DEFAULT_PARTITION = "tasks_default"
+
+CREATE_TASKS_DEFAULT_PARTITION = f"""
+CREATE TABLE IF NOT EXISTS {TASKS_DEFAULT_PARTITION} PARTITION OF tasks DEFAULT
+"""
+
+# Statement-level, with one trigger per event (transition tables take a
+# single event each). Deleting a task's id deletes its messages, feedback and
+# webhook config through their foreign keys. Dropping a partition does not
+# fire them; partitions.py deletes a dropped partition's ids itself
+SYNC_TASK_IDS_FUNCTION = """
+CREATE OR REPLACE FUNCTION sync_task_ids()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO task_ids (id, created_at)
+        SELECT id, created_at FROM new_tasks;
+    ELSE
+        DELETE FROM task_ids WHERE id IN (SELECT id FROM old_tasks);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+SYNC_TASK_IDS_TRIGGERS = (
+    """
+    CREATE TRIGGER sync_task_ids_insert
+    AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_task_ids()
+    """,
+    """
+    CREATE TRIGGER sync_task_ids_delete
+    AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_task_ids()
+    """,
+)
+
+# -----------------------------------------------------------------------------
+# Task Counts by State
+# -----------------------------------------------------------------------------
+
+# Writers add to the shard picked by their backend pid, so concurrent
+# transactions rarely wait on the same counter row
+TASK_STATE_COUNT_SHARDS = 16
+
+task_state_counts_table = Table(
+    "task_state_counts",
+    metadata,
+    # Number of tasks in a state is the sum over its shards
+    Column("state", String(50), primary_key=True, nullable=False),
+    Column("shard", SmallInteger, primary_key=True, nullable=False),
+    Column("count", BigInteger, nullable=False, server_default="0"),
+    comment="Task counts per state, maintained by triggers on tasks",
+)
+
+# Statement-level, so a batch update or purge touches each counter once.
+# Detaching a partition does not fire it; partitions.py subtracts the counts
+# of a detached partition itself
+COUNT_TASK_STATES_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION count_task_states()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM task_state_counts;
+    ELSIF TG_OP = 'INSERT' THEN
+        INSERT INTO task_state_counts AS c (state, shard, count)
+        SELECT state, mod(pg_backend_pid(), {TASK_STATE_COUNT_SHARDS}), count(*)
+        FROM new_tasks GROUP BY state ORDER BY state
+        ON CONFLICT (state, shard) DO UPDATE SET count = c.count + excluded.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO task_state_counts AS c (state, shard, count)
+        SELECT state, mod(pg_backend_pid(), {TASK_STATE_COUNT_SHARDS}), -count(*)
+        FROM old_tasks GROUP BY state ORDER BY state
+        ON CONFLICT (state, shard) DO UPDATE SET count = c.count + excluded.count;
+    ELSE
+        -- Rows that kept their state cancel out
+        INSERT INTO task_state_counts AS c (state, shard, count)
+        SELECT state, mod(pg_backend_pid(), {TASK_STATE_COUNT_SHARDS}), sum(delta)
+        FROM (
+            SELECT state, 1 AS delta FROM new_tasks
+            UNION ALL
+            SELECT state, -1 AS delta FROM old_tasks
+        ) changes
+        GROUP BY state HAVING sum(delta) <> 0 ORDER BY state
+        ON CONFLICT (state, shard) DO UPDATE SET count = c.count + excluded.count;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Triggers with transition tables take a single event each
+COUNT_TASK_STATES_TRIGGERS = (
+    """
+    CREATE TRIGGER count_tasks_insert
+    AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION count_task_states()
+    """,
+    """
+    CREATE TRIGGER count_tasks_update
+    AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_tasks NEW TABLE AS new_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION count_task_states()
+    """,
+    """
+    CREATE TRIGGER count_tasks_delete
+    AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION count_task_states()
+    """,
+    """
+    CREATE TRIGGER count_tasks_truncate
+    AFTER TRUNCATE ON tasks
+    FOR EACH STATEMENT EXECUTE FUNCTION count_task_states()
+    """,
+)
+
+# -----------------------------------------------------------------------------
+# Feedback Rollups
+# -----------------------------------------------------------------------------
+
+# Sharded by backend pid like task_state_counts, since all feedback for a
+# skill on a day lands on the same group
+FEEDBACK_ROLLUP_SHARDS = 16
+
+task_feedback_rollups_table = Table(
+    "task_feedback_rollups",
+    metadata,
+    # '' for feedback without a skill_id
+    Column("skill_id", String, primary_key=True, nullable=False),
+    # UTC day of task_feedback.created_at
+    Column("day", Date, primary_key=True, nullable=False),
+    Column("shard", SmallInteger, primary_key=True, nullable=False),
+    Column("feedback_count", BigInteger, nullable=False, server_default="0"),
+    # Sum of the ratings from 1 to 5; entries without one only add to the count
+    Column("rating_sum", BigInteger, nullable=False, server_default="0"),
+    *(
+        Column(f"rating_{rating}", BigInteger, nullable=False, server_default="0")
+        for rating in range(1, 6)
+    ),
+    comment="Feedback counts and ratings per skill and day, maintained by a "
+    "trigger on task_feedback",
+)
+
+# Only inserts are counted: feedback deleted with its task (retention,
+# partition drops) stays in the rollups. Keep the skill and rating rules in
+# sync with helpers/feedback.py
+ROLLUP_TASK_FEEDBACK_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION rollup_task_feedback()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO task_feedback_rollups AS r (
+        skill_id, day, shard, feedback_count, rating_sum,
+        rating_1, rating_2, rating_3, rating_4, rating_5
+    )
+    SELECT skill_id, day, mod(pg_backend_pid(), {FEEDBACK_ROLLUP_SHARDS}),
+           count(*), coalesce(sum(rating), 0),
+           count(*) FILTER (WHERE rating = 1), count(*) FILTER (WHERE rating = 2),
+           count(*) FILTER (WHERE rating = 3), count(*) FILTER (WHERE rating = 4),
+           count(*) FILTER (WHERE rating = 5)
+    FROM (
+        SELECT CASE WHEN jsonb_typeof(feedback_data -> 'skill_id') = 'string'
+                    THEN feedback_data ->> 'skill_id' ELSE '' END AS skill_id,
+               (created_at AT TIME ZONE 'UTC')::date AS day,
+               CASE WHEN jsonb_typeof(feedback_data -> 'rating') = 'number' THEN
+                   CASE WHEN (feedback_data ->> 'rating')::numeric IN (1, 2, 3, 4, 5)
+                        THEN (feedback_data ->> 'rating')::numeric::int END
+               END AS rating
+        FROM new_feedback
+    ) entries
+    GROUP BY skill_id, day ORDER BY skill_id, day
+    ON CONFLICT (skill_id, day, shard) DO UPDATE SET
+        feedback_count = r.feedback_count + excluded.feedback_count,
+        rating_sum = r.rating_sum + excluded.rating_sum,
+        rating_1 = r.rating_1 + excluded.rating_1,
+        rating_2 = r.rating_2 + excluded.rating_2,
+        rating_3 = r.rating_3 + excluded.rating_3,
+        rating_4 = r.rating_4 + excluded.rating_4,
+        rating_5 = r.rating_5 + excluded.rating_5;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+ROLLUP_TASK_FEEDBACK_TRIGGER = """
+CREATE TRIGGER rollup_task_feedback_insert
+AFTER INSERT ON task_feedback
+REFERENCING NEW TABLE AS new_feedback
+FOR EACH STATEMENT EXECUTE FUNCTION rollup_task_feedback()
+"""
+
+# Tables created with metadata.create_all() (DID schemas, tests) get the
+# triggers and default partition too; the public schema gets them from the
+# Alembic migrations
+event.listen(tasks_table, "after_create", DDL(NOTIFY_TASK_CHANGE_FUNCTION))
+event.listen(tasks_table, "after_create", DDL(NOTIFY_TASK_CHANGE_TRIGGER))
+event.listen(tasks_table, "after_create", DDL(CREATE_TASKS_DEFAULT_PARTITION))
+event.listen(tasks_table, "after_create", DDL(SYNC_TASK_IDS_FUNCTION))
+for _trigger in SYNC_TASK_IDS_TRIGGERS:
+    event.listen(tasks_table, "after_create", DDL(_trigger))
+event.listen(tasks_table, "after_create", DDL(COUNT_TASK_STATES_FUNCTION))
+for _trigger in COUNT_TASK_STATES_TRIGGERS:
+    event.listen(tasks_table, "after_create", DDL(_trigger))
+event.listen(
+    task_feedback_table, "after_create", DDL(ROLLUP_TASK_FEEDBACK_FUNCTION)
+)
+event.listen(task_feedback_table, "after_create", DDL(ROLLUP_TASK_FEEDBACK_TRIGGER))
+
 # -----------------------------------------------------------------------------
 # Helper Functions
 # -----------------------------------------------------------------------------
@@ -0,0 +1,1945 @@
+"""SQLite storage implementation using aiosqlite.
+
+This implementation provides a persistent storage backend suitable for:
+- Single-host deployments without a database server
+- Edge devices and desktop agents
+- Local development that should survive restarts
+
+Hybrid Agent Pattern Support:
+- Stores tasks with flexible state transitions (working → input-required → completed)
+- Maintains conversation context across multiple tasks
+- Supports incremental message history updates
+- Enables task refinements through context-based task lookup
+
+Features:
+- WAL journal mode: readers never block the writer or each other
+- One dedicated writer connection (SQLite allows one writer at a time) and a
+  pool of reader connections, each running on its own aiosqlite thread
+- JSON1 functions assemble message history and append artifacts in SQL
+- Same table layout as PostgreSQL: append-only task_messages, per-state
+  counters kept by triggers, dependents deleted with their task by trigger
+
+Note: Changes are only published to subscribers in this process. Use
+PostgreSQL when several processes or pods share the same storage.
+"""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import itertools
+import sqlite3
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Mapping
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+import aiosqlite
+from typing_extensions import TypeVar
+
+from bindu.common.protocol.types import (
+    Artifact,
+    FeedbackGroupBy,
+    FeedbackSummary,
+    ListContextsResult,
+    ListTasksResult,
+    Message,
+    PushNotificationConfig,
+    Task,
+    TaskProjection,
+    TaskState,
+    TaskStatus,
+)
+from bindu.settings import app_settings
+from bindu.utils.logging import get_logger
+
+from .base import DuplicateMessageError, RecordKind, Storage
+from .change_feed import (
+    TaskChange,
+    TaskChangeFeed,
+    TaskChangeOperation,
+    TaskSubscription,
+)
+from .helpers import (
+    dumps_jsonb,
+    includes_history,
+    loads_jsonb,
+    normalize_message_uuids,
+    normalize_timestamp,
+    normalize_uuid,
+    project_task,
+    validate_projection,
+    validate_uuid_type,
+)
+from .helpers.feedback import summarize_rollups, validate_group_by
+from .helpers.pagination import (
+    clamp_page_size,
+    decode_page_token,
+    encode_page_token,
+)
+from .helpers.search import (
+    metadata_contains,
+    rank_messages,
+    search_page,
+    search_terms,
+)
+
+logger = get_logger("bindu.server.storage.sqlite_storage")
+
+ContextT = TypeVar("ContextT", default=Any)
+
+# Bumped with every schema change; stored in PRAGMA user_version
+SCHEMA_VERSION = 3
+
+# Feedback totals per skill and UTC day for get_feedback_summary(); the skill
+# and rating rules match helpers/feedback.py
+FEEDBACK_ROLLUPS_TABLE = """
+CREATE TABLE IF NOT EXISTS task_feedback_rollups (
+    skill_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    feedback_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    rating_1 INTEGER NOT NULL DEFAULT 0,
+    rating_2 INTEGER NOT NULL DEFAULT 0,
+    rating_3 INTEGER NOT NULL DEFAULT 0,
+    rating_4 INTEGER NOT NULL DEFAULT 0,
+    rating_5 INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (skill_id, day)
+);
+"""
+
+# Skill, day and rating (1-5, else NULL) of task_feedback rows; {row} is the
+# row's alias
+_FEEDBACK_ENTRY = """
+SELECT CASE WHEN json_type({row}.feedback_data, '$.skill_id') = 'text'
+            THEN json_extract({row}.feedback_data, '$.skill_id') ELSE '' END
+           AS skill_id,
+       substr({row}.created_at, 1, 10) AS day,
+       CASE WHEN json_type({row}.feedback_data, '$.rating') IN ('integer', 'real')
+             AND json_extract({row}.feedback_data, '$.rating') IN (1, 2, 3, 4, 5)
+            THEN CAST(json_extract({row}.feedback_data, '$.rating') AS INTEGER)
+       END AS rating
+"""
+
+_FEEDBACK_ROLLUP_COLUMNS = (
+    "skill_id, day, feedback_count, rating_sum, "
+    "rating_1, rating_2, rating_3, rating_4, rating_5"
+)
+
+FEEDBACK_ROLLUPS = FEEDBACK_ROLLUPS_TABLE + f"""
+CREATE TRIGGER IF NOT EXISTS rollup_task_feedback_insert
+AFTER INSERT ON task_feedback
+BEGIN
+    INSERT INTO task_feedback_rollups ({_FEEDBACK_ROLLUP_COLUMNS})
+    SELECT skill_id, day, 1, coalesce(rating, 0), rating IS 1, rating IS 2,
+           rating IS 3, rating IS 4, rating IS 5
+    FROM ({_FEEDBACK_ENTRY.format(row="NEW")}) WHERE true
+    ON CONFLICT (skill_id, day) DO UPDATE SET
+        feedback_count = feedback_count + excluded.feedback_count,
+        rating_sum = rating_sum + excluded.rating_sum,
+        rating_1 = rating_1 + excluded.rating_1,
+        rating_2 = rating_2 + excluded.rating_2,
+        rating_3 = rating_3 + excluded.rating_3,
+        rating_4 = rating_4 + excluded.rating_4,
+        rating_5 = rating_5 + excluded.rating_5;
+END;
+"""
+
+# UUIDs are stored as canonical text and timestamps as fixed-width UTC ISO
+# 8601 text, so both sort the same as text and as values
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contexts (
+    id TEXT PRIMARY KEY,
+    context_data TEXT NOT NULL DEFAULT '{}',
+    message_history TEXT NOT NULL DEFAULT '[]',
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_contexts_created_at_id ON contexts (created_at, id);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    context_id TEXT NOT NULL REFERENCES contexts (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL DEFAULT 'task',
+    state TEXT NOT NULL,
+    state_timestamp TEXT NOT NULL,
+    artifacts TEXT NOT NULL DEFAULT '[]',
+    metadata TEXT NOT NULL DEFAULT '{}',
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_created_at_id ON tasks (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_context_id_created_at_id
+    ON tasks (context_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_state_created_at_id
+    ON tasks (state, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_state_state_timestamp
+    ON tasks (state, state_timestamp);
+
+CREATE TABLE IF NOT EXISTS task_messages (
+    seq INTEGER PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    message_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_task_messages_task_id_seq
+    ON task_messages (task_id, seq);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_task_messages_task_id_message_id
+    ON task_messages (task_id, message_id);
+
+CREATE TABLE IF NOT EXISTS task_feedback (
+    id INTEGER PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    feedback_data TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_task_feedback_task_id ON task_feedback (task_id, id);
+
+CREATE TABLE IF NOT EXISTS webhook_configs (
+    task_id TEXT PRIMARY KEY,
+    config TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS task_state_counts (
+    state TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS delete_tasks_dependents AFTER DELETE ON tasks
+BEGIN
+    DELETE FROM task_messages WHERE task_id = OLD.id;
+    DELETE FROM task_feedback WHERE task_id = OLD.id;
+    DELETE FROM webhook_configs WHERE task_id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS count_tasks_insert AFTER INSERT ON tasks
+BEGIN
+    INSERT INTO task_state_counts (state, count) VALUES (NEW.state, 1)
+    ON CONFLICT (state) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS count_tasks_update AFTER UPDATE OF state ON tasks
+WHEN OLD.state IS NOT NEW.state
+BEGIN
+    UPDATE task_state_counts SET count = count - 1 WHERE state = OLD.state;
+    INSERT INTO task_state_counts (state, count) VALUES (NEW.state, 1)
+    ON CONFLICT (state) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS count_tasks_delete AFTER DELETE ON tasks
+BEGIN
+    UPDATE task_state_counts SET count = count - 1 WHERE state = OLD.state;
+END;
+""" + FEEDBACK_ROLLUPS
+
+# Statements bringing a database at the key's version minus one up to it;
+# SCHEMA (idempotent) runs after them
+UPGRADES: dict[int, str] = {
+    # message_id of messages added by submit_task, for idempotent sends
+    2: "ALTER TABLE task_messages ADD COLUMN message_id TEXT;",
+    # Feedback rollups, counting the feedback stored so far
+    3: FEEDBACK_ROLLUPS_TABLE
+    + f"""
+INSERT INTO task_feedback_rollups ({_FEEDBACK_ROLLUP_COLUMNS})
+SELECT skill_id, day, count(*), coalesce(sum(rating), 0), sum(rating IS 1),
+       sum(rating IS 2), sum(rating IS 3), sum(rating IS 4), sum(rating IS 5)
+FROM ({_FEEDBACK_ENTRY.format(row="f")} FROM task_feedback f)
+GROUP BY skill_id, day;
+""",
+}
+
+# Task columns selected by each projection (history is added separately)
+_PROJECTION_COLUMNS: dict[str, tuple[str, ...]] = {
+    "full": (
+        "id",
+        "context_id",
+        "kind",
+        "state",
+        "state_timestamp",
+        "created_at",
+        "metadata",
+        "artifacts",
+    ),
+    "summary": (
+        "id",
+        "context_id",
+        "kind",
+        "state",
+        "state_timestamp",
+        "created_at",
+        "metadata",
+    ),
+    "status": ("id", "context_id", "kind", "state", "state_timestamp", "created_at"),
+}
+
+
+def _format_timestamp(value: datetime) -> str:
+    """Format a datetime as fixed-width UTC text that sorts chronologically."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+
+def _now() -> str:
+    return _format_timestamp(datetime.now(timezone.utc))
+
+
+def _history_sql(history_length: int | None) -> str:
+    """Correlated subquery building a task's history array with JSON1.
+
+    Reads task_messages for the row aliased ``t`` in seq order; with a
+    positive history_length only the last N rows are read.
+    """
+    if history_length is not None and history_length > 0:
+        messages = (
+            "SELECT seq, payload FROM ("
+            "SELECT seq, payload FROM task_messages WHERE task_id = t.id "
+            f"ORDER BY seq DESC LIMIT {int(history_length)}"
+            ") ORDER BY seq"
+        )
+    else:
+        messages = "SELECT payload FROM task_messages WHERE task_id = t.id ORDER BY seq"
+    return f"(SELECT json_group_array(json(payload)) FROM ({messages}))"
+
+
+def _json_append_sql(column: str, count: int, name: str) -> str:
+    """JSON1 expression appending ``count`` bound JSON values to an array column.
+
+    Values are bound as ``:{name}_0`` ... in order; each ``$[#]`` insert sees
+    the array left by the previous one, so list order is kept.
+    """
+    pairs = "".join(f", '$[#]', json(:{name}_{i})" for i in range(count))
+    return f"json_insert({column}{pairs})"
+
+
+def _json_params(name: str, values: list[Any]) -> dict[str, str]:
+    return {f"{name}_{i}": dumps_jsonb(value) for i, value in enumerate(values)}
+
+
+def _in_params(name: str, values: Iterable[Any]) -> tuple[str, dict[str, Any]]:
+    """Placeholder list and parameters for an ``IN (...)`` clause."""
+    params = {f"{name}_{i}": value for i, value in enumerate(values)}
+    return ", ".join(f":{key}" for key in params), params
+
+
+class SQLiteStorage(Storage[ContextT]):
+    """SQLite storage implementation for tasks and contexts.
+
+    Storage Structure:
+    - tasks: Task rows with JSON artifacts and metadata
+    - task_messages: Append-only message history (one row per message)
+    - contexts: Context metadata and message history
+    - task_feedback: Optional feedback storage
+    - webhook_configs: Push notification configs of long-running tasks
+
+    Connection Management:
+    - One writer connection; write transactions (BEGIN IMMEDIATE) take turns
+      behind an asyncio lock instead of waiting on SQLITE_BUSY
+    - sqlite_readers reader connections (query_only) handed out from a queue
+    - WAL mode with synchronous=NORMAL: commits do not fsync, checkpoints do
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        readers: int | None = None,
+        busy_timeout_ms: int | None = None,
+    ):
+        """Initialize SQLite storage.
+
+        Args:
+            path: Database file (defaults to settings); created on connect()
+            readers: Number of reader connections (defaults to settings)
+            busy_timeout_ms: How long a connection waits for a lock held by
+                another process (defaults to settings)
+        """
+        self.path = Path(path or app_settings.storage.sqlite_path)
+        self.readers = max(readers or app_settings.storage.sqlite_readers, 1)
+        self.busy_timeout_ms = (
+            app_settings.storage.sqlite_busy_timeout_ms
+            if busy_timeout_ms is None
+            else busy_timeout_ms
+        )
+
+        self._writer: aiosqlite.Connection | None = None
+        self._write_lock = asyncio.Lock()
+        self._reader_pool: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._reader_conns: list[aiosqlite.Connection] = []
+        # Change events for subscribe(); published after each commit
+        self._change_feed = TaskChangeFeed()
+
+    # -------------------------------------------------------------------------
+    # Connection Management
+    # -------------------------------------------------------------------------
+
+    async def connect(self) -> None:
+        """Open the writer and reader connections and create the schema.
+
+        Raises:
+            ConnectionError: If the database cannot be opened
+        """
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = await self._open(read_only=False)
+            await self._create_schema(self._writer)
+
+            for _ in range(self.readers):
+                conn = await self._open(read_only=True)
+                self._reader_conns.append(conn)
+                self._reader_pool.put_nowait(conn)
+        except (OSError, sqlite3.Error) as e:
+            await self.disconnect()
+            raise ConnectionError(
+                f"Failed to open SQLite database {self.path}: {e}"
+            ) from e
+
+        logger.info(
+            f"SQLite storage opened at {self.path} "
+            f"(WAL, 1 writer, {self.readers} readers)"
+        )
+
+    async def _open(self, read_only: bool) -> aiosqlite.Connection:
+        # isolation_level=None: transactions are begun explicitly, so reads
+        # never hold a snapshot open between statements
+        conn = await aiosqlite.connect(self.path, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        await conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        if read_only:
+            await conn.execute("PRAGMA query_only = ON")
+        else:
+            await conn.execute("PRAGMA journal_mode = WAL")
+            await conn.execute("PRAGMA synchronous = NORMAL")
+            await conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    @staticmethod
+    async def _create_schema(conn: aiosqlite.Connection) -> None:
+        async with conn.execute("PRAGMA user_version") as cursor:
+            row = await cursor.fetchone()
+        version = row[0] if row else 0
+        if version > SCHEMA_VERSION:
+            raise sqlite3.DatabaseError(
+                f"Database schema version {version} is newer than this "
+                f"release supports ({SCHEMA_VERSION})"
+            )
+        if version < SCHEMA_VERSION:
+            # A new database (version 0) gets the current SCHEMA directly
+            upgrades = "\n".join(
+                sql for target, sql in sorted(UPGRADES.items()) if 0 < version < target
+            )
+            await conn.executescript(
+                f"BEGIN IMMEDIATE;\n{upgrades}\n{SCHEMA}\n"
+                f"PRAGMA user_version = {SCHEMA_VERSION};\nCOMMIT;"
+            )
+
+    async def disconnect(self) -> None:
+        """Close all connections."""
+        self._change_feed.interrupt()
+
+        for conn in self._reader_conns:
+            await conn.close()
+        self._reader_conns.clear()
+        self._reader_pool = asyncio.Queue()
+
+        if self._writer is not None:
+            writer, self._writer = self._writer, None
+            try:
+                await writer.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.debug(f"PRAGMA optimize failed: {e}")
+            await writer.close()
+            logger.info("SQLite storage closed")
+
+    def _ensure_connected(self) -> aiosqlite.Connection:
+        """Return the writer connection.
+
+        Raises:
+            RuntimeError: If connect() has not been called
+        """
+        if self._writer is None:
+            raise RuntimeError("SQLite storage not initialized. Call connect() first.")
+        return self._writer
+
+    @asynccontextmanager
+    async def _read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a reader connection for one or more statements."""
+        self._ensure_connected()
+        conn = await self._reader_pool.get()
+        try:
+            yield conn
+        finally:
+            self._reader_pool.put_nowait(conn)
+
+    @asynccontextmanager
+    async def _write(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Run a write transaction on the writer connection.
+
+        Commits when the block exits and rolls back if it raises.
+        """
+        writer = self._ensure_connected()
+        async with self._write_lock:
+            await writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield writer
+            except BaseException:
+                await writer.rollback()
+                raise
+            await writer.commit()
+
+    @staticmethod
+    async def _fetchone(
+        conn: aiosqlite.Connection, sql: str, params: Any = ()
+    ) -> sqlite3.Row | None:
+        async with conn.execute(sql, params) as cursor:
+            return await cursor.fetchone()
+
+    @staticmethod
+    async def _fetchall(
+        conn: aiosqlite.Connection, sql: str, params: Any = ()
+    ) -> list[sqlite3.Row]:
+        async with conn.execute(sql, params) as cursor:
+            return list(await cursor.fetchall())
+
+    def _publish(self, changes: Iterable[TaskChange]) -> None:
+        for change in changes:
+            self._change_feed.publish(change)
+
+    @staticmethod
+    def _change(row: sqlite3.Row, operation: TaskChangeOperation) -> TaskChange:
+        return TaskChange(
+            task_id=UUID(row["id"]),
+            context_id=UUID(row["context_id"]),
+            state=row["state"],
+            operation=operation,
+        )
+
+    # -------------------------------------------------------------------------
+    # Row Mapping
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _task_select(
+        projection: TaskProjection = "full", history_length: int | None = None
+    ) -> str:
+        """SELECT list for tasks aliased ``t``, pushing the projection down."""
+        columns = [f"t.{name}" for name in _PROJECTION_COLUMNS[projection]]
+        if includes_history(projection, history_length):
+            columns.append(f"{_history_sql(history_length)} AS history")
+        return f"SELECT {', '.join(columns)} FROM tasks AS t"
+
+    @staticmethod
+    def _row_to_task(row: sqlite3.Row) -> Task:
+        """Convert a row selected with _task_select() to a Task."""
+        keys = row.keys()
+        task = Task(
+            id=UUID(row["id"]),
+            context_id=UUID(row["context_id"]),
+            kind=row["kind"],
+            status=TaskStatus(state=row["state"], timestamp=row["state_timestamp"]),
+        )
+        if "history" in keys:
+            task["history"] = loads_jsonb(row["history"])
+        if "artifacts" in keys:
+            task["artifacts"] = loads_jsonb(row["artifacts"])
+        if "metadata" in keys:
+            task["metadata"] = loads_jsonb(row["metadata"])
+        return task
+
+    async def _load_task_row(
+        self, conn: aiosqlite.Connection, task_id: UUID
+    ) -> Task | None:
+        row = await self._fetchone(
+            conn, f"{self._task_select()} WHERE t.id = ?", (str(task_id),)
+        )
+        return self._row_to_task(row) if row is not None else None
+
+    # -------------------------------------------------------------------------
+    # Task Operations
+    # -------------------------------------------------------------------------
+
+    async def load_task(
+        self,
+        task_id: UUID,
+        history_length: int | None = None,
+        projection: TaskProjection = "full",
+    ) -> Task | None:
+        """Load a task from SQLite.
+
+        Only the projected columns are read, and only the last
+        ``history_length`` message rows when a limit is given.
+
+        Args:
+            task_id: Unique identifier of the task
+            history_length: Optional limit on message history length
+            projection: Which fields to return ("full", "summary" or "status")
+
+        Returns:
+            Task object if found, None otherwise
+
+        Raises:
+            TypeError: If task_id is not UUID
+            ValueError: If projection is unknown
+        """
+        task_id = validate_uuid_type(task_id, "task_id")
+        projection = validate_projection(projection)
+
+        sql = f"{self._task_select(projection, history_length)} WHERE t.id = ?"
+        async with self._read() as conn:
+            row = await self._fetchone(conn, sql, (str(task_id),))
+        return self._row_to_task(row) if row is not None else None
+
+    async def load_tasks_many(
+        self,
+        task_ids: Iterable[UUID],
+        history_length: int | None = None,
+        projection: TaskProjection = "full",
+    ) -> dict[UUID, Task]:
+        """Load several tasks with a single ``WHERE id IN (...)`` query.
+
+        Args:
+            task_ids: Task identifiers (duplicates are loaded once)
+            history_length: Optional limit on message history length per task
+            projection: Which fields to return ("full", "summary" or "status")
+
+        Returns:
+            Mapping of task ID to task for every task that exists
+
+        Raises:
+            TypeError: If any task_id is not UUID
+            ValueError: If projection is unknown
+        """
+        ids = list(
+            dict.fromkeys(validate_uuid_type(tid, "task_id") for tid in task_ids)
+        )
+        projection = validate_projection(projection)
+        if not ids:
+            return {}
+
+        placeholders, params = _in_params("id", (str(tid) for tid in ids))
+        sql = (
+            f"{self._task_select(projection, history_length)} "
+            f"WHERE t.id IN ({placeholders})"
+        )
+        async with self._read() as conn:
+            rows = await self._fetchall(conn, sql, params)
+
+        tasks: dict[UUID, Task] = {}
+        for row in rows:
+            task = self._row_to_task(row)
+            tasks[task["id"]] = task
+        return tasks
+
+    async def submit_task(self, context_id: UUID, message: Message) -> Task:
+        """Create a new task or continue an existing non-terminal task.
+
+        Task-First Pattern (Bindu):
+        - If task exists and is in non-terminal state: Append message and reset to 'submitted'
+        - If task exists and is in terminal state: Raise error (immutable)
+        - If task doesn't exist: Create new task
+        - If task already holds the message (same message_id): Raise
+          DuplicateMessageError with the task as it is (a retried send)
+
+        Args:
+            context_id: Context to associate the task with
+            message: Initial message containing task request
+
+        Returns:
+            Task in 'submitted' state (new or continued)
+
+        Raises:
+            TypeError: If IDs are invalid types
+            ValueError: If attempting to continue a terminal task
+            DuplicateMessageError: If the task already holds the message
+        """
+        context_id = validate_uuid_type(context_id, "context_id")
+        task_id = normalize_uuid(message.get("task_id"), "task_id")
+        message = normalize_message_uuids(
+            message, task_id=task_id, context_id=context_id
+        )
+
+        async with self._write() as conn:
+            now = _now()
+            existing = await self._fetchone(
+                conn, "SELECT state FROM tasks WHERE id = ?", (str(task_id),)
+            )
+
+            message_id = message.get("message_id")
+            if existing is not None and message_id is not None:
+                submitted = await self._fetchone(
+                    conn,
+                    "SELECT 1 FROM task_messages WHERE task_id = ? AND message_id = ?",
+                    (str(task_id), str(message_id)),
+                )
+                if submitted is not None:
+                    task = await self._load_task_row(conn, task_id)
+                    assert task is not None
+                    raise DuplicateMessageError(task, message_id)
+
+            if existing is not None:
+                current_state = existing["state"]
+                if current_state in app_settings.agent.terminal_states:
+                    raise ValueError(
+                        f"Cannot continue task {task_id}: Task is in terminal state '{current_state}' and is immutable. "
+                        f"Create a new task with referenceTaskIds to continue the conversation."
+                    )
+                logger.info(
+                    f"Continuing existing task {task_id} from state '{current_state}'"
+                )
+                await conn.execute(
+                    "UPDATE tasks SET state = 'submitted', state_timestamp = ?, "
+                    "updated_at = ? WHERE id = ?",
+                    (now, now, str(task_id)),
+                )
+                operation: TaskChangeOperation = "update"
+            else:
+                await conn.execute(
+                    "INSERT INTO contexts (id, created_at, updated_at) "
+                    "VALUES (?, ?, ?) ON CONFLICT (id) DO NOTHING",
+                    (str(context_id), now, now),
+                )
+                await conn.execute(
+                    "INSERT INTO tasks (id, context_id, state, state_timestamp, "
+                    "created_at, updated_at) VALUES (?, ?, 'submitted', ?, ?, ?)",
+                    (str(task_id), str(context_id), now, now, now),
+                )
+                operation = "insert"
+
+            await conn.execute(
+                "INSERT INTO task_messages (task_id, payload, message_id) "
+                "VALUES (?, ?, ?)",
+                (
+                    str(task_id),
+                    dumps_jsonb(message),
+                    str(message_id) if message_id is not None else None,
+                ),
+            )
+            task = await self._load_task_row(conn, task_id)
+
+        assert task is not None
+        self._publish(
+            [
+                TaskChange(
+                    task_id=task_id,
+                    context_id=task["context_id"],
+                    state="submitted",
+                    operation=operation,
+                )
+            ]
+        )
+        return task
+
+    async def _update_task(
+        self,
+        task_id: UUID,
+        state: TaskState,
+        new_artifacts: list[Artifact] | None,
+        new_messages: list[Message] | None,
+        metadata: dict[str, Any] | None,
+        expected_states: Iterable[TaskState] | None = None,
+    ) -> Task | None:
+        """Apply update_task()/transition_task() in one write transaction.
+
+        Artifacts and messages are appended without reading the stored ones;
+        metadata is merged key by key like ``dict.update``.
+
+        Returns:
+            Updated task, or None if it does not exist or is not in one of
+            expected_states
+        """
+        expected = set(expected_states) if expected_states is not None else None
+
+        async with self._write() as conn:
+            row = await self._fetchone(
+                conn,
+                "SELECT context_id, state, metadata FROM tasks WHERE id = ?",
+                (str(task_id),),
+            )
+            if row is None or (expected is not None and row["state"] not in expected):
+                return None
+
+            now = _now()
+            sets = ["state = :state", "state_timestamp = :now", "updated_at = :now"]
+            params: dict[str, Any] = {"id": str(task_id), "state": state, "now": now}
+            if metadata:
+                sets.append("metadata = :metadata")
+                params["metadata"] = dumps_jsonb(
+                    {**loads_jsonb(row["metadata"]), **metadata}
+                )
+            if new_artifacts:
+                sets.append(
+                    "artifacts = "
+                    + _json_append_sql("artifacts", len(new_artifacts), "artifact")
+                )
+                params.update(_json_params("artifact", new_artifacts))
+
+            await conn.execute(
+                f"UPDATE tasks SET {', '.join(sets)} WHERE id = :id", params
+            )
+
+            if new_messages:
+                context_id = UUID(row["context_id"])
+                for message in new_messages:
+                    if not isinstance(message, dict):
+                        raise TypeError(
+                            f"Message must be dict, got {type(message).__name__}"
+                        )
+                    normalize_message_uuids(
+                        message, task_id=task_id, context_id=context_id
+                    )
+                await conn.executemany(
+                    "INSERT INTO task_messages (task_id, payload) VALUES (?, ?)",
+                    [(str(task_id), dumps_jsonb(message)) for message in new_messages],
+                )
+
+            task = await self._load_task_row(conn, task_id)
+
+        assert task is not None
+        self._publish(
+            [
+                TaskChange(
+                    task_id=task_id,
+                    context_id=task["context_id"],
+                    state=state,
+                    operation="update",
+                )
+            ]
+        )
+        return task
+
+    async def update_task(
+        self,
+        task_id: UUID,
+        state: TaskState,
+        new_artifacts: list[Artifact] | None = None,
+        new_messages: list[Message] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> Task:
+        """Update task state and append new content.
+
+        Args:
+            task_id: Task to update
+            state: New task state
+            new_artifacts: Optional artifacts to append
+            new_messages: Optional messages to append to history
+            metadata: Optional metadata to update/merge
+
+        Returns:
+            Updated task object
+
+        Raises:
+            TypeError: If task_id is not UUID
+            KeyError: If task not found
+        """
+        task_id = validate_uuid_type(task_id, "task_id")
+
+        task = await self._update_task(
+            task_id, state, new_artifacts, new_messages, metadata
+        )
+        if task is None:
+            raise KeyError(f"Task {task_id} not found")
+        return task
+
+    async def transition_task(
+        self,
+        task_id: UUID,
+        expected_states: Iterable[TaskState],
+        state: TaskState,
+        new_artifacts: list[Artifact] | None = None,
+        new_messages: list[Message] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> Task | None:
+        """Update a task only if it is currently in one of the expected states.
+
+        The state check and the update share one write transaction, so the
+        transition is atomic.
+
+        Args:
+            task_id: Task to transition
+            expected_states: States the task must currently be in
+            state: New task state
+            new_artifacts: Optional artifacts to append
+            new_messages: Optional messages to append to history
+            metadata: Optional metadata to update/merge
+
+        Returns:
+            Updated task object, or None if the task does not exist or is not
+            in one of the expected states
+
+        Raises:
+            TypeError: If task_id is not UUID
+        """
+        task_id = validate_uuid_type(task_id, "task_id")
+
+        return await self._update_task(
+            task_id, state, new_artifacts, new_messages, metadata, expected_states
+        )
+
+    async def list_tasks(
+        self,
+        length: int | None = None,
+        projection: TaskProjection = "full",
+        history_length: int | None = None,
+    ) -> list[Task]:
+        """List all tasks, newest first.
+
+        Args:
+            length: Optional limit on number of tasks to return
+            projection: Which fields to return ("full", "summary" or "status")
+            history_length: Optional limit on message history length per task
+
+        Returns:
+            List of tasks
+
+        Raises:
+            ValueError: If projection is unknown
+        """
+        projection = validate_projection(projection)
+
+        sql = (
+            f"{self._task_select(projection, history_length)} "
+            "ORDER BY t.created_at DESC, t.id DESC"
+        )
+        params: tuple[Any, ...] = ()
+        if length is not None:
+            sql += " LIMIT ?"
+            params = (length,)
+
+        async with self._read() as conn:
+            rows = await self._fetchall(conn, sql, params)
+        return [self._row_to_task(row) for row in rows]
+
+    async def list_tasks_page(
+        self,
+        page_size: int | None = None,
+        page_token: str | None = None,
+        *,
+        projection: TaskProjection = "full",
+        history_length: int | None = None,
+        context_id: UUID | None = None,
+        states: Iterable[TaskState] | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> ListTasksResult:
+        """List one page of tasks, newest first, using a keyset cursor.
+
+        The page is read as ``WHERE (created_at, id) < (:created_at, :id)
+        ORDER BY created_at DESC, id DESC LIMIT :size + 1``, a range scan on
+        idx_tasks_created_at_id (or its context/state variants).
+
+        Args:
+            page_size: Maximum tasks per page (default 50, capped at 1000)
+            page_token: Cursor from a previous page's next_page_token
+            projection: Which fields to return ("full", "summary" or "status")
+            history_length: Optional limit on message history length per task
+            context_id: Only return tasks in this context
+            states: Only return tasks in one of these states
+            created_after: Only return tasks created at or after this time
+            created_before: Only return tasks created before this time
+
+        Returns:
+            Page of tasks, with next_page_token set if more tasks may follow
+
+        Raises:
+            TypeError: If context_id is not UUID
+            ValueError: If page_token or projection is invalid
+        """
+        projection = validate_projection(projection)
+        size = clamp_page_size(page_size)
+        after = decode_page_token(page_token) if page_token is not None else None
+
+        conditions: list[str] = []
+        params: dict[str, Any] = {"limit": size + 1}
+        if context_id is not None:
+            context_id = validate_uuid_type(context_id, "context_id")
+            conditions.append("t.context_id = :context_id")
+            params["context_id"] = str(context_id)
+        if states is not None:
+            placeholders, state_params = _in_params("state", states)
+            conditions.append(f"t.state IN ({placeholders or 'NULL'})")
+            params.update(state_params)
+        if created_after is not None:
+            conditions.append("t.created_at >= :created_after")
+            params["created_after"] = _format_timestamp(created_after)
+        if created_before is not None:
+            conditions.append("t.created_at < :created_before")
+            params["created_before"] = _format_timestamp(created_before)
+        if after is not None:
+            conditions.append("(t.created_at, t.id) < (:after_created_at, :after_id)")
+            params["after_created_at"] = _format_timestamp(after[0])
+            params["after_id"] = str(after[1])
+
+        sql = self._task_select(projection, history_length)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY t.created_at DESC, t.id DESC LIMIT :limit"
+
+        async with self._read() as conn:
+            rows = await self._fetchall(conn, sql, params)
+
+        page = ListTasksResult(tasks=[self._row_to_task(row) for row in rows[:size]])
+        if len(rows) > size:
+            last = rows[size - 1]
+            page["next_page_token"] = encode_page_token(
+                datetime.fromisoformat(last["created_at"]), UUID(last["id"])
+            )
+        return page
+
+    async def search_tasks(
+        self,
+        query: str | None = None,
+        page_size: int | None = None,
+        page_token: str | None = None,
+        *,
+        metadata: dict[str, Any] | None = None,
+        projection: TaskProjection = "full",
+        history_length: int | None = None,
+        context_id: UUID | None = None,
+        states: Iterable[TaskState] | None = None,
+    ) -> ListTasksResult:
+        """Search tasks by message text and metadata, best matches first.
+
+        Context, state and a LIKE on the messages for each query word narrow
+        the candidates in SQL; they are then matched and ranked in Python
+        (see helpers/search.py).
+
+        Args:
+            query: Words to find in the text parts of the task's messages
+            page_size: Maximum tasks per page (default 50, capped at 1000)
+            page_token: Cursor from a previous search page's next_page_token
+            metadata: Only return tasks whose metadata contains this object
+            projection: Which fields to return ("full", "summary" or "status")
+            history_length: Optional limit on message history length per task
+            context_id: Only return tasks in this context
+            states: Only return tasks in one of these states
+
+        Returns:
+            Page of tasks, with next_page_token set if more tasks may follow
+
+        Raises:
+            TypeError: If context_id is not UUID
+            ValueError: If the search has no filter, or page_token or
+                projection is invalid
+        """
+        projection = validate_projection(projection)
+        terms = search_terms(query, metadata)
+
+        conditions: list[str] = []
+        params: dict[str, Any] = {}
+        if context_id is not None:
+            context_id = validate_uuid_type(context_id, "context_id")
+            conditions.append("t.context_id = :context_id")
+            params["context_id"] = str(context_id)
+        if states is not None:
+            placeholders, state_params = _in_params("state", states)
+            conditions.append(f"t.state IN ({placeholders or 'NULL'})")
+            params.update(state_params)
+        for i, term in enumerate(terms or ()):
+            # Words are letters and digits, so they need no escaping; LIKE only
+            # ignores case for ASCII
+            if not term.isascii():
+                continue
+            conditions.append(
+                "EXISTS (SELECT 1 FROM task_messages AS m "
+                f"WHERE m.task_id = t.id AND m.payload LIKE :term_{i})"
+            )
+            params[f"term_{i}"] = f"%{term}%"
+
+        sql = self._task_select()
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+
+        async with self._read() as conn:
+            rows = await self._fetchall(conn, sql, params)
+
+        keyed = []
+        for row in rows:
+            task = self._row_to_task(row)
+            if metadata is not None and not metadata_contains(
+                task.get("metadata", {}), metadata
+            ):
+                continue
+            rank = 0.0
+            if terms is not None:
+                rank = rank_messages(task.get("history", []), terms)
+                if not rank:
+                    continue
+            created_at = datetime.fromisoformat(row["created_at"])
+            keyed.append((rank, created_at, task["id"], task))
+
+        tasks, next_token = search_page(keyed, page_size, page_token)
+        page = ListTasksResult(
+            tasks=[project_task(t, projection, history_length) for t in tasks]
+        )
+        if next_token is not None:
+            page["next_page_token"] = next_token
+        return page
+
+    async def count_tasks(self, status: str | None = None) -> int:
+        """Count number of tasks from the trigger-maintained counters.
+
+        Args:
+            status: Optional status to filter by
+
+        Returns:
+            Count of matching tasks
+        """
+        sql = "SELECT coalesce(sum(count), 0) FROM task_state_counts"
+        params: tuple[Any, ...] = ()
+        if status is not None:
+            sql += " WHERE state = ?"
+            params = (status,)
+
+        async with self._read() as conn:
+            row = await self._fetchone(conn, sql, params)
+        return int(row[0]) if row else 0
+
+    async def count_tasks_by_state(self) -> dict[str, int]:
+        """Count tasks in every state from the trigger-maintained counters.
+
+        Returns:
+            Number of tasks per state; states without tasks are left out
+        """
+        async with self._read() as conn:
+            rows = await self._fetchall(
+                conn, "SELECT state, count FROM task_state_counts WHERE count != 0"
+            )
+        return {row["state"]: int(row["count"]) for row in rows}
+
+    async def list_tasks_by_context(
+        self, context_id: UUID, length: int | None = None
+    ) -> list[Task]:
+        """List tasks belonging to a specific context, oldest first.
+
+        Args:
+            context_id: Context to filter tasks by
+            length: Optional limit on number of tasks to return
+
+        Returns:
+            List of tasks in the context
+
+        Raises:
+            TypeError: If context_id is not UUID
+        """
+        context_id = validate_uuid_type(context_id, "context_id")
+
+        sql = (
+            f"{self._task_select()} WHERE t.context_id = ? "
+            "ORDER BY t.created_at, t.id"
+        )
+        params: tuple[Any, ...] = (str(context_id),)
+        if length is not None:
+            sql += " LIMIT ?"
+            params += (length,)
+
+        async with self._read() as conn:
+            rows = await self._fetchall(conn, sql, params)
+        return [self._row_to_task(row) for row in rows]
+
+    # -------------------------------------------------------------------------
+    # Context Operations
+    # -------------------------------------------------------------------------
+
+    async def load_context(self, context_id: UUID) -> dict[str, Any] | None:
+        """Load context data from storage.
+
+        Args:
+            context_id: Unique identifier of the context
+
+        Returns:
+            Context data if found, None otherwise
+
+        Raises:
+            TypeError: If context_id is not UUID
+        """
+        context_id = validate_uuid_type(context_id, "context_id")
+
+        async with self._read() as conn:
+            row = await self._fetchone(
+                conn,
+                "SELECT context_data FROM contexts WHERE id = ?",
+                (str(context_id),),
+            )
+        return loads_jsonb(row["context_data"]) if row is not None else None
+
+    async def update_context(self, context_id: UUID, context: ContextT) -> None:
+        """Store or update context data.
+
+        Args:
+            context_id: Context identifier
+            context: Context data
+
+        Raises:
+            TypeError: If context_id is not UUID
+        """
+        context_id = validate_uuid_type(context_id, "context_id")
+        context_data = dumps_jsonb(context if isinstance(context, dict) else {})
+
+        async with self._write() as conn:
+            now = _now()
+            await conn.execute(
+                "INSERT INTO contexts (id, context_data, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET "
+                "context_data = excluded.context_data, "
+                "updated_at = excluded.updated_at",
+                (str(context_id), context_data, now, now),
+            )
+
+    async def append_to_contexts(
+        self, context_id: UUID, messages: list[Message]
+    ) -> None:
+        """Append messages to context history with JSON1.
+
+        Args:
+            context_id: Context to update
+            messages: Messages to append to history
+
+        Raises:
+            TypeError: If context_id is not UUID or messages is not a list
+        """
+        context_id = validate_uuid_type(context_id, "context_id")
+
+        if not isinstance(messages, list):
+            raise TypeError(f"messages must be list, got {type(messages).__name__}")
+
+        history = _json_append_sql("message_history", len(messages), "message")
+        params: dict[str, Any] = {"id": str(context_id)}
+        params.update(_json_params("message", messages))
+
+        async with self._write() as conn:
+            params["now"] = _now()
+            await conn.execute(
+                "INSERT INTO contexts (id, created_at, updated_at) "
+                "VALUES (:id, :now, :now) ON CONFLICT (id) DO NOTHING",
+                params,
+            )
+            await conn.execute(
+                f"UPDATE contexts SET message_history = {history}, "
+                "updated_at = :now WHERE id = :id",
+                params,
+            )
+
+    @staticmethod
+    def _context_page_sql(page: str) -> str:
+        """Select task counts and ids for a page of contexts, newest first."""
+        return (
+            "SELECT c.id, c.created_at, "
+            "(SELECT count(*) FROM tasks WHERE context_id = c.id) AS task_count, "
+            "(SELECT json_group_array(id) FROM (SELECT id FROM tasks "
+            "WHERE context_id = c.id ORDER BY created_at, id)) AS task_ids "
+            f"FROM ({page}) AS c ORDER BY c.created_at DESC, c.id DESC"
+        )
+
+    @staticmethod
+    def _row_to_context(row: sqlite3.Row) -> dict[str, Any]:
+        return {
+            "context_id": UUID(row["id"]),
+            "task_count": row["task_count"],
+            "task_ids": loads_jsonb(row["task_ids"]),
+        }
+
+    async def list_contexts(self, length: int | None = None) -> list[dict[str, Any]]:
+        """List all contexts, newest first.
+
+        Args:
+            length: Optional limit on number of contexts to return
+
+        Returns:
+            List of context objects with task counts
+        """
+        page = "SELECT id, created_at FROM contexts ORDER BY created_at DESC, id DESC"
+        params: tuple[Any, ...] = ()
+        if length is not None:
+            page += " LIMIT ?"
+            params = (length,)
+
+        async with self._read() as conn:
+            rows = await self._fetchall(conn, self._context_page_sql(page), params)
+        return [self._row_to_context(row) for row in rows]
+
+    async def list_contexts_page(
+        self,
+        page_size: int | None = None,
+        page_token: str | None = None,
+        *,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+    ) -> ListContextsResult:
+        """List one page of contexts, newest first, using a keyset cursor.
+
+        Args:
+            page_size: Maximum contexts per page (default 50, capped at 1000)
+            page_token: Cursor from a previous page's next_page_token
+            created_after: Only return contexts created at or after this time
+            created_before: Only return contexts created before this time
+
+        Returns:
+            Page of contexts, with next_page_token set if more may follow
+
+        Raises:
+            ValueError: If page_token is invalid
+        """
+        size = clamp_page_size(page_size)
+        after = decode_page_token(page_token) if page_token is not None else None
+
+        conditions: list[str] = []
+        params: dict[str, Any] = {"limit": size + 1}
+        if created_after is not None:
+            conditions.append("created_at >= :created_after")
+            params["created_after"] = _format_timestamp(created_after)
+        if created_before is not None:
+            conditions.append("created_at < :created_before")
+            params["created_before"] = _format_timestamp(created_before)
+        if after is not None:
+            conditions.append("(created_at, id) < (:after_created_at, :after_id)")
+            params["after_created_at"] = _format_timestamp(after[0])
+            params["after_id"] = str(after[1])
+
+        page = "SELECT id, created_at FROM contexts"
+        if conditions:
+            page += " WHERE " + " AND ".join(conditions)
+        page += " ORDER BY created_at DESC, id DESC LIMIT :limit"
+
+        async with self._read() as conn:
+            rows = await self._fetchall(conn, self._context_page_sql(page), params)
+
+        result = ListContextsResult(
+            contexts=[self._row_to_context(row) for row in rows[:size]]
+        )
+        if len(rows) > size:
+            last = rows[size - 1]
+            result["next_page_token"] = encode_page_token(
+                datetime.fromisoformat(last["created_at"]), UUID(last["id"])
+            )
+        return result
+
+    # -------------------------------------------------------------------------
+    # Utility Operations
+    # -------------------------------------------------------------------------
+
+    async def _delete_tasks_in_batches(
+        self, condition: str = "1", params: Any = ()
+    ) -> int:
+        """Delete matching tasks in write transactions of purge_batch_size rows.
+
+        Keeps each turn on the writer short, so submits and updates are not
+        held up behind one large DELETE.
+
+        Returns:
+            Number of tasks deleted
+        """
+        batch_size = max(app_settings.storage.purge_batch_size, 1)
+        sql = (
+            "DELETE FROM tasks WHERE rowid IN "
+            f"(SELECT rowid FROM tasks WHERE {condition} LIMIT {batch_size}) "
+            "RETURNING id, context_id, state"
+        )
+
+        deleted = 0
+        while True:
+            async with self._write() as conn:
+                rows = await self._fetchall(conn, sql, params)
+            self._publish(self._change(row, "delete") for row in rows)
+            deleted += len(rows)
+            if len(rows) < batch_size:
+                return deleted
+
+    async def clear_context(self, context_id: UUID) -> None:
+        """Clear all tasks associated with a specific context.
+
+        Args:
+            context_id: The context ID to clear
+
+        Raises:
+            TypeError: If context_id is not UUID
+            ValueError: If context does not exist
+
+        Warning: This is a destructive operation.
+        """
+        context_id = validate_uuid_type(context_id, "context_id")
+
+        async with self._read() as conn:
+            exists = await self._fetchone(
+                conn, "SELECT 1 FROM contexts WHERE id = ?", (str(context_id),)
+            )
+        if exists is None:
+            raise ValueError(f"Context {context_id} not found")
+
+        deleted_count = await self._delete_tasks_in_batches(
+            "context_id = ?", (str(context_id),)
+        )
+        async with self._write() as conn:
+            await conn.execute("DELETE FROM contexts WHERE id = ?", (str(context_id),))
+
+        logger.info(f"Cleared context {context_id}: removed {deleted_count} tasks")
+
+    async def clear_all(self) -> None:
+        """Clear all tasks and contexts from storage.
+
+        Tasks are deleted in batches; messages, feedback and webhook configs
+        go with them.
+
+        Warning: This is a destructive operation.
+        """
+        await self._delete_tasks_in_batches()
+        async with self._write() as conn:
+            await conn.execute("DELETE FROM contexts")
+            await conn.execute("DELETE FROM webhook_configs")
+            await conn.execute("DELETE FROM task_feedback")
+            await conn.execute("DELETE FROM task_feedback_rollups")
+            await conn.execute("DELETE FROM task_messages")
+        logger.info("Cleared all tasks, contexts, feedback, and webhook configs")
+
+    async def purge_expired_tasks(
+        self,
+        cutoffs: Mapping[TaskState, datetime],
+        limit: int,
+        archive: Callable[[list[Task]], Awaitable[None]] | None = None,
+    ) -> int:
+        """Delete one batch of tasks that have been in their state too long.
+
+        The batch is selected, archived and deleted in one write transaction;
+        if archiving fails nothing is deleted. Served by
+        idx_tasks_state_state_timestamp.
+
+        Args:
+            cutoffs: Oldest status timestamp kept, per state
+            limit: Maximum number of tasks to delete
+            archive: Called with the full expired tasks before deletion
+
+        Returns:
+            Number of tasks deleted
+        """
+        if not cutoffs or limit <= 0:
+            return 0
+
+        conditions = []
+        params: dict[str, Any] = {"limit": limit}
+        for i, (state, cutoff) in enumerate(cutoffs.items()):
+            conditions.append(
+                f"(t.state = :state_{i} AND t.state_timestamp < :cutoff_{i})"
+            )
+            params[f"state_{i}"] = state
+            params[f"cutoff_{i}"] = _format_timestamp(cutoff)
+
+        select_sql = (
+            self._task_select()
+            if archive is not None
+            else "SELECT t.id, t.context_id, t.state FROM tasks AS t"
+        )
+        sql = (
+            f"{select_sql} WHERE {' OR '.join(conditions)} "
+            "ORDER BY t.state_timestamp LIMIT :limit"
+        )
+
+        async with self._write() as conn:
+            rows = await self._fetchall(conn, sql, params)
+            if not rows:
+                return 0
+
+            if archive is not None:
+                await archive([self._row_to_task(row) for row in rows])
+
+            placeholders, id_params = _in_params("id", (row["id"] for row in rows))
+            deleted = await self._fetchall(
+                conn,
+                f"DELETE FROM tasks WHERE id IN ({placeholders}) "
+                "RETURNING id, context_id, state",
+                id_params,
+            )
+
+            # Drop contexts whose last task was just purged
+            placeholders, context_params = _in_params(
+                "context", {row["context_id"] for row in deleted}
+            )
+            await conn.execute(
+                f"DELETE FROM contexts WHERE id IN ({placeholders}) AND NOT EXISTS "
+                "(SELECT 1 FROM tasks WHERE tasks.context_id = contexts.id)",
+                context_params,
+            )
+
+        self._publish(self._change(row, "delete") for row in deleted)
+        logger.info(f"Purged {len(deleted)} expired tasks")
+        return len(deleted)
+
+    # -------------------------------------------------------------------------
+    # Bulk Transfer
+    # -------------------------------------------------------------------------
+
+    async def export_records(
+        self, kind: RecordKind, after: str | None, limit: int
+    ) -> list[dict[str, Any]]:
+        """Read one batch of records for export, in ascending key order.
+
+        Each batch is a keyset query on the kind's primary key index.
+
+        Args:
+            kind: Which records to read
+            after: Key of the last record of the previous batch (None to start)
+            limit: Maximum number of records
+
+        Returns:
+            Records with keys greater than ``after``
+        """
+        start = str(normalize_uuid(after, "after")) if after is not None else ""
+        params = {"after": start, "limit": limit}
+
+        async with self._read() as conn:
+            if kind == "contexts":
+                rows = await self._fetchall(
+                    conn,
+                    "SELECT id, created_at, context_data, message_history "
+                    "FROM contexts WHERE id > :after ORDER BY id LIMIT :limit",
+                    params,
+                )
+                return [
+                    {
+                        "id": UUID(row["id"]),
+                        "created_at": datetime.fromisoformat(row["created_at"]),
+                        "context_data": loads_jsonb(row["context_data"]),
+                        "message_history": loads_jsonb(row["message_history"]),
+                    }
+                    for row in rows
+                ]
+
+            if kind == "tasks":
+                rows = await self._fetchall(
+                    conn,
+                    f"{self._task_select()} WHERE t.id > :after "
+                    "ORDER BY t.id LIMIT :limit",
+                    params,
+                )
+                return [
+                    {
+                        **self._row_to_task(row),
+                        "created_at": datetime.fromisoformat(row["created_at"]),
+                    }
+                    for row in rows
+                ]
+
+            if kind == "feedback":
+                rows = await self._fetchall(
+                    conn,
+                    "SELECT task_id, feedback_data FROM task_feedback "
+                    "WHERE task_id IN (SELECT DISTINCT task_id FROM task_feedback "
+                    "WHERE task_id > :after ORDER BY task_id LIMIT :limit) "
+                    "ORDER BY task_id, id",
+                    params,
+                )
+                return [
+                    {
+                        "task_id": UUID(task_id),
+                        "feedback": [
+                            loads_jsonb(row["feedback_data"]) for row in group
+                        ],
+                    }
+                    for task_id, group in itertools.groupby(
+                        rows, key=lambda row: row["task_id"]
+                    )
+                ]
+
+            rows = await self._fetchall(
+                conn,
+                "SELECT task_id, config FROM webhook_configs "
+                "WHERE task_id > :after ORDER BY task_id LIMIT :limit",
+                params,
+            )
+            return [
+                {"task_id": UUID(row["task_id"]), "config": loads_jsonb(row["config"])}
+                for row in rows
+            ]
+
+    async def import_records(
+        self, kind: RecordKind, records: list[dict[str, Any]]
+    ) -> int:
+        """Insert exported records that are not stored yet.
+
+        Each call is one write transaction.
+
+        Args:
+            kind: Which records these are
+            records: Records as produced by export_records()
+
+        Returns:
+            Number of records inserted
+        """
+        if not records:
+            return 0
+
+        changes: list[TaskChange] = []
+        async with self._write() as conn:
+            if kind == "contexts":
+                inserted = await self._import_contexts(conn, records)
+            elif kind == "tasks":
+                inserted = await self._import_tasks(conn, records, changes)
+            else:
+                inserted = await self._import_task_dependents(conn, kind, records)
+
+        self._publish(changes)
+        return inserted
+
+    @staticmethod
+    def _record_timestamp(record: dict[str, Any], now: str) -> str:
+        created_at = normalize_timestamp(record.get("created_at"))
+        return _format_timestamp(created_at) if created_at is not None else now
+
+    async def _import_contexts(
+        self, conn: aiosqlite.Connection, records: list[dict[str, Any]]
+    ) -> int:
+        now = _now()
+        inserted = 0
+        for record in records:
+            cursor = await conn.execute(
+                "INSERT INTO contexts (id, context_data, message_history, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO NOTHING",
+                (
+                    str(normalize_uuid(record["id"], "id")),
+                    dumps_jsonb(record.get("context_data") or {}),
+                    dumps_jsonb(record.get("message_history") or []),
+                    self._record_timestamp(record, now),
+                    now,
+                ),
+            )
+            inserted += cursor.rowcount
+        return inserted
+
+    async def _import_tasks(
+        self,
+        conn: aiosqlite.Connection,
+        records: list[dict[str, Any]],
+        changes: list[TaskChange],
+    ) -> int:
+        by_id = {normalize_uuid(record["id"], "id"): record for record in records}
+        placeholders, params = _in_params("id", (str(tid) for tid in by_id))
+        existing = {
+            UUID(row["id"])
+            for row in await self._fetchall(
+                conn, f"SELECT id FROM tasks WHERE id IN ({placeholders})", params
+            )
+        }
+        new_ids = sorted((tid for tid in by_id if tid not in existing), key=str)
+        if not new_ids:
+            return 0
+
+        now = _now()
+        task_rows = []
+        message_rows = []
+        for task_id in new_ids:
+            record = by_id[task_id]
+            context_id = normalize_uuid(record["context_id"], "context_id")
+            status = record["status"]
+            state_timestamp = normalize_timestamp(status.get("timestamp"))
+            state_text = (
+                _format_timestamp(state_timestamp)
+                if state_timestamp is not None
+                else now
+            )
+            created_at = self._record_timestamp(record, now)
+            task_rows.append(
+                (
+                    str(task_id),
+                    str(context_id),
+                    record.get("kind", "task"),
+                    status["state"],
+                    state_text,
+                    dumps_jsonb(record.get("artifacts") or []),
+                    dumps_jsonb(record.get("metadata") or {}),
+                    created_at,
+                    state_text,
+                )
+            )
+            # Inserted in order, so seq keeps the history order
+            message_rows.extend(
+                (str(task_id), dumps_jsonb(message))
+                for message in record.get("history") or []
+            )
+            changes.append(
+                TaskChange(
+                    task_id=task_id,
+                    context_id=context_id,
+                    state=status["state"],
+                    operation="insert",
+                )
+            )
+
+        await conn.executemany(
+            "INSERT INTO contexts (id, created_at, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (id) DO NOTHING",
+            [(context_id, now, now) for context_id in {row[1] for row in task_rows}],
+        )
+        await conn.executemany(
+            "INSERT INTO tasks (id, context_id, kind, state, state_timestamp, "
+            "artifacts, metadata, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            task_rows,
+        )
+        if message_rows:
+            await conn.executemany(
+                "INSERT INTO task_messages (task_id, payload) VALUES (?, ?)",
+                message_rows,
+            )
+        return len(new_ids)
+
+    async def _import_task_dependents(
+        self,
+        conn: aiosqlite.Connection,
+        kind: RecordKind,
+        records: list[dict[str, Any]],
+    ) -> int:
+        table = "task_feedback" if kind == "feedback" else "webhook_configs"
+        by_id = {
+            str(normalize_uuid(record["task_id"], "task_id")): record
+            for record in records
+        }
+        placeholders, params = _in_params("id", by_id)
+
+        # Only tasks that exist and have none of these rows yet
+        known = {
+            row["id"]
+            for row in await self._fetchall(
+                conn, f"SELECT id FROM tasks WHERE id IN ({placeholders})", params
+            )
+        }
+        taken = {
+            row["task_id"]
+            for row in await self._fetchall(
+                conn,
+                f"SELECT DISTINCT task_id FROM {table} "
+                f"WHERE task_id IN ({placeholders})",
+                params,
+            )
+        }
+        task_ids = [task_id for task_id in by_id if task_id in known - taken]
+        if not task_ids:
+            return 0
+
+        now = _now()
+        if kind == "feedback":
+            await conn.executemany(
+                "INSERT INTO task_feedback (task_id, feedback_data, created_at) "
+                "VALUES (?, ?, ?)",
+                [
+                    (task_id, dumps_jsonb(entry), now)
+                    for task_id in task_ids
+                    for entry in by_id[task_id]["feedback"]
+                ],
+            )
+        else:
+            await conn.executemany(
+                "INSERT INTO webhook_configs (task_id, config, created_at, "
+                "updated_at) VALUES (?, ?, ?, ?)",
+                [
+                    (task_id, dumps_jsonb(by_id[task_id]["config"]), now, now)
+                    for task_id in task_ids
+                ],
+            )
+        return len(task_ids)
+
+    # -------------------------------------------------------------------------
+    # Feedback Operations
+    # -------------------------------------------------------------------------
+
+    async def store_task_feedback(
+        self, task_id: UUID, feedback_data: dict[str, Any]
+    ) -> None:
+        """Store user feedback for a task.
+
+        Args:
+            task_id: Task to associate feedback with
+            feedback_data: Feedback content
+
+        Raises:
+            TypeError: If task_id is not UUID or feedback_data is not dict
+        """
+        task_id = validate_uuid_type(task_id, "task_id")
+
+        if not isinstance(feedback_data, dict):
+            raise TypeError(
+                f"feedback_data must be dict, got {type(feedback_data).__name__}"
+            )
+
+        async with self._write() as conn:
+            await conn.execute(
+                "INSERT INTO task_feedback (task_id, feedback_data, created_at) "
+                "VALUES (?, ?, ?)",
+                (str(task_id), dumps_jsonb(feedback_data), _now()),
+            )
+
+    async def get_task_feedback(self, task_id: UUID) -> list[dict[str, Any]] | None:
+        """Retrieve feedback for a task, oldest first.
+
+        Args:
+            task_id: Task to get feedback for
+
+        Returns:
+            List of feedback entries or None if no feedback exists
+
+        Raises:
+            TypeError: If task_id is not UUID
+        """
+        task_id = validate_uuid_type(task_id, "task_id")
+
+        async with self._read() as conn:
+            rows = await self._fetchall(
+                conn,
+                "SELECT feedback_data FROM task_feedback WHERE task_id = ? "
+                "ORDER BY id",
+                (str(task_id),),
+            )
+        if not rows:
+            return None
+        return [loads_jsonb(row["feedback_data"]) for row in rows]
+
+    async def get_feedback_summary(
+        self,
+        *,
+        skill_id: str | None = None,
+        since: date | None = None,
+        until: date | None = None,
+        group_by: Iterable[FeedbackGroupBy] = (),
+    ) -> list[FeedbackSummary]:
+        """Summarize stored feedback per skill and UTC day.
+
+        Reads task_feedback_rollups, kept up to date by a trigger on
+        task_feedback.
+
+        Args:
+            skill_id: Only count feedback for this skill
+            since: First day to count
+            until: Last day to count, inclusive
+            group_by: Split the summary by "skill", "day" or both
+
+        Returns:
+            One summary per group, by skill then day
+
+        Raises:
+            ValueError: If group_by has an unknown field
+        """
+        group_by = validate_group_by(group_by)
+        sql = f"SELECT {_FEEDBACK_ROLLUP_COLUMNS} FROM task_feedback_rollups"
+        conditions: list[str] = []
+        params: list[Any] = []
+        if skill_id is not None:
+            conditions.append("skill_id = ?")
+            params.append(skill_id)
+        if since is not None:
+            conditions.append("day >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            conditions.append("day <= ?")
+            params.append(until.isoformat())
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+
+        async with self._read() as conn:
+            rows = await self._fetchall(conn, sql, tuple(params))
+        return summarize_rollups(
+            (
+                (row["skill_id"], date.fromisoformat(row["day"]), tuple(row)[2:])
+                for row in rows
+            ),
+            group_by=group_by,
+        )
+
+    # -------------------------------------------------------------------------
+    # Change Notifications
+    # -------------------------------------------------------------------------
+
+    async def subscribe(
+        self, task_id: UUID | None = None, context_id: UUID | None = None
+    ) -> TaskSubscription:
+        """Subscribe to task changes committed through this storage instance.
+
+        Args:
+            task_id: Only deliver changes to this task
+            context_id: Only deliver changes to tasks in this context
+
+        Returns:
+            Async iterator of TaskChange events
+        """
+        return self._change_feed.subscribe(task_id, context_id)
+
+    # -------------------------------------------------------------------------
+    # Webhook Persistence Operations (for long-running tasks)
+    # -------------------------------------------------------------------------
+
+    async def save_webhook_config(
+        self, task_id: UUID, config: PushNotificationConfig
+    ) -> None:
+        """Save a webhook configuration for a task (upsert).
+
+        Args:
+            task_id: Task to associate the webhook config with
+            config: Push notification configuration to persist
+
+        Raises:
+            TypeError: If task_id is not UUID
+        """
+        task_id = validate_uuid_type(task_id, "task_id")
+
+        async with self._write() as conn:
+            now = _now()
+            await conn.execute(
+                "INSERT INTO webhook_configs (task_id, config, created_at, "
+                "updated_at) VALUES (?, ?, ?, ?) ON CONFLICT (task_id) DO UPDATE "
+                "SET config = excluded.config, updated_at = excluded.updated_at",
+                (str(task_id), dumps_jsonb(config), now, now),
+            )
+        logger.debug(f"Saved webhook config for task {task_id}")
+
+    async def load_webhook_config(self, task_id: UUID) -> PushNotificationConfig | None:
+        """Load a webhook configuration for a task.
+
+        Args:
+            task_id: Task to load the webhook config for
+
+        Returns:
+            The webhook configuration if found, None otherwise
+
+        Raises:
+            TypeError: If task_id is not UUID
+        """
+        task_id = validate_uuid_type(task_id, "task_id")
+
+        async with self._read() as conn:
+            row = await self._fetchone(
+                conn,
+                "SELECT config FROM webhook_configs WHERE task_id = ?",
+                (str(task_id),),
+            )
+        return loads_jsonb(row["config"]) if row is not None else None
+
+    async def delete_webhook_config(self, task_id: UUID) -> None:
+        """Delete a webhook configuration for a task.
+
+        Args:
+            task_id: Task to delete the webhook config for
+
+        Raises:
+            TypeError: If task_id is not UUID
+
+        Note: Does not raise if the config doesn't exist.
+        """
+        task_id = validate_uuid_type(task_id, "task_id")
+
+        async with self._write() as conn:
+            cursor = await conn.execute(
+                "DELETE FROM webhook_configs WHERE task_id = ?", (str(task_id),)
+            )
+        if cursor.rowcount > 0:
+            logger.debug(f"Deleted webhook config for task {task_id}")
+
+    async def load_all_webhook_configs(self) -> dict[UUID, PushNotificationConfig]:
+        """Load all stored webhook configurations.
+
+        Returns:
+            Dictionary mapping task IDs to their webhook configurations
+        """
+        async with self._read() as conn:
+            rows = await self._fetchall(
+                conn, "SELECT task_id, config FROM webhook_configs"
+            )
+        return {UUID(row["task_id"]): loads_jsonb(row["config"]) for row in rows}
@@ -0,0 +1,196 @@
+"""One engine shared by every DID schema in a process.
+
+``PostgresStorage(did=...)`` normally builds its own engine, so hosting many
+agents in one process means one connection pool per agent. With
+``storage.postgres_shared_engine`` enabled, storages for the same database
+share a SharedEngine instead:
+
+- One pool of ``postgres_pool_max`` connections serves every schema. Each
+  transaction starts with ``SET LOCAL search_path``, which ends with the
+  transaction, so pooled connections never carry a tenant's schema.
+- Each schema is initialized (created, tables created) once per process.
+- A tenant may hold at most ``postgres_tenant_pool_share`` of the pool at a
+  time, so one busy agent cannot starve the others.
+"""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import math
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from bindu.settings import app_settings
+from bindu.utils.logging import get_logger
+
+from .helpers import mask_database_url, sanitize_identifier
+from .pool import PoolPinger, create_pooled_engine, dispose_pooled_engine
+
+logger = get_logger("bindu.server.storage.tenancy")
+
+# Key of the slot limit for storages without a DID schema
+_DEFAULT_TENANT = "public"
+
+_shared_engines: dict[str, SharedEngine] = {}
+_registry_lock = asyncio.Lock()
+
+
+def schema_session_class(schema_name: str | None) -> type[Session]:
+    """Session class whose transactions start with ``SET LOCAL search_path``.
+
+    Args:
+        schema_name: Schema to use, or None for the default search_path
+    """
+    # A Session subclass per schema carries the after_begin listener
+    session_class = type(f"TenantSession_{schema_name}", (Session,), {})
+    if schema_name:
+        schema = sanitize_identifier(schema_name)
+        search_path = f'SET LOCAL search_path TO "{schema}"'
+
+        @event.listens_for(session_class, "after_begin")
+        def set_search_path(session, transaction, connection):
+            connection.exec_driver_sql(search_path)
+
+    return session_class
+
+
+class SharedEngine:
+    """A connection pool shared by tenants that each use their own schema."""
+
+    def __init__(
+        self,
+        database_url: str,
+        pool_max: int,
+        timeout: float,
+        tenant_pool_share: float = 0.5,
+    ):
+        """Initialize the shared engine.
+
+        Args:
+            database_url: SQLAlchemy asyncpg URL
+            pool_max: Connections in the shared pool
+            timeout: Seconds to wait for a connection (or a tenant slot)
+            tenant_pool_share: Fraction of the pool one tenant may hold
+        """
+        self.database_url = database_url
+        self.timeout = timeout
+        self.engine: AsyncEngine = create_pooled_engine(
+            database_url, pool_max, timeout, label="shared"
+        )
+        self.pinger: PoolPinger | None = None
+        self.tenant_limit = max(1, math.floor(pool_max * tenant_pool_share))
+        self.references = 0
+        self._initialized: set[str] = set()
+        self._init_locks: dict[str, asyncio.Lock] = {}
+        self._session_factories: dict[
+            str | None, async_sessionmaker[AsyncSession]
+        ] = {}
+        self._slots: dict[str, asyncio.Semaphore] = {}
+
+    def session_factory(
+        self, schema_name: str | None
+    ) -> async_sessionmaker[AsyncSession]:
+        """Session factory whose transactions run in ``schema_name``.
+
+        Args:
+            schema_name: Tenant schema, or None for the default search_path
+        """
+        factory = self._session_factories.get(schema_name)
+        if factory is not None:
+            return factory
+
+        factory = async_sessionmaker(
+            self.engine,
+            class_=AsyncSession,
+            sync_session_class=schema_session_class(schema_name),
+            expire_on_commit=False,
+        )
+        self._session_factories[schema_name] = factory
+        return factory
+
+    @asynccontextmanager
+    async def session(self, schema_name: str | None) -> AsyncIterator[AsyncSession]:
+        """Open a tenant session once the tenant is under its pool share.
+
+        Raises:
+            TimeoutError: If the tenant's slots stay taken for ``timeout``
+        """
+        tenant = schema_name or _DEFAULT_TENANT
+        slots = self._slots.get(tenant)
+        if slots is None:
+            slots = self._slots[tenant] = asyncio.Semaphore(self.tenant_limit)
+
+        try:
+            await asyncio.wait_for(slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(
+                f"Schema '{tenant}' already uses its {self.tenant_limit} "
+                "connections of the shared pool"
+            ) from None
+        try:
+            async with self.session_factory(schema_name)() as session:
+                yield session
+        finally:
+            slots.release()
+
+    async def ensure_schema(self, schema_name: str) -> None:
+        """Create the schema and its tables unless done before in this process."""
+        if schema_name in self._initialized:
+            return
+
+        lock = self._init_locks.setdefault(schema_name, asyncio.Lock())
+        async with lock:
+            if schema_name in self._initialized:
+                return
+            from bindu.utils.schema_manager import initialize_did_schema
+
+            await initialize_did_schema(self.engine, schema_name, create_tables=True)
+            self._initialized.add(schema_name)
+
+
+async def acquire_shared_engine(
+    database_url: str,
+    pool_max: int,
+    timeout: float,
+    tenant_pool_share: float = 0.5,
+) -> SharedEngine:
+    """Get the process-wide engine for a database, creating it on first use.
+
+    The pool settings of the first caller apply; release every engine
+    acquired with release_shared_engine().
+    """
+    async with _registry_lock:
+        shared = _shared_engines.get(database_url)
+        if shared is None:
+            shared = SharedEngine(database_url, pool_max, timeout, tenant_pool_share)
+            _shared_engines[database_url] = shared
+            settings = app_settings.storage
+            if settings.postgres_pool_ping == "periodic":
+                shared.pinger = PoolPinger(
+                    [shared.engine], settings.postgres_pool_ping_interval
+                )
+                await shared.pinger.start()
+            logger.info(
+                f"Created shared engine for {mask_database_url(database_url)} "
+                f"(pool_size={pool_max}, per-schema limit={shared.tenant_limit})"
+            )
+        shared.references += 1
+        return shared
+
+
+async def release_shared_engine(shared: SharedEngine) -> None:
+    """Drop a reference; the pool is closed when the last storage releases it."""
+    async with _registry_lock:
+        shared.references -= 1
+        if shared.references > 0:
+            return
+        if _shared_engines.get(shared.database_url) is shared:
+            del _shared_engines[shared.database_url]
+    if shared.pinger is not None:
+        await shared.pinger.stop()
+    await dispose_pooled_engine(shared.engine)
+    logger.info(f"Closed shared engine for {mask_database_url(shared.database_url)}")
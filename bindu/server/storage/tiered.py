@@ -0,0 +1,222 @@
+"""Hot/cold tiered storage: in-memory active tasks over a persistent backend.
+
+Most reads hit tasks that are still running or finished moments ago, and the
+worker running a task re-reads it between its own updates. TieredStorage keeps
+those tasks in a bounded in-process hot tier and the backend (normally
+PostgreSQL) as the cold tier:
+
+- Writes go to the cold tier first; the task it returns replaces the hot
+  copy (write-through), so the writer's next read is served from memory.
+- Non-terminal tasks stay hot until evicted for capacity. Terminal tasks are
+  demoted (dropped from the hot tier, kept cold) terminal_ttl_seconds after
+  they were last written or loaded.
+- A miss falls back to the cold tier and promotes what it loaded.
+
+Coherence works as for CachedStorage: changes committed by other processes
+arrive through the backend's change feed and drop the hot copy, and a lost
+feed empties the tier until it is back. The notification for a write made
+through this process is recognised and skipped instead of dropping the copy
+it just stored. Overlapping writes to one task from this process drop the
+copy, since their results may come back out of commit order.
+"""
+
+from __future__ import annotations as _annotations
+
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, cast
+from uuid import UUID
+
+from typing_extensions import TypeVar
+
+from bindu.common.protocol.types import Artifact, Message, Task, TaskState
+from bindu.settings import app_settings
+
+from .base import Storage
+from .cache import CachedStorage
+from .helpers import project_task
+
+ContextT = TypeVar("ContextT", default=Any)
+
+# How long a write made through this process may take to come back on the
+# change feed before its notification is treated as another process's write
+_OWN_CHANGE_WINDOW = 5.0
+
+
+class TieredStorage(CachedStorage[ContextT]):
+    """Storage keeping active and recently finished tasks in memory.
+
+    Reads of hot tasks never reach the cold tier; everything except task
+    writes is delegated to it as in CachedStorage.
+    """
+
+    def __init__(
+        self,
+        storage: Storage[ContextT],
+        max_entries: int = 10_000,
+        terminal_ttl_seconds: float = 300.0,
+    ):
+        """Initialize the hot tier.
+
+        Args:
+            storage: Cold tier every write goes through to
+            max_entries: Maximum number of hot tasks (least recently used
+                tasks are evicted first, whatever their state)
+            terminal_ttl_seconds: How long a task in a terminal state stays
+                hot before it is demoted to the cold tier only
+        """
+        super().__init__(storage, max_entries, ttl_seconds=terminal_ttl_seconds)
+        # In-flight writes per task, and tasks whose writes overlapped
+        self._writes: dict[UUID, int] = {}
+        self._overlapping: set[UUID] = set()
+        # Deadlines for change notifications expected from our own writes
+        self._own_changes: dict[UUID, deque[float]] = {}
+
+    @property
+    def terminal_ttl_seconds(self) -> float:
+        """Seconds a terminal task stays hot."""
+        return self.ttl_seconds
+
+    def _store(self, task_id: UUID, task: Task) -> None:
+        # Only terminal tasks expire; the rest stay until evicted for capacity
+        if task["status"]["state"] in app_settings.agent.terminal_states:
+            self._put(task_id, task, time.monotonic() + self.ttl_seconds)
+        else:
+            self._put(task_id, task, math.inf)
+
+    # -------------------------------------------------------------------------
+    # Own-write tracking
+    # -------------------------------------------------------------------------
+
+    def _expect_own_change(self, task_id: UUID) -> None:
+        if self._unwatch is None:
+            return
+        self._own_changes.setdefault(task_id, deque()).append(
+            time.monotonic() + _OWN_CHANGE_WINDOW
+        )
+
+    def _forget_own_change(self, task_id: UUID) -> None:
+        deadlines = self._own_changes.get(task_id)
+        if deadlines:
+            deadlines.pop()
+            if not deadlines:
+                del self._own_changes[task_id]
+
+    def _consume_own_change(self, task_id: UUID) -> bool:
+        deadlines = self._own_changes.get(task_id)
+        if not deadlines:
+            return False
+
+        now = time.monotonic()
+        while deadlines and deadlines[0] <= now:
+            deadlines.popleft()
+        own = bool(deadlines)
+        if own:
+            deadlines.popleft()
+        if not deadlines:
+            del self._own_changes[task_id]
+        return own
+
+    def _on_task_change(self, task_id: UUID | None) -> None:
+        if task_id is not None and self._consume_own_change(task_id):
+            return
+        super()._on_task_change(task_id)
+
+    # -------------------------------------------------------------------------
+    # Write-through
+    # -------------------------------------------------------------------------
+
+    def _begin_write(self, task_id: UUID) -> None:
+        # Loads in flight may have read the task before this write
+        self._loads.pop(task_id, None)
+        if self._writes.get(task_id):
+            self._overlapping.add(task_id)
+        self._writes[task_id] = self._writes.get(task_id, 0) + 1
+        self._expect_own_change(task_id)
+
+    def _end_write(self, task_id: UUID, task: Task | None) -> None:
+        self._loads.pop(task_id, None)
+        overlapped = task_id in self._overlapping
+        remaining = self._writes.pop(task_id) - 1
+        if remaining:
+            self._writes[task_id] = remaining
+        else:
+            self._overlapping.discard(task_id)
+
+        if task is None:
+            # Failed or refused: nothing committed, so nothing to skip
+            self._forget_own_change(task_id)
+        if task is None or overlapped or not self._coherent:
+            self.invalidate(task_id)
+        else:
+            # The caller gets the backend's task; keep a private copy
+            self._store(task_id, project_task(task))
+
+    async def _write_through(
+        self, task_id: UUID, write: Callable[[], Awaitable[Task | None]]
+    ) -> Task | None:
+        self._begin_write(task_id)
+        task = None
+        try:
+            task = await write()
+            return task
+        finally:
+            self._end_write(task_id, task)
+
+    async def submit_task(self, context_id: UUID, message: Message) -> Task:
+        """Create or continue a task in the cold tier and keep it hot."""
+        task_id = message.get("task_id")
+        if isinstance(task_id, str):
+            task_id = UUID(task_id)
+        if not isinstance(task_id, UUID):
+            # Rejected by the backend; nothing to keep hot
+            return await super().submit_task(context_id, message)
+
+        return cast(
+            Task,
+            await self._write_through(
+                task_id, lambda: self.storage.submit_task(context_id, message)
+            ),
+        )
+
+    async def update_task(
+        self,
+        task_id: UUID,
+        state: TaskState,
+        new_artifacts: list[Artifact] | None = None,
+        new_messages: list[Message] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> Task:
+        """Update a task in the cold tier and keep the result hot."""
+        return cast(
+            Task,
+            await self._write_through(
+                task_id,
+                lambda: self.storage.update_task(
+                    task_id, state, new_artifacts, new_messages, metadata
+                ),
+            ),
+        )
+
+    async def transition_task(
+        self,
+        task_id: UUID,
+        expected_states: Iterable[TaskState],
+        state: TaskState,
+        new_artifacts: list[Artifact] | None = None,
+        new_messages: list[Message] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> Task | None:
+        """Transition a task in the cold tier and keep the result hot.
+
+        A refused transition means the hot copy may be out of date, so it is
+        dropped.
+        """
+        return await self._write_through(
+            task_id,
+            lambda: self.storage.transition_task(
+                task_id, expected_states, state, new_artifacts, new_messages, metadata
+            ),
+        )
@@ -0,0 +1,363 @@
+"""Bulk export and import of storage contents.
+
+Moving an agent to another cluster, or restoring it from a backup, would
+otherwise mean replaying every task through submit_task() one at a time. A
+dump is a directory with a ``manifest.json`` and one file per record kind or
+table, in one of two forms:
+
+- ``ndjson``: one JSON record per line per kind (contexts, tasks, feedback,
+  webhook configs), read with Storage.export_records() and written with
+  Storage.import_records(). Any backend can produce and load it, so it also
+  moves data between backends.
+- ``binary`` / ``csv``: one PostgreSQL ``COPY`` file per table, written from
+  a single snapshot and restored through a staging table. PostgreSQL only,
+  and much faster for large agents.
+
+Both directions hold one batch in memory at a time and are resumable: the
+export records its keyset cursor and file offset after every batch, and the
+import records how far it got in a progress file next to the manifest.
+Imports skip what already exists, so a batch repeated after a crash does no
+harm.
+"""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Literal
+
+from bindu.utils.logging import get_logger
+
+from .base import RECORD_KEYS, RECORD_KINDS, Storage
+from .helpers.serialization import dumps_jsonb_bytes, loads_jsonb
+
+logger = get_logger("bindu.server.storage.transfer")
+
+DumpFormat = Literal["ndjson", "binary", "csv"]
+
+MANIFEST_NAME = "manifest.json"
+IMPORT_PROGRESS_NAME = "import-progress.json"
+DUMP_VERSION = 1
+
+# PostgreSQL COPY dumps, one file per table in restore order
+COPY_TABLE_NAMES = (
+    "contexts",
+    "tasks",
+    "task_messages",
+    "task_feedback",
+    "webhook_configs",
+)
+_COPY_SUFFIXES = {"binary": "copy", "csv": "csv"}
+
+
+@dataclass
+class TransferResult:
+    """Records moved by one export, import or copy run.
+
+    Attributes:
+        records: Records (or COPY rows) read per kind or table in this run
+        inserted: Records inserted per kind or table (imports only)
+        skipped: Kinds or tables a previous run had already finished
+    """
+
+    records: dict[str, int] = field(default_factory=dict)
+    inserted: dict[str, int] = field(default_factory=dict)
+    skipped: list[str] = field(default_factory=list)
+
+
+def _read_json(path: Path) -> dict[str, Any] | None:
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+
+
+def _write_json(path: Path, data: dict[str, Any]) -> None:
+    # Replace atomically, so a crash never leaves a torn manifest behind
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+def _append_batch(path: Path, offset: int, data: bytes) -> None:
+    """Write data at offset, dropping anything a crashed run left after it."""
+    with open(path, "r+b" if path.exists() else "wb") as f:
+        f.truncate(offset)
+        f.seek(offset)
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _read_batch(
+    path: Path, offset: int, limit: int
+) -> tuple[list[bytes], int, bool]:
+    """Read up to limit lines from offset.
+
+    Returns:
+        The lines, the offset after them, and whether the file has ended
+    """
+    lines: list[bytes] = []
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while len(lines) < limit:
+            line = f.readline()
+            if not line:
+                return lines, offset, True
+            offset += len(line)
+            if line.strip():
+                lines.append(line)
+        return lines, offset, f.read(1) == b""
+
+
+def _copy_support(storage: Storage[Any], format: DumpFormat) -> Any:
+    """The storage if it can COPY, else raise."""
+    if not hasattr(storage, "copy_out") or not hasattr(storage, "copy_in"):
+        raise ValueError(f"The {format} format requires PostgreSQL storage")
+    return storage
+
+
+async def export_storage(
+    storage: Storage[Any],
+    directory: Path,
+    format: DumpFormat = "ndjson",
+    batch_size: int = 1000,
+    restart: bool = False,
+) -> TransferResult:
+    """Export everything in storage to a dump directory.
+
+    An unfinished export of the same format in ``directory`` is resumed.
+
+    Args:
+        storage: Backend to export
+        directory: Dump directory (created if missing)
+        format: "ndjson", or "binary"/"csv" for PostgreSQL COPY files
+        batch_size: Records read per batch (ndjson)
+        restart: Discard the progress of an earlier export
+
+    Returns:
+        Records written in this run
+
+    Raises:
+        ValueError: If the directory holds a dump of another format, or a
+            COPY format is used with a backend other than PostgreSQL
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest_path = directory / MANIFEST_NAME
+    manifest = None if restart else _read_json(manifest_path)
+    if manifest is not None and manifest.get("format") != format:
+        raise ValueError(
+            f"{directory} holds a {manifest.get('format')} dump; "
+            "export to another directory or restart"
+        )
+    if manifest is None:
+        manifest = {"version": DUMP_VERSION, "format": format, "kinds": {}}
+        _write_json(manifest_path, manifest)
+
+    if format == "ndjson":
+        return await _export_ndjson(storage, directory, manifest, batch_size)
+    return await _export_copy(storage, directory, manifest, format)
+
+
+async def _export_ndjson(
+    storage: Storage[Any],
+    directory: Path,
+    manifest: dict[str, Any],
+    batch_size: int,
+) -> TransferResult:
+    result = TransferResult()
+    manifest_path = directory / MANIFEST_NAME
+
+    for kind in RECORD_KINDS:
+        state = manifest["kinds"].setdefault(
+            kind,
+            {
+                "file": f"{kind}.ndjson",
+                "records": 0,
+                "bytes": 0,
+                "cursor": None,
+                "done": False,
+            },
+        )
+        if state["done"]:
+            result.skipped.append(kind)
+            continue
+
+        path = directory / state["file"]
+        result.records[kind] = 0
+        while True:
+            records = await storage.export_records(kind, state["cursor"], batch_size)
+            data = b"".join(dumps_jsonb_bytes(r) + b"\n" for r in records)
+            await asyncio.to_thread(_append_batch, path, state["bytes"], data)
+            state["bytes"] += len(data)
+            if records:
+                state["records"] += len(records)
+                state["cursor"] = str(records[-1][RECORD_KEYS[kind]])
+                result.records[kind] += len(records)
+            state["done"] = len(records) < batch_size
+            _write_json(manifest_path, manifest)
+            if state["done"]:
+                break
+
+        logger.info(f"Exported {state['records']} {kind} to {path}")
+    return result
+
+
+async def _export_copy(
+    storage: Storage[Any],
+    directory: Path,
+    manifest: dict[str, Any],
+    format: DumpFormat,
+) -> TransferResult:
+    result = TransferResult()
+    manifest_path = directory / MANIFEST_NAME
+    postgres = _copy_support(storage, format)
+
+    files: dict[str, Path] = {}
+    for table in COPY_TABLE_NAMES:
+        state = manifest["kinds"].setdefault(
+            table,
+            {"file": f"{table}.{_COPY_SUFFIXES[format]}", "records": 0, "done": False},
+        )
+        if state["done"]:
+            result.skipped.append(table)
+        else:
+            files[table] = directory / state["file"]
+
+    async def _copied(table: str, rows: int) -> None:
+        manifest["kinds"][table].update(records=rows, done=True)
+        _write_json(manifest_path, manifest)
+        result.records[table] = rows
+        logger.info(f"Exported {rows} {table} rows to {files[table]}")
+
+    if files:
+        await postgres.copy_out(files, format, _copied)
+    return result
+
+
+async def import_storage(
+    storage: Storage[Any],
+    directory: Path,
+    batch_size: int = 1000,
+    restart: bool = False,
+) -> TransferResult:
+    """Import a dump directory written by export_storage().
+
+    Progress is kept in ``import-progress.json`` in the dump directory; an
+    interrupted import picks up where it stopped.
+
+    Args:
+        storage: Backend to import into
+        directory: Dump directory
+        batch_size: Records inserted per transaction (ndjson)
+        restart: Ignore the progress of an earlier import
+
+    Returns:
+        Records read and inserted in this run
+
+    Raises:
+        ValueError: If the directory holds no finished dump, or a COPY dump
+            is imported into a backend other than PostgreSQL
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    manifest = _read_json(directory / MANIFEST_NAME)
+    if manifest is None:
+        raise ValueError(f"No {MANIFEST_NAME} in {directory}")
+    if manifest.get("version") != DUMP_VERSION:
+        raise ValueError(f"Unsupported dump version {manifest.get('version')}")
+    unfinished = [k for k, state in manifest["kinds"].items() if not state["done"]]
+    expected = RECORD_KINDS if manifest["format"] == "ndjson" else COPY_TABLE_NAMES
+    if unfinished or set(manifest["kinds"]) != set(expected):
+        raise ValueError(f"The dump in {directory} is incomplete; resume the export")
+
+    progress_path = directory / IMPORT_PROGRESS_NAME
+    progress = None if restart else _read_json(progress_path)
+    if progress is None:
+        progress = {"kinds": {}}
+        _write_json(progress_path, progress)
+
+    result = TransferResult()
+    format: DumpFormat = manifest["format"]
+    postgres = _copy_support(storage, format) if format != "ndjson" else None
+
+    for kind in expected:
+        entry = manifest["kinds"][kind]
+        state = progress["kinds"].setdefault(
+            kind, {"records": 0, "inserted": 0, "bytes": 0, "done": False}
+        )
+        if state["done"]:
+            result.skipped.append(kind)
+            continue
+
+        path = directory / entry["file"]
+        result.records[kind] = 0
+        result.inserted[kind] = 0
+        if postgres is not None:
+            inserted = await postgres.copy_in(kind, path, format)
+            result.records[kind] = entry["records"]
+            result.inserted[kind] = inserted
+            state.update(records=entry["records"], inserted=inserted, done=True)
+            _write_json(progress_path, progress)
+        else:
+            while not state["done"]:
+                lines, offset, ended = await asyncio.to_thread(
+                    _read_batch, path, state["bytes"], batch_size
+                )
+                records = [loads_jsonb(line) for line in lines]
+                inserted = await storage.import_records(kind, records)
+                state["bytes"] = offset
+                state["records"] += len(records)
+                state["inserted"] += inserted
+                state["done"] = ended
+                result.records[kind] += len(records)
+                result.inserted[kind] += inserted
+                _write_json(progress_path, progress)
+
+        logger.info(
+            f"Imported {state['inserted']} of {state['records']} {kind} "
+            f"from {path}"
+        )
+    return result
+
+
+async def copy_storage(
+    source: Storage[Any], target: Storage[Any], batch_size: int = 1000
+) -> TransferResult:
+    """Copy everything from one backend into another, batch by batch.
+
+    Nothing is written to disk, so an interrupted copy starts over; records
+    the target already has are skipped.
+
+    Args:
+        source: Backend to read
+        target: Backend to write
+        batch_size: Records per batch
+
+    Returns:
+        Records read and inserted per kind
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    result = TransferResult()
+    for kind in RECORD_KINDS:
+        result.records[kind] = 0
+        result.inserted[kind] = 0
+        cursor: str | None = None
+        while True:
+            records = await source.export_records(kind, cursor, batch_size)
+            if records:
+                result.inserted[kind] += await target.import_records(kind, records)
+                result.records[kind] += len(records)
+                cursor = str(records[-1][RECORD_KEYS[kind]])
+            if len(records) < batch_size:
+                break
+    return result
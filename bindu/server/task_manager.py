@@ -74,6 +74,7 @@ from .handlers import ContextHandlers, MessageHandlers, TaskHandlers
 from .notifications import PushNotificationManager
 from .scheduler import Scheduler
 from .storage import Storage
+from .storage.blob import BlobStore
 from .workers import ManifestWorker
 
 logger = get_logger("pebbling.server.task_manager")
@@ -86,6 +87,7 @@ class TaskManager:
     scheduler: Scheduler
     storage: Storage[Any]
     manifest: Any | None = None  # AgentManifest for creating workers
+    blob_store: BlobStore | None = None  # Offload target for large file parts
 
     _aexit_stack: AsyncExitStack | None = field(default=None, init=False)
     _workers: list[ManifestWorker] = field(default_factory=list, init=False)
@@ -116,6 +118,7 @@ class TaskManager:
                 storage=self.storage,
                 manifest=self.manifest,
                 lifecycle_notifier=self._push_manager.notify_lifecycle,
+                blob_store=self.blob_store,
             )
             self._workers.append(worker)
             await self._aexit_stack.enter_async_context(worker.run())
@@ -128,11 +131,13 @@ class TaskManager:
             workers=self._workers,
             context_id_parser=self._parse_context_id,
             push_manager=self._push_manager,
+            blob_store=self.blob_store,
         )
         self._task_handlers = TaskHandlers(
             scheduler=self.scheduler,
             storage=self.storage,
             error_response_creator=self._create_error_response,
+            manifest=self.manifest,
         )
         self._context_handlers = ContextHandlers(
             storage=self.storage,
@@ -212,7 +217,14 @@ class TaskManager:
             return getattr(self._message_handlers, name)
 
         # Task handler methods
-        if name in ("get_task", "list_tasks", "cancel_task", "task_feedback"):
+        if name in (
+            "get_task",
+            "list_tasks",
+            "search_tasks",
+            "cancel_task",
+            "task_feedback",
+            "feedback_summary",
+        ):
             return getattr(self._task_handlers, name)
 
         # Context handler methods
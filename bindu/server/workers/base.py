@@ -37,6 +37,15 @@ tracer = get_tracer(__name__)
 logger = get_logger(__name__)
 
 
+class TaskAlreadyClaimedError(ValueError):
+    """run_task() found its task already claimed by another run.
+
+    A task can be scheduled more than once, e.g. when a retried message/send
+    finds it still submitted. Only the run that moves it from submitted to
+    working executes it; the others raise this and leave the task alone.
+    """
+
+
 @dataclass
 class Worker(ABC):
     """Abstract base worker for A2A protocol task execution.
@@ -137,6 +146,9 @@ class Worker(ABC):
                         logger.warning(
                             f"Unknown operation: {task_operation['operation']}"
                         )
+        except TaskAlreadyClaimedError as e:
+            # Another run owns the task; failing it would clobber that run
+            logger.info(f"Skipping task run: {e}")
         except Exception as e:
             # Update task status to failed on any exception
             from uuid import UUID
@@ -45,7 +45,8 @@ from bindu.common.protocol.types import (
     TaskState,
 )
 from bindu.penguin.manifest import AgentManifest
-from bindu.server.workers.base import Worker
+from bindu.server.storage.blob import BlobStore, offload_messages
+from bindu.server.workers.base import TaskAlreadyClaimedError, Worker
 from bindu.server.workers.helpers import ResponseDetector, ResultProcessor
 from bindu.utils.logging import get_logger
 from bindu.utils.retry import retry_worker_operation
@@ -86,12 +87,15 @@ class ManifestWorker(Worker):
     )
     """Optional callback for task lifecycle notifications (task_id, context_id, state, final)."""
 
+    blob_store: Optional[BlobStore] = field(default=None)
+    """Optional blob store that large file parts are offloaded to before persisting."""
+
     @retry_worker_operation()
     async def run_task(self, params: TaskSendParams) -> None:
         """Execute a task using the AgentManifest.
 
         Hybrid Pattern Flow:
-        1. Load task and validate state
+        1. Claim task by transitioning submitted → working
         2. Build conversation history (using referenceTaskIds or context)
         3. Execute manifest with conversation context
         4. Detect response type:
@@ -107,18 +111,27 @@ class ManifestWorker(Worker):
 
         Raises:
             ValueError: If task not found
+            TaskAlreadyClaimedError: If another run already claimed the task
             Exception: Re-raised after marking task as failed
         """
-        # Step 1: Load and validate task
-        task = await self.storage.load_task(params["task_id"])
+        # Step 1: Claim the task (submitted → working) in a single storage call
+        task = await self.storage.transition_task(
+            params["task_id"], expected_states=("submitted",), state="working"
+        )
         if task is None:
-            raise ValueError(f"Task {params['task_id']} not found")
+            # Transition refused - load only to report why
+            existing = await self.storage.load_task(params["task_id"])
+            if existing is None:
+                raise ValueError(f"Task {params['task_id']} not found")
+            try:
+                await TaskStateManager.validate_task_state(existing)
+            except ValueError as e:
+                raise TaskAlreadyClaimedError(str(e)) from None
+            raise ValueError(f"Task {params['task_id']} could not be claimed")
 
         # Extract payment context if available (from x402 middleware)
         payment_context = params.get("payment_context")
 
-        await TaskStateManager.validate_task_state(task)
-
         # Add span event for state transition
         from opentelemetry.trace import get_current_span
 
@@ -128,14 +141,16 @@ class ManifestWorker(Worker):
                 "task.state_changed", attributes={"to_state": "working"}
             )
 
-        # Transition to working
-        await self.storage.update_task(task["id"], state="working")
-        await self._notify_lifecycle(task["id"], task["context_id"], "working", False)
+        # Everything after the claim fails the task on error: a retry of
+        # run_task would find the task claimed (by this run) and skip it
+        try:
+            await self._notify_lifecycle(
+                task["id"], task["context_id"], "working", False
+            )
 
-        # Step 2: Build conversation history (A2A Protocol)
-        message_history = await self._build_complete_message_history(task)
+            # Step 2: Build conversation history (A2A Protocol)
+            message_history = await self._build_complete_message_history(task)
 
-        try:
             # Step 3: Execute manifest with system prompt (if enabled)
             if (
                 self.manifest.enable_system_message
@@ -324,11 +339,18 @@ class ManifestWorker(Worker):
             # Strategy 1: Explicit references (A2A refinement pattern)
             from uuid import UUID
 
+            # Ensure task ids are UUID objects
+            ref_ids = [
+                UUID(task_id) if isinstance(task_id, str) else task_id
+                for task_id in reference_task_ids
+            ]
+
+            # Load all referenced tasks in one round trip, keep reference order
+            ref_tasks = await self.storage.load_tasks_many(ref_ids)
+
             referenced_messages: list[Message] = []
-            for task_id in reference_task_ids:
-                # Ensure task_id is UUID object
-                task_id_uuid = UUID(task_id) if isinstance(task_id, str) else task_id
-                ref_task = await self.storage.load_task(task_id_uuid)
+            for task_id in ref_ids:
+                ref_task = ref_tasks.get(task_id)
                 if ref_task and ref_task.get("history"):
                     referenced_messages.extend(ref_task["history"])
 
@@ -388,6 +410,8 @@ class ManifestWorker(Worker):
 
         metadata: dict[str, Any] | None = None
 
+        await self._offload_file_parts(agent_messages)
+
         # Update task with state and append agent messages to history
         await self.storage.update_task(
             task["id"], state=state, new_messages=agent_messages, metadata=metadata
@@ -441,6 +465,7 @@ class ManifestWorker(Worker):
                 results, task["id"], task["context_id"]
             )
             artifacts = self.build_artifacts(results)
+            await self._offload_file_parts(agent_messages, artifacts)
 
             # A2A Protocol: Send artifact notifications before updating storage
             # This allows clients to receive artifact updates via webhook
@@ -556,6 +581,22 @@ class ManifestWorker(Worker):
                 app_settings.x402.meta_error_key: str(e),
             }
 
+    async def _offload_file_parts(self, *collections: list[Any]) -> None:
+        """Move large inline file parts to the blob store before they are persisted.
+
+        Args:
+            collections: Lists of messages or artifacts, modified in place
+        """
+        if self.blob_store is None:
+            return
+        for items in collections:
+            await offload_messages(
+                items,
+                self.blob_store,
+                self.manifest.url,
+                app_settings.storage.blob_threshold_bytes,
+            )
+
     async def _notify_artifact(
         self, task_id: UUID, context_id: UUID, artifact: Artifact
     ) -> None:
@@ -359,9 +359,11 @@ class AgentSettings(BaseSettings):
         "tasks/get": "get_task",
         "tasks/cancel": "cancel_task",
         "tasks/list": "list_tasks",
+        "tasks/search": "search_tasks",
         "contexts/list": "list_contexts",
         "contexts/clear": "clear_context",
         "tasks/feedback": "task_feedback",
+        "tasks/feedback/summary": "feedback_summary",
     }
 
     # Task State Configuration (A2A Protocol)
@@ -385,6 +387,12 @@ class AgentSettings(BaseSettings):
         }
     )
 
+    # message/send is idempotent per (task_id, message_id): storage never
+    # appends a message twice, and tasks of messages accepted by this process
+    # are remembered this long, so client retries skip storage entirely
+    message_dedup_ttl_seconds: float = 300.0
+    message_dedup_max_entries: int = 10_000
+
     # Structured Response System Prompt
     # This prompt instructs LLMs to return structured JSON responses for state transitions
     # following the A2A Protocol hybrid agent pattern
@@ -515,8 +523,10 @@ class AuthSettings(BaseSettings):
         "tasks/get": ["agent:read"],
         "tasks/cancel": ["agent:write"],
         "tasks/list": ["agent:read"],
+        "tasks/search": ["agent:read"],
         "contexts/list": ["agent:read"],
         "tasks/feedback": ["agent:write"],
+        "tasks/feedback/summary": ["agent:read"],
     }
 
 
@@ -614,6 +624,7 @@ class StorageSettings(BaseSettings):
     Supports multiple storage backends:
     - memory: In-memory storage (default, non-persistent)
     - postgres: PostgreSQL storage (persistent)
+    - sqlite: SQLite file storage (persistent, single host; needs aiosqlite)
 
     PostgreSQL settings must be provided via environment variables or config.
     """
@@ -624,7 +635,7 @@ class StorageSettings(BaseSettings):
     )
 
     # Storage backend selection
-    backend: Literal["memory", "postgres"] = Field(
+    backend: Literal["memory", "postgres", "sqlite"] = Field(
         default="memory",
         validation_alias=AliasChoices("backend", "STORAGE_TYPE"),
     )
@@ -639,6 +650,23 @@ class StorageSettings(BaseSettings):
     postgres_timeout: int = 60
     postgres_command_timeout: int = 30
 
+    # Pooled connections: postgres_pool_min of them are opened on connect.
+    # Idle connections are checked with a round trip on every checkout
+    # ("checkout"), every postgres_pool_ping_interval seconds ("periodic"),
+    # or never ("none"; broken connections then fail one query, which is
+    # retried)
+    postgres_pool_ping: Literal["checkout", "periodic", "none"] = "checkout"
+    postgres_pool_ping_interval: float = 30.0
+
+    # Connecting through PgBouncer in transaction pooling mode: no prepared
+    # statement caching, and the DID schema is set per transaction instead
+    # of per connection. The fast path is not used with a DID schema
+    postgres_pgbouncer: bool = False
+    # Direct (or session pooled) URL for the LISTEN connection of the task
+    # change feed, which transaction pooling cannot carry. Without it the
+    # feed, the task cache and the hot tier are off with postgres_pgbouncer
+    postgres_listen_url: str | None = None
+
     # DID-based schema isolation
     postgres_did: str | None = Field(
         default=None,
@@ -649,9 +677,102 @@ class StorageSettings(BaseSettings):
     postgres_max_retries: int = 3
     postgres_retry_delay: float = 1.0
 
+    # Group commit for task status/metadata updates: writes arriving within
+    # the window are applied with one multi-row UPDATE and one commit
+    postgres_coalesce_writes: bool = False
+    postgres_coalesce_window_ms: float = 2.0
+    postgres_coalesce_max_batch: int = 500
+
+    # Run load/submit/update/count as prepared statements on a dedicated
+    # asyncpg pool (up to postgres_pool_max more connections), bypassing
+    # SQLAlchemy statement compilation and row mapping
+    postgres_fast_path: bool = False
+
+    # Read replicas (separate pools): read-only queries go to a replica unless
+    # it lags more than postgres_replica_max_lag_seconds, or the task/context
+    # was written by this process in the last postgres_replica_sticky_seconds
+    postgres_replica_urls: list[str] = Field(default_factory=list)
+    postgres_replica_max_lag_seconds: float = 5.0
+    postgres_replica_sticky_seconds: float = 10.0
+    postgres_replica_check_interval: float = 2.0
+
+    # One pool (postgres_pool_max connections) shared by every DID schema in
+    # the process instead of a pool per storage; each transaction sets its
+    # schema with SET LOCAL. A schema may hold at most postgres_tenant_pool_share
+    # of the pool at once. Not combined with the fast path or read replicas
+    postgres_shared_engine: bool = False
+    postgres_tenant_pool_share: float = 0.5
+
+    # tasks is range-partitioned by created_at into monthly partitions.
+    # PostgresStorage creates partitions this many months ahead on connect
+    # and every maintenance interval (0 disables the periodic run)
+    postgres_partition_months_ahead: int = 3
+    postgres_partition_maintenance_interval: float = 3600.0
+    # Detach and drop monthly partitions that ended more than this many months
+    # ago, with all their tasks regardless of state (None keeps them all)
+    postgres_partition_retention_months: int | None = None
+
+    # SQLite database file (WAL mode): one writer connection and this many
+    # reader connections, so reads never wait behind a write
+    sqlite_path: str = Field(
+        default=".bindu/bindu.db",
+        validation_alias=AliasChoices("sqlite_path", "SQLITE_PATH"),
+    )
+    sqlite_readers: int = 4
+    sqlite_busy_timeout_ms: int = 5000
+
+    # Read-through task cache (bounded LRU + TTL) in front of any backend;
+    # PostgreSQL invalidates entries across pods via LISTEN/NOTIFY
+    task_cache_enabled: bool = False
+    task_cache_max_entries: int = 10_000
+    task_cache_ttl_seconds: float = 30.0
+
+    # Hot/cold tiering: active and recently finished tasks are kept in memory
+    # over the backend, written through and demoted terminal TTL after they
+    # finish. Takes the place of the task cache when enabled
+    hot_tier_enabled: bool = False
+    hot_tier_max_entries: int = 10_000
+    hot_tier_terminal_ttl_seconds: float = 300.0
+
+    # Retention: purge tasks whose state is older than a per-state TTL, in
+    # small batches, optionally archiving them to gzipped JSONL first.
+    # Runs in the app lifespan when enabled, or via `bindu storage purge`
+    retention_enabled: bool = False
+    retention_ttl_seconds: dict[str, int] = Field(
+        default_factory=lambda: {
+            "completed": 30 * 86400,
+            "failed": 30 * 86400,
+            "canceled": 30 * 86400,
+            "rejected": 30 * 86400,
+        }
+    )
+    retention_interval_seconds: int = 3600
+    retention_archive_path: str | None = None  # No archive when unset
+    # Rows deleted per transaction by retention, clear_context and clear_all
+    purge_batch_size: int = 500
+
+    # Compaction (PostgreSQL, needs zstandard): history and artifacts of tasks
+    # terminal for longer than compression_after_days are moved into one zstd
+    # frame per task, compressed with a shared trained dictionary. Runs in the
+    # app lifespan when enabled, or via `bindu storage compact`
+    compression_enabled: bool = False
+    compression_after_days: int = 30
+    compression_level: int = 9
+    compression_batch_size: int = 200
+    compression_interval_seconds: int = 3600
+    compression_dictionary_size: int = 64 * 1024
+    # Finished tasks sampled to train the dictionary on the first run
+    compression_training_samples: int = 2000
+
     # Migration settings
     run_migrations_on_startup: bool = False  # Safer default for production
 
+    # Blob store for large file parts (content-addressed by SHA-256)
+    # "none" keeps file bytes inline in task history/artifacts
+    blob_backend: Literal["none", "filesystem"] = "none"
+    blob_path: str = ".bindu/blobs"
+    blob_threshold_bytes: int = 256 * 1024  # Offload file parts at or above 256 KiB
+
 
 class SchedulerSettings(BaseSettings):
     """Scheduler backend configuration settings.
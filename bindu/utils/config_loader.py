@@ -27,12 +27,13 @@ def create_storage_config_from_env(user_config: Dict[str, Any]):
     if "storage" in user_config:
         storage_dict = user_config["storage"]
         storage_type = storage_dict.get("type")
-        if storage_type not in ("postgres", "memory"):
+        if storage_type not in ("postgres", "memory", "sqlite"):
             logger.warning(f"Invalid storage type: {storage_type}, using memory")
             storage_type = "memory"
         return StorageConfig(
             type=storage_type,
             database_url=storage_dict.get("postgres_url"),
+            sqlite_path=storage_dict.get("sqlite_path"),
         )
 
     # Load from environment
@@ -40,7 +41,7 @@ def create_storage_config_from_env(user_config: Dict[str, Any]):
     if not storage_type:
         return None
 
-    if storage_type not in ("postgres", "memory"):
+    if storage_type not in ("postgres", "memory", "sqlite"):
         logger.warning(f"Invalid storage type: {storage_type}, using memory")
         storage_type = "memory"
 
@@ -53,9 +54,15 @@ def create_storage_config_from_env(user_config: Dict[str, Any]):
         if database_url:
             logger.debug("Loaded DATABASE_URL from environment")
 
+    # SQLite path is optional; settings default to .bindu/bindu.db
+    sqlite_path = None
+    if storage_type == "sqlite":
+        sqlite_path = os.getenv("SQLITE_PATH")
+
     return StorageConfig(
-        type=cast(Literal["postgres", "memory"], storage_type),
+        type=cast(Literal["postgres", "memory", "sqlite"], storage_type),
         database_url=database_url,
+        sqlite_path=sqlite_path,
     )
 
 
@@ -212,7 +219,7 @@ def load_config_from_env(config: Dict[str, Any]) -> Dict[str, Any]:
     """Load capability-specific configurations from environment variables.
 
     This function loads all infrastructure and capability configs from environment:
-    - Storage: STORAGE_TYPE, DATABASE_URL
+    - Storage: STORAGE_TYPE, DATABASE_URL, SQLITE_PATH
     - Scheduler: SCHEDULER_TYPE, REDIS_URL
     - Sentry: SENTRY_ENABLED, SENTRY_DSN
     - Telemetry: TELEMETRY_ENABLED
@@ -245,6 +252,9 @@ def load_config_from_env(config: Dict[str, Any]) -> Dict[str, Any]:
                     )
                 enriched_config["storage"]["postgres_url"] = database_url
                 logger.debug("Loaded DATABASE_URL from environment")
+            elif storage_type == "sqlite" and os.getenv("SQLITE_PATH"):
+                enriched_config["storage"]["sqlite_path"] = os.getenv("SQLITE_PATH")
+                logger.debug("Loaded SQLITE_PATH from environment")
             logger.debug(f"Loaded STORAGE_TYPE from environment: {storage_type}")
 
     # Scheduler configuration - load from env if not in user config
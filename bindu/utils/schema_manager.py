@@ -149,7 +149,10 @@ async def drop_schema_if_exists(
 
 
 async def set_search_path(
-    connection: AsyncConnection, schema_name: str, include_public: bool = False
+    connection: AsyncConnection,
+    schema_name: str,
+    include_public: bool = False,
+    local: bool = False,
 ) -> None:
     """Set the search_path for the current connection to use a specific schema.
 
@@ -160,6 +163,7 @@ async def set_search_path(
         connection: SQLAlchemy async connection
         schema_name: Schema to set as the search path
         include_public: If True, also include 'public' schema in search path
+        local: If True, only set it for the current transaction (SET LOCAL)
 
     Example:
         After setting search_path to 'did_bindu_alice_agent1':
@@ -171,7 +175,8 @@ async def set_search_path(
     else:
         search_path = f'"{schema_name}"'
 
-    await connection.execute(text(f"SET search_path TO {search_path}"))
+    scope = "LOCAL " if local else ""
+    await connection.execute(text(f"SET {scope}search_path TO {search_path}"))
     logger.debug(f"Set search_path to: {search_path}")
 
 
@@ -246,8 +251,9 @@ async def initialize_did_schema(
     # Create tables in a separate transaction to avoid conflicts
     if create_tables:
         async with engine.begin() as conn:
-            # Set search path to the new schema
-            await set_search_path(conn, schema_name)
+            # Set search path to the new schema for this transaction only, so
+            # the pooled connection does not keep it (engines may be shared)
+            await set_search_path(conn, schema_name, local=True)
 
             # Create all tables in this schema
             from bindu.server.storage.schema import metadata
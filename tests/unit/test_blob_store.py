@@ -0,0 +1,199 @@
+"""Unit tests for the content-addressed blob store, offloading and download endpoint."""
+
+import base64
+import hashlib
+from types import SimpleNamespace
+from typing import cast
+
+import pytest
+from starlette.requests import Request
+
+from bindu.server.applications import BinduApplication
+from bindu.server.endpoints.blobs import blob_download_endpoint, parse_range_header
+from bindu.server.storage.blob import (
+    FilesystemBlobStore,
+    is_valid_digest,
+    offload_messages,
+)
+
+
+@pytest.fixture
+def blob_store(tmp_path):
+    """Filesystem blob store in a temporary directory."""
+    return FilesystemBlobStore(tmp_path / "blobs")
+
+
+def _file_message(data: bytes, name: str = "report.pdf") -> dict:
+    return {
+        "message_id": "m1",
+        "kind": "message",
+        "role": "user",
+        "parts": [
+            {"kind": "text", "text": "see attached"},
+            {
+                "kind": "file",
+                "file": {
+                    "bytes": base64.b64encode(data).decode(),
+                    "mimeType": "application/pdf",
+                    "name": name,
+                },
+            },
+        ],
+    }
+
+
+async def _read(blob_store, digest, start=0, end=None) -> bytes:
+    chunks = [
+        c async for c in blob_store.iter_range(digest, start, end, chunk_size=7)
+    ]
+    return b"".join(chunks)
+
+
+@pytest.mark.asyncio
+async def test_put_is_content_addressed_and_deduplicated(blob_store):
+    """Same content yields the same digest and a single file on disk."""
+    data = b"hello blob" * 100
+
+    first = await blob_store.put(data)
+    second = await blob_store.put(data)
+
+    assert first == second == hashlib.sha256(data).hexdigest()
+    assert await blob_store.size(first) == len(data)
+    assert len([p for p in blob_store.root.rglob("*") if p.is_file()]) == 1
+    assert await _read(blob_store, first) == data
+
+
+@pytest.mark.asyncio
+async def test_iter_range_and_delete(blob_store):
+    """Ranges are inclusive and deleting a missing blob is a no-op."""
+    data = bytes(range(100))
+    digest = await blob_store.put(data)
+
+    assert await _read(blob_store, digest, 10, 29) == data[10:30]
+    assert await _read(blob_store, digest, 90) == data[90:]
+
+    await blob_store.delete(digest)
+    await blob_store.delete(digest)
+    assert await blob_store.size(digest) is None
+
+
+@pytest.mark.asyncio
+async def test_invalid_digest_rejected(blob_store):
+    """Digests are validated before touching the filesystem."""
+    assert not is_valid_digest("../../etc/passwd")
+    with pytest.raises(ValueError):
+        await blob_store.size("../../etc/passwd")
+
+
+@pytest.mark.asyncio
+async def test_offload_replaces_large_parts_with_uri(blob_store):
+    """Parts at or above the threshold become FileWithUri, small ones stay inline."""
+    large = _file_message(b"x" * 2048)
+    small = _file_message(b"y" * 10, name="small.txt")
+
+    count = await offload_messages(
+        [large, small], blob_store, "http://agent:3773/", threshold_bytes=1024
+    )
+
+    assert count == 1
+    file = large["parts"][1]["file"]
+    digest = hashlib.sha256(b"x" * 2048).hexdigest()
+    assert "bytes" not in file
+    assert file["uri"] == f"http://agent:3773/blobs/{digest}"
+    assert file["name"] == "report.pdf"
+    assert file["mimeType"] == "application/pdf"
+    assert "bytes" in small["parts"][1]["file"]
+    assert large["parts"][0] == {"kind": "text", "text": "see attached"}
+
+
+@pytest.mark.asyncio
+async def test_offload_keeps_invalid_base64_inline(blob_store):
+    """Undecodable payloads are left untouched."""
+    message = _file_message(b"")
+    message["parts"][1]["file"]["bytes"] = "!" * 4096
+
+    assert await offload_messages([message], blob_store, "http://a", 16) == 0
+    assert message["parts"][1]["file"]["bytes"] == "!" * 4096
+
+
+@pytest.mark.parametrize(
+    "header,expected",
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=90-", (90, 99)),
+        ("bytes=-10", (90, 99)),
+        ("bytes=50-500", (50, 99)),
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+        ("bytes=abc", None),
+        ("bytes=9-1", None),
+    ],
+)
+def test_parse_range_header(header, expected):
+    """Single byte ranges are parsed; unsupported forms are ignored."""
+    assert parse_range_header(header, 100) == expected
+
+
+def test_parse_range_header_unsatisfiable():
+    """Ranges starting past the end are unsatisfiable."""
+    with pytest.raises(ValueError):
+        parse_range_header("bytes=100-", 100)
+
+
+def _make_request(digest: str, headers: dict | None = None) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": f"/blobs/{digest}",
+            "headers": [
+                (k.lower().encode(), v.encode()) for k, v in (headers or {}).items()
+            ],
+            "path_params": {"digest": digest},
+            "client": ("127.0.0.1", 1234),
+        }
+    )
+
+
+async def _body(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+@pytest.mark.asyncio
+async def test_download_endpoint_full_and_range(blob_store):
+    """Full downloads return 200, ranged downloads 206 with Content-Range."""
+    data = bytes(range(256)) * 4
+    digest = await blob_store.put(data)
+    app = cast(BinduApplication, SimpleNamespace(_blob_store=blob_store))
+
+    response = await blob_download_endpoint(app, _make_request(digest))
+    assert response.status_code == 200
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-length"] == str(len(data))
+    assert await _body(response) == data
+
+    response = await blob_download_endpoint(
+        app, _make_request(digest, {"Range": "bytes=100-199"})
+    )
+    assert response.status_code == 206
+    assert response.headers["content-range"] == f"bytes 100-199/{len(data)}"
+    assert await _body(response) == data[100:200]
+
+
+@pytest.mark.asyncio
+async def test_download_endpoint_errors(blob_store):
+    """Unknown, malformed and unsatisfiable requests are rejected."""
+    digest = await blob_store.put(b"abc")
+    app = cast(BinduApplication, SimpleNamespace(_blob_store=blob_store))
+
+    response = await blob_download_endpoint(app, _make_request("0" * 64))
+    assert response.status_code == 404
+
+    response = await blob_download_endpoint(app, _make_request("not-a-digest"))
+    assert response.status_code == 400
+
+    response = await blob_download_endpoint(
+        app, _make_request(digest, {"Range": "bytes=10-"})
+    )
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */3"
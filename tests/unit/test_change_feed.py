@@ -0,0 +1,212 @@
+"""Unit tests for the task change feed and Storage.subscribe()."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from bindu.server.storage.change_feed import (
+    ChangeFeedGapError,
+    TaskChange,
+    TaskChangeFeed,
+)
+from bindu.server.storage.memory_storage import InMemoryStorage
+from bindu.server.storage.postgres_storage import PostgresStorage
+from bindu.settings import app_settings
+from tests.utils import create_test_message
+
+
+async def _drain(subscription, count: int) -> list[TaskChange]:
+    return [
+        await asyncio.wait_for(subscription.__anext__(), timeout=1)
+        for _ in range(count)
+    ]
+
+
+class TestTaskChangeFeed:
+    """Test fan-out, filtering and gap reporting."""
+
+    @pytest.mark.asyncio
+    async def test_filters_by_task_and_context(self):
+        """Test subscriptions only receive matching changes."""
+        feed = TaskChangeFeed()
+        task_id, context_id = uuid4(), uuid4()
+        by_task = feed.subscribe(task_id=task_id)
+        by_context = feed.subscribe(context_id=context_id)
+        everything = feed.subscribe()
+
+        feed.publish(TaskChange(task_id, context_id, "working", "update"))
+        feed.publish(TaskChange(uuid4(), context_id, "submitted", "insert"))
+        feed.publish(TaskChange(uuid4(), uuid4(), "submitted", "insert"))
+
+        assert [c.state for c in await _drain(by_task, 1)] == ["working"]
+        assert len(await _drain(by_context, 2)) == 2
+        assert len(await _drain(everything, 3)) == 3
+
+    @pytest.mark.asyncio
+    async def test_iterator_waits_for_changes(self):
+        """Test iteration blocks until a change is published."""
+        feed = TaskChangeFeed()
+        subscription = feed.subscribe()
+        waiter = asyncio.ensure_future(subscription.__anext__())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        change = TaskChange(uuid4(), None, "completed", "update")
+        feed.publish(change)
+
+        assert await asyncio.wait_for(waiter, timeout=1) == change
+
+    @pytest.mark.asyncio
+    async def test_interrupt_delivers_pending_then_raises_gap(self):
+        """Test queued changes are delivered before the gap is reported."""
+        feed = TaskChangeFeed()
+        subscription = feed.subscribe()
+        feed.publish(TaskChange(uuid4(), None, "working", "update"))
+        feed.interrupt()
+
+        await _drain(subscription, 1)
+        with pytest.raises(ChangeFeedGapError):
+            await subscription.__anext__()
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_gets_gap(self):
+        """Test overflowing the buffer is reported instead of dropping silently."""
+        feed = TaskChangeFeed(max_pending=2)
+        subscription = feed.subscribe()
+        for _ in range(3):
+            feed.publish(TaskChange(uuid4(), None, "working", "update"))
+
+        await _drain(subscription, 2)
+        with pytest.raises(ChangeFeedGapError):
+            await subscription.__anext__()
+
+    @pytest.mark.asyncio
+    async def test_close_ends_iteration_and_unregisters(self):
+        """Test closing stops iteration and removes the subscription."""
+        feed = TaskChangeFeed()
+        async with feed.subscribe() as subscription:
+            assert feed.has_consumers
+
+        assert not feed.has_consumers
+        with pytest.raises(StopAsyncIteration):
+            await subscription.__anext__()
+
+    def test_callbacks_receive_changes_and_gaps(self):
+        """Test callbacks get each change and None on interrupt."""
+        feed = TaskChangeFeed()
+        received = []
+        remove = feed.add_callback(received.append)
+
+        change = TaskChange(uuid4(), None, "working", "update")
+        feed.publish(change)
+        feed.interrupt()
+        remove()
+        feed.publish(change)
+
+        assert received == [change, None]
+
+
+class TestInMemorySubscribe:
+    """Test InMemoryStorage publishes every task write."""
+
+    @pytest.mark.asyncio
+    async def test_task_lifecycle_events(self):
+        """Test insert, update and delete are published for a context."""
+        storage = InMemoryStorage()
+        message = create_test_message()
+        context_id = message["context_id"]
+
+        async with await storage.subscribe(context_id=context_id) as changes:
+            task = await storage.submit_task(context_id, message)
+            await storage.update_task(task["id"], "working")
+            await storage.transition_task(task["id"], ("working",), "completed")
+            await storage.clear_context(context_id)
+
+            events = await _drain(changes, 4)
+
+        assert [(e.operation, e.state) for e in events] == [
+            ("insert", "submitted"),
+            ("update", "working"),
+            ("update", "completed"),
+            ("delete", "completed"),
+        ]
+        assert {e.task_id for e in events} == {task["id"]}
+
+    @pytest.mark.asyncio
+    async def test_task_filter_ignores_other_tasks(self):
+        """Test a task subscription does not see other tasks."""
+        storage = InMemoryStorage()
+        first, second = create_test_message(), create_test_message()
+        task = await storage.submit_task(first["context_id"], first)
+
+        async with await storage.subscribe(task_id=task["id"]) as changes:
+            await storage.submit_task(second["context_id"], second)
+            await storage.update_task(task["id"], "working")
+
+            (event,) = await _drain(changes, 1)
+
+        assert event.task_id == task["id"] and event.state == "working"
+
+
+class TestPostgresChangePayload:
+    """Test parsing of notify_task_change() payloads."""
+
+    def test_json_payload(self):
+        """Test the JSON payload carries context, state and operation."""
+        task_id, context_id = uuid4(), uuid4()
+        payload = (
+            f'{{"id": "{task_id}", "context_id": "{context_id}", '
+            f'"state": "working", "op": "update"}}'
+        )
+
+        assert PostgresStorage._parse_task_change(payload) == TaskChange(
+            task_id, context_id, "working", "update"
+        )
+
+    def test_bare_task_id_payload(self):
+        """Test payloads from the original trigger are still understood."""
+        task_id = uuid4()
+
+        change = PostgresStorage._parse_task_change(str(task_id))
+
+        assert change == TaskChange(task_id, None, None, "update")
+
+    def test_malformed_payload_is_ignored(self):
+        """Test malformed payloads are dropped."""
+        assert PostgresStorage._parse_task_change("not-a-uuid") is None
+        assert PostgresStorage._parse_task_change('{"state": "working"}') is None
+
+
+class TestPostgresListenerBehindPgBouncer:
+    """Test where the LISTEN connection goes with postgres_pgbouncer."""
+
+    @pytest.mark.asyncio
+    async def test_subscribe_refused_without_listen_url(self):
+        """Test the feed is refused instead of listening through the pool."""
+        storage = PostgresStorage(listen_url=None)
+        storage._engine = MagicMock()
+        storage._session_factory = MagicMock()
+
+        with (
+            patch.object(app_settings.storage, "postgres_pgbouncer", True),
+            pytest.raises(ConnectionError, match="postgres_listen_url"),
+        ):
+            await storage.subscribe()
+
+        storage._engine.connect.assert_not_called()
+
+    def test_listen_url_gets_unpooled_engine(self):
+        """Test LISTEN uses its own unpooled engine on the direct URL."""
+        storage = PostgresStorage(listen_url="postgresql://direct/bindu")
+        storage._engine = MagicMock()
+
+        with patch.object(app_settings.storage, "postgres_pgbouncer", True):
+            engine = storage._listen_engine()
+
+        assert engine is not storage._engine
+        assert engine.url.render_as_string() == "postgresql+asyncpg://direct/bindu"
+        assert type(engine.pool).__name__ == "NullPool"
+        with patch.object(app_settings.storage, "postgres_pgbouncer", False):
+            assert storage._listen_engine() is storage._engine
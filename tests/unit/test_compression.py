@@ -0,0 +1,185 @@
+"""Unit tests for compaction of finished tasks into zstd payloads."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+pytest.importorskip("zstandard")
+
+from bindu.cli import main  # noqa: E402
+from bindu.server.metrics import PrometheusMetrics  # noqa: E402
+from bindu.server.storage.compression import (  # noqa: E402
+    MIN_TRAINING_SAMPLES,
+    CompactionEngine,
+    CompactionResult,
+    TaskCompressor,
+    UnknownCompressionDictionary,
+    restore_compressed,
+)
+from bindu.server.storage.memory_storage import InMemoryStorage  # noqa: E402
+from bindu.server.storage.postgres_storage import PostgresStorage  # noqa: E402
+from tests.utils import create_test_message  # noqa: E402
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def _samples(count: int) -> list[bytes]:
+    return [
+        TaskCompressor.encode(
+            [create_test_message(text=f"Summarise report {i} for the team")],
+            [{"artifact_id": str(uuid4()), "name": "summary", "parts": []}],
+        )
+        for i in range(count)
+    ]
+
+
+class TestTaskCompressor:
+    """Test compression with and without a shared dictionary."""
+
+    def test_round_trip_with_dictionary(self):
+        """Test payloads compressed with a trained dictionary decode."""
+        compressor = TaskCompressor(level=3)
+        plain = compressor.compress(_samples(1)[0])
+        dictionary = compressor.train(_samples(MIN_TRAINING_SAMPLES * 4), 4096)
+        assert dictionary is not None
+        dictionary_id = compressor.add_dictionary(dictionary)
+
+        raw = _samples(1)[0]
+        payload = compressor.compress(raw)
+
+        assert compressor.dictionary_id == dictionary_id
+        assert len(payload) < len(raw)
+        assert compressor.decompress(payload)["artifacts"][0]["name"] == "summary"
+        # Frames written before the dictionary existed still decode
+        assert compressor.decompress(plain)["history"][0]["kind"] == "message"
+
+    def test_unknown_dictionary(self):
+        """Test a frame needing a dictionary not loaded here is reported."""
+        writer = TaskCompressor()
+        writer.add_dictionary(writer.train(_samples(MIN_TRAINING_SAMPLES * 4), 4096))
+        payload = writer.compress(_samples(1)[0])
+
+        with pytest.raises(UnknownCompressionDictionary) as exc_info:
+            TaskCompressor().decompress(payload)
+
+        assert exc_info.value.dictionary_id == writer.dictionary_id
+
+    def test_too_few_samples_train_nothing(self):
+        """Test training is skipped until there are enough finished tasks."""
+        assert TaskCompressor().train(_samples(3), 4096) is None
+
+    def test_restore_compressed_prepends_payload(self):
+        """Test compressed history and artifacts come before newer entries."""
+        compressor = TaskCompressor()
+        old, new = {"text": "old"}, {"text": "new"}
+        payload = compressor.compress(compressor.encode([old], [{"name": "a"}]))
+
+        full = restore_compressed(
+            {"id": uuid4(), "history": [new], "artifacts": []}, payload, compressor
+        )
+        history = restore_compressed(
+            {"id": uuid4(), "history": []}, payload, compressor
+        )
+        status = {"id": uuid4()}
+
+        assert full["history"] == [old, new]
+        assert full["artifacts"] == [{"name": "a"}]
+        assert "artifacts" not in history
+        # Nothing to restore, so nothing is decompressed
+        assert restore_compressed(status, b"not a frame", None) is status
+
+    def test_restore_without_compressor_fails(self):
+        """Test reading a compacted task without zstandard fails clearly."""
+        with pytest.raises(RuntimeError, match="zstandard"):
+            restore_compressed({"id": uuid4(), "history": []}, b"frame", None)
+
+
+class TestCompactionEngine:
+    """Test batching and metrics of the compaction job."""
+
+    @pytest.mark.asyncio
+    async def test_run_once_compacts_until_done(self):
+        """Test batches run until one is empty and are counted in metrics."""
+        storage = MagicMock()
+        storage.compact_tasks = AsyncMock(
+            side_effect=[
+                CompactionResult(tasks=2, raw_bytes=1000, compressed_bytes=100),
+                CompactionResult(tasks=1, raw_bytes=500, compressed_bytes=50),
+                CompactionResult(),
+            ]
+        )
+        metrics = PrometheusMetrics()
+
+        with patch(
+            "bindu.server.storage.compression.get_metrics", return_value=metrics
+        ):
+            result = await CompactionEngine(
+                storage, timedelta(days=30), batch_size=2
+            ).run_once(now=NOW)
+
+        assert (result.tasks, result.saved_bytes) == (3, 1350)
+        storage.compact_tasks.assert_awaited_with(NOW - timedelta(days=30), 2)
+        assert storage.compact_tasks.await_count == 3
+        text = metrics.generate_prometheus_text()
+        assert "storage_compacted_tasks_total 3" in text
+        assert 'storage_compaction_bytes_total{size="compressed"} 150' in text
+        assert "storage_compaction_bytes_saved_total 1350" in text
+
+    def test_requires_postgres(self):
+        """Test backends without compact_tasks are rejected."""
+        with pytest.raises(ValueError, match="PostgreSQL"):
+            CompactionEngine(InMemoryStorage(), timedelta(days=1))
+
+    def test_compact_command(self, capsys):
+        """Test ``bindu storage compact`` applies its options and reports."""
+        storage = MagicMock()
+        storage.compact_tasks = AsyncMock(
+            side_effect=[CompactionResult(4, 4000, 400), CompactionResult()]
+        )
+
+        with (
+            patch("bindu.cli.storage.create_storage", AsyncMock(return_value=storage)),
+            patch("bindu.cli.storage.close_storage", AsyncMock()),
+        ):
+            code = main(["storage", "compact", "--older-than", "7d"])
+
+        assert code == 0
+        cutoff, _ = storage.compact_tasks.call_args[0]
+        assert datetime.now(timezone.utc) - cutoff >= timedelta(days=7)
+        assert "Compacted 4 tasks" in capsys.readouterr().out
+
+
+class TestPostgresCompaction:
+    """Test PostgresStorage reads of compacted tasks."""
+
+    def test_row_to_task_decompresses(self):
+        """Test a compacted row gets its history and artifacts back."""
+        storage = PostgresStorage()
+        message = {"kind": "message", "parts": [{"kind": "text", "text": "old"}]}
+        payload = storage._compressor.compress(
+            TaskCompressor.encode([message], [{"name": "report"}])
+        )
+        row = MagicMock(
+            id=uuid4(),
+            context_id=uuid4(),
+            kind="task",
+            state="completed",
+            state_timestamp=NOW,
+            history=[],
+            artifacts=[],
+            metadata={},
+            compressed_payload=payload,
+        )
+
+        task = storage._row_to_task(row)
+
+        assert task["history"] == [message]
+        assert task["artifacts"] == [{"name": "report"}]
+
+    @pytest.mark.asyncio
+    async def test_compact_tasks_nothing_to_do(self):
+        """Test a zero limit does not touch the database."""
+        result = await PostgresStorage().compact_tasks(NOW, limit=0)
+        assert result.tasks == 0
@@ -0,0 +1,295 @@
+"""Unit tests for the asyncpg fast path of PostgresStorage."""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from bindu.server.storage.fast_path import (
+    COUNT_TASKS_IN_STATE_SQL,
+    COUNT_TASKS_SQL,
+    LOAD_TASK_SQL,
+    UPDATE_TASK_SQL,
+    AsyncpgFastPath,
+    _decode_jsonb,
+    _encode_jsonb,
+    _record_to_task,
+)
+from bindu.server.storage.base import DuplicateMessageError
+from bindu.server.storage.postgres_storage import PostgresStorage
+from tests.utils import create_test_message
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def _record(**overrides):
+    record = {
+        "id": uuid4(),
+        "context_id": uuid4(),
+        "kind": "task",
+        "state": "working",
+        "state_timestamp": NOW,
+        "history": [{"text": "a"}, {"text": "b"}, {"text": "c"}],
+        "artifacts": None,
+        "metadata": {"k": 1},
+        "inserted": True,
+    }
+    record.update(overrides)
+    return record
+
+
+def _fast_path_with_pool(pool):
+    fast_path = AsyncpgFastPath("postgresql+asyncpg://db/bindu", 1, 2, 5, 5)
+    fast_path._pool = pool
+    return fast_path
+
+
+def _storage_with_fast_path():
+    storage = PostgresStorage()
+    storage._engine = MagicMock()
+    storage._session_factory = MagicMock()
+    storage._fast_path = MagicMock()
+    return storage
+
+
+class TestFastPathCodecs:
+    """Test JSONB encoding and record mapping."""
+
+    def test_jsonb_round_trip(self):
+        """Test values survive the binary jsonb codec."""
+        value = {"parts": [{"kind": "text", "text": "héllo"}], "n": 1.5}
+        encoded = _encode_jsonb(value)
+
+        assert encoded[:1] == b"\x01"
+        assert _decode_jsonb(encoded) == value
+
+    def test_jsonb_codec_encodes_uuids_and_datetimes(self):
+        """Test UUIDs and datetimes need no serialize_for_jsonb() pass."""
+        task_id = uuid4()
+
+        decoded = _decode_jsonb(_encode_jsonb({"task_id": task_id, "at": NOW}))
+
+        assert decoded == {"task_id": str(task_id), "at": NOW.isoformat()}
+
+    def test_record_to_task_defaults_empty_columns(self):
+        """Test NULL JSONB columns map to empty collections."""
+        record = _record(history=None, metadata=None)
+        task = _record_to_task(record)
+
+        assert task["status"] == {"state": "working", "timestamp": NOW.isoformat()}
+        assert task["history"] == []
+        assert task["artifacts"] == []
+        assert task["metadata"] == {}
+
+    def test_driver_suffix_is_dropped_from_url(self):
+        """Test the SQLAlchemy URL is turned into an asyncpg DSN."""
+        fast_path = AsyncpgFastPath("postgresql+asyncpg://u@h/db", 1, 2, 5, 5)
+        assert fast_path.dsn == "postgresql://u@h/db"
+
+
+class TestAsyncpgFastPath:
+    """Test the statements the fast path runs."""
+
+    @pytest.mark.asyncio
+    async def test_connect_sets_search_path_and_codec(self):
+        """Test DID schemas go on the search_path of every pool connection."""
+        fast_path = AsyncpgFastPath(
+            "postgresql://h/db", 2, 4, 5, 30, schema_name="did_bindu_agent"
+        )
+        with patch(
+            "bindu.server.storage.fast_path.asyncpg.create_pool", AsyncMock()
+        ) as create_pool:
+            await fast_path.connect()
+
+        kwargs = create_pool.call_args.kwargs
+        assert kwargs["server_settings"] == {"search_path": '"did_bindu_agent"'}
+        assert (kwargs["min_size"], kwargs["max_size"]) == (2, 4)
+        assert kwargs["init"] is not None
+
+    @pytest.mark.asyncio
+    async def test_load_task_passes_history_limit(self):
+        """Test a non-positive history_length reads the whole history."""
+        pool = MagicMock()
+        pool.fetchrow = AsyncMock(return_value=None)
+        fast_path = _fast_path_with_pool(pool)
+        task_id = uuid4()
+
+        assert await fast_path.load_task(task_id, history_length=0) is None
+        await fast_path.load_task(task_id, history_length=5)
+
+        assert pool.fetchrow.call_args_list[0].args == (LOAD_TASK_SQL, task_id, None)
+        assert pool.fetchrow.call_args_list[1].args == (LOAD_TASK_SQL, task_id, 5)
+
+    @pytest.mark.asyncio
+    async def test_update_task_uses_one_statement_for_every_shape(self):
+        """Test omitted arguments are bound as NULL, not left out of the SQL."""
+        pool = MagicMock()
+        pool.fetchrow = AsyncMock(return_value=_record())
+        fast_path = _fast_path_with_pool(pool)
+        task_id = uuid4()
+
+        await fast_path.update_task(task_id, "working", NOW, metadata={})
+        await fast_path.update_task(task_id, "working", NOW, metadata={"id": task_id})
+
+        first, second = pool.fetchrow.call_args_list
+        assert first.args == (
+            UPDATE_TASK_SQL,
+            task_id,
+            "working",
+            NOW,
+            None,
+            None,
+            None,
+        )
+        assert second.args[0] == UPDATE_TASK_SQL
+        assert second.args[4] == {"id": task_id}  # encoded by the jsonb codec
+
+    @pytest.mark.asyncio
+    async def test_update_missing_task_raises_key_error(self):
+        """Test updating an unknown task raises KeyError."""
+        pool = MagicMock()
+        pool.fetchrow = AsyncMock(return_value=None)
+
+        with pytest.raises(KeyError):
+            await _fast_path_with_pool(pool).update_task(uuid4(), "working", NOW)
+
+    @pytest.mark.asyncio
+    async def test_submit_terminal_task_raises(self):
+        """Test continuing a terminal task raises with its current state."""
+        conn = MagicMock()
+        conn.execute = AsyncMock()
+        conn.fetchrow = AsyncMock(return_value=None)
+        # Not a retried message; then the task's state
+        conn.fetchval = AsyncMock(side_effect=[False, "completed"])
+        conn.transaction.return_value.__aenter__ = AsyncMock()
+        conn.transaction.return_value.__aexit__ = AsyncMock(return_value=None)
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = AsyncMock(return_value=None)
+        message = create_test_message()
+
+        with pytest.raises(ValueError, match="terminal state 'completed'"):
+            await _fast_path_with_pool(pool).submit_task(
+                message["task_id"], message["context_id"], message, NOW
+            )
+
+        assert "pg_advisory_xact_lock" in conn.execute.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_submit_retried_message_returns_task(self):
+        """Test a message the task already holds is reported, not appended."""
+        record = _record(state="completed")
+        conn = MagicMock()
+        conn.execute = AsyncMock()
+        conn.fetchrow = AsyncMock(side_effect=[None, record])
+        conn.fetchval = AsyncMock(return_value=True)
+        conn.transaction.return_value.__aenter__ = AsyncMock()
+        conn.transaction.return_value.__aexit__ = AsyncMock(return_value=None)
+        pool = MagicMock()
+        pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+        pool.acquire.return_value.__aexit__ = AsyncMock(return_value=None)
+        message = create_test_message()
+
+        with pytest.raises(DuplicateMessageError) as exc_info:
+            await _fast_path_with_pool(pool).submit_task(
+                message["task_id"], message["context_id"], message, NOW
+            )
+
+        assert exc_info.value.task["id"] == record["id"]
+        assert exc_info.value.task["status"]["state"] == "completed"
+        assert conn.fetchrow.call_args_list[0].args[6] == message["message_id"]
+        assert conn.fetchrow.call_args_list[1].args[0] == LOAD_TASK_SQL
+
+    @pytest.mark.asyncio
+    async def test_count_tasks_picks_statement(self):
+        """Test counting all tasks and tasks in one state."""
+        pool = MagicMock()
+        pool.fetchval = AsyncMock(return_value=3)
+        fast_path = _fast_path_with_pool(pool)
+
+        assert await fast_path.count_tasks() == 3
+        assert await fast_path.count_tasks("working") == 3
+        assert pool.fetchval.call_args_list[0].args == (COUNT_TASKS_SQL,)
+        assert pool.fetchval.call_args_list[1].args == (
+            COUNT_TASKS_IN_STATE_SQL,
+            "working",
+        )
+
+
+class TestPostgresStorageFastPath:
+    """Test PostgresStorage routes hot operations to the fast path."""
+
+    @pytest.mark.asyncio
+    async def test_full_load_uses_fast_path_and_trims_history(self):
+        """Test full loads go through the fast path with legacy history trimmed."""
+        storage = _storage_with_fast_path()
+        storage._fast_path.load_task = AsyncMock(
+            return_value=_record_to_task(_record())
+        )
+        task_id = uuid4()
+
+        task = await storage.load_task(task_id, history_length=2)
+
+        storage._fast_path.load_task.assert_awaited_once_with(task_id, 2)
+        assert task["history"] == [{"text": "b"}, {"text": "c"}]
+
+    @pytest.mark.asyncio
+    async def test_projected_load_skips_fast_path(self):
+        """Test narrower projections still use the SQLAlchemy statements."""
+        storage = _storage_with_fast_path()
+        storage._fast_path.load_task = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.first.return_value = None
+        mock_session = AsyncMock()
+        mock_session.execute = AsyncMock(return_value=mock_result)
+        mock_factory = MagicMock()
+        mock_factory.return_value.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_factory.return_value.__aexit__ = AsyncMock(return_value=None)
+        storage._session_factory = mock_factory
+
+        assert await storage.load_task(uuid4(), projection="status") is None
+        storage._fast_path.load_task.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_update_validates_messages_first(self):
+        """Test messages are validated and stamped before the fast path runs."""
+        storage = _storage_with_fast_path()
+        storage._fast_path.update_task = AsyncMock(return_value={})
+        task_id = uuid4()
+        message = create_test_message()
+
+        await storage.update_task(task_id, "working", new_messages=[message])
+        with pytest.raises(TypeError):
+            await storage.update_task(task_id, "working", new_messages=["text"])
+
+        assert message["task_id"] == task_id
+        storage._fast_path.update_task.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_submit_and_count_use_fast_path(self):
+        """Test submit_task and count_tasks are delegated."""
+        storage = _storage_with_fast_path()
+        storage._fast_path.submit_task = AsyncMock(return_value={})
+        storage._fast_path.count_tasks = AsyncMock(return_value=7)
+        message = create_test_message()
+
+        await storage.submit_task(message["context_id"], message)
+
+        args = storage._fast_path.submit_task.call_args.args
+        assert args[:2] == (message["task_id"], message["context_id"])
+        assert await storage.count_tasks("completed") == 7
+        storage._fast_path.count_tasks.assert_awaited_once_with("completed")
+
+    @pytest.mark.asyncio
+    async def test_disconnect_closes_fast_path(self):
+        """Test the asyncpg pool is closed with the engine."""
+        storage = PostgresStorage()
+        fast_path = MagicMock()
+        fast_path.close = AsyncMock()
+        storage._fast_path = fast_path
+
+        await storage.disconnect()
+
+        fast_path.close.assert_awaited_once()
+        assert storage._fast_path is None
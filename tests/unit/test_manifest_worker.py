@@ -1,6 +1,7 @@
 """Unit tests for ManifestWorker and hybrid agent pattern."""
 
 from typing import cast
+from unittest.mock import MagicMock, patch
 from uuid import uuid4
 
 import pytest
@@ -391,6 +392,47 @@ class TestConversationHistory:
         ]
 
 
+    @pytest.mark.asyncio
+    async def test_reference_tasks_loaded_in_one_batch(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+    ):
+        """Test referenced tasks are batch loaded and kept in reference order."""
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, MockManifest(agent_fn=MockAgent())),
+        )
+
+        ref_ids = []
+        for text in ("First", "Second", "Third"):
+            msg = create_test_message(text=text)
+            ref_ids.append((await storage.submit_task(msg["context_id"], msg))["id"])
+
+        new_message = create_test_message(
+            text="Combine them",
+            reference_task_ids=[ref_ids[2], ref_ids[0], str(ref_ids[1])],
+        )
+        new_task = await storage.submit_task(new_message["context_id"], new_message)
+
+        with (
+            patch.object(storage, "load_task", wraps=storage.load_task) as load_one,
+            patch.object(
+                storage, "load_tasks_many", wraps=storage.load_tasks_many
+            ) as load_many,
+        ):
+            history = await worker._build_complete_message_history(new_task)
+
+        load_many.assert_awaited_once()
+        load_one.assert_not_called()
+        assert [m["content"] for m in history] == [
+            "Third",
+            "First",
+            "Second",
+            "Combine them",
+        ]
+
 class TestErrorHandling:
     """Test error handling in worker."""
 
@@ -455,6 +497,117 @@ class TestErrorHandling:
         with pytest.raises(ValueError, match="not found"):
             await worker.run_task(params)
 
+    @pytest.mark.asyncio
+    async def test_task_already_claimed(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+        mock_manifest: MockManifest,
+    ):
+        """Test that a task no longer in 'submitted' is not run again."""
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, mock_manifest),
+        )
+
+        message = create_test_message(text="Test")
+        task = await storage.submit_task(message["context_id"], message)
+        await storage.update_task(task["id"], state="working")
+
+        params = cast(
+            TaskSendParams,
+            {
+                "task_id": task["id"],
+                "context_id": task["context_id"],
+                "message": message,
+            },
+        )
+
+        with pytest.raises(ValueError, match="already processed"):
+            await worker.run_task(params)
+
+    @pytest.mark.asyncio
+    async def test_second_run_leaves_claimed_task_alone(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+        mock_manifest: MockManifest,
+    ):
+        """Test a task scheduled twice is not failed by the run that lost it."""
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, mock_manifest),
+        )
+
+        message = create_test_message(text="Test")
+        task = await storage.submit_task(message["context_id"], message)
+        await storage.update_task(task["id"], state="working")
+
+        operation = {
+            "operation": "run",
+            "params": {
+                "task_id": task["id"],
+                "context_id": task["context_id"],
+                "message": message,
+            },
+            "_current_span": MagicMock(),
+        }
+        with patch("bindu.server.workers.base.tracer", MagicMock()):
+            await worker._handle_task_operation(operation)
+
+        stored = await storage.load_task(task["id"])
+        assert stored is not None
+        assert_task_state(stored, "working")
+
+    @pytest.mark.asyncio
+    async def test_transient_error_after_claim_does_not_strand_task(
+        self,
+        storage: InMemoryStorage,
+        scheduler: InMemoryScheduler,
+        mock_manifest: MockManifest,
+    ):
+        """Test a retried run does not mistake its own claim for another run's."""
+        worker = ManifestWorker(
+            scheduler=scheduler,
+            storage=storage,
+            manifest=cast(AgentManifest, mock_manifest),
+        )
+
+        message = create_test_message(text="Test")
+        task = await storage.submit_task(message["context_id"], message)
+
+        build_history = worker._build_complete_message_history
+        calls = []
+
+        async def flaky_history(task):
+            calls.append(task["id"])
+            if len(calls) == 1:
+                raise ConnectionError("connection reset")
+            return await build_history(task)
+
+        operation = {
+            "operation": "run",
+            "params": {
+                "task_id": task["id"],
+                "context_id": task["context_id"],
+                "message": message,
+            },
+            "_current_span": MagicMock(),
+        }
+        with (
+            patch.object(worker, "_build_complete_message_history", flaky_history),
+            patch("bindu.server.workers.base.tracer", MagicMock()),
+            patch("bindu.settings.app_settings.retry.worker_min_wait", 0.01),
+            patch("bindu.settings.app_settings.retry.worker_max_wait", 0.01),
+        ):
+            await worker._handle_task_operation(operation)
+
+        stored = await storage.load_task(task["id"])
+        assert stored is not None
+        assert stored["status"]["state"] in ("failed", "completed")
+
 
 class TestLifecycleNotifications:
     """Test lifecycle notification callbacks."""
@@ -112,3 +112,51 @@ def test_metrics_prometheus_format_headers():
     assert "# TYPE http_request_duration_seconds histogram" in output
     assert "# HELP http_requests_in_flight" in output
     assert "# TYPE http_requests_in_flight gauge" in output
+
+
+def test_metrics_task_cache(metrics):
+    """Test task cache hit/miss and eviction counters."""
+    metrics.record_task_cache_lookup(hit=True)
+    metrics.record_task_cache_lookup(hit=True)
+    metrics.record_task_cache_lookup(hit=False)
+    metrics.record_task_cache_eviction("capacity")
+    metrics.record_task_cache_eviction("invalidated", 3)
+
+    output = metrics.generate_prometheus_text()
+
+    assert 'storage_task_cache_requests_total{result="hit"} 2' in output
+    assert 'storage_task_cache_requests_total{result="miss"} 1' in output
+    assert 'storage_task_cache_evictions_total{reason="capacity"} 1' in output
+    assert 'storage_task_cache_evictions_total{reason="invalidated"} 3' in output
+
+
+def test_metrics_feedback_gauges(metrics):
+    """Test feedback gauges per skill, replaced on each update."""
+    summary = {
+        "count": 3,
+        "rated": 2,
+        "mean_rating": 4.5,
+        "ratings": {"1": 0, "2": 0, "3": 0, "4": 1, "5": 1},
+    }
+    metrics.set_feedback_summaries("agent-1", [{**summary, "skill_id": "old"}])
+    metrics.set_feedback_summaries(
+        "agent-1",
+        [
+            {**summary, "skill_id": 'say "hi"'},
+            {**summary, "skill_id": "", "rated": 0, "mean_rating": None},
+        ],
+    )
+
+    output = metrics.generate_prometheus_text()
+
+    assert 'skill="old"' not in output
+    assert 'agent_feedback_count{agent_id="agent-1",skill="say \\"hi\\""} 3' in output
+    assert (
+        'agent_feedback_rating_mean{agent_id="agent-1",skill="say \\"hi\\""} 4.5000'
+        in output
+    )
+    assert 'agent_feedback_rating_mean{agent_id="agent-1",skill=""}' not in output
+    assert (
+        'agent_feedback_ratings{agent_id="agent-1",skill="",rating="5"} 1' in output
+    )
+
@@ -17,6 +17,8 @@ import pytest
 
 from bindu.server.applications import BinduApplication
 from bindu.server.endpoints.negotiation import negotiation_endpoint
+from bindu.server.storage.memory_storage import InMemoryStorage
+from tests.utils import create_test_message
 
 
 def _make_request(body: dict, headers: dict | None = None) -> object:
@@ -251,3 +253,21 @@ async def test_negotiation_endpoint_skill_matches():
         assert "skill_id" in match
         assert "skill_name" in match
         assert "score" in match
+
+
+@pytest.mark.asyncio
+async def test_negotiation_endpoint_queue_depth_counts_non_terminal_tasks():
+    """Test the load score uses the number of non-terminal tasks."""
+    storage = InMemoryStorage()
+    for state in ("working", "input-required", "completed"):
+        message = create_test_message()
+        task = await storage.submit_task(message["context_id"], message)
+        await storage.update_task(task["id"], state)
+    app = _make_app_with_manifest([{"id": "summarizer", "name": "Summarizer"}])
+    app.task_manager = SimpleNamespace(storage=storage)  # type: ignore[attr-defined]
+    request = _make_request({"task_summary": "summarize this"})
+
+    response = await negotiation_endpoint(cast(BinduApplication, app), request)  # type: ignore
+
+    data = json.loads(response.body)
+    assert data["subscores"]["load"] == round(1 / (1 + 2), 4)
@@ -0,0 +1,60 @@
+"""Unit tests for keyset page tokens."""
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from bindu.server.storage.helpers.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    clamp_page_size,
+    decode_page_token,
+    decode_search_token,
+    encode_page_token,
+    encode_search_token,
+)
+
+
+def test_page_token_round_trip():
+    """Test tokens decode to the exact keyset position they encode."""
+    created_at = datetime(2026, 10, 18, 9, 30, 15, 123456, tzinfo=timezone.utc)
+    row_id = uuid4()
+
+    token = encode_page_token(created_at, row_id)
+
+    assert "=" not in token
+    assert decode_page_token(token) == (created_at, row_id)
+
+
+def test_search_token_round_trip():
+    """Test search tokens carry the rank along with the keyset position."""
+    created_at = datetime(2026, 10, 18, 9, 30, 15, tzinfo=timezone.utc)
+    row_id = uuid4()
+
+    token = encode_search_token(0.25, created_at, row_id)
+
+    assert decode_search_token(token) == (0.25, created_at, row_id)
+    with pytest.raises(ValueError, match="Invalid page token"):
+        decode_search_token(encode_page_token(created_at, row_id))
+
+
+@pytest.mark.parametrize("token", ["", "garbage", "WyJ4Il0", "e30"])
+def test_decode_rejects_malformed_tokens(token):
+    """Test malformed tokens raise ValueError."""
+    with pytest.raises(ValueError, match="Invalid page token"):
+        decode_page_token(token)
+
+
+@pytest.mark.parametrize(
+    "requested,expected",
+    [
+        (None, DEFAULT_PAGE_SIZE),
+        (0, DEFAULT_PAGE_SIZE),
+        (10, 10),
+        (10**6, MAX_PAGE_SIZE),
+    ],
+)
+def test_clamp_page_size(requested, expected):
+    """Test page sizes are defaulted and capped."""
+    assert clamp_page_size(requested) == expected
@@ -0,0 +1,134 @@
+"""Unit tests for connection pool telemetry, pre-warming and health checks."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import exc
+
+from bindu.server.metrics import PrometheusMetrics
+from bindu.server.storage.pool import (
+    PoolPinger,
+    create_pooled_engine,
+    dispose_pooled_engine,
+    ping_idle_connections,
+    prewarm,
+)
+
+SQLITE_URL = "sqlite+aiosqlite:///:memory:"
+
+
+@pytest.fixture
+def metrics():
+    """Record pool metrics into a fresh registry."""
+    registry = PrometheusMetrics()
+    with patch("bindu.server.storage.pool.get_metrics", return_value=registry):
+        yield registry
+
+
+class TestPooledEngine:
+    """Test the instrumented pool and its metrics."""
+
+    @pytest.mark.asyncio
+    async def test_prewarm_and_metrics(self, metrics):
+        """Test pre-warmed connections and checkouts show up on /metrics."""
+        engine = create_pooled_engine(SQLITE_URL, 3, 5, label="primary")
+        await prewarm(engine, 2)
+
+        async with engine.connect():
+            text = metrics.generate_prometheus_text()
+
+        assert 'storage_pool_connections{pool="primary",state="checked_out"} 1' in text
+        assert 'storage_pool_connections{pool="primary",state="idle"} 1' in text
+        assert 'storage_pool_max_connections{pool="primary"} 3' in text
+        assert 'storage_pool_waiting{pool="primary"} 0' in text
+        assert 'storage_pool_checkout_seconds_count{pool="primary"} 3' in text
+        assert 'storage_pool_checkout_wait_seconds_count{pool="primary"} 3' in text
+
+        await dispose_pooled_engine(engine)
+        text = metrics.generate_prometheus_text()
+        assert "storage_pool_connections" not in text
+        # Counters outlive the pool
+        assert 'storage_pool_checkout_seconds_count{pool="primary"} 3' in text
+
+    @pytest.mark.asyncio
+    async def test_checkout_timeout_counted(self, metrics):
+        """Test a checkout that waited too long is counted per pool."""
+        engine = create_pooled_engine(SQLITE_URL, 1, 0.05, label="replica0")
+
+        async with engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                await engine.connect()
+
+        text = metrics.generate_prometheus_text()
+        assert 'storage_pool_checkout_timeouts_total{pool="replica0"} 1' in text
+        await dispose_pooled_engine(engine)
+
+    @pytest.mark.asyncio
+    async def test_label_survives_dispose(self, metrics):
+        """Test the pool replacing a disposed one keeps its label."""
+        engine = create_pooled_engine(SQLITE_URL, 2, 5, label="shared")
+        await engine.dispose()
+
+        assert engine.sync_engine.pool.label == "shared"
+        assert engine.sync_engine.pool.stats()["max"] == 2
+        await dispose_pooled_engine(engine)
+
+    def test_pgbouncer_disables_statement_cache(self, metrics):
+        """Test PgBouncer mode turns off asyncpg's prepared statement cache."""
+        with (
+            patch("bindu.server.storage.pool.create_async_engine") as create_engine,
+            patch(
+                "bindu.server.storage.pool.app_settings.storage.postgres_pgbouncer",
+                True,
+            ),
+            patch(
+                "bindu.server.storage.pool.app_settings.storage.postgres_pool_ping",
+                "periodic",
+            ),
+        ):
+            create_pooled_engine("postgresql+asyncpg://db/bindu", 5, 5, "primary")
+
+        kwargs = create_engine.call_args.kwargs
+        assert kwargs["connect_args"]["statement_cache_size"] == 0
+        assert kwargs["connect_args"]["prepared_statement_cache_size"] == 0
+        assert kwargs["pool_pre_ping"] is False
+        assert kwargs["max_overflow"] == 0
+
+
+class TestHealthChecks:
+    """Test pre-warming failures and periodic pings."""
+
+    @pytest.mark.asyncio
+    async def test_prewarm_raises_after_returning_connections(self):
+        """Test a failed connection is raised once the others are closed."""
+        conn = MagicMock(close=AsyncMock())
+        engine = MagicMock()
+        engine.connect = AsyncMock(side_effect=[conn, OSError("refused")])
+
+        with pytest.raises(OSError, match="refused"):
+            await prewarm(engine, 2)
+
+        conn.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_ping_idle_connections(self, metrics):
+        """Test every idle connection is checked and returned."""
+        engine = create_pooled_engine(SQLITE_URL, 3, 5, label="primary")
+        await prewarm(engine, 3)
+
+        assert await ping_idle_connections(engine) == 0
+        assert engine.sync_engine.pool.checkedin() == 3
+        await dispose_pooled_engine(engine)
+
+    @pytest.mark.asyncio
+    async def test_pinger_logs_failures(self):
+        """Test one unreachable engine does not stop the others' checks."""
+        engines = [MagicMock(), MagicMock()]
+
+        with patch(
+            "bindu.server.storage.pool.ping_idle_connections",
+            AsyncMock(side_effect=[OSError("down"), 2]),
+        ) as ping:
+            assert await PoolPinger(engines).ping_once() == 2
+
+        assert ping.await_count == 2
@@ -14,10 +14,31 @@ from uuid import uuid4
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from bindu.server.storage.postgres_storage import PostgresStorage
+from bindu.server.storage.helpers import dumps_jsonb, loads_jsonb
 from bindu.server.storage.helpers import serialize_for_jsonb as _serialize_for_jsonb
 from tests.utils import create_test_message
 
 
+def _mock_session(storage: PostgresStorage, **results) -> AsyncMock:
+    """Give storage a mocked session whose execute() result returns ``results``.
+
+    Each keyword names a result method (``fetchall``, ``first``, ``all``) and
+    the value it returns.
+    """
+    mock_result = MagicMock()
+    for name, value in results.items():
+        getattr(mock_result, name).return_value = value
+    mock_session = AsyncMock()
+    mock_session.execute = AsyncMock(return_value=mock_result)
+    mock_session.begin = MagicMock(return_value=AsyncMock())
+    mock_factory = MagicMock()
+    mock_factory.return_value.__aenter__ = AsyncMock(return_value=mock_session)
+    mock_factory.return_value.__aexit__ = AsyncMock(return_value=None)
+    storage._engine = MagicMock()
+    storage._session_factory = mock_factory
+    return mock_session
+
+
 class TestSerializeForJsonb:
     """Test JSONB serialization helper."""
 
@@ -61,6 +82,44 @@ class TestSerializeForJsonb:
         assert _serialize_for_jsonb(None) is None
 
 
+class TestJsonbCodec:
+    """Test the engine's orjson JSON serializer."""
+
+    def test_matches_recursive_serialization(self):
+        """Test one-pass encoding equals serialize_for_jsonb() plus json."""
+        test_uuid = uuid4()
+        data = {"outer": {"inner": [test_uuid, {"deep": test_uuid}]}, "n": 1.5}
+
+        assert loads_jsonb(dumps_jsonb(data)) == _serialize_for_jsonb(data)
+
+    def test_encodes_uuid_subclasses(self):
+        """Test UUIDs read back by asyncpg (a UUID subclass) are encoded."""
+        from asyncpg.pgproto.pgproto import UUID as AsyncpgUUID
+
+        value = AsyncpgUUID(str(uuid4()))
+
+        assert loads_jsonb(dumps_jsonb([value])) == [str(value)]
+
+    def test_encodes_datetimes_and_non_str_keys(self):
+        """Test datetimes and int keys are encoded like the stdlib would."""
+        moment = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+        assert loads_jsonb(dumps_jsonb({1: moment})) == {"1": moment.isoformat()}
+
+    def test_engine_uses_codec(self):
+        """Test PostgresStorage engines encode JSONB with the codec."""
+        storage = PostgresStorage(database_url="localhost:5432/testdb")
+
+        with patch(
+            "bindu.server.storage.pool.create_async_engine"
+        ) as create_engine:
+            storage._create_engine(storage.database_url)
+
+        kwargs = create_engine.call_args.kwargs
+        assert kwargs["json_serializer"] is dumps_jsonb
+        assert kwargs["json_deserializer"] is loads_jsonb
+
+
 class TestPostgresStorageInit:
     """Test PostgresStorage initialization."""
 
@@ -113,9 +172,10 @@ class TestPostgresStorageConnection:
     async def test_connect_success(self):
         """Test successful connection."""
         storage = PostgresStorage()
+        storage.maintain_partitions = AsyncMock()  # type: ignore[method-assign]
 
         with patch(
-            "bindu.server.storage.postgres_storage.create_async_engine"
+            "bindu.server.storage.pool.create_async_engine"
         ) as mock_engine:
             mock_engine_instance = MagicMock()
 
@@ -130,11 +190,16 @@ class TestPostgresStorageConnection:
             mock_engine_instance.begin = MagicMock(return_value=mock_begin_context)
             mock_engine.return_value = mock_engine_instance
 
-            with patch("bindu.server.storage.postgres_storage.async_sessionmaker"):
+            with (
+                patch("bindu.server.storage.postgres_storage.async_sessionmaker"),
+                patch("bindu.server.storage.postgres_storage.prewarm", AsyncMock()),
+            ):
                 await storage.connect()
 
                 assert storage._engine is not None
                 assert storage._session_factory is not None
+                storage.maintain_partitions.assert_awaited_once()
+                storage._partition_task.cancel()
 
     @pytest.mark.asyncio
     async def test_connect_failure(self):
@@ -142,7 +207,7 @@ class TestPostgresStorageConnection:
         storage = PostgresStorage()
 
         with patch(
-            "bindu.server.storage.postgres_storage.create_async_engine"
+            "bindu.server.storage.pool.create_async_engine"
         ) as mock_engine:
             mock_engine.side_effect = Exception("Connection failed")
 
@@ -198,6 +263,241 @@ class TestPostgresStorageTaskOperations:
         with pytest.raises(TypeError, match="context_id must be a valid UUID string"):
             await storage.submit_task("not-a-uuid", message)  # type: ignore
 
+    @pytest.mark.asyncio
+    async def test_transition_task_invalid_type(self):
+        """Test transition_task with invalid task_id type."""
+        storage = PostgresStorage()
+
+        with pytest.raises(TypeError, match="task_id must be a valid UUID string"):
+            await storage.transition_task(  # type: ignore
+                "not-a-uuid", expected_states=("submitted",), state="working"
+            )
+
+    def test_update_appends_to_task_messages(self):
+        """Test appended messages are inserted into task_messages in one statement."""
+        from sqlalchemy.dialects import postgresql
+
+        storage = PostgresStorage()
+        task_id = uuid4()
+        message = create_test_message(task_id=uuid4())
+
+        stmt = storage._build_task_update(
+            task_id, "input-required", new_messages=[message], metadata={"k": "v"}
+        )
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert message["task_id"] == task_id
+        assert "INSERT INTO task_messages" in sql
+        assert "WITH ORDINALITY" in sql
+        # Context id comes from the updated row, not from a prior SELECT
+        assert "jsonb_build_object" in sql
+        assert "updated.context_id" in sql
+        # The history array itself is never rewritten
+        assert "SET history" not in sql
+
+    def test_load_history_reads_only_tail(self):
+        """Test history_length is pushed down as a LIMIT on task_messages."""
+        from sqlalchemy import select
+        from sqlalchemy.dialects import postgresql
+
+        storage = PostgresStorage()
+        stmt = select(*storage._task_columns(history_length=5))
+        sql = str(
+            stmt.compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
+
+        assert "FROM task_messages" in sql
+        assert "ORDER BY task_messages.seq DESC" in sql
+        assert "LIMIT 5" in sql
+
+    def test_status_projection_skips_history_and_artifacts(self):
+        """Test narrow projections select neither artifacts nor message history."""
+        from sqlalchemy import select
+        from sqlalchemy.dialects import postgresql
+
+        storage = PostgresStorage()
+        status_sql = str(
+            select(*storage._task_columns(projection="status")).compile(
+                dialect=postgresql.dialect()
+            )
+        )
+        summary_sql = str(
+            select(
+                *storage._task_columns(history_length=3, projection="summary")
+            ).compile(dialect=postgresql.dialect())
+        )
+
+        assert "task_messages" not in status_sql
+        assert "artifacts" not in status_sql
+        assert "metadata" not in status_sql
+        assert "artifacts" not in summary_sql
+        assert "tasks.metadata" in summary_sql
+        assert "FROM task_messages" in summary_sql
+
+    @pytest.mark.asyncio
+    async def test_load_tasks_many_single_query(self):
+        """Test batch loading issues one query, keyed through task_ids."""
+        from sqlalchemy.dialects import postgresql
+
+        storage = PostgresStorage()
+        mock_session = _mock_session(storage, fetchall=[])
+
+        task_id = uuid4()
+        assert await storage.load_tasks_many([task_id, task_id, uuid4()]) == {}
+
+        mock_session.execute.assert_awaited_once()
+        stmt = mock_session.execute.call_args[0][0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "task_ids.id = ANY" in sql
+        assert len(stmt.compile().params["param_1"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_load_tasks_many_empty_skips_query(self):
+        """Test an empty id list returns without touching the database."""
+        storage = PostgresStorage()
+        assert await storage.load_tasks_many([]) == {}
+
+    @pytest.mark.asyncio
+    async def test_list_tasks_page_uses_keyset_predicate(self):
+        """Test task pages use a row-value keyset predicate, not OFFSET."""
+        from sqlalchemy.dialects import postgresql
+
+        from bindu.server.storage.helpers.pagination import encode_page_token
+
+        storage = PostgresStorage()
+        mock_session = _mock_session(storage, fetchall=[])
+
+        token = encode_page_token(datetime.now(timezone.utc), uuid4())
+        page = await storage.list_tasks_page(
+            10, token, projection="status", context_id=uuid4(), states=["working"]
+        )
+
+        assert page == {"tasks": []}
+        stmt = mock_session.execute.call_args[0][0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "(tasks.created_at, tasks.id) <" in sql
+        assert "ORDER BY tasks.created_at DESC, tasks.id DESC" in sql
+        assert "LIMIT" in sql and "OFFSET" not in sql
+        assert "tasks.context_id =" in sql and "tasks.state IN" in sql
+
+    @pytest.mark.asyncio
+    async def test_search_tasks_uses_search_vector(self):
+        """Test search matches search_vector and metadata and pages by rank."""
+        from sqlalchemy.dialects import postgresql
+
+        from bindu.server.storage.helpers.pagination import encode_search_token
+
+        storage = PostgresStorage()
+        mock_session = _mock_session(storage, fetchall=[])
+
+        token = encode_search_token(0.5, datetime.now(timezone.utc), uuid4())
+        page = await storage.search_tasks(
+            "Quarterly report", 10, token, metadata={"team": "a"}, projection="status"
+        )
+
+        assert page == {"tasks": []}
+        stmt = mock_session.execute.call_args[0][0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "task_messages.search_vector @@ plainto_tsquery" in sql
+        assert "tasks.metadata @>" in sql
+        assert "(hits.rank, tasks.created_at, tasks.id) <" in sql
+        assert "ORDER BY hits.rank DESC, tasks.created_at DESC, tasks.id DESC" in sql
+
+    @pytest.mark.asyncio
+    async def test_feedback_summary_reads_rollups(self):
+        """Test summaries sum the rollup shards, never scanning task_feedback."""
+        from datetime import date
+
+        from sqlalchemy.dialects import postgresql
+
+        storage = PostgresStorage()
+        mock_session = _mock_session(storage, all=[])
+
+        summaries = await storage.get_feedback_summary(
+            since=date(2026, 10, 1), group_by=["day", "skill"]
+        )
+
+        assert summaries == []
+        stmt = mock_session.execute.call_args[0][0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "FROM task_feedback_rollups" in sql
+        assert "task_feedback " not in sql
+        assert "sum(task_feedback_rollups.rating_5)" in sql
+        assert "task_feedback_rollups.day >=" in sql
+        assert (
+            "GROUP BY task_feedback_rollups.skill_id, task_feedback_rollups.day" in sql
+        )
+
+    @pytest.mark.asyncio
+    async def test_update_task_missing_row_raises_key_error(self):
+        """Test update_task raises KeyError when the UPDATE matches no row."""
+        storage = PostgresStorage()
+        mock_session = _mock_session(storage, first=None)
+
+        with pytest.raises(KeyError, match="not found"):
+            await storage.update_task(uuid4(), "working")
+
+        # Single round trip: no SELECT before the UPDATE
+        assert mock_session.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_transition_task_not_applied_returns_none(self):
+        """Test transition_task returns None when the guarded UPDATE matches nothing."""
+        storage = PostgresStorage()
+        mock_session = _mock_session(storage, first=None)
+
+        result = await storage.transition_task(
+            uuid4(), expected_states=("submitted",), state="working"
+        )
+
+        assert result is None
+        assert mock_session.execute.await_count == 1
+        sql = str(mock_session.execute.await_args.args[0])
+        assert "ANY" in sql
+
+    @pytest.mark.asyncio
+    async def test_coalesced_update_task_routing(self):
+        """Test status-only updates are queued and content updates go direct."""
+        storage = PostgresStorage(coalesce_writes=True)
+        storage._engine = MagicMock()
+        storage._session_factory = MagicMock()
+        storage._coalescer = MagicMock()
+        storage._coalescer.submit = AsyncMock(return_value={"id": "queued"})
+        storage._coalescer.wait_for = AsyncMock()
+
+        task_id = uuid4()
+        result = await storage.update_task(task_id, "working", metadata={"a": 1})
+
+        assert result == {"id": "queued"}
+        storage._coalescer.submit.assert_awaited_once_with(
+            task_id, (task_id, "working", {"a": 1})
+        )
+
+        # Updates carrying messages bypass the queue but wait for it first
+        storage._retry_on_connection_error = AsyncMock(return_value={"id": "direct"})
+        message = create_test_message(task_id=task_id)
+        result = await storage.update_task(task_id, "working", new_messages=[message])
+
+        assert result == {"id": "direct"}
+        storage._coalescer.wait_for.assert_awaited_once_with(task_id)
+        assert storage._coalescer.submit.await_count == 1
+
+    def test_status_batch_update_is_one_multi_row_statement(self):
+        """Test a coalesced batch compiles to a single UPDATE ... FROM VALUES."""
+        from sqlalchemy.dialects import postgresql
+
+        storage = PostgresStorage()
+        stmt = storage._build_status_batch_update(
+            [(uuid4(), "working", {"a": 1}), (uuid4(), "completed", None)]
+        )
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert sql.count("UPDATE tasks") == 1
+        assert "FROM (VALUES" in sql
+        assert "tasks.id = batch.id" in sql
+
     @pytest.mark.asyncio
     async def test_row_to_task_conversion(self):
         """Test _row_to_task conversion."""
@@ -223,6 +523,62 @@ class TestPostgresStorageTaskOperations:
         assert isinstance(task["history"], list)
         assert isinstance(task["artifacts"], list)
 
+    @pytest.mark.asyncio
+    async def test_count_tasks_by_state_reads_counters(self):
+        """Test per-state counts come from task_state_counts, not tasks."""
+        from sqlalchemy.dialects import postgresql
+
+        storage = PostgresStorage()
+        mock_session = _mock_session(storage, all=[("working", 3), ("completed", 12)])
+
+        counts = await storage.count_tasks_by_state()
+
+        assert counts == {"working": 3, "completed": 12}
+        sql = str(
+            mock_session.execute.call_args.args[0].compile(
+                dialect=postgresql.dialect()
+            )
+        )
+        assert "FROM task_state_counts" in sql and "FROM tasks" not in sql
+
+
+class TestPostgresStorageTransfer:
+    """Test bulk export/import queries."""
+
+    @pytest.mark.asyncio
+    async def test_export_records_uses_keyset_on_id(self):
+        """Test an export batch continues after the cursor in id order."""
+        from sqlalchemy.dialects import postgresql
+
+        storage = PostgresStorage()
+        mock_session = _mock_session(storage, fetchall=[])
+
+        after = uuid4()
+        assert await storage.export_records("webhook_configs", str(after), 50) == []
+
+        stmt = mock_session.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "webhook_configs.task_id > " in sql
+        assert "ORDER BY webhook_configs.task_id" in sql
+        assert stmt.compile().params["param_1"] == 50
+
+    @pytest.mark.asyncio
+    async def test_import_records_empty_batch_is_noop(self):
+        """Test importing nothing touches no connection."""
+        storage = PostgresStorage()
+
+        assert await storage.import_records("tasks", []) == 0
+
+    @pytest.mark.asyncio
+    async def test_copy_rejects_unknown_tables(self, tmp_path):
+        """Test COPY only runs for the dumped tables."""
+        storage = PostgresStorage()
+
+        with pytest.raises(ValueError, match="task_state_counts"):
+            await storage.copy_in("task_state_counts", tmp_path / "x.copy")
+        with pytest.raises(ValueError, match="pg_authid"):
+            await storage.copy_out({"pg_authid": tmp_path / "x.copy"})
+
 
 class TestPostgresStorageRetryLogic:
     """Test PostgresStorage retry logic."""
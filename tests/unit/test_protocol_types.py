@@ -293,6 +293,22 @@ class TestJSONRPCRequests:
         validated = a2a_request_ta.validate_python(request_dict)
         assert validated["method"] == "message/send"
 
+    def test_list_tasks_request_keeps_metadata(self):
+        """Test tasks/list params keep metadata alongside filters."""
+        request_dict = {
+            "jsonrpc": "2.0",
+            "id": str(uuid4()),
+            "method": "tasks/list",
+            "params": {
+                "createdAfter": "2026-01-01T00:00:00Z",
+                "metadata": {"a": 1},
+            },
+        }
+
+        validated = a2a_request_ta.validate_python(request_dict)
+        assert validated["params"]["metadata"] == {"a": 1}
+        assert validated["params"]["created_after"].year == 2026
+
 
 class TestPartTypes:
     """Test Part type variations."""
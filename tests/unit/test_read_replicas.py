@@ -0,0 +1,149 @@
+"""Unit tests for read-replica routing in PostgresStorage."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+from bindu.server.storage.postgres_storage import PostgresStorage
+from bindu.server.storage.replicas import Replica, ReplicaRouter
+
+
+def _replica(name: str, healthy: bool = True) -> Replica:
+    return Replica(
+        url=f"postgresql+asyncpg://{name}/db",
+        engine=MagicMock(),
+        session_factory=MagicMock(name=name),
+        lag_seconds=0.0 if healthy else None,
+        healthy=healthy,
+    )
+
+
+def _probe_engine(lag=None, error=None):
+    conn = MagicMock()
+    result = MagicMock()
+    result.scalar.return_value = lag
+    conn.execute = AsyncMock(return_value=result, side_effect=error)
+    engine = MagicMock()
+    engine.connect.return_value.__aenter__ = AsyncMock(return_value=conn)
+    engine.connect.return_value.__aexit__ = AsyncMock(return_value=None)
+    return engine
+
+
+class TestReplicaRouter:
+    """Test replica choice, stickiness and lag probing."""
+
+    def test_round_robin_skips_unhealthy(self):
+        """Test reads rotate over healthy replicas only."""
+        a, b, c = _replica("a"), _replica("b", healthy=False), _replica("c")
+        router = ReplicaRouter([a, b, c])
+
+        assert [router.choose() for _ in range(4)] == [a, c, a, c]
+
+        a.healthy = c.healthy = False
+        assert router.choose() is None
+
+    def test_written_keys_stick_to_primary(self):
+        """Test reads of a key written within the window go to the primary."""
+        router = ReplicaRouter([_replica("a")], sticky_seconds=10)
+        written, other = uuid4(), uuid4()
+
+        with patch("bindu.server.storage.replicas.time.monotonic", return_value=100):
+            router.mark_written(written)
+            assert router.choose(written) is None
+            assert router.choose(other) is not None
+
+        with patch("bindu.server.storage.replicas.time.monotonic", return_value=111):
+            assert router.choose(written) is not None
+            router.mark_written(other)
+        assert written not in router._written  # expired entries are pruned
+
+    def test_bulk_write_sticks_every_read(self):
+        """Test marking without keys keeps all reads on the primary."""
+        router = ReplicaRouter([_replica("a")], sticky_seconds=10)
+
+        router.mark_written()
+
+        assert router.choose() is None
+        assert router.choose(uuid4()) is None
+
+    @pytest.mark.asyncio
+    async def test_check_lag_marks_lagging_and_unreachable_replicas(self):
+        """Test replicas over the lag limit or failing the probe are skipped."""
+        current = _replica("current", healthy=False)
+        current.engine = _probe_engine(lag=0.2)
+        lagging = _replica("lagging")
+        lagging.engine = _probe_engine(lag=30.0)
+        down = _replica("down")
+        down.engine = _probe_engine(error=OSError("connection refused"))
+        router = ReplicaRouter([current, lagging, down], max_lag_seconds=5)
+
+        await router.check_lag()
+
+        assert (current.healthy, current.lag_seconds) == (True, 0.2)
+        assert (lagging.healthy, lagging.lag_seconds) == (False, 30.0)
+        assert (down.healthy, down.lag_seconds) == (False, None)
+
+
+class TestPostgresStorageRouting:
+    """Test PostgresStorage sends reads to replicas and writes to the primary."""
+
+    def test_replica_urls_use_asyncpg(self):
+        """Test replica URLs are normalized like the primary URL."""
+        storage = PostgresStorage(
+            database_url="postgresql://primary/db",
+            replica_urls=["postgresql://replica/db", "replica2/db"],
+        )
+
+        assert storage.replica_urls == [
+            "postgresql+asyncpg://replica/db",
+            "postgresql+asyncpg://replica2/db",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_read_uses_replica_session(self):
+        """Test a read runs on the chosen replica's sessions."""
+        storage = PostgresStorage()
+        replica = _replica("a")
+        storage._replicas = ReplicaRouter([replica])
+        read = AsyncMock(return_value="rows")
+
+        assert await storage._run_read(read, uuid4()) == "rows"
+        read.assert_awaited_once_with(replica.session_factory)
+
+    @pytest.mark.asyncio
+    async def test_failed_replica_falls_back_to_primary(self):
+        """Test a replica error marks it unhealthy and retries on the primary."""
+        storage = PostgresStorage()
+        replica = _replica("a")
+        storage._replicas = ReplicaRouter([replica])
+        error = DBAPIError("SELECT 1", None, ConnectionResetError())
+        read = AsyncMock(side_effect=[error, "rows"])
+
+        assert await storage._run_read(read) == "rows"
+        assert not replica.healthy
+        assert read.call_args.args[0] == storage._get_session_with_schema
+
+    @pytest.mark.asyncio
+    async def test_writes_mark_keys_written(self):
+        """Test a write makes the written task read from the primary."""
+        storage = PostgresStorage()
+        storage._engine = MagicMock()
+        storage._replicas = ReplicaRouter([_replica("a")])
+        task_id = uuid4()
+
+        mock_session = AsyncMock()
+        mock_session.execute = AsyncMock()
+        mock_session.begin = MagicMock()
+        mock_session.begin.return_value.__aenter__ = AsyncMock()
+        mock_session.begin.return_value.__aexit__ = AsyncMock(return_value=None)
+        mock_factory = MagicMock()
+        mock_factory.return_value.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_factory.return_value.__aexit__ = AsyncMock(return_value=None)
+        storage._session_factory = mock_factory
+
+        await storage.store_task_feedback(task_id, {"rating": 5})
+
+        assert storage._replicas.choose(task_id) is None
+        assert storage._replicas.choose(uuid4()) is not None
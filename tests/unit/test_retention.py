@@ -0,0 +1,280 @@
+"""Unit tests for retention: TTL purge, archival and the purge CLI."""
+
+import asyncio
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from bindu.cli import build_parser, main
+from bindu.cli.storage import build_policy, parse_duration
+from bindu.server.storage.memory_storage import InMemoryStorage
+from bindu.server.storage.postgres_storage import PostgresStorage
+from bindu.server.storage.retention import RetentionEngine, RetentionPolicy
+from tests.utils import create_test_message
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+async def _task_in_state(storage, state, age: timedelta, context_id=None):
+    message = create_test_message(context_id=context_id or uuid4())
+    task = await storage.submit_task(message["context_id"], message)
+    await storage.update_task(task["id"], state)
+    storage.tasks[task["id"]]["status"]["timestamp"] = (NOW - age).isoformat()
+    return task
+
+
+class TestInMemoryPurge:
+    """Test InMemoryStorage.purge_expired_tasks."""
+
+    @pytest.mark.asyncio
+    async def test_purges_only_expired_states_oldest_first(self):
+        """Test per-state cutoffs, the batch limit and deletion order."""
+        storage = InMemoryStorage()
+        oldest = await _task_in_state(storage, "completed", timedelta(days=40))
+        older = await _task_in_state(storage, "completed", timedelta(days=35))
+        recent = await _task_in_state(storage, "completed", timedelta(days=1))
+        failed = await _task_in_state(storage, "failed", timedelta(days=40))
+        cutoffs = {"completed": NOW - timedelta(days=30)}
+
+        assert await storage.purge_expired_tasks(cutoffs, limit=1) == 1
+        assert oldest["id"] not in storage.tasks
+        assert older["id"] in storage.tasks
+
+        assert await storage.purge_expired_tasks(cutoffs, limit=10) == 1
+        assert await storage.purge_expired_tasks(cutoffs, limit=10) == 0
+        assert set(storage.tasks) == {recent["id"], failed["id"]}
+
+    @pytest.mark.asyncio
+    async def test_removes_feedback_and_empty_contexts(self):
+        """Test related data goes with the task and shared contexts survive."""
+        storage = InMemoryStorage()
+        context_id = uuid4()
+        expired = await _task_in_state(
+            storage, "completed", timedelta(days=40), context_id
+        )
+        kept = await _task_in_state(storage, "working", timedelta(days=40), context_id)
+        lonely = await _task_in_state(storage, "completed", timedelta(days=40))
+        await storage.store_task_feedback(expired["id"], {"rating": 1})
+
+        purged = await storage.purge_expired_tasks(
+            {"completed": NOW - timedelta(days=30)}, limit=10
+        )
+
+        assert purged == 2
+        assert await storage.get_task_feedback(expired["id"]) is None
+        assert storage.contexts[context_id] == [kept["id"]]
+        assert lonely["context_id"] not in storage.contexts
+
+    @pytest.mark.asyncio
+    async def test_archive_failure_deletes_nothing(self):
+        """Test tasks are kept when the archive callback raises."""
+        storage = InMemoryStorage()
+        task = await _task_in_state(storage, "completed", timedelta(days=40))
+        archive = AsyncMock(side_effect=OSError("disk full"))
+
+        with pytest.raises(OSError):
+            await storage.purge_expired_tasks(
+                {"completed": NOW - timedelta(days=30)}, limit=10, archive=archive
+            )
+
+        assert task["id"] in storage.tasks
+
+
+class TestRetentionEngine:
+    """Test batching, archival and the background task."""
+
+    @pytest.mark.asyncio
+    async def test_run_once_purges_in_batches_and_archives(self, tmp_path):
+        """Test every expired task is archived to gzipped JSONL, then deleted."""
+        storage = InMemoryStorage()
+        for _ in range(5):
+            await _task_in_state(storage, "completed", timedelta(days=40))
+        keep = await _task_in_state(storage, "completed", timedelta(days=1))
+        policy = RetentionPolicy(
+            ttls={"completed": timedelta(days=30)}, batch_size=2, archive_dir=tmp_path
+        )
+        storage.purge_expired_tasks = AsyncMock(wraps=storage.purge_expired_tasks)
+
+        result = await RetentionEngine(storage, policy).run_once(now=NOW)
+
+        assert (result.purged, result.archived) == (5, 5)
+        assert storage.purge_expired_tasks.await_count == 4  # 2 + 2 + 1 + empty
+        assert list(storage.tasks) == [keep["id"]]
+
+        (path,) = result.archive_files
+        assert path == tmp_path / "tasks-20261018.jsonl.gz"
+        with gzip.open(path, "rt") as f:
+            archived = [json.loads(line) for line in f]
+        assert len(archived) == 5
+        assert all(task["status"]["state"] == "completed" for task in archived)
+
+    @pytest.mark.asyncio
+    async def test_max_batches_limits_run(self):
+        """Test a run stops after max_batches."""
+        storage = InMemoryStorage()
+        for _ in range(5):
+            await _task_in_state(storage, "failed", timedelta(days=40))
+        policy = RetentionPolicy(ttls={"failed": timedelta(days=30)}, batch_size=2)
+
+        result = await RetentionEngine(storage, policy).run_once(
+            now=NOW, max_batches=1
+        )
+
+        assert result.purged == 2
+        assert len(storage.tasks) == 3
+
+    @pytest.mark.asyncio
+    async def test_background_task_runs_and_stops(self):
+        """Test the periodic task purges on start and stops cleanly."""
+        storage = MagicMock()
+        storage.purge_expired_tasks = AsyncMock(return_value=0)
+        engine = RetentionEngine(
+            storage,
+            RetentionPolicy(ttls={"completed": timedelta(days=1)}),
+            interval_seconds=3600,
+        )
+
+        await engine.start()
+        await asyncio.sleep(0.01)
+        await engine.stop()
+
+        storage.purge_expired_tasks.assert_awaited_once()
+        assert engine._task.done()
+
+    def test_policy_rejects_non_terminal_states(self):
+        """Test live tasks can never be purged."""
+        with pytest.raises(ValueError, match="working"):
+            RetentionPolicy(ttls={"working": timedelta(days=1)})
+
+    def test_policy_from_settings(self, tmp_path):
+        """Test the policy is built from storage settings."""
+        with patch("bindu.server.storage.retention.app_settings") as settings:
+            settings.agent.non_terminal_states = frozenset({"working"})
+            settings.storage.retention_ttl_seconds = {"completed": 60}
+            settings.storage.purge_batch_size = 10
+            settings.storage.retention_archive_path = str(tmp_path)
+
+            policy = RetentionPolicy.from_settings()
+
+        assert policy.ttls == {"completed": timedelta(seconds=60)}
+        assert policy.batch_size == 10
+        assert policy.archive_dir == tmp_path
+
+
+class TestPostgresPurge:
+    """Test the SQL issued by PostgresStorage.purge_expired_tasks."""
+
+    @pytest.mark.asyncio
+    async def test_selects_batch_with_skip_locked(self):
+        """Test the batch is locked with SKIP LOCKED and nothing else runs."""
+        from sqlalchemy.dialects import postgresql
+
+        storage = PostgresStorage()
+        storage._engine = MagicMock()
+
+        mock_result = MagicMock()
+        mock_result.fetchall.return_value = []
+        mock_session = AsyncMock()
+        mock_session.execute = AsyncMock(return_value=mock_result)
+        mock_session.begin = MagicMock()
+        mock_session.begin.return_value.__aenter__ = AsyncMock()
+        mock_session.begin.return_value.__aexit__ = AsyncMock(return_value=None)
+        mock_factory = MagicMock()
+        mock_factory.return_value.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_factory.return_value.__aexit__ = AsyncMock(return_value=None)
+        storage._session_factory = mock_factory
+
+        purged = await storage.purge_expired_tasks(
+            {"completed": NOW, "failed": NOW}, limit=50
+        )
+
+        assert purged == 0
+        mock_session.execute.assert_awaited_once()
+        stmt = mock_session.execute.call_args[0][0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "FOR UPDATE OF tasks SKIP LOCKED" in sql
+        assert "ORDER BY tasks.state_timestamp" in sql
+        assert sql.count("tasks.state_timestamp <") == 2
+
+    @pytest.mark.asyncio
+    async def test_no_cutoffs_skips_query(self):
+        """Test an empty policy does not touch the database."""
+        storage = PostgresStorage()
+        assert await storage.purge_expired_tasks({}, limit=50) == 0
+
+
+class TestPurgeCommand:
+    """Test `bindu storage purge` argument handling."""
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("30d", timedelta(days=30)),
+            ("12h", timedelta(hours=12)),
+            ("90m", timedelta(minutes=90)),
+            ("3600", timedelta(seconds=3600)),
+            ("2w", timedelta(weeks=2)),
+        ],
+    )
+    def test_parse_duration(self, value, expected):
+        """Test supported duration formats."""
+        assert parse_duration(value) == expected
+
+    def test_parse_duration_rejects_garbage(self):
+        """Test malformed durations are rejected."""
+        with pytest.raises(ValueError):
+            parse_duration("soon")
+
+    def test_ttl_options_replace_settings(self, tmp_path):
+        """Test --ttl, --batch-size and --archive-dir build the policy."""
+        args = build_parser().parse_args(
+            [
+                "storage",
+                "purge",
+                "--ttl",
+                "completed=7d",
+                "--ttl",
+                "failed=1h",
+                "--batch-size",
+                "25",
+                "--archive-dir",
+                str(tmp_path),
+            ]
+        )
+
+        policy = build_policy(args)
+
+        assert policy.ttls == {
+            "completed": timedelta(days=7),
+            "failed": timedelta(hours=1),
+        }
+        assert policy.batch_size == 25
+        assert policy.archive_dir == tmp_path
+
+    def test_invalid_ttl_state_fails(self, capsys):
+        """Test purging a non-terminal state is refused with exit code 1."""
+        assert main(["storage", "purge", "--ttl", "working=1d"]) == 1
+        assert "non-terminal" in capsys.readouterr().err
+
+    def test_dry_run_deletes_nothing(self, capsys):
+        """Test --dry-run lists the batch and keeps the tasks."""
+        storage = InMemoryStorage()
+        message = create_test_message()
+        task = asyncio.run(storage.submit_task(message["context_id"], message))
+        asyncio.run(storage.update_task(task["id"], "completed"))
+
+        with (
+            patch("bindu.cli.storage.create_storage", AsyncMock(return_value=storage)),
+            patch("bindu.cli.storage.close_storage", AsyncMock()),
+        ):
+            code = main(["storage", "purge", "--ttl", "completed=0s", "--dry-run"])
+
+        assert code == 0
+        output = capsys.readouterr().out
+        assert str(task["id"]) in output
+        assert "Would purge 1 tasks" in output
+        assert task["id"] in storage.tasks
@@ -0,0 +1,156 @@
+"""Unit tests for the engine shared by DID schemas (tenancy)."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from bindu.server.storage import tenancy
+from bindu.server.storage.postgres_storage import PostgresStorage
+from bindu.server.storage.tenancy import (
+    SharedEngine,
+    acquire_shared_engine,
+    release_shared_engine,
+)
+
+URL = "postgresql+asyncpg://h/db"
+
+
+def _run_after_begin(factory):
+    """Fire the after_begin listeners of a factory's sessions."""
+    session = factory.kw["sync_session_class"]()
+    connection = MagicMock()
+    session.dispatch.after_begin(session, None, connection)
+    return connection
+
+
+class TestSharedEngine:
+    """Test schema selection, schema setup and per-schema limits."""
+
+    def test_sessions_set_schema_per_transaction(self):
+        """Test each transaction starts with SET LOCAL for its schema."""
+        shared = SharedEngine(URL, pool_max=4, timeout=1)
+
+        factory = shared.session_factory("did_bindu_a")
+        connection = _run_after_begin(factory)
+
+        connection.exec_driver_sql.assert_called_once_with(
+            'SET LOCAL search_path TO "did_bindu_a"'
+        )
+        assert shared.session_factory("did_bindu_a") is factory
+        assert not _run_after_begin(
+            shared.session_factory(None)
+        ).exec_driver_sql.called
+
+    def test_invalid_schema_is_rejected(self):
+        """Test schema names are not interpolated unchecked."""
+        shared = SharedEngine(URL, pool_max=4, timeout=1)
+
+        with pytest.raises(ValueError):
+            shared.session_factory('x"; DROP TABLE tasks; --')
+
+    @pytest.mark.asyncio
+    async def test_schema_is_limited_to_its_pool_share(self):
+        """Test a schema waits for a slot and times out, others are unaffected."""
+        shared = SharedEngine(URL, pool_max=4, timeout=0.05, tenant_pool_share=0.25)
+        assert shared.tenant_limit == 1
+
+        async with shared.session("did_bindu_a"):
+            with pytest.raises(TimeoutError, match="did_bindu_a"):
+                async with shared.session("did_bindu_a"):
+                    pass
+            async with shared.session("did_bindu_b"):
+                pass
+
+        async with shared.session("did_bindu_a"):
+            pass
+
+    @pytest.mark.asyncio
+    async def test_schema_is_initialized_once(self):
+        """Test concurrent storages of one DID create its schema once."""
+        shared = SharedEngine(URL, pool_max=4, timeout=1)
+
+        with patch(
+            "bindu.utils.schema_manager.initialize_did_schema", AsyncMock()
+        ) as initialize:
+            await asyncio.gather(
+                *(shared.ensure_schema("did_bindu_a") for _ in range(3))
+            )
+            await shared.ensure_schema("did_bindu_b")
+
+        assert [call.args[1] for call in initialize.await_args_list] == [
+            "did_bindu_a",
+            "did_bindu_b",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_engine_is_disposed_with_last_reference(self):
+        """Test storages of one database share an engine until all release it."""
+        with patch("bindu.server.storage.pool.create_async_engine") as create:
+            create.return_value.dispose = AsyncMock()
+            first = await acquire_shared_engine(URL, pool_max=4, timeout=1)
+            second = await acquire_shared_engine(URL, pool_max=8, timeout=1)
+        assert first is second and first.references == 2
+        create.assert_called_once()
+
+        await release_shared_engine(first)
+        first.engine.dispose.assert_not_awaited()
+        await release_shared_engine(second)
+        first.engine.dispose.assert_awaited_once()
+
+        assert URL not in tenancy._shared_engines
+
+
+class TestPostgresStorageSharedEngine:
+    """Test PostgresStorage on the shared engine."""
+
+    @pytest.mark.asyncio
+    async def test_storages_share_one_pool(self):
+        """Test DID storages use one engine and skip per-storage pools."""
+        shared = SharedEngine(URL, pool_max=4, timeout=1)
+        shared.ensure_schema = AsyncMock()
+        storages = [
+            PostgresStorage(
+                URL, did=f"did:bindu:agent{i}", shared_engine=True, fast_path=True
+            )
+            for i in range(2)
+        ]
+
+        with (
+            patch(
+                "bindu.server.storage.postgres_storage.acquire_shared_engine",
+                AsyncMock(return_value=shared),
+            ),
+            patch.object(PostgresStorage, "maintain_partitions", AsyncMock()),
+            patch(
+                "bindu.server.storage.postgres_storage.app_settings."
+                "storage.postgres_partition_maintenance_interval",
+                0,
+            ),
+        ):
+            for storage in storages:
+                await storage.connect()
+
+        assert storages[0]._engine is storages[1]._engine is shared.engine
+        assert storages[0]._fast_path is None
+        assert [call.args[0] for call in shared.ensure_schema.await_args_list] == [
+            storage.schema_name for storage in storages
+        ]
+
+    @pytest.mark.asyncio
+    async def test_disconnect_releases_instead_of_disposing(self):
+        """Test disconnect leaves the pool to the remaining storages."""
+        shared = MagicMock()
+        shared.engine.dispose = AsyncMock()
+        storage = PostgresStorage(URL, shared_engine=True)
+        storage._shared = shared
+        storage._engine = shared.engine
+
+        with patch(
+            "bindu.server.storage.postgres_storage.release_shared_engine", AsyncMock()
+        ) as release:
+            await storage.disconnect()
+
+        release.assert_awaited_once_with(shared)
+        shared.engine.dispose.assert_not_awaited()
+        assert storage._engine is None and storage._shared is None
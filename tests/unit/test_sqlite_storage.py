@@ -0,0 +1,392 @@
+"""Unit tests for SQLiteStorage."""
+
+import asyncio
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+
+pytest.importorskip("aiosqlite")
+
+from bindu.server.storage import DuplicateMessageError  # noqa: E402
+from bindu.server.storage.memory_storage import InMemoryStorage  # noqa: E402
+from bindu.server.storage.sqlite_storage import SQLiteStorage  # noqa: E402
+from bindu.server.storage.transfer import copy_storage  # noqa: E402
+from tests.utils import assert_task_state, create_test_message  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def sqlite_storage(tmp_path):
+    """SQLite storage on a fresh database file."""
+    storage = SQLiteStorage(tmp_path / "bindu.db", readers=2)
+    await storage.connect()
+    yield storage
+    await storage.disconnect()
+
+
+async def _submit(storage: SQLiteStorage, text: str = "Test task", **kwargs):
+    message = create_test_message(text=text, **kwargs)
+    return await storage.submit_task(message["context_id"], message)
+
+
+class TestSQLiteTasks:
+    """Test task writes and reads."""
+
+    @pytest.mark.asyncio
+    async def test_submit_update_and_load(self, sqlite_storage):
+        """Test history, artifacts and metadata survive a round trip."""
+        task = await _submit(sqlite_storage)
+
+        await sqlite_storage.update_task(
+            task["id"],
+            "working",
+            new_artifacts=[{"artifact_id": str(uuid4()), "parts": []}],
+            new_messages=[create_test_message(text="progress")],
+            metadata={"step": {"n": 1}, "flag": True},
+        )
+        await sqlite_storage.update_task(
+            task["id"],
+            "completed",
+            new_artifacts=[{"artifact_id": str(uuid4()), "parts": []}],
+            metadata={"flag": False},
+        )
+
+        loaded = await sqlite_storage.load_task(task["id"])
+        assert_task_state(loaded, "completed")
+        assert [m["parts"][0]["text"] for m in loaded["history"]] == [
+            "Test task",
+            "progress",
+        ]
+        context_id = str(task["context_id"])
+        assert all(m["context_id"] == context_id for m in loaded["history"])
+        assert len(loaded["artifacts"]) == 2
+        assert loaded["metadata"] == {"step": {"n": 1}, "flag": False}
+
+    @pytest.mark.asyncio
+    async def test_resubmitted_message_is_not_appended(self, sqlite_storage):
+        """Test a retried message leaves the task as it is."""
+        message = create_test_message(text="Test task")
+        task = await sqlite_storage.submit_task(message["context_id"], message)
+        await sqlite_storage.update_task(task["id"], "working")
+
+        with pytest.raises(DuplicateMessageError) as exc_info:
+            await sqlite_storage.submit_task(message["context_id"], dict(message))
+
+        assert_task_state(exc_info.value.task, "working")
+        loaded = await sqlite_storage.load_task(task["id"])
+        assert_task_state(loaded, "working")
+        assert len(loaded["history"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_continue_and_terminal_tasks(self, sqlite_storage):
+        """Test non-terminal tasks are continued and terminal ones refused."""
+        task = await _submit(sqlite_storage)
+        await sqlite_storage.update_task(task["id"], "input-required")
+
+        continued = await _submit(
+            sqlite_storage,
+            "More input",
+            task_id=task["id"],
+            context_id=task["context_id"],
+        )
+        assert_task_state(continued, "submitted")
+        assert len(continued["history"]) == 2
+
+        await sqlite_storage.update_task(task["id"], "completed")
+        with pytest.raises(ValueError, match="terminal state"):
+            await _submit(sqlite_storage, task_id=task["id"])
+
+    @pytest.mark.asyncio
+    async def test_update_missing_task(self, sqlite_storage):
+        """Test updating an unknown task raises KeyError."""
+        with pytest.raises(KeyError):
+            await sqlite_storage.update_task(uuid4(), "working")
+
+    @pytest.mark.asyncio
+    async def test_transition_task(self, sqlite_storage):
+        """Test compare-and-set transitions only from expected states."""
+        task = await _submit(sqlite_storage)
+
+        assert await sqlite_storage.transition_task(
+            task["id"], ["working"], "completed"
+        ) is None
+        claimed = await sqlite_storage.transition_task(
+            task["id"], ["submitted"], "working"
+        )
+        assert_task_state(claimed, "working")
+
+    @pytest.mark.asyncio
+    async def test_projections_and_history_tail(self, sqlite_storage):
+        """Test projections and history_length are pushed into the query."""
+        task = await _submit(sqlite_storage, "first")
+        await sqlite_storage.update_task(
+            task["id"],
+            "working",
+            new_messages=[create_test_message(text=t) for t in ("second", "third")],
+        )
+
+        tail = await sqlite_storage.load_task(task["id"], history_length=2)
+        status = await sqlite_storage.load_task(task["id"], projection="status")
+        many = await sqlite_storage.load_tasks_many(
+            [task["id"], uuid4()], projection="summary"
+        )
+
+        assert [m["parts"][0]["text"] for m in tail["history"]] == ["second", "third"]
+        assert set(status) == {"id", "context_id", "kind", "status"}
+        assert list(many) == [task["id"]]
+        assert "history" not in many[task["id"]]
+
+    @pytest.mark.asyncio
+    async def test_counts_follow_state_changes(self, sqlite_storage):
+        """Test the trigger-kept counters follow inserts, updates and deletes."""
+        tasks = [await _submit(sqlite_storage) for _ in range(3)]
+        await sqlite_storage.update_task(tasks[0]["id"], "working")
+        await sqlite_storage.update_task(tasks[1]["id"], "completed")
+
+        assert await sqlite_storage.count_tasks_by_state() == {
+            "submitted": 1,
+            "working": 1,
+            "completed": 1,
+        }
+        assert await sqlite_storage.count_tasks() == 3
+
+        await sqlite_storage.clear_context(tasks[1]["context_id"])
+        assert await sqlite_storage.count_tasks("completed") == 0
+
+
+class TestSQLiteListing:
+    """Test keyset pagination and contexts."""
+
+    @pytest.mark.asyncio
+    async def test_list_tasks_page_walks_all_tasks(self, sqlite_storage):
+        """Test the pages cover every task exactly once."""
+        context_id = uuid4()
+        ids = [
+            (await _submit(sqlite_storage, context_id=context_id))["id"]
+            for _ in range(5)
+        ]
+
+        seen = []
+        token = None
+        while True:
+            page = await sqlite_storage.list_tasks_page(
+                page_size=2, page_token=token, context_id=context_id
+            )
+            seen.extend(task["id"] for task in page["tasks"])
+            token = page.get("next_page_token")
+            if token is None:
+                break
+
+        assert len(seen) == 5
+        assert set(seen) == set(ids)
+        contexts = await sqlite_storage.list_contexts_page(page_size=10)
+        assert contexts["contexts"][0]["task_count"] == 5
+        assert set(contexts["contexts"][0]["task_ids"]) == {str(i) for i in ids}
+
+    @pytest.mark.asyncio
+    async def test_list_tasks_page_filters(self, sqlite_storage):
+        """Test state and creation-time filters."""
+        task = await _submit(sqlite_storage)
+        await _submit(sqlite_storage)
+        await sqlite_storage.update_task(task["id"], "working")
+        later = datetime.now(timezone.utc) + timedelta(minutes=1)
+
+        working = await sqlite_storage.list_tasks_page(states=["working"])
+        future = await sqlite_storage.list_tasks_page(created_after=later)
+
+        assert [t["id"] for t in working["tasks"]] == [task["id"]]
+        assert future["tasks"] == []
+
+    @pytest.mark.asyncio
+    async def test_search_tasks(self, sqlite_storage):
+        """Test search by message words and metadata, like the other backends."""
+        report = await _submit(sqlite_storage, text="Quarterly revenue report")
+        await _submit(sqlite_storage, text="Revenue revenue")
+        await _submit(sqlite_storage, text="Weather")
+        await sqlite_storage.update_task(report["id"], "working", metadata={"t": [1]})
+
+        by_text = await sqlite_storage.search_tasks("revenue", page_size=1)
+        by_both = await sqlite_storage.search_tasks("revenue", metadata={"t": [1]})
+
+        assert len(by_text["tasks"]) == 1
+        assert "next_page_token" in by_text
+        assert [t["id"] for t in by_both["tasks"]] == [report["id"]]
+        assert (await sqlite_storage.search_tasks("reports"))["tasks"] == []
+
+    @pytest.mark.asyncio
+    async def test_contexts(self, sqlite_storage):
+        """Test context data and history are stored per context."""
+        context_id = uuid4()
+        await sqlite_storage.update_context(context_id, {"topic": "billing"})
+        await sqlite_storage.append_to_contexts(
+            context_id, [{"text": "a"}, {"text": "b"}]
+        )
+        await sqlite_storage.append_to_contexts(context_id, [{"text": "c"}])
+
+        assert await sqlite_storage.load_context(context_id) == {"topic": "billing"}
+        records = await sqlite_storage.export_records("contexts", None, 10)
+        assert [m["text"] for m in records[0]["message_history"]] == ["a", "b", "c"]
+        with pytest.raises(ValueError, match="not found"):
+            await sqlite_storage.clear_context(uuid4())
+
+
+class TestSQLiteMaintenance:
+    """Test purge, feedback, webhooks, change feed and persistence."""
+
+    @pytest.mark.asyncio
+    async def test_upgrades_version_1_database(self, tmp_path):
+        """Test a version 1 database gets message ids and feedback rollups."""
+        path = tmp_path / "bindu.db"
+        storage = SQLiteStorage(path)
+        await storage.connect()
+        task = await _submit(storage)
+        await storage.store_task_feedback(task["id"], {"rating": 3})
+        await storage.disconnect()
+        with sqlite3.connect(path) as conn:
+            conn.execute("DROP INDEX uq_task_messages_task_id_message_id")
+            conn.execute("ALTER TABLE task_messages DROP COLUMN message_id")
+            conn.execute("DROP TRIGGER rollup_task_feedback_insert")
+            conn.execute("DROP TABLE task_feedback_rollups")
+            conn.execute("PRAGMA user_version = 1")
+
+        storage = SQLiteStorage(path)
+        await storage.connect()
+        try:
+            message = create_test_message(
+                text="again", task_id=task["id"], context_id=task["context_id"]
+            )
+            await storage.submit_task(task["context_id"], message)
+            with pytest.raises(DuplicateMessageError):
+                await storage.submit_task(task["context_id"], dict(message))
+            # Feedback stored before the upgrade is rolled up
+            [summary] = await storage.get_feedback_summary()
+            assert summary["count"] == 1 and summary["mean_rating"] == 3.0
+        finally:
+            await storage.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_purge_expired_tasks(self, sqlite_storage):
+        """Test expired tasks are archived and deleted with their dependents."""
+        done = await _submit(sqlite_storage)
+        kept = await _submit(sqlite_storage)
+        await sqlite_storage.update_task(done["id"], "completed")
+        await sqlite_storage.store_task_feedback(done["id"], {"rating": 4})
+        await sqlite_storage.save_webhook_config(
+            done["id"], {"id": str(uuid4()), "url": "https://hooks.example"}
+        )
+        archived = []
+
+        async def _archive(tasks):
+            archived.extend(tasks)
+
+        cutoff = datetime.now(timezone.utc) + timedelta(seconds=1)
+        purged = await sqlite_storage.purge_expired_tasks(
+            {"completed": cutoff}, limit=10, archive=_archive
+        )
+
+        assert purged == 1
+        assert [t["id"] for t in archived] == [done["id"]]
+        assert await sqlite_storage.load_task(done["id"]) is None
+        assert await sqlite_storage.get_task_feedback(done["id"]) is None
+        assert await sqlite_storage.load_all_webhook_configs() == {}
+        assert await sqlite_storage.load_task(kept["id"]) is not None
+        contexts = await sqlite_storage.list_contexts()
+        assert [c["context_id"] for c in contexts] == [kept["context_id"]]
+
+    @pytest.mark.asyncio
+    async def test_feedback_and_webhooks(self, sqlite_storage):
+        """Test feedback is kept in order and webhook configs are upserted."""
+        task = await _submit(sqlite_storage)
+        await sqlite_storage.store_task_feedback(task["id"], {"rating": 1})
+        await sqlite_storage.store_task_feedback(task["id"], {"rating": 5})
+        await sqlite_storage.save_webhook_config(task["id"], {"url": "https://a"})
+        await sqlite_storage.save_webhook_config(task["id"], {"url": "https://b"})
+
+        assert await sqlite_storage.get_task_feedback(task["id"]) == [
+            {"rating": 1},
+            {"rating": 5},
+        ]
+        assert await sqlite_storage.load_webhook_config(task["id"]) == {
+            "url": "https://b"
+        }
+        await sqlite_storage.delete_webhook_config(task["id"])
+        assert await sqlite_storage.load_webhook_config(task["id"]) is None
+
+    @pytest.mark.asyncio
+    async def test_feedback_summary(self, sqlite_storage):
+        """Test the trigger-kept rollups match the in-memory summary."""
+        task = await _submit(sqlite_storage)
+        memory = InMemoryStorage()
+        for feedback in ({"rating": 5, "skill_id": "a"}, {"rating": 2}, {"x": 1}):
+            await sqlite_storage.store_task_feedback(task["id"], feedback)
+            await memory.store_task_feedback(task["id"], feedback)
+
+        for group_by in ((), ("skill",), ("skill", "day")):
+            assert await sqlite_storage.get_feedback_summary(
+                group_by=group_by
+            ) == await memory.get_feedback_summary(group_by=group_by)
+        [summary] = await sqlite_storage.get_feedback_summary(skill_id="a")
+        assert summary["ratings"]["5"] == 1 and summary["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_subscribe_receives_changes(self, sqlite_storage):
+        """Test committed writes are published to subscribers."""
+        task = await _submit(sqlite_storage)
+        async with await sqlite_storage.subscribe(task_id=task["id"]) as changes:
+            await sqlite_storage.update_task(task["id"], "working")
+            change = await asyncio.wait_for(changes.__anext__(), timeout=1)
+
+        assert (change.operation, change.state) == ("update", "working")
+
+    @pytest.mark.asyncio
+    async def test_data_survives_reconnect(self, tmp_path):
+        """Test tasks are still there after the database is reopened."""
+        path = tmp_path / "bindu.db"
+        storage = SQLiteStorage(path, readers=1)
+        await storage.connect()
+        task = await _submit(storage)
+        await storage.disconnect()
+
+        reopened = SQLiteStorage(path, readers=1)
+        await reopened.connect()
+        try:
+            loaded = await reopened.load_task(task["id"])
+            assert loaded is not None
+            assert await reopened.count_tasks() == 1
+        finally:
+            await reopened.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_requires_connect(self, tmp_path):
+        """Test operations before connect() fail clearly."""
+        storage = SQLiteStorage(tmp_path / "bindu.db")
+        with pytest.raises(RuntimeError, match="connect"):
+            await storage.load_task(uuid4())
+
+    @pytest.mark.asyncio
+    async def test_copy_from_memory_storage(self, sqlite_storage):
+        """Test a bulk copy into SQLite and back keeps every record."""
+        source = InMemoryStorage()
+        for i in range(3):
+            message = create_test_message(text=f"task {i}")
+            task = await source.submit_task(message["context_id"], message)
+            await source.update_task(task["id"], "completed")
+            await source.store_task_feedback(task["id"], {"rating": i})
+
+        first = await copy_storage(source, sqlite_storage, batch_size=2)
+        second = await copy_storage(source, sqlite_storage, batch_size=2)
+        back = InMemoryStorage()
+        await copy_storage(sqlite_storage, back)
+
+        assert first.inserted == {
+            "contexts": 3,
+            "tasks": 3,
+            "feedback": 3,
+            "webhook_configs": 0,
+        }
+        assert sum(second.inserted.values()) == 0
+        assert set(back.tasks) == set(source.tasks)
+        assert back.task_feedback == source.task_feedback
+        assert await sqlite_storage.count_tasks_by_state() == {"completed": 3}
@@ -4,6 +4,7 @@ from uuid import uuid4
 
 import pytest
 
+from bindu.server.storage import DuplicateMessageError
 from bindu.server.storage.memory_storage import InMemoryStorage
 from tests.utils import assert_task_state, create_test_message
 
@@ -36,6 +37,21 @@ class TestTaskStorage:
 
         assert task is None
 
+    @pytest.mark.asyncio
+    async def test_resubmitted_message_is_not_appended(self, storage: InMemoryStorage):
+        """Test a retried message returns the task instead of appending again."""
+        message = create_test_message(text="Test task")
+        task = await storage.submit_task(message["context_id"], message)
+        await storage.update_task(task["id"], "completed")
+
+        # Even a finished task answers the retry rather than refusing it
+        with pytest.raises(DuplicateMessageError) as exc_info:
+            await storage.submit_task(message["context_id"], dict(message))
+
+        assert exc_info.value.message_id == message["message_id"]
+        assert_task_state(exc_info.value.task, "completed")
+        assert len(exc_info.value.task["history"]) == 1
+
     @pytest.mark.asyncio
     async def test_update_task(self, storage: InMemoryStorage):
         """Test updating an existing task."""
@@ -51,6 +67,47 @@ class TestTaskStorage:
         loaded_task = await storage.load_task(task_id)
         assert_task_state(loaded_task, "working")
 
+    @pytest.mark.asyncio
+    async def test_transition_task_from_expected_state(self, storage: InMemoryStorage):
+        """Test compare-and-set transition when the current state matches."""
+        message = create_test_message(text="Test task")
+        task = await storage.submit_task(message["context_id"], message)
+
+        updated = await storage.transition_task(
+            task["id"], expected_states=("submitted",), state="working"
+        )
+
+        assert updated is not None
+        assert_task_state(updated, "working")
+
+    @pytest.mark.asyncio
+    async def test_transition_task_rejects_unexpected_state(
+        self, storage: InMemoryStorage
+    ):
+        """Test transition is refused when the task already moved on."""
+        message = create_test_message(text="Test task")
+        task = await storage.submit_task(message["context_id"], message)
+        await storage.update_task(task["id"], "working")
+
+        result = await storage.transition_task(
+            task["id"],
+            expected_states=("submitted",),
+            state="working",
+            metadata={"claimed": True},
+        )
+
+        assert result is None
+        loaded_task = await storage.load_task(task["id"])
+        assert "claimed" not in loaded_task.get("metadata", {})
+
+    @pytest.mark.asyncio
+    async def test_transition_task_missing(self, storage: InMemoryStorage):
+        """Test transition of an unknown task returns None."""
+        result = await storage.transition_task(
+            uuid4(), expected_states=("submitted",), state="working"
+        )
+        assert result is None
+
     @pytest.mark.asyncio
     async def test_list_tasks_empty(self, storage: InMemoryStorage):
         """Test listing tasks when storage is empty."""
@@ -120,6 +177,91 @@ class TestTaskStorage:
         assert "history" in loaded_task
         assert len(loaded_task["history"]) == 2
 
+    @pytest.mark.asyncio
+    async def test_load_task_history_tail(self, storage: InMemoryStorage):
+        """Test history_length returns an independent copy of the last messages."""
+        msg1 = create_test_message(text="First")
+        task = await storage.submit_task(msg1["context_id"], msg1)
+        await storage.update_task(
+            task["id"],
+            "input-required",
+            new_messages=[create_test_message(text=t) for t in ("Second", "Third")],
+        )
+
+        loaded_task = await storage.load_task(task["id"], history_length=2)
+
+        assert [m["parts"][0]["text"] for m in loaded_task["history"]] == [
+            "Second",
+            "Third",
+        ]
+        loaded_task["history"][0]["parts"][0]["text"] = "changed"
+        stored = await storage.load_task(task["id"])
+        assert stored["history"][1]["parts"][0]["text"] == "Second"
+
+    @pytest.mark.asyncio
+    async def test_load_tasks_many(self, storage: InMemoryStorage):
+        """Test batch loading skips missing IDs and de-duplicates."""
+        ids = []
+        for text in ("First", "Second"):
+            msg = create_test_message(text=text)
+            ids.append((await storage.submit_task(msg["context_id"], msg))["id"])
+
+        tasks = await storage.load_tasks_many([ids[1], uuid4(), ids[0], ids[1]])
+
+        assert set(tasks) == set(ids)
+        assert tasks[ids[0]]["history"][0]["parts"][0]["text"] == "First"
+        assert await storage.load_tasks_many([]) == {}
+        with pytest.raises(TypeError):
+            await storage.load_tasks_many(["not-a-uuid"])  # type: ignore[list-item]
+
+    @pytest.mark.asyncio
+    async def test_load_task_projections(self, storage: InMemoryStorage):
+        """Test status and summary projections omit unrequested fields."""
+        msg = create_test_message(text="First")
+        task = await storage.submit_task(msg["context_id"], msg)
+        await storage.update_task(
+            task["id"], "completed", new_artifacts=[{"artifact_id": "a", "parts": []}]
+        )
+
+        status = await storage.load_task(task["id"], projection="status")
+        assert set(status) == {"id", "context_id", "kind", "status"}
+        assert status["status"]["state"] == "completed"
+
+        summary = await storage.load_task(task["id"], projection="summary")
+        assert "artifacts" not in summary and "history" not in summary
+        assert summary["status"]["state"] == "completed"
+
+        summary = await storage.load_task(
+            task["id"], history_length=1, projection="summary"
+        )
+        assert [m["parts"][0]["text"] for m in summary["history"]] == ["First"]
+
+        with pytest.raises(ValueError, match="Unknown task projection"):
+            await storage.load_task(task["id"], projection="everything")  # type: ignore[arg-type]
+
+    @pytest.mark.asyncio
+    async def test_count_tasks_by_state(self, storage: InMemoryStorage):
+        """Test per-state counts follow submits, updates and deletes."""
+        messages = [create_test_message(text=str(i)) for i in range(4)]
+        ids = [
+            (await storage.submit_task(m["context_id"], m))["id"] for m in messages
+        ]
+        await storage.update_task(ids[0], "working")
+        await storage.transition_task(ids[1], ["submitted"], "working")
+        await storage.update_task(ids[1], "completed")
+        await storage.clear_context(messages[2]["context_id"])
+
+        assert await storage.count_tasks_by_state() == {
+            "submitted": 1,
+            "working": 1,
+            "completed": 1,
+        }
+        assert await storage.count_tasks("working") == 1
+        assert await storage.count_tasks("failed") == 0
+
+        await storage.clear_all()
+        assert await storage.count_tasks_by_state() == {}
+
 
 class TestContextStorage:
     """Test context CRUD operations."""
@@ -241,6 +383,115 @@ class TestContextStorage:
         assert len(loaded_context) == 3
 
 
+class TestKeysetPagination:
+    """Test keyset-paginated task and context listings."""
+
+    @pytest.mark.asyncio
+    async def test_list_tasks_page_walks_all_tasks(self, storage: InMemoryStorage):
+        """Test following next_page_token visits every task exactly once."""
+        created = []
+        for i in range(5):
+            msg = create_test_message(text=f"Task {i}")
+            created.append((await storage.submit_task(msg["context_id"], msg))["id"])
+
+        seen, token = [], None
+        while True:
+            page = await storage.list_tasks_page(2, token, projection="status")
+            assert len(page["tasks"]) <= 2
+            seen.extend(task["id"] for task in page["tasks"])
+            token = page.get("next_page_token")
+            if token is None:
+                break
+
+        # Newest first, no duplicates across pages
+        assert seen == list(reversed(created))
+
+    @pytest.mark.asyncio
+    async def test_list_tasks_page_filters(self, storage: InMemoryStorage):
+        """Test context, state and time range filters."""
+        from datetime import datetime, timedelta, timezone
+
+        context_id = uuid4()
+        for i in range(3):
+            msg = create_test_message(text=f"Task {i}", context_id=context_id)
+            task = await storage.submit_task(context_id, msg)
+        await storage.update_task(task["id"], "completed")
+        other = create_test_message(text="Other")
+        await storage.submit_task(other["context_id"], other)
+
+        page = await storage.list_tasks_page(context_id=context_id)
+        assert len(page["tasks"]) == 3
+        assert "next_page_token" not in page
+
+        page = await storage.list_tasks_page(states=["completed"])
+        assert [t["id"] for t in page["tasks"]] == [task["id"]]
+
+        future = datetime.now(timezone.utc) + timedelta(hours=1)
+        assert (await storage.list_tasks_page(created_after=future))["tasks"] == []
+        assert len((await storage.list_tasks_page(created_before=future))["tasks"]) == 4
+
+    @pytest.mark.asyncio
+    async def test_list_tasks_page_invalid_token(self, storage: InMemoryStorage):
+        """Test malformed page tokens are rejected."""
+        with pytest.raises(ValueError, match="Invalid page token"):
+            await storage.list_tasks_page(page_token="not-a-token")
+
+    @pytest.mark.asyncio
+    async def test_search_tasks(self, storage: InMemoryStorage):
+        """Test search matches message words and metadata, best match first."""
+        texts = ["Quarterly revenue report", "Revenue revenue revenue", "Weather"]
+        tasks = []
+        for text in texts:
+            msg = create_test_message(text=text)
+            tasks.append(await storage.submit_task(msg["context_id"], msg))
+        await storage.update_task(tasks[0]["id"], "working", metadata={"team": "a"})
+
+        page = await storage.search_tasks("REVENUE", projection="status")
+        assert [t["id"] for t in page["tasks"]] == [tasks[1]["id"], tasks[0]["id"]]
+
+        page = await storage.search_tasks("revenue report")
+        assert [t["id"] for t in page["tasks"]] == [tasks[0]["id"]]
+
+        page = await storage.search_tasks(metadata={"team": "a"})
+        assert [t["id"] for t in page["tasks"]] == [tasks[0]["id"]]
+        assert (await storage.search_tasks("weather", metadata={"team": "a"}))[
+            "tasks"
+        ] == []
+
+        first = await storage.search_tasks("revenue", page_size=1)
+        rest = await storage.search_tasks(
+            "revenue", page_size=1, page_token=first["next_page_token"]
+        )
+        assert [t["id"] for t in first["tasks"] + rest["tasks"]] == [
+            tasks[1]["id"],
+            tasks[0]["id"],
+        ]
+        assert "next_page_token" not in rest
+
+    @pytest.mark.asyncio
+    async def test_search_tasks_needs_a_filter(self, storage: InMemoryStorage):
+        """Test a search without query or metadata, or with no words, is rejected."""
+        with pytest.raises(ValueError, match="query or a metadata filter"):
+            await storage.search_tasks()
+        with pytest.raises(ValueError, match="no words"):
+            await storage.search_tasks("  ?! ")
+
+    @pytest.mark.asyncio
+    async def test_list_contexts_page(self, storage: InMemoryStorage):
+        """Test contexts are paged newest first with task counts."""
+        for i in range(3):
+            msg = create_test_message(text=f"Task {i}")
+            await storage.submit_task(msg["context_id"], msg)
+
+        first = await storage.list_contexts_page(2)
+        second = await storage.list_contexts_page(2, first["next_page_token"])
+
+        assert len(first["contexts"]) == 2
+        assert len(second["contexts"]) == 1
+        assert "next_page_token" not in second
+        assert all(c["task_count"] == 1 for c in first["contexts"])
+
+
 class TestTaskContextRelationship:
     """Test task-context relationship integrity."""
 
@@ -384,3 +635,65 @@ class TestDataIntegrity:
         loaded_task = await storage.load_task(task_id)
         # Check if metadata exists and has the custom field
         assert loaded_task is not None
+
+
+class TestFeedbackSummary:
+    """Test feedback aggregates per skill and day."""
+
+    @pytest.mark.asyncio
+    async def test_summary_groups_and_filters(self, storage: InMemoryStorage):
+        """Test counts, means and histograms per skill, day and filter."""
+        from datetime import datetime, timedelta, timezone
+
+        task_id = uuid4()
+        for feedback in (
+            {"rating": 5, "skill_id": "summarize"},
+            {"rating": 3, "skill_id": "summarize"},
+            {"rating": 4.0},
+            {"rating": "5"},
+            {"feedback": "No rating"},
+        ):
+            await storage.store_task_feedback(task_id, feedback)
+        today = datetime.now(timezone.utc).date()
+
+        [total] = await storage.get_feedback_summary()
+        assert total == {
+            "count": 5,
+            "rated": 3,
+            "mean_rating": 4.0,
+            "ratings": {"1": 0, "2": 0, "3": 1, "4": 1, "5": 1},
+        }
+
+        by_skill = await storage.get_feedback_summary(group_by=["day", "skill"])
+        assert [(s["skill_id"], s["day"], s["count"]) for s in by_skill] == [
+            ("", today, 3),
+            ("summarize", today, 2),
+        ]
+
+        [skill] = await storage.get_feedback_summary(skill_id="summarize")
+        assert skill["mean_rating"] == 4.0
+        tomorrow = today + timedelta(days=1)
+        summaries = await storage.get_feedback_summary(since=tomorrow, group_by=["day"])
+        assert summaries == []
+        [empty] = await storage.get_feedback_summary(until=today - timedelta(days=1))
+        assert empty["count"] == 0 and empty["mean_rating"] is None
+
+    @pytest.mark.asyncio
+    async def test_summary_outlives_tasks(self, storage: InMemoryStorage):
+        """Test deleting a task keeps its feedback counted until clear_all."""
+        msg = create_test_message()
+        task = await storage.submit_task(msg["context_id"], msg)
+        await storage.store_task_feedback(task["id"], {"rating": 2})
+        await storage.clear_context(msg["context_id"])
+
+        assert (await storage.get_feedback_summary())[0]["count"] == 1
+
+        await storage.clear_all()
+        assert (await storage.get_feedback_summary())[0]["count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_summary_rejects_unknown_group(self, storage: InMemoryStorage):
+        """Test grouping by an unknown field is rejected."""
+        with pytest.raises(ValueError, match="Invalid group_by"):
+            await storage.get_feedback_summary(group_by=["week"])
+
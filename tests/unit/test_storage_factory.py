@@ -3,7 +3,14 @@
 import pytest
 from unittest.mock import AsyncMock, patch
 
-from bindu.server.storage.factory import create_storage, close_storage
+from bindu.server.storage.blob import FilesystemBlobStore
+from bindu.server.storage.cache import CachedStorage
+from bindu.server.storage.factory import (
+    _with_task_cache,
+    close_storage,
+    create_blob_store,
+    create_storage,
+)
 from bindu.server.storage.memory_storage import InMemoryStorage
 from bindu.settings import app_settings
 
@@ -38,6 +45,26 @@ class TestStorageFactory:
             mock_postgres.assert_called_once()
             mock_instance.connect.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_create_sqlite_storage(self, tmp_path):
+        """Test creating SQLite storage at the configured path."""
+        pytest.importorskip("aiosqlite")
+        from bindu.server.storage.sqlite_storage import SQLiteStorage
+
+        path = tmp_path / "agent" / "bindu.db"
+        with (
+            patch.object(app_settings.storage, "backend", "sqlite"),
+            patch.object(app_settings.storage, "sqlite_path", str(path)),
+            patch.object(app_settings.storage, "sqlite_readers", 2),
+        ):
+            storage = await create_storage()
+
+        assert isinstance(storage, SQLiteStorage)
+        assert storage.readers == 2
+        assert path.exists()
+        await close_storage(storage)
+        assert storage._writer is None
+
     @pytest.mark.asyncio
     async def test_create_storage_invalid_backend(self):
         """Test that invalid backend raises ValueError."""
@@ -45,6 +72,46 @@ class TestStorageFactory:
             with pytest.raises(ValueError, match="Unknown storage backend"):
                 await create_storage()
 
+    @pytest.mark.asyncio
+    async def test_create_storage_with_task_cache(self):
+        """Test the task cache wraps the backend when enabled and closes with it."""
+        with (
+            patch.object(app_settings.storage, "backend", "memory"),
+            patch.object(app_settings.storage, "task_cache_enabled", True),
+            patch.object(app_settings.storage, "task_cache_max_entries", 5),
+        ):
+            storage = await create_storage()
+
+        assert isinstance(storage, CachedStorage)
+        assert isinstance(storage.storage, InMemoryStorage)
+        assert storage.max_entries == 5
+
+        await close_storage(storage)
+
+    @pytest.mark.asyncio
+    async def test_task_cache_needs_listen_url_behind_pgbouncer(self):
+        """Test the cache is not enabled when it could not be invalidated."""
+        from bindu.server.storage.postgres_storage import PostgresStorage
+
+        storage = PostgresStorage(listen_url=None)
+        with (
+            patch.object(app_settings.storage, "task_cache_enabled", True),
+            patch.object(app_settings.storage, "postgres_pgbouncer", True),
+        ):
+            assert await _with_task_cache(storage) is storage
+
+    @pytest.mark.asyncio
+    async def test_hot_tier_needs_listen_url_behind_pgbouncer(self):
+        """Test the hot tier falls back to the plain storage instead of failing."""
+        from bindu.server.storage.postgres_storage import PostgresStorage
+
+        storage = PostgresStorage(listen_url=None)
+        with (
+            patch.object(app_settings.storage, "hot_tier_enabled", True),
+            patch.object(app_settings.storage, "postgres_pgbouncer", True),
+        ):
+            assert await _with_task_cache(storage) is storage
+
     @pytest.mark.asyncio
     async def test_close_memory_storage(self):
         """Test closing memory storage (no-op)."""
@@ -77,3 +144,22 @@ class TestStorageFactory:
 
         # Should not raise an error
         await close_storage(mock_storage)
+
+
+class TestBlobStoreFactory:
+    """Test blob store factory function."""
+
+    def test_blob_store_disabled_by_default(self):
+        """Test that no blob store is created when offloading is off."""
+        with patch.object(app_settings.storage, "blob_backend", "none"):
+            assert create_blob_store() is None
+
+    def test_create_filesystem_blob_store(self, tmp_path):
+        """Test creating filesystem blob store."""
+        with (
+            patch.object(app_settings.storage, "blob_backend", "filesystem"),
+            patch.object(app_settings.storage, "blob_path", str(tmp_path)),
+        ):
+            blob_store = create_blob_store()
+            assert isinstance(blob_store, FilesystemBlobStore)
+            assert blob_store.root == tmp_path
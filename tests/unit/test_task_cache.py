@@ -0,0 +1,228 @@
+"""Unit tests for the CachedStorage read-through task cache."""
+
+from unittest.mock import patch
+from uuid import UUID
+
+import pytest
+
+from bindu.server.storage.cache import CachedStorage
+from bindu.server.storage.memory_storage import InMemoryStorage
+from tests.utils import create_test_message
+
+
+class FeedStorage(InMemoryStorage):
+    """In-memory storage with a controllable change feed and load counter."""
+
+    def __init__(self):
+        super().__init__()
+        self.loads = 0
+        self.callback = None
+        self.watch_calls = 0
+
+    async def load_task(self, task_id, history_length=None, projection="full"):
+        self.loads += 1
+        return await super().load_task(task_id, history_length, projection)
+
+    async def watch_task_changes(self, callback):
+        self.watch_calls += 1
+        self.callback = callback
+
+        async def _unwatch():
+            self.callback = None
+
+        return _unwatch
+
+
+async def _submit(storage, text: str = "hello") -> UUID:
+    message = create_test_message(text=text)
+    task = await storage.submit_task(message["context_id"], message)
+    return task["id"]
+
+
+class TestCachedStorage:
+    """Test cache hits, invalidation and coherence."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_loads_hit_cache(self):
+        """Test a second load is served without touching the backend."""
+        backend = FeedStorage()
+        cache = CachedStorage(backend)
+        task_id = await _submit(cache)
+
+        first = await cache.load_task(task_id)
+        second = await cache.load_task(task_id, projection="status")
+
+        assert backend.loads == 1
+        assert first["status"]["state"] == "submitted"
+        assert set(second) == {"id", "context_id", "kind", "status"}
+
+    @pytest.mark.asyncio
+    async def test_returned_tasks_are_copies(self):
+        """Test mutating a returned task does not change the cached entry."""
+        cache = CachedStorage(FeedStorage())
+        task_id = await _submit(cache)
+
+        task = await cache.load_task(task_id)
+        task["status"]["state"] = "failed"
+
+        assert (await cache.load_task(task_id))["status"]["state"] == "submitted"
+
+    @pytest.mark.asyncio
+    async def test_local_write_invalidates(self):
+        """Test update_task through the cache is visible on the next read."""
+        backend = FeedStorage()
+        cache = CachedStorage(backend)
+        task_id = await _submit(cache)
+        await cache.load_task(task_id)
+
+        await cache.update_task(task_id, "working")
+
+        assert (await cache.load_task(task_id))["status"]["state"] == "working"
+        assert backend.loads == 2
+
+    @pytest.mark.asyncio
+    async def test_change_feed_invalidates(self):
+        """Test a change reported by another process drops the entry."""
+        backend = FeedStorage()
+        cache = CachedStorage(backend)
+        await cache.start()
+        task_id = await _submit(cache)
+        await cache.load_task(task_id)
+
+        # Written behind the cache's back, then announced on the feed
+        await backend.update_task(task_id, "completed")
+        backend.callback(task_id)
+
+        assert (await cache.load_task(task_id))["status"]["state"] == "completed"
+
+        await cache.stop()
+        assert backend.callback is None
+
+    @pytest.mark.asyncio
+    async def test_load_racing_invalidation_is_not_cached(self):
+        """Test a load overlapped by an invalidation is not stored."""
+        backend = FeedStorage()
+        cache = CachedStorage(backend)
+        task_id = await _submit(cache)
+
+        original = backend.load_task
+
+        async def slow_load(*args, **kwargs):
+            task = await original(*args, **kwargs)
+            cache.invalidate(task_id)  # write lands while the read is in flight
+            return task
+
+        with patch.object(backend, "load_task", slow_load):
+            await cache.load_task(task_id)
+
+        await cache.load_task(task_id)
+        assert backend.loads == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_capacity_and_ttl(self):
+        """Test least recently used entries are evicted and TTL expires entries."""
+        backend = FeedStorage()
+        cache = CachedStorage(backend, max_entries=2, ttl_seconds=60)
+        ids = [await _submit(cache, str(i)) for i in range(3)]
+
+        await cache.load_task(ids[0])
+        await cache.load_task(ids[1])
+        await cache.load_task(ids[0])  # ids[1] is now least recently used
+        await cache.load_task(ids[2])
+
+        assert list(cache._entries) == [ids[0], ids[2]]
+
+        cache.ttl_seconds = 0
+        cache.clear()
+        await cache.load_task(ids[0])
+        await cache.load_task(ids[0])
+        assert backend.loads == 5
+
+    @pytest.mark.asyncio
+    async def test_load_tasks_many_fetches_only_misses(self):
+        """Test batch loads serve hits from cache and fetch the rest together."""
+        backend = FeedStorage()
+        cache = CachedStorage(backend)
+        ids = [await _submit(cache, str(i)) for i in range(3)]
+        await cache.load_task(ids[0])
+
+        with patch.object(
+            backend, "load_tasks_many", wraps=backend.load_tasks_many
+        ) as many:
+            tasks = await cache.load_tasks_many(ids)
+
+        many.assert_awaited_once_with([ids[1], ids[2]])
+        assert set(tasks) == set(ids)
+        assert len(cache._entries) == 3
+
+    @pytest.mark.asyncio
+    async def test_partial_load_misses_pass_through(self):
+        """Test projected misses are loaded as projected and not cached."""
+        backend = FeedStorage()
+        cache = CachedStorage(backend)
+        ids = [await _submit(cache, str(i)) for i in range(2)]
+        await cache.load_task(ids[0])
+
+        with patch.object(backend, "load_task", wraps=backend.load_task) as load:
+            task = await cache.load_task(ids[1], history_length=1)
+        with patch.object(
+            backend, "load_tasks_many", wraps=backend.load_tasks_many
+        ) as many:
+            tasks = await cache.load_tasks_many(ids, projection="status")
+
+        load.assert_awaited_once_with(ids[1], 1, "full")
+        assert task["id"] == ids[1]
+        many.assert_awaited_once_with([ids[1]], None, "status")
+        assert set(tasks[ids[0]]) == set(tasks[ids[1]]) == {
+            "id",
+            "context_id",
+            "kind",
+            "status",
+        }
+        assert list(cache._entries) == [ids[0]]
+
+    @pytest.mark.asyncio
+    async def test_feed_loss_bypasses_cache_until_rewatched(self):
+        """Test losing the change feed empties the cache and re-subscribes."""
+        backend = FeedStorage()
+        cache = CachedStorage(backend)
+        await cache.start()
+        task_id = await _submit(cache)
+        await cache.load_task(task_id)
+
+        with patch("bindu.server.storage.cache._REWATCH_MIN_DELAY", 0):
+            backend.callback(None)
+            assert not cache._entries
+
+            await cache._rewatch_task
+
+        assert backend.watch_calls == 2
+        await cache.load_task(task_id)
+        await cache.load_task(task_id)
+        assert backend.loads == 2
+
+    @pytest.mark.asyncio
+    async def test_hit_miss_metrics(self):
+        """Test lookups are counted as hits and misses."""
+        with patch("bindu.server.storage.cache.get_metrics") as get_metrics:
+            cache = CachedStorage(FeedStorage())
+            task_id = await _submit(cache)
+            await cache.load_task(task_id)
+            await cache.load_task(task_id)
+
+        lookups = get_metrics.return_value.record_task_cache_lookup.call_args_list
+        assert [c.args for c in lookups] == [(False,), (True,)]
+
+    @pytest.mark.asyncio
+    async def test_delegates_other_operations(self):
+        """Test non-task operations pass through to the backend."""
+        backend = FeedStorage()
+        cache = CachedStorage(backend)
+        task_id = await _submit(cache)
+
+        assert await cache.count_tasks() == 1
+        assert len(await cache.list_tasks()) == 1
+        assert cache.tasks is backend.tasks  # backend attributes are exposed
+
+        await cache.clear_all()
+        assert await cache.load_task(task_id) is None
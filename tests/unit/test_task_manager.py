@@ -1,5 +1,7 @@
 """Unit tests for TaskManager."""
 
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 
 import pytest
@@ -7,11 +9,16 @@ import pytest
 from bindu.common.protocol.types import (
     CancelTaskRequest,
     ClearContextsRequest,
+    FeedbackSummaryRequest,
     GetTaskRequest,
     ListContextsRequest,
     ListTasksRequest,
+    SearchTasksRequest,
+    SendMessageRequest,
     TaskFeedbackRequest,
 )
+from bindu.server.handlers.message_handlers import SentMessages
+from bindu.server.handlers.task_handlers import TaskHandlers
 from bindu.server.scheduler.memory_scheduler import InMemoryScheduler
 from bindu.server.storage.memory_storage import InMemoryStorage
 from bindu.server.task_manager import TaskManager
@@ -236,6 +243,91 @@ async def test_feedback_for_nonexistent_task():
             assert_jsonrpc_error(response, -32001)
 
 
+@pytest.mark.asyncio
+async def test_feedback_summary():
+    """Test tasks/feedback/summary per skill and for a single task."""
+    storage = InMemoryStorage()
+    async with InMemoryScheduler() as scheduler:
+        async with TaskManager(
+            scheduler=scheduler, storage=storage, manifest=None
+        ) as tm:
+            message = create_test_message()
+            task = await storage.submit_task(message["context_id"], message)
+            await storage.update_task(
+                task["id"], "completed", metadata={"skill_id": "summarize"}
+            )
+            for rating, metadata in ((5, {}), (2, {"skill_id": "translate"})):
+                await tm.task_feedback(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": uuid4(),
+                        "method": "tasks/feedback",
+                        "params": {
+                            "task_id": task["id"],
+                            "feedback": "ok",
+                            "rating": rating,
+                            "metadata": metadata,
+                        },
+                    }
+                )
+
+            request: FeedbackSummaryRequest = {
+                "jsonrpc": "2.0",
+                "id": uuid4(),
+                "method": "tasks/feedback/summary",
+                "params": {"group_by": ["skill"]},
+            }
+            response = await tm.feedback_summary(request)
+
+            assert_jsonrpc_success(response)
+            assert [(s["skill_id"], s["mean_rating"]) for s in response["result"]] == [
+                ("summarize", 5.0),
+                ("translate", 2.0),
+            ]
+
+            request["params"] = {"task_id": task["id"]}
+            response = await tm.feedback_summary(request)
+
+            [summary] = response["result"]
+            assert summary["task_id"] == task["id"]
+            assert summary["count"] == 2 and summary["mean_rating"] == 3.5
+
+            request["params"] = {"task_id": uuid4()}
+            assert_jsonrpc_error(await tm.feedback_summary(request), -32001)
+
+
+@pytest.mark.asyncio
+async def test_feedback_skill_must_be_an_agent_skill():
+    """Test feedback only counts towards skills the agent declares."""
+    from types import SimpleNamespace
+
+    storage = InMemoryStorage()
+    handlers = TaskHandlers(
+        scheduler=AsyncMock(),
+        storage=storage,
+        manifest=SimpleNamespace(skills=[{"id": "summarize", "name": "Summarizer"}]),
+    )
+    message = create_test_message()
+    task = await storage.submit_task(message["context_id"], message)
+
+    for skill_id in ("Summarizer", "made-up"):
+        await handlers.task_feedback(
+            {
+                "jsonrpc": "2.0",
+                "id": uuid4(),
+                "method": "tasks/feedback",
+                "params": {
+                    "task_id": task["id"],
+                    "feedback": "ok",
+                    "metadata": {"skill_id": skill_id},
+                },
+            }
+        )
+
+    feedback = await storage.get_task_feedback(task["id"])
+    assert [entry.get("skill_id") for entry in feedback] == ["summarize", None]
+
+
 @pytest.mark.asyncio
 async def test_list_empty_contexts():
     """Test listing contexts when none exist."""
@@ -362,3 +454,279 @@ async def test_push_not_supported():
             # Should return PushNotificationNotSupportedError (-32005)
             if not tm._push_manager.is_push_supported():
                 assert_jsonrpc_error(response, -32005)
+
+
+@pytest.mark.asyncio
+async def test_get_task_status_projection():
+    """Test tasks/get with a status-only projection."""
+    storage = InMemoryStorage()
+    async with InMemoryScheduler() as scheduler:
+        async with TaskManager(
+            scheduler=scheduler, storage=storage, manifest=None
+        ) as tm:
+            message = create_test_message(text="Test message")
+            task = await storage.submit_task(message["context_id"], message)
+
+            request: GetTaskRequest = {
+                "jsonrpc": "2.0",
+                "id": uuid4(),
+                "method": "tasks/get",
+                "params": {"task_id": task["id"], "projection": "status"},
+            }
+
+            response = await tm.get_task(request)
+
+            assert_jsonrpc_success(response)
+            assert set(response["result"]) == {"id", "context_id", "kind", "status"}
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_summary_projection_with_length():
+    """Test tasks/list with summary projection, length and history_length."""
+    storage = InMemoryStorage()
+    async with InMemoryScheduler() as scheduler:
+        async with TaskManager(
+            scheduler=scheduler, storage=storage, manifest=None
+        ) as tm:
+            for i in range(3):
+                message = create_test_message(text=f"Message {i}")
+                await storage.submit_task(message["context_id"], message)
+
+            request: ListTasksRequest = {
+                "jsonrpc": "2.0",
+                "id": uuid4(),
+                "method": "tasks/list",
+                "params": {"length": 2, "projection": "summary", "history_length": 1},
+            }
+
+            response = await tm.list_tasks(request)
+
+            task_list = response["result"]
+            assert len(task_list) == 2
+            for task in task_list:
+                assert "artifacts" not in task
+                assert len(task["history"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_paginated():
+    """Test tasks/list returns a keyset page when page_size is given."""
+    storage = InMemoryStorage()
+    async with InMemoryScheduler() as scheduler:
+        async with TaskManager(
+            scheduler=scheduler, storage=storage, manifest=None
+        ) as tm:
+            for i in range(3):
+                message = create_test_message(text=f"Message {i}")
+                await storage.submit_task(message["context_id"], message)
+
+            request: ListTasksRequest = {
+                "jsonrpc": "2.0",
+                "id": uuid4(),
+                "method": "tasks/list",
+                "params": {"page_size": 2},
+            }
+            response = await tm.list_tasks(request)
+
+            assert_jsonrpc_success(response)
+            assert len(response["result"]["tasks"]) == 2
+
+            request["params"] = {
+                "page_size": 2,
+                "page_token": response["result"]["next_page_token"],
+            }
+            response = await tm.list_tasks(request)
+
+            assert len(response["result"]["tasks"]) == 1
+            assert "next_page_token" not in response["result"]
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_invalid_page_token():
+    """Test tasks/list rejects a malformed page token."""
+    storage = InMemoryStorage()
+    async with InMemoryScheduler() as scheduler:
+        async with TaskManager(
+            scheduler=scheduler, storage=storage, manifest=None
+        ) as tm:
+            request: ListTasksRequest = {
+                "jsonrpc": "2.0",
+                "id": uuid4(),
+                "method": "tasks/list",
+                "params": {"page_token": "garbage"},
+            }
+            response = await tm.list_tasks(request)
+
+            assert_jsonrpc_error(response, -32001)
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_naive_created_after():
+    """Test tasks/list reads a naive created_after/created_before as UTC."""
+    storage = InMemoryStorage()
+    async with InMemoryScheduler() as scheduler:
+        async with TaskManager(
+            scheduler=scheduler, storage=storage, manifest=None
+        ) as tm:
+            message = create_test_message(text="Message")
+            await storage.submit_task(message["context_id"], message)
+
+            request: ListTasksRequest = {
+                "jsonrpc": "2.0",
+                "id": uuid4(),
+                "method": "tasks/list",
+                "params": {"created_after": datetime(2020, 1, 1)},
+            }
+            response = await tm.list_tasks(request)
+
+            assert_jsonrpc_success(response)
+            assert len(response["result"]["tasks"]) == 1
+
+            request["params"] = {"created_before": datetime(2020, 1, 1)}
+            response = await tm.list_tasks(request)
+
+            assert response["result"]["tasks"] == []
+
+
+@pytest.mark.asyncio
+async def test_list_contexts_naive_created_after():
+    """Test contexts/list reads a naive created_after/created_before as UTC."""
+    storage = InMemoryStorage()
+    async with InMemoryScheduler() as scheduler:
+        async with TaskManager(
+            scheduler=scheduler, storage=storage, manifest=None
+        ) as tm:
+            message = create_test_message(text="Message")
+            await storage.submit_task(message["context_id"], message)
+
+            request: ListContextsRequest = {
+                "jsonrpc": "2.0",
+                "id": uuid4(),
+                "method": "contexts/list",
+                "params": {"created_after": datetime(2020, 1, 1)},
+            }
+            response = await tm.list_contexts(request)
+
+            assert_jsonrpc_success(response)
+            assert len(response["result"]["contexts"]) == 1
+
+            request["params"] = {"created_before": datetime(2020, 1, 1)}
+            response = await tm.list_contexts(request)
+
+            assert response["result"]["contexts"] == []
+
+
+@pytest.mark.asyncio
+async def test_search_tasks():
+    """Test tasks/search returns matching tasks and rejects empty searches."""
+    storage = InMemoryStorage()
+    async with InMemoryScheduler() as scheduler:
+        async with TaskManager(
+            scheduler=scheduler, storage=storage, manifest=None
+        ) as tm:
+            for text in ("Invoice overdue", "Lunch plans"):
+                message = create_test_message(text=text)
+                await storage.submit_task(message["context_id"], message)
+
+            request: SearchTasksRequest = {
+                "jsonrpc": "2.0",
+                "id": uuid4(),
+                "method": "tasks/search",
+                "params": {"query": "invoice", "projection": "status"},
+            }
+            response = await tm.search_tasks(request)
+
+            assert_jsonrpc_success(response)
+            assert len(response["result"]["tasks"]) == 1
+
+            request["params"] = {"page_size": 5}
+            response = await tm.search_tasks(request)
+
+            assert_jsonrpc_error(response, -32001)
+
+
+def _send_request(message) -> SendMessageRequest:
+    return {
+        "jsonrpc": "2.0",
+        "id": uuid4(),
+        "method": "message/send",
+        "params": {"message": dict(message)},
+    }
+
+
+@pytest.mark.asyncio
+async def test_send_message_retry_runs_task_once():
+    """Test a retried message/send returns the task without scheduling it again."""
+    storage = InMemoryStorage()
+    async with InMemoryScheduler() as scheduler:
+        async with TaskManager(
+            scheduler=scheduler, storage=storage, manifest=None
+        ) as tm:
+            message = create_test_message(text="Summarise the report")
+            with (
+                patch.object(scheduler, "run_task", AsyncMock()) as run_task,
+                patch.object(
+                    storage, "submit_task", wraps=storage.submit_task
+                ) as submit_task,
+            ):
+                first = await tm.send_message(_send_request(message))
+                # Answered from the process's cache of accepted messages
+                second = await tm.send_message(_send_request(message))
+
+                # Another process (no cache) is answered by storage once a
+                # worker has claimed the task
+                await storage.update_task(message["task_id"], "working")
+                tm._message_handlers.sent_messages = SentMessages()
+                third = await tm.send_message(_send_request(message))
+
+            assert first["result"]["id"] == message["task_id"]
+            assert second["result"]["id"] == third["result"]["id"]
+            assert run_task.await_count == 1
+            assert submit_task.await_count == 2
+            task = await storage.load_task(message["task_id"])
+            assert len(task["history"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_send_message_retry_after_scheduling_failure():
+    """Test a retry schedules a task whose scheduling failed the first time."""
+    storage = InMemoryStorage()
+    async with InMemoryScheduler() as scheduler:
+        async with TaskManager(
+            scheduler=scheduler, storage=storage, manifest=None
+        ) as tm:
+            message = create_test_message(text="Summarise the report")
+            with patch.object(
+                scheduler,
+                "run_task",
+                AsyncMock(side_effect=[ConnectionError("broker down"), None]),
+            ) as run_task:
+                with pytest.raises(ConnectionError):
+                    await tm.send_message(_send_request(message))
+                response = await tm.send_message(_send_request(message))
+
+            assert_jsonrpc_success(response)
+            assert run_task.await_count == 2
+            task = await storage.load_task(message["task_id"])
+            assert len(task["history"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_send_message_retry_schedules_submitted_task():
+    """Test a retry reaching storage schedules a task that is still submitted."""
+    storage = InMemoryStorage()
+    async with InMemoryScheduler() as scheduler:
+        async with TaskManager(
+            scheduler=scheduler, storage=storage, manifest=None
+        ) as tm:
+            message = create_test_message(text="Summarise the report")
+            # Stored by a process that crashed before scheduling it
+            await storage.submit_task(message["context_id"], message)
+
+            with patch.object(scheduler, "run_task", AsyncMock()) as run_task:
+                response = await tm.send_message(_send_request(message))
+
+            assert_jsonrpc_success(response)
+            assert run_task.await_count == 1
+            task = await storage.load_task(message["task_id"])
+            assert len(task["history"]) == 1
@@ -0,0 +1,192 @@
+"""Unit tests for monthly partitioning of the tasks table."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from bindu.server.storage.partitions import (
+    PartitionMaintenanceResult,
+    add_months,
+    maintain_task_partitions,
+    month_start,
+    partition_month,
+    partition_name,
+)
+from bindu.server.storage.postgres_storage import (
+    PostgresStorage,
+    _task_key,
+    _task_keys,
+)
+from bindu.server.storage.schema import (
+    task_feedback_table,
+    task_ids_table,
+    task_messages_table,
+    tasks_table,
+    webhook_configs_table,
+)
+from tests.utils import create_test_message
+
+
+def _utc(year: int, month: int, day: int = 1) -> datetime:
+    return datetime(year, month, day, tzinfo=timezone.utc)
+
+
+class TestPartitionNaming:
+    """Test month arithmetic and partition names."""
+
+    def test_month_start_normalizes_to_utc(self):
+        """Test a local time is mapped to its UTC month."""
+        local = datetime(2026, 11, 1, 0, 30, tzinfo=timezone(timedelta(hours=2)))
+        assert month_start(local) == _utc(2026, 10)
+
+    @pytest.mark.parametrize(
+        "month,offset,expected",
+        [
+            (_utc(2026, 10), 3, _utc(2027, 1)),
+            (_utc(2026, 1), -1, _utc(2025, 12)),
+            (_utc(2026, 10), -24, _utc(2024, 10)),
+        ],
+    )
+    def test_add_months(self, month, offset, expected):
+        """Test months roll over year boundaries both ways."""
+        assert add_months(month, offset) == expected
+
+    def test_partition_name_round_trip(self):
+        """Test names encode the month and parse back."""
+        assert partition_name(_utc(2026, 3)) == "tasks_p202603"
+        assert partition_month("tasks_p202603") == _utc(2026, 3)
+        assert partition_month("tasks_default") is None
+        assert partition_month("tasks_p2026031") is None
+
+
+class TestPartitionedSchema:
+    """Test the tasks table definition."""
+
+    def test_tasks_is_range_partitioned(self):
+        """Test DDL partitions by created_at with it in the primary key."""
+        ddl = str(CreateTable(tasks_table).compile(dialect=postgresql.dialect()))
+
+        assert "PARTITION BY RANGE (created_at)" in ddl
+        assert [c.name for c in tasks_table.primary_key] == ["id", "created_at"]
+
+    def test_dependents_reference_task_ids(self):
+        """Test dependents reference task_ids, checked at commit and cascading."""
+        assert [c.name for c in task_ids_table.primary_key] == ["id"]
+        for table in (task_messages_table, task_feedback_table, webhook_configs_table):
+            [fk] = table.foreign_keys
+            assert fk.target_fullname == "task_ids.id"
+            assert fk.ondelete == "CASCADE"
+            assert fk.initially == "DEFERRED"
+
+    def test_lookups_by_id_carry_created_at(self):
+        """Test lookups by id read created_at from task_ids to prune partitions."""
+        task_id = uuid4()
+        for clause in (_task_key(task_id), _task_keys([task_id])):
+            sql = str(clause.compile(dialect=postgresql.dialect()))
+            assert "tasks.created_at" in sql
+            assert "FROM task_ids" in sql
+
+
+class TestMaintainTaskPartitions:
+    """Test locking around partition maintenance."""
+
+    @pytest.mark.asyncio
+    async def test_lock_is_transaction_level(self):
+        """Test no session lock is taken that could outlive a PgBouncer transaction."""
+        locked = MagicMock()
+        locked.scalar.return_value = False
+        conn = AsyncMock()
+        conn.execute = AsyncMock(return_value=locked)
+        conn.begin = MagicMock()
+        conn.begin.return_value.__aenter__ = AsyncMock()
+        conn.begin.return_value.__aexit__ = AsyncMock(return_value=None)
+        engine = MagicMock()
+        engine.connect.return_value.__aenter__ = AsyncMock(return_value=conn)
+        engine.connect.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        result = await maintain_task_partitions(engine, retention_months=12)
+
+        assert result.skipped
+        (sql,) = (str(call.args[0]) for call in conn.execute.call_args_list)
+        assert "pg_try_advisory_xact_lock" in sql
+
+
+class TestPostgresPartitioning:
+    """Test PostgresStorage's use of the partitioned table."""
+
+    @pytest.mark.asyncio
+    async def test_maintain_partitions_uses_settings(self):
+        """Test maintenance is run with the configured window."""
+        storage = PostgresStorage()
+        storage._engine = MagicMock()
+        storage._session_factory = MagicMock()
+        expected = PartitionMaintenanceResult(created=["tasks_p202611"])
+
+        with (
+            patch(
+                "bindu.server.storage.postgres_storage.maintain_task_partitions",
+                AsyncMock(return_value=expected),
+            ) as maintain,
+            patch("bindu.server.storage.postgres_storage.app_settings") as settings,
+        ):
+            settings.storage.postgres_partition_months_ahead = 2
+            settings.storage.postgres_partition_retention_months = 12
+            result = await storage.maintain_partitions()
+
+        assert result is expected
+        assert maintain.call_args.kwargs["months_ahead"] == 2
+        assert maintain.call_args.kwargs["retention_months"] == 12
+
+    @pytest.mark.asyncio
+    async def test_maintain_partitions_failure_is_not_raised(self):
+        """Test a failed run is logged and reported as skipped."""
+        storage = PostgresStorage()
+        storage._engine = MagicMock()
+        storage._session_factory = MagicMock()
+
+        with patch(
+            "bindu.server.storage.postgres_storage.maintain_task_partitions",
+            AsyncMock(side_effect=RuntimeError("permission denied")),
+        ):
+            result = await storage.maintain_partitions()
+
+        assert result.skipped
+
+    @pytest.mark.asyncio
+    async def test_submit_task_locks_id_instead_of_upserting(self):
+        """Test submit serializes on the task id and never relies on ON CONFLICT."""
+        storage = PostgresStorage()
+        storage._engine = MagicMock()
+
+        no_row = MagicMock()
+        no_row.first.return_value = None
+        state = MagicMock()
+        state.scalar.return_value = "completed"
+        mock_session = AsyncMock()
+        mock_session.execute = AsyncMock(
+            side_effect=[MagicMock(), no_row, no_row, state]
+        )
+        mock_session.begin = MagicMock()
+        mock_session.begin.return_value.__aenter__ = AsyncMock()
+        mock_session.begin.return_value.__aexit__ = AsyncMock(return_value=None)
+        mock_factory = MagicMock()
+        mock_factory.return_value.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_factory.return_value.__aexit__ = AsyncMock(return_value=None)
+        storage._session_factory = mock_factory
+
+        message = create_test_message()
+        with pytest.raises(ValueError, match="terminal state 'completed'"):
+            await storage.submit_task(message["context_id"], message)
+
+        lock, submit = (
+            str(call.args[0].compile(dialect=postgresql.dialect()))
+            for call in mock_session.execute.call_args_list[:2]
+        )
+        assert "pg_advisory_xact_lock" in lock
+        assert "UPDATE tasks" in submit
+        assert "INSERT INTO tasks" in submit
+        assert "ON CONFLICT (id) DO UPDATE" not in submit
@@ -0,0 +1,178 @@
+"""Unit tests for the TieredStorage hot/cold tiers."""
+
+import asyncio
+from unittest.mock import patch
+from uuid import UUID
+
+import pytest
+
+from bindu.server.storage.factory import close_storage, create_storage
+from bindu.server.storage.memory_storage import InMemoryStorage
+from bindu.server.storage.tiered import TieredStorage
+from bindu.settings import app_settings
+from tests.utils import create_test_message
+
+
+class FeedStorage(InMemoryStorage):
+    """In-memory cold tier with a controllable change feed and load counter."""
+
+    def __init__(self):
+        super().__init__()
+        self.loads = 0
+        self.callback = None
+
+    async def load_task(self, task_id, history_length=None, projection="full"):
+        self.loads += 1
+        return await super().load_task(task_id, history_length, projection)
+
+    async def watch_task_changes(self, callback):
+        self.callback = callback
+
+        async def _unwatch():
+            self.callback = None
+
+        return _unwatch
+
+
+async def _submit(storage, text: str = "hello") -> UUID:
+    message = create_test_message(text=text)
+    task = await storage.submit_task(message["context_id"], message)
+    return task["id"]
+
+
+class TestTieredStorage:
+    """Test write-through, demotion and coherence of the hot tier."""
+
+    @pytest.mark.asyncio
+    async def test_writes_keep_task_hot(self):
+        """Test a task written through the tier is read without the backend."""
+        backend = FeedStorage()
+        tiered = TieredStorage(backend)
+        task_id = await _submit(tiered)
+
+        await tiered.update_task(
+            task_id, "working", new_messages=[create_test_message(text="step")]
+        )
+        task = await tiered.load_task(task_id)
+
+        assert backend.loads == 0
+        assert task["status"]["state"] == "working"
+        assert len(task["history"]) == 2
+        assert task == await backend.load_task(task_id)
+
+    @pytest.mark.asyncio
+    async def test_hot_copy_is_private(self):
+        """Test mutating a written or loaded task does not change the hot copy."""
+        tiered = TieredStorage(FeedStorage())
+        task_id = await _submit(tiered)
+
+        written = await tiered.update_task(task_id, "working")
+        written["status"]["state"] = "failed"
+        loaded = await tiered.load_task(task_id)
+        loaded["status"]["state"] = "failed"
+
+        assert (await tiered.load_task(task_id))["status"]["state"] == "working"
+
+    @pytest.mark.asyncio
+    async def test_terminal_tasks_are_demoted(self):
+        """Test active tasks stay hot and terminal ones expire after the TTL."""
+        backend = FeedStorage()
+        tiered = TieredStorage(backend, terminal_ttl_seconds=0)
+        active = await _submit(tiered)
+        done = await _submit(tiered)
+        await tiered.update_task(done, "completed")
+
+        await tiered.load_task(active)
+        assert backend.loads == 0
+
+        assert (await tiered.load_task(done))["status"]["state"] == "completed"
+        assert backend.loads == 1
+
+    @pytest.mark.asyncio
+    async def test_miss_promotes_from_cold_tier(self):
+        """Test a task written elsewhere is loaded once, then served hot."""
+        backend = FeedStorage()
+        tiered = TieredStorage(backend)
+        task_id = await _submit(backend)
+
+        await tiered.load_task(task_id)
+        await tiered.load_task(task_id, projection="status")
+
+        assert backend.loads == 1
+
+    @pytest.mark.asyncio
+    async def test_own_notifications_are_skipped(self):
+        """Test the feed echo of our own write keeps the hot copy."""
+        backend = FeedStorage()
+        tiered = TieredStorage(backend)
+        await tiered.start()
+        task_id = await _submit(tiered)
+        await tiered.update_task(task_id, "working")
+
+        backend.callback(task_id)  # echo of submit_task
+        backend.callback(task_id)  # echo of update_task
+        assert task_id in tiered._entries
+
+        # Written by another process, then announced on the feed
+        await backend.update_task(task_id, "canceled")
+        backend.callback(task_id)
+
+        assert (await tiered.load_task(task_id))["status"]["state"] == "canceled"
+        assert backend.loads == 1
+        await tiered.stop()
+
+    @pytest.mark.asyncio
+    async def test_refused_and_overlapping_writes_drop_copy(self):
+        """Test writes whose result may be stale leave nothing hot."""
+        backend = FeedStorage()
+        tiered = TieredStorage(backend)
+        task_id = await _submit(tiered)
+
+        assert await tiered.transition_task(task_id, ["working"], "completed") is None
+        assert task_id not in tiered._entries
+
+        original = backend.update_task
+
+        async def slow_update(*args, **kwargs):
+            await asyncio.sleep(0)
+            return await original(*args, **kwargs)
+
+        with patch.object(backend, "update_task", slow_update):
+            await asyncio.gather(
+                tiered.update_task(task_id, "working"),
+                tiered.update_task(task_id, "input-required"),
+            )
+
+        assert task_id not in tiered._entries
+        assert not tiered._writes
+
+    @pytest.mark.asyncio
+    async def test_failed_write_drops_copy(self):
+        """Test a write that raises invalidates the task."""
+        tiered = TieredStorage(FeedStorage())
+        task_id = await _submit(tiered)
+
+        with patch.object(tiered.storage, "update_task", side_effect=KeyError):
+            with pytest.raises(KeyError):
+                await tiered.update_task(task_id, "working")
+
+        assert task_id not in tiered._entries
+
+
+class TestTieredFactory:
+    """Test the factory builds the hot tier from settings."""
+
+    @pytest.mark.asyncio
+    async def test_hot_tier_replaces_task_cache(self):
+        """Test hot_tier_enabled wraps the backend in TieredStorage."""
+        with (
+            patch.object(app_settings.storage, "backend", "memory"),
+            patch.object(app_settings.storage, "hot_tier_enabled", True),
+            patch.object(app_settings.storage, "task_cache_enabled", True),
+            patch.object(app_settings.storage, "hot_tier_terminal_ttl_seconds", 5),
+        ):
+            storage = await create_storage()
+
+        assert isinstance(storage, TieredStorage)
+        assert storage.terminal_ttl_seconds == 5
+        await close_storage(storage)
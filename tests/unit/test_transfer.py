@@ -0,0 +1,251 @@
+"""Unit tests for bulk export/import and the transfer CLI."""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from bindu.cli import main
+from bindu.server.storage.memory_storage import InMemoryStorage
+from bindu.server.storage.transfer import (
+    IMPORT_PROGRESS_NAME,
+    MANIFEST_NAME,
+    copy_storage,
+    export_storage,
+    import_storage,
+)
+from tests.utils import create_test_message
+
+CREATED = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+async def _populated(count: int = 5) -> InMemoryStorage:
+    """Storage with tasks, two of them with feedback and a webhook config."""
+    storage = InMemoryStorage()
+    for i in range(count):
+        message = create_test_message(text=f"task {i}")
+        task = await storage.submit_task(message["context_id"], message)
+        storage._created_at[task["id"]] = CREATED
+        if i < 2:
+            await storage.update_task(task["id"], "completed")
+            await storage.store_task_feedback(task["id"], {"rating": i + 1})
+            await storage.save_webhook_config(
+                task["id"], {"id": uuid4(), "url": f"https://hooks.example/{i}"}
+            )
+    return storage
+
+
+def _contents(storage: InMemoryStorage) -> dict:
+    return {
+        task_id: (
+            task["context_id"],
+            task["status"]["state"],
+            [message["message_id"] for message in task["history"]],
+            storage._created_at[task_id],
+            storage.task_feedback.get(task_id),
+            (storage._webhook_configs.get(task_id) or {}).get("url"),
+        )
+        for task_id, task in storage.tasks.items()
+    }
+
+
+class _FailingStorage(InMemoryStorage):
+    """Raise from export/import after a number of successful calls."""
+
+    def __init__(self, fail_after: int):
+        super().__init__()
+        self.calls = 0
+        self.fail_after = fail_after
+
+    def _count_call(self) -> None:
+        self.calls += 1
+        if self.calls > self.fail_after:
+            raise ConnectionError("connection lost")
+
+    async def export_records(self, kind, after, limit):
+        self._count_call()
+        return await super().export_records(kind, after, limit)
+
+    async def import_records(self, kind, records):
+        self._count_call()
+        return await super().import_records(kind, records)
+
+
+class TestMemoryRecords:
+    """Test InMemoryStorage.export_records and import_records."""
+
+    @pytest.mark.asyncio
+    async def test_export_pages_in_key_order(self):
+        """Test batches follow the key order and continue after the cursor."""
+        storage = await _populated()
+
+        first = await storage.export_records("tasks", None, 3)
+        rest = await storage.export_records("tasks", str(first[-1]["id"]), 3)
+
+        ids = [record["id"] for record in first + rest]
+        assert ids == sorted(storage.tasks)
+        assert first[0]["created_at"] == CREATED
+
+    @pytest.mark.asyncio
+    async def test_import_skips_existing_and_orphans(self):
+        """Test existing records and dependents of unknown tasks are skipped."""
+        source = await _populated()
+        target = InMemoryStorage()
+        tasks = await source.export_records("tasks", None, 100)
+        feedback = await source.export_records("feedback", None, 100)
+
+        assert await target.import_records("feedback", feedback) == 0
+        assert await target.import_records("tasks", tasks) == 5
+        assert await target.import_records("tasks", tasks) == 0
+        assert await target.import_records("feedback", feedback) == 2
+        assert await target.import_records("feedback", feedback) == 0
+        assert await target.count_tasks_by_state() == {"completed": 2, "submitted": 3}
+
+
+class TestExportImport:
+    """Test export_storage, import_storage and copy_storage."""
+
+    @pytest.mark.asyncio
+    async def test_ndjson_round_trip(self, tmp_path):
+        """Test a dump restores tasks, history, feedback and webhook configs."""
+        source = await _populated()
+        target = InMemoryStorage()
+
+        exported = await export_storage(source, tmp_path, batch_size=2)
+        imported = await import_storage(target, tmp_path, batch_size=2)
+
+        assert exported.records == {
+            "contexts": 5,
+            "tasks": 5,
+            "feedback": 2,
+            "webhook_configs": 2,
+        }
+        assert imported.inserted == exported.records
+        assert _contents(target) == _contents(source)
+        lines = (tmp_path / "tasks.ndjson").read_bytes().splitlines()
+        assert len(lines) == 5
+
+    @pytest.mark.asyncio
+    async def test_export_resumes_after_failure(self, tmp_path):
+        """Test an interrupted export continues from its cursor."""
+        source = _FailingStorage(fail_after=2)
+        for i in range(5):
+            message = create_test_message(text=f"task {i}")
+            await source.submit_task(message["context_id"], message)
+
+        with pytest.raises(ConnectionError):
+            await export_storage(source, tmp_path, batch_size=2)
+        manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+        assert manifest["kinds"]["contexts"]["records"] == 4
+        assert not manifest["kinds"]["contexts"]["done"]
+        # A crash between writing a batch and saving the manifest leaves a tail
+        with open(tmp_path / "contexts.ndjson", "ab") as f:
+            f.write(b'{"id": "torn')
+
+        source.fail_after = 100
+        result = await export_storage(source, tmp_path, batch_size=2)
+
+        assert result.skipped == []
+        assert result.records["contexts"] == 1
+        contexts = (tmp_path / "contexts.ndjson").read_bytes().splitlines()
+        assert sorted(json.loads(line)["id"] for line in contexts) == sorted(
+            str(context_id) for context_id in source.contexts
+        )
+        target = InMemoryStorage()
+        await import_storage(target, tmp_path)
+        assert set(target.tasks) == set(source.tasks)
+
+    @pytest.mark.asyncio
+    async def test_import_resumes_after_failure(self, tmp_path):
+        """Test an interrupted import continues from its recorded offset."""
+        source = await _populated()
+        await export_storage(source, tmp_path, batch_size=2)
+        target = _FailingStorage(fail_after=4)
+
+        with pytest.raises(ConnectionError):
+            await import_storage(target, tmp_path, batch_size=2)
+        assert len(target.tasks) == 2
+
+        target.fail_after = 100
+        target.calls = 0
+        result = await import_storage(target, tmp_path, batch_size=2)
+
+        assert result.skipped == ["contexts"]
+        assert result.records["tasks"] == 3
+        assert _contents(target) == _contents(source)
+        progress = json.loads((tmp_path / IMPORT_PROGRESS_NAME).read_text())
+        assert all(state["done"] for state in progress["kinds"].values())
+
+        again = await import_storage(target, tmp_path, restart=True)
+        assert sum(again.inserted.values()) == 0
+
+    @pytest.mark.asyncio
+    async def test_import_rejects_unfinished_dump(self, tmp_path):
+        """Test a dump whose export did not finish is refused."""
+        source = _FailingStorage(fail_after=1)
+        message = create_test_message()
+        await source.submit_task(message["context_id"], message)
+        with pytest.raises(ConnectionError):
+            await export_storage(source, tmp_path, batch_size=1)
+
+        with pytest.raises(ValueError, match="incomplete"):
+            await import_storage(InMemoryStorage(), tmp_path)
+
+    @pytest.mark.asyncio
+    async def test_copy_format_requires_postgres(self, tmp_path):
+        """Test COPY formats are refused for the in-memory backend."""
+        with pytest.raises(ValueError, match="requires PostgreSQL"):
+            await export_storage(InMemoryStorage(), tmp_path, format="binary")
+
+    @pytest.mark.asyncio
+    async def test_copy_storage_between_backends(self):
+        """Test a direct copy moves everything and can be repeated."""
+        source = await _populated()
+        target = InMemoryStorage()
+
+        first = await copy_storage(source, target, batch_size=2)
+        second = await copy_storage(source, target, batch_size=2)
+
+        assert first.inserted["tasks"] == 5
+        assert sum(second.inserted.values()) == 0
+        assert _contents(target) == _contents(source)
+
+
+class TestTransferCommands:
+    """Test `bindu storage export` and `bindu storage import`."""
+
+    def test_export_then_import(self, tmp_path, capsys):
+        """Test the commands move a dump between two storages."""
+        source = asyncio.run(_populated())
+        target = InMemoryStorage()
+        dump = str(tmp_path / "dump")
+
+        with patch("bindu.cli.storage.close_storage", AsyncMock()):
+            with patch(
+                "bindu.cli.storage.create_storage", AsyncMock(return_value=source)
+            ):
+                assert main(["storage", "export", dump, "--batch-size", "2"]) == 0
+            with patch(
+                "bindu.cli.storage.create_storage", AsyncMock(return_value=target)
+            ):
+                assert main(["storage", "import", dump]) == 0
+
+        output = capsys.readouterr().out
+        assert "tasks: Exported 5" in output
+        assert "tasks: Imported 5 of 5" in output
+        assert _contents(target) == _contents(source)
+
+    def test_import_without_dump_fails(self, tmp_path, capsys):
+        """Test importing a directory without a manifest exits with 1."""
+        with (
+            patch(
+                "bindu.cli.storage.create_storage",
+                AsyncMock(return_value=InMemoryStorage()),
+            ),
+            patch("bindu.cli.storage.close_storage", AsyncMock()),
+        ):
+            assert main(["storage", "import", str(tmp_path)]) == 1
+        assert MANIFEST_NAME in capsys.readouterr().err
@@ -0,0 +1,127 @@
+"""Unit tests for the group-commit WriteCoalescer."""
+
+import asyncio
+
+import pytest
+
+from bindu.server.storage.coalescer import WriteCoalescer
+
+
+class RecordingFlush:
+    """Flush callback that records each batch and echoes items back."""
+
+    def __init__(self, delay: float = 0.0):
+        self.batches: list[list] = []
+        self.delay = delay
+
+    async def __call__(self, batch: list) -> list:
+        self.batches.append(list(batch))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return [KeyError(item) if item == "missing" else item for item in batch]
+
+
+class TestWriteCoalescer:
+    """Test batching, ordering and error propagation."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_share_one_flush(self):
+        """Test writes submitted within the window are flushed together."""
+        flush = RecordingFlush()
+        coalescer = WriteCoalescer(flush, window_ms=5)
+
+        results = await asyncio.gather(
+            *(coalescer.submit(i, i * 10) for i in range(20))
+        )
+
+        assert results == [i * 10 for i in range(20)]
+        assert len(flush.batches) == 1
+        assert coalescer.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_max_batch_flushes_immediately(self):
+        """Test a full batch is cut without waiting for the window."""
+        flush = RecordingFlush()
+        coalescer = WriteCoalescer(flush, window_ms=10_000, max_batch=3)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*(coalescer.submit(i, i) for i in range(6))), timeout=1
+        )
+
+        assert results == list(range(6))
+        assert [len(b) for b in flush.batches] == [3, 3]
+
+    @pytest.mark.asyncio
+    async def test_batches_flush_in_submission_order(self):
+        """Test a later batch waits for the in-flight one to commit."""
+        flush = RecordingFlush(delay=0.01)
+        coalescer = WriteCoalescer(flush, window_ms=0, max_batch=2)
+        order: list[int] = []
+
+        async def submit(value: int) -> None:
+            await coalescer.submit("task", value)
+            order.append(value)
+
+        await asyncio.gather(*(submit(i) for i in range(6)))
+
+        assert [item for b in flush.batches for item in b] == list(range(6))
+        assert order == list(range(6))
+
+    @pytest.mark.asyncio
+    async def test_per_item_error_only_fails_its_caller(self):
+        """Test an exception result is raised to that caller alone."""
+        coalescer = WriteCoalescer(RecordingFlush(), window_ms=1)
+
+        ok, missing = await asyncio.gather(
+            coalescer.submit(1, "found"),
+            coalescer.submit(2, "missing"),
+            return_exceptions=True,
+        )
+
+        assert ok == "found"
+        assert isinstance(missing, KeyError)
+
+    @pytest.mark.asyncio
+    async def test_flush_failure_fails_whole_batch(self):
+        """Test a failed flush is raised to every caller in the batch."""
+
+        async def failing_flush(batch: list) -> list:
+            raise ConnectionError("database down")
+
+        coalescer = WriteCoalescer(failing_flush, window_ms=1)
+        results = await asyncio.gather(
+            coalescer.submit(1, "a"), coalescer.submit(2, "b"), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ConnectionError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_wait_for_blocks_until_key_flushed(self):
+        """Test wait_for returns only after queued writes for the key commit."""
+        flush = RecordingFlush()
+        coalescer = WriteCoalescer(flush, window_ms=20)
+
+        pending = asyncio.ensure_future(coalescer.submit("task", 1))
+        await asyncio.sleep(0)
+        assert coalescer.pending == 1
+
+        await coalescer.wait_for("task")
+        assert flush.batches == [[1]]
+        assert await pending == 1
+
+        # No queued writes: returns immediately
+        await asyncio.wait_for(coalescer.wait_for("other"), timeout=0.1)
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_pending_and_rejects_new_writes(self):
+        """Test close commits queued writes and refuses later submits."""
+        flush = RecordingFlush()
+        coalescer = WriteCoalescer(flush, window_ms=10_000)
+
+        pending = asyncio.ensure_future(coalescer.submit(1, "queued"))
+        await asyncio.sleep(0)
+        await coalescer.close()
+
+        assert await pending == "queued"
+        with pytest.raises(RuntimeError, match="closed"):
+            await coalescer.submit(2, "late")